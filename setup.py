@@ -29,6 +29,7 @@ INSTALL_REQUIRES = [
     "colorama >= 0.3.9, < 1",
     "distro >= 1.5.0, < 2",
     "packaging >= 17.1, < 18",
+    "scandir >= 1.10, < 2; python_version < '3.5'",
     "six >= 1.15.0, < 2",
     "toml >= 0.10.1, < 1",
     "ujson >= 2.0.3, < 4"
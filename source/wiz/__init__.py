@@ -3,6 +3,7 @@
 import os
 import shlex
 
+import wiz.config
 import wiz.definition
 import wiz.environ
 import wiz.exception
@@ -10,6 +11,7 @@ import wiz.filesystem
 import wiz.graph
 import wiz.package
 import wiz.registry
+import wiz.solver
 import wiz.spawn
 import wiz.symbol
 import wiz.system
@@ -17,7 +19,10 @@ import wiz.utility
 from ._version import __version__
 
 
-def fetch_definition_mapping(paths, max_depth=None, system_mapping=None):
+def fetch_definition_mapping(
+    paths, max_depth=None, system_mapping=None, use_index=False, workers=None,
+    lazy=False, snapshot_path=None, targeted=False
+):
     """Return mapping including all definitions available under *paths*.
 
     Mapping returned should be in the form of::
@@ -57,6 +62,33 @@ def fetch_definition_mapping(paths, max_depth=None, system_mapping=None):
         out non compatible definitions. Default is None, which means that the
         current system mapping will be :func:`queried <wiz.system.query>`.
 
+    :param use_index: Indicate whether a persistent :class:`~wiz.index.Index`
+        should be used for each registry to prevent parsing definition files
+        which have not been modified since the previous discovery. Default is
+        False.
+
+    :param workers: Number of threads used to discover definitions
+        concurrently. Default is None, which means that definitions are
+        discovered sequentially.
+
+    :param lazy: Indicate whether definitions should be :func:`lazily loaded
+        <wiz.definition.load>` so that :data:`deferred keywords
+        <wiz.definition.DEFERRED_KEYWORDS>` are only validated when accessed.
+        Default is False.
+
+    :param snapshot_path: Path to a registry :class:`snapshot
+        <wiz.snapshot.Snapshot>` to fetch definitions from if it is valid for
+        *paths*. Definitions are discovered from *paths* if the snapshot is
+        outdated or incorrect. Default is None.
+
+    :param targeted: Indicate whether definitions should only be loaded from
+        file names matching identifiers requested while resolving a context.
+        Definitions are queried by identifier from the snapshot instead if
+        *snapshot_path* is valid. *workers* is ignored when it is True.
+        Default is False.
+
+        .. seealso:: :ref:`registry/targeted_fetch`
+
     :return: Definition mapping.
 
     """
@@ -64,7 +96,9 @@ def fetch_definition_mapping(paths, max_depth=None, system_mapping=None):
         system_mapping = wiz.system.query()
 
     mapping = wiz.definition.fetch(
-        paths, system_mapping=system_mapping, max_depth=max_depth
+        paths, system_mapping=system_mapping, max_depth=max_depth,
+        use_index=use_index, workers=workers, lazy=lazy,
+        snapshot_path=snapshot_path, targeted=targeted
     )
 
     mapping["registries"] = paths
@@ -161,7 +195,8 @@ def fetch_package_request_from_command(command_request, definition_mapping):
 
 def resolve_context(
     requests, definition_mapping=None, ignore_implicit=False,
-    environ_mapping=None, maximum_combinations=None, maximum_attempts=None
+    environ_mapping=None, maximum_combinations=None, maximum_attempts=None,
+    engine=None
 ):
     """Return context mapping from *requests*.
 
@@ -215,11 +250,20 @@ def resolve_context(
         raising an error. Default is None, which means  that the default
         value will be picked from the :ref:`configuration <configuration>`.
 
+    :param engine: Name of the engine used to resolve the context, either
+        "graph" to use :class:`wiz.graph.Resolver` or "sat" to use
+        :class:`wiz.solver.Resolver`. *maximum_combinations* and
+        *maximum_attempts* are ignored by the "sat" engine. Default is None,
+        which means that the default value will be picked from the
+        :ref:`configuration <configuration>`.
+
     :return: Context mapping.
 
     :raise: :exc:`wiz.exception.GraphResolutionError` if the resolution graph
         cannot be resolved in time.
 
+    :raise: :exc:`ValueError` if *engine* is not a valid resolver engine.
+
     """
     requirements = wiz.utility.get_requirements(requests)
 
@@ -239,11 +283,25 @@ def resolve_context(
         _requests = definition_mapping.get(wiz.symbol.IMPLICIT_PACKAGE, [])
         requirements = wiz.utility.get_requirements(_requests) + requirements
 
-    resolver = wiz.graph.Resolver(
-        definition_mapping[wiz.symbol.PACKAGE_REQUEST_TYPE],
-        maximum_combinations=maximum_combinations,
-        maximum_attempts=maximum_attempts,
-    )
+    if engine is None:
+        config = wiz.config.fetch().get("resolver", {})
+        engine = config.get("engine", "graph")
+
+    if engine == "graph":
+        resolver = wiz.graph.Resolver(
+            definition_mapping[wiz.symbol.PACKAGE_REQUEST_TYPE],
+            maximum_combinations=maximum_combinations,
+            maximum_attempts=maximum_attempts,
+        )
+
+    elif engine == "sat":
+        resolver = wiz.solver.Resolver(
+            definition_mapping[wiz.symbol.PACKAGE_REQUEST_TYPE]
+        )
+
+    else:
+        raise ValueError("'{}' is not a valid resolver engine.".format(engine))
+
     packages = resolver.compute_packages(
         requirements, namespace_counter=namespace_counter
     )
@@ -1,11 +1,16 @@
 # :coding: utf-8
 
+import collections
+import re
+import threading
+
 import packaging.requirements
 from packaging.requirements import (
     L, Combine, Word, ZeroOrMore, ALPHANUM, Optional, EXTRAS,
     URL_AND_MARKER, VERSION_AND_MARKER, stringStart, stringEnd
 )
 from packaging.requirements import Requirement
+from packaging.specifiers import SpecifierSet
 
 import wiz.symbol
 
@@ -23,6 +28,108 @@ packaging.requirements.REQUIREMENT = (
     + (URL_AND_MARKER | VERSION_AND_MARKER) + stringEnd
 )
 
+# Expressions used to parse the subset of requirements commonly used without
+# the pyparsing grammar. Whitespaces are limited to the ones skipped by
+# pyparsing, and version specifiers are limited to the operators supported by
+# the legacy specifier so that every version accepted is also accepted by
+# the grammar.
+_WHITESPACE = r"[ \t\n\r]*"
+_NAME = r"[A-Za-z0-9]+(?:[-_.]+[A-Za-z0-9]+)*"
+_IDENTIFIER = r"(?:(?:{name})?{separator})*{name}".format(
+    name=_NAME, separator=re.escape(wiz.symbol.NAMESPACE_SEPARATOR)
+)
+_SPECIFIER = r"(?:==|!=|<=|>=|<|>){ws}[A-Za-z0-9][A-Za-z0-9.*+!_-]*".format(
+    ws=_WHITESPACE
+)
+
+_PATTERN = re.compile(
+    r"{ws}(?P<name>{identifier}){ws}"
+    r"(?:\[{ws}(?P<extras>{name}(?:{ws},{ws}{name})*)?{ws}\]{ws})?"
+    r"(?P<specifier>{specifier}(?:{ws},{ws}{specifier})*)?{ws}\Z".format(
+        ws=_WHITESPACE, identifier=_IDENTIFIER, name=_NAME,
+        specifier=_SPECIFIER
+    )
+)
+
+#: Maximum number of requirement strings whose parsed elements are memoized.
+CACHE_SIZE = 10000
+
+#: Parsed elements per requirement string, ordered from the least recently
+#: used to the most recently used.
+_CACHE = collections.OrderedDict()
+
+#: Lock protecting memoized elements from concurrent parsing.
+_CACHE_LOCK = threading.Lock()
+
+
+def parse(content):
+    """Return requirement instance from *content*.
+
+    Requirements made of a name, a variant and version specifiers are parsed
+    with a regular expression, and other requirements are parsed with the
+    pyparsing grammar. Elements parsed are memoized per string, and a new
+    instance is returned for each call as requirements can be mutated. Only
+    the :data:`CACHE_SIZE` most recently used strings are memoized.
+
+    Example::
+
+        >>> parse("foo::bar[V1] >= 1, < 2")
+        <Requirement('foo::bar[V1] >=1, <2')>
+
+    :param content: String representing a requirement (e.g. "maya",
+        "nuke >= 10, < 11", "ldpk-nuke[10.0]").
+
+    :return: Instance of :class:`packaging.requirements.Requirement`.
+
+    :raise: :exc:`packaging.requirements.InvalidRequirement` if the
+        requirement is incorrect.
+
+    """
+    with _CACHE_LOCK:
+        elements = _CACHE.pop(content, None)
+        if elements is not None:
+            _CACHE[content] = elements
+
+    if elements is None:
+        elements = _parse(content)
+
+        with _CACHE_LOCK:
+            _CACHE[content] = elements
+            if len(_CACHE) > CACHE_SIZE:
+                _CACHE.popitem(last=False)
+
+    name, url, extras, specifier, marker = elements
+
+    requirement = Requirement.__new__(Requirement)
+    requirement.name = name
+    requirement.url = url
+    requirement.extras = set(extras)
+    requirement.specifier = specifier
+    requirement.marker = marker
+    return requirement
+
+
+def _parse(content):
+    """Return tuple with elements of requirement parsed from *content*."""
+    match = _PATTERN.match(content)
+
+    if match is None:
+        requirement = Requirement(content)
+        return (
+            requirement.name, requirement.url, frozenset(requirement.extras),
+            requirement.specifier, requirement.marker
+        )
+
+    extras = match.group("extras")
+
+    return (
+        match.group("name"), None,
+        frozenset(
+            extra.strip(" \t\n\r") for extra in extras.split(",")
+        ) if extras else frozenset(),
+        SpecifierSet(match.group("specifier") or ""), None
+    )
+
 
 def _display_requirement(_requirement):
     """Improve readability when displaying Requirement instance.
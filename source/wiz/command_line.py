@@ -16,12 +16,14 @@ import six.moves
 import ujson
 
 import wiz.config
+import wiz.daemon
 import wiz.definition
 import wiz.exception
 import wiz.filesystem
 import wiz.history
 import wiz.logging
 import wiz.registry
+import wiz.snapshot
 import wiz.spawn
 import wiz.symbol
 import wiz.utility
@@ -134,6 +136,14 @@ class _MainGroup(click.Group):
     type=int,
     metavar="NUMBER",
 )
+@click.option(
+    "-j", "--jobs",
+    help="Number of threads used to discover definitions.",
+    default=_CONFIG.get("registry", {}).get("discovery_workers", 1),
+    type=click.IntRange(min=1),
+    metavar="NUMBER",
+    show_default=True
+)
 @click.option(
     "-r", "--registry",
     help="Set registry path for package definitions.",
@@ -159,6 +169,13 @@ class _MainGroup(click.Group):
     is_flag=True,
     default=_CONFIG.get("command", {}).get("ignore_implicit", False),
 )
+@click.option(
+    "--resolver",
+    help="Set engine used to resolve contexts.",
+    type=click.Choice(["graph", "sat"]),
+    default=_CONFIG.get("resolver", {}).get("engine", "graph"),
+    show_default=True
+)
 @click.option(
     "--init",
     help=(
@@ -236,7 +253,19 @@ def main(click_context, **kwargs):
         "system_mapping": system_mapping,
         "registry_paths": registries,
         "registry_search_depth": kwargs["registry_depth"],
+        "registry_use_index": (
+            _CONFIG.get("registry", {}).get("use_index", False)
+        ),
+        "registry_workers": kwargs["jobs"],
+        "registry_lazy_loading": (
+            _CONFIG.get("registry", {}).get("lazy_loading", False)
+        ),
+        "registry_snapshot": _CONFIG.get("registry", {}).get("snapshot"),
+        "registry_targeted": (
+            _CONFIG.get("registry", {}).get("targeted_fetch", False)
+        ),
         "ignore_implicit_packages": kwargs["ignore_implicit"],
+        "resolver_engine": kwargs["resolver"],
         "initial_environment": initial_environment,
         "recording_path": kwargs["record"],
     })
@@ -315,7 +344,11 @@ def wiz_list_package(click_context, **kwargs):
     for definition in wiz.definition.discover(
         click_context.obj["registry_paths"],
         system_mapping=system_mapping,
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        use_index=click_context.obj["registry_use_index"],
+        workers=click_context.obj["registry_workers"],
+        lazy=click_context.obj["registry_lazy_loading"],
+        snapshot_path=click_context.obj["registry_snapshot"]
     ):
         _add_to_mapping(definition, package_mapping)
 
@@ -379,7 +412,11 @@ def wiz_list_command(click_context, **kwargs):
     for definition in wiz.definition.discover(
         click_context.obj["registry_paths"],
         system_mapping=system_mapping,
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        use_index=click_context.obj["registry_use_index"],
+        workers=click_context.obj["registry_workers"],
+        lazy=click_context.obj["registry_lazy_loading"],
+        snapshot_path=click_context.obj["registry_snapshot"]
     ):
         _add_to_mapping(definition, package_mapping)
 
@@ -474,7 +511,11 @@ def wiz_search(click_context, **kwargs):
     for definition in wiz.definition.discover(
         click_context.obj["registry_paths"],
         system_mapping=system_mapping,
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        use_index=click_context.obj["registry_use_index"],
+        workers=click_context.obj["registry_workers"],
+        lazy=click_context.obj["registry_lazy_loading"],
+        snapshot_path=click_context.obj["registry_snapshot"]
     ):
         values = [str(getattr(definition, keyword)) for keyword in keywords]
         values += definition.command.keys()
@@ -516,6 +557,90 @@ def wiz_search(click_context, **kwargs):
     _export_history_if_requested(click_context)
 
 
+@main.group(
+    name="registry",
+    help=textwrap.dedent(
+        """
+        Manage registries.
+
+        Example:
+
+        \b
+        >>> wiz registry pack -o /path/to/snapshot
+
+        """
+    ),
+    short_help="Manage registries.",
+    context_settings=CONTEXT_SETTINGS
+)
+@click.pass_context
+def wiz_registry_group(click_context):
+    """Group command which manage registries."""
+    # Ensure that context fail if extra arguments were passed.
+    _fail_on_extra_arguments(click_context)
+
+
+@wiz_registry_group.command(
+    name="pack",
+    help=textwrap.dedent(
+        """
+        Pack all definitions from registries into a binary snapshot.
+
+        The snapshot will be used instead of the registries when discovering
+        definitions if its path is set as "registry.snapshot" in the
+        configuration, as long as no definitions have been added, removed or
+        modified in the registries since.
+
+        Example:
+
+        \b
+        >>> wiz registry pack -o /path/to/snapshot
+        >>> wiz -r /path/to/registry registry pack -o /path/to/snapshot
+
+        """
+    ),
+    short_help="Pack registries into a snapshot.",
+    context_settings=CONTEXT_SETTINGS
+)
+@click.option(
+    "-o", "--output",
+    help="Path to the snapshot file to create.",
+    type=click.Path(),
+    default=_CONFIG.get("registry", {}).get("snapshot"),
+    required=True
+)
+@click.pass_context
+def wiz_registry_pack(click_context, **kwargs):
+    """Pack registries into a binary snapshot."""
+    logger = logging.getLogger(__name__ + ".wiz_registry_pack")
+
+    # Ensure that context fail if extra arguments were passed.
+    _fail_on_extra_arguments(click_context)
+
+    # Display registries.
+    display_registries(click_context.obj["registry_paths"])
+
+    try:
+        count = wiz.snapshot.pack(
+            kwargs["output"], click_context.obj["registry_paths"],
+            max_depth=click_context.obj["registry_search_depth"]
+        )
+
+    except (IOError, OSError) as error:
+        logger.error("Impossible to create snapshot [{}]".format(error))
+
+        wiz.history.record_action(
+            wiz.symbol.EXCEPTION_RAISE_ACTION, error=error
+        )
+
+    else:
+        logger.info(
+            "{} definition(s) packed into {!r}".format(count, kwargs["output"])
+        )
+
+    _export_history_if_requested(click_context)
+
+
 @main.command(
     name="view",
     help=textwrap.dedent(
@@ -669,18 +794,12 @@ def wiz_use(click_context, **kwargs):
     """Resolve and use context from command."""
     logger = logging.getLogger(__name__ + ".wiz_use")
 
-    definition_mapping = _fetch_definition_mapping_from_context(click_context)
-    ignore_implicit = click_context.obj["ignore_implicit_packages"]
-    environ_mapping = click_context.obj["initial_environment"]
-
     # Fetch extra arguments from context.
     extra_arguments = _fetch_extra_arguments(click_context)
 
     try:
-        wiz_context = wiz.resolve_context(
-            list(kwargs["requests"]), definition_mapping,
-            ignore_implicit=ignore_implicit,
-            environ_mapping=environ_mapping,
+        wiz_context = _resolve_context_from_context(
+            click_context, list(kwargs["requests"]),
             maximum_combinations=kwargs["max_combinations"],
             maximum_attempts=kwargs["max_attempts"],
         )
@@ -780,23 +899,14 @@ def wiz_run(click_context, **kwargs):
     """Run application from resolved context."""
     logger = logging.getLogger(__name__ + ".wiz_run")
 
-    definition_mapping = _fetch_definition_mapping_from_context(click_context)
-    ignore_implicit = click_context.obj["ignore_implicit_packages"]
-    environ_mapping = click_context.obj["initial_environment"]
-
     # Fetch extra arguments from context.
     extra_arguments = _fetch_extra_arguments(click_context)
 
     try:
         requirement = wiz.utility.get_requirement(kwargs["request"])
-        request = wiz.fetch_package_request_from_command(
-            kwargs["request"], definition_mapping
-        )
 
-        wiz_context = wiz.resolve_context(
-            [request], definition_mapping,
-            ignore_implicit=ignore_implicit,
-            environ_mapping=environ_mapping,
+        wiz_context = _resolve_context_from_context(
+            click_context, [kwargs["request"]], from_command=True,
             maximum_combinations=kwargs["max_combinations"],
             maximum_attempts=kwargs["max_attempts"],
         )
@@ -877,15 +987,9 @@ def wiz_freeze(click_context, **kwargs):
     # Ensure that context fail if extra arguments were passed.
     _fail_on_extra_arguments(click_context)
 
-    definition_mapping = _fetch_definition_mapping_from_context(click_context)
-    ignore_implicit = click_context.obj["ignore_implicit_packages"]
-    environ_mapping = click_context.obj["initial_environment"]
-
     try:
-        _context = wiz.resolve_context(
-            list(kwargs["requests"]), definition_mapping,
-            ignore_implicit=ignore_implicit,
-            environ_mapping=environ_mapping,
+        _context = _resolve_context_from_context(
+            click_context, list(kwargs["requests"])
         )
         identifier = _query_identifier()
 
@@ -942,6 +1046,58 @@ def wiz_freeze(click_context, **kwargs):
     _export_history_if_requested(click_context)
 
 
+@main.command(
+    "daemon",
+    help=textwrap.dedent(
+        """
+        Start daemon keeping definitions in memory to resolve contexts.
+
+        When the daemon is running, contexts requested from the "use", "run"
+        and "freeze" commands are resolved by the daemon, so that definitions
+        do not have to be discovered each time. Contexts are resolved within
+        the current process if the daemon cannot be reached.
+
+        Example:
+
+        \b
+        >>> wiz daemon
+        >>> wiz daemon --socket /path/to/daemon.sock
+
+        """
+    ),
+    short_help="Start resolution daemon.",
+    context_settings=CONTEXT_SETTINGS
+)
+@click.option(
+    "-s", "--socket",
+    help="Path to the Unix socket to listen to.",
+    type=click.Path(),
+    default=_CONFIG.get("daemon", {}).get("socket_path"),
+)
+@click.pass_context
+def wiz_daemon(click_context, **kwargs):
+    """Start daemon resolving contexts."""
+    logger = logging.getLogger(__name__ + ".wiz_daemon")
+
+    # Ensure that context fail if extra arguments were passed.
+    _fail_on_extra_arguments(click_context)
+
+    try:
+        wiz.daemon.serve(socket_path=kwargs["socket"])
+
+    except wiz.exception.DaemonError as error:
+        logger.error(str(error))
+
+        wiz.history.record_action(
+            wiz.symbol.EXCEPTION_RAISE_ACTION, error=error
+        )
+
+    except KeyboardInterrupt:
+        logger.info("Daemon stopped.")
+
+    _export_history_if_requested(click_context)
+
+
 @main.command(
     "install",
     help=textwrap.dedent(
@@ -1304,6 +1460,8 @@ def wiz_analyze(click_context, **kwargs):
     over_duration_threshold = []
     max_version_dropdown = 0
     max_combinations = 0
+    max_nogoods_learned = 0
+    max_nogoods_used = 0
     max_duration = 0
 
     with click.progressbar(
@@ -1337,6 +1495,14 @@ def wiz_analyze(click_context, **kwargs):
                 if value >= extraction_threshold:
                     over_combination_threshold.append((value, identifier))
 
+            action = wiz.symbol.GRAPH_NOGOOD_LEARNING_ACTION
+            value = result["history"].get(action, 0)
+            max_nogoods_learned = max(max_nogoods_learned, value)
+
+            action = wiz.symbol.GRAPH_NOGOOD_USAGE_ACTION
+            value = result["history"].get(action, 0)
+            max_nogoods_used = max(max_nogoods_used, value)
+
             max_duration = max(max_duration, result["duration"])
 
             if result["duration"] >= duration_threshold:
@@ -1359,7 +1525,9 @@ def wiz_analyze(click_context, **kwargs):
         ),
         ("Max resolution time", "{:0.4f}s".format(max_duration)),
         ("Max combinations", max_combinations),
-        ("Max version dropdown", max_version_dropdown)
+        ("Max version dropdown", max_version_dropdown),
+        ("Max nogoods learned", max_nogoods_learned),
+        ("Max nogoods used", max_nogoods_used),
     ]
 
     for key, value in rows:
@@ -2099,12 +2267,97 @@ def _fetch_extra_arguments(click_context):
     return click_context.obj["extra_arguments"] or click_context.args
 
 
-def _fetch_definition_mapping_from_context(click_context):
-    """Return definition mapping from elements stored in *click_context*."""
+def _fetch_definition_mapping_from_context(click_context, targeted=False):
+    """Return definition mapping from elements stored in *click_context*.
+
+    :param click_context: Click context.
+
+    :param targeted: Indicate whether a :ref:`targeted fetch
+        <registry/targeted_fetch>` can be used if enabled in the
+        :ref:`configuration <configuration>`. It should only be True when the
+        mapping is used to resolve a context. Default is False.
+
+    :return: Definition mapping.
+
+    """
     return wiz.fetch_definition_mapping(
         click_context.obj["registry_paths"],
         system_mapping=click_context.obj["system_mapping"],
-        max_depth=click_context.obj["registry_search_depth"]
+        max_depth=click_context.obj["registry_search_depth"],
+        use_index=click_context.obj["registry_use_index"],
+        workers=click_context.obj["registry_workers"],
+        lazy=click_context.obj["registry_lazy_loading"],
+        snapshot_path=click_context.obj["registry_snapshot"],
+        targeted=targeted and click_context.obj["registry_targeted"]
+    )
+
+
+def _resolve_context_from_context(
+    click_context, requests, from_command=False, **kwargs
+):
+    """Return context resolved from *requests* and *click_context* elements.
+
+    The context is resolved by the :ref:`daemon <daemon>` when it can be
+    reached, unless the resolution process is being recorded. Otherwise, the
+    context is resolved within the current process.
+
+    :param click_context: Click context.
+
+    :param requests: List of strings indicating the package version requested
+        to build the context.
+
+    :param from_command: Indicate whether the unique request is a command
+        request. Default is False.
+
+    :param kwargs: Other keyword arguments passed to
+        :func:`wiz.resolve_context`.
+
+    :return: Context mapping.
+
+    """
+    logger = logging.getLogger(__name__ + "._resolve_context_from_context")
+
+    ignore_implicit = click_context.obj["ignore_implicit_packages"]
+    environ_mapping = click_context.obj["initial_environment"]
+    engine = click_context.obj["resolver_engine"]
+
+    if click_context.obj["recording_path"] is None:
+        try:
+            return wiz.daemon.resolve_context(
+                requests, click_context.obj["registry_paths"],
+                system_mapping=click_context.obj["system_mapping"],
+                max_depth=click_context.obj["registry_search_depth"],
+                use_index=click_context.obj["registry_use_index"],
+                workers=click_context.obj["registry_workers"],
+                lazy=click_context.obj["registry_lazy_loading"],
+                snapshot_path=click_context.obj["registry_snapshot"],
+                ignore_implicit=ignore_implicit,
+                environ_mapping=environ_mapping,
+                engine=engine,
+                from_command=from_command,
+                **kwargs
+            )
+
+        except wiz.exception.DaemonError as error:
+            logger.debug("Resolve context without daemon: {}".format(error))
+
+    definition_mapping = _fetch_definition_mapping_from_context(
+        click_context, targeted=True
+    )
+
+    if from_command:
+        requests = [
+            wiz.fetch_package_request_from_command(
+                requests[0], definition_mapping
+            )
+        ]
+
+    return wiz.resolve_context(
+        requests, definition_mapping,
+        ignore_implicit=ignore_implicit,
+        environ_mapping=environ_mapping,
+        engine=engine,
+        **kwargs
     )
 
 
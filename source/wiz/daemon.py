@@ -0,0 +1,624 @@
+# :coding: utf-8
+
+from __future__ import absolute_import
+import collections
+import logging
+import os
+import socket
+import threading
+
+import six.moves
+import ujson
+
+import wiz
+import wiz.config
+import wiz.definition
+import wiz.environ
+import wiz.exception
+import wiz.filesystem
+import wiz.package
+import wiz.utility
+from ._version import __version__
+
+#: Number of seconds to wait when connecting to the daemon before falling
+#: back to in-process resolution.
+CONNECTION_TIMEOUT = 1.0
+
+#: Maximum number of definition mappings kept in memory by the daemon.
+CACHE_SIZE = 8
+
+
+def get_socket_path():
+    """Return path to the Unix socket used by the daemon.
+
+    :return: Value of ``daemon.socket_path`` in the :ref:`configuration
+        <configuration>` or :file:`~/.wiz/daemon.sock`.
+
+    .. seealso:: :ref:`daemon`
+
+    """
+    config = wiz.config.fetch()
+    path = config.get("daemon", {}).get("socket_path")
+    if path is not None:
+        return os.path.abspath(os.path.expanduser(path))
+
+    return os.path.join(os.path.expanduser("~"), ".wiz", "daemon.sock")
+
+
+def serve(socket_path=None):
+    """Start daemon listening to *socket_path* until interrupted.
+
+    :param socket_path: Path to the Unix socket to create. Default is None,
+        which means that the path will be returned by :func:`get_socket_path`.
+
+    :raise: :exc:`wiz.exception.DaemonError` if the Unix sockets are not
+        supported on this platform or if another daemon is already listening to
+        *socket_path*.
+
+    .. seealso:: :ref:`daemon`
+
+    """
+    logger = logging.getLogger(__name__ + ".serve")
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise wiz.exception.DaemonError(
+            "Unix sockets are not supported on this platform."
+        )
+
+    socket_path = socket_path or get_socket_path()
+
+    if is_running(socket_path=socket_path):
+        raise wiz.exception.DaemonError(
+            "A daemon is already listening to {!r}.".format(socket_path)
+        )
+
+    # Remove socket left by a daemon which did not exit properly.
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    wiz.filesystem.ensure_directory(
+        os.path.dirname(os.path.abspath(socket_path))
+    )
+
+    server = Server(socket_path)
+    logger.info("Daemon listening to {!r}".format(socket_path))
+
+    try:
+        server.serve_forever()
+
+    finally:
+        server.server_close()
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def is_running(socket_path=None):
+    """Indicate whether a daemon is listening to *socket_path*.
+
+    :param socket_path: Path to the Unix socket. Default is None, which means
+        that the path will be returned by :func:`get_socket_path`.
+
+    :return: Boolean value.
+
+    """
+    try:
+        _send({"action": "ping"}, socket_path=socket_path)
+    except wiz.exception.DaemonError:
+        return False
+
+    return True
+
+
+def resolve_context(
+    requests, registry_paths, system_mapping=None, max_depth=None,
+    use_index=False, workers=None, lazy=False, snapshot_path=None,
+    ignore_implicit=False, environ_mapping=None, maximum_combinations=None,
+    maximum_attempts=None, engine=None, from_command=False, socket_path=None
+):
+    """Return context mapping from *requests* resolved by the daemon.
+
+    The daemon keeps the definition mapping fetched from *registry_paths* in
+    memory, so only the resolution is performed for each request. The
+    environment is initiated within the current process, so the context
+    returned is identical to the one returned by :func:`wiz.resolve_context`.
+
+    :param requests: List of strings indicating the package version requested
+        to build the context (e.g. ["package >= 1.0.0, < 2"])
+
+    :param registry_paths: List of registry paths to fetch definitions from.
+
+    :param system_mapping: Mapping of the current system which will filter out
+        non compatible definitions. The mapping should have been retrieved via
+        :func:`wiz.system.query`.
+
+    :param max_depth: Limited recursion value to search for definitions.
+        Default is None, which means that all sub-trees will be visited.
+
+    :param use_index: Indicate whether the daemon should use :ref:`registry
+        indexes <registry/index>` to fetch definitions. Default is False.
+
+    :param workers: Number of threads used by the daemon to discover
+        definitions. Default is None.
+
+    :param lazy: Indicate whether the daemon should load definitions
+        :ref:`lazily <registry/lazy_loading>`. Default is False.
+
+    :param snapshot_path: Path to a :ref:`registry snapshot
+        <registry/snapshot>` used by the daemon to fetch definitions. Default
+        is None.
+
+    :param ignore_implicit: Indicates whether implicit packages should not be
+        included in context. Default is False.
+
+    :param environ_mapping: Mapping of environment variables which would be
+        augmented by the resolved environment. Default is None.
+
+    :param maximum_combinations: Maximum number of combinations which can be
+        generated from conflicting variants. Default is None.
+
+    :param maximum_attempts: Maximum number of resolution attempts before
+        raising an error. Default is None.
+
+    :param engine: Name of the engine used to resolve the context. Default is
+        None.
+
+    :param from_command: Indicate whether the unique request is a command
+        request which should be converted into a package request (e.g.
+        "app >= 1.0.0"). Default is False.
+
+    :param socket_path: Path to the Unix socket. Default is None, which means
+        that the path will be returned by :func:`get_socket_path`.
+
+    :return: Context mapping.
+
+    :raise: :exc:`wiz.exception.DaemonError` if the daemon cannot be reached,
+        in which case the context should be resolved within the current
+        process.
+
+    :raise: :exc:`wiz.exception.WizError` if the context cannot be resolved.
+        The error raised by the daemon is raised again with the same type
+        (e.g. :exc:`wiz.exception.GraphConflictsError`).
+
+    .. seealso:: :ref:`daemon`
+
+    """
+    response = _send(
+        {
+            "action": "resolve",
+            "requests": requests,
+            "from_command": from_command,
+            "registries": registry_paths,
+            "system": system_mapping,
+            "max_depth": max_depth,
+            "use_index": use_index,
+            "workers": workers,
+            "lazy": lazy,
+            "snapshot_path": snapshot_path,
+            "ignore_implicit": ignore_implicit,
+            "maximum_combinations": maximum_combinations,
+            "maximum_attempts": maximum_attempts,
+            "engine": engine,
+        },
+        socket_path=socket_path
+    )
+
+    if "error" in response:
+        raise _deserialize_error(response["error"])
+
+    packages = [_deserialize_package(item) for item in response["packages"]]
+    registries = response["registries"]
+
+    _environ_mapping = wiz.environ.initiate(environ_mapping)
+    context = wiz.package.extract_context(
+        packages, environ_mapping=_environ_mapping
+    )
+
+    context["packages"] = packages
+    context["registries"] = registries
+
+    # Augment context environment with wiz signature
+    context["environ"].update({
+        "WIZ_VERSION": __version__,
+        "WIZ_CONTEXT": wiz.utility.encode([
+            [_package.identifier for _package in packages], registries
+        ])
+    })
+    return context
+
+
+class Server(six.moves.socketserver.ThreadingUnixStreamServer):
+    """Daemon server keeping definition mappings in memory.
+
+    Definition mappings are cached per registry paths, system mapping and
+    maximum depth, and only the most recently used mappings are kept in
+    memory. The modification time of each folder visited to fetch
+    a mapping is recorded, and the mapping is fetched again when one of these
+    folders is modified, so that definitions added, removed or replaced are
+    taken into account without listing all definition files for each request.
+
+    Requests are processed concurrently. Only the access to cached mappings
+    is serialized.
+
+    The Unix socket can only be accessed by the current user.
+
+    .. seealso:: :ref:`daemon`
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, cache_size=CACHE_SIZE):
+        """Initialize server listening to *path*.
+
+        :param path: Path to the Unix socket to create.
+
+        :param cache_size: Maximum number of definition mappings kept in
+            memory. Default is :data:`CACHE_SIZE`.
+
+        """
+        six.moves.socketserver.ThreadingUnixStreamServer.__init__(
+            self, path, _RequestHandler
+        )
+
+        self._lock = threading.Lock()
+        self._cache_size = cache_size
+
+        # Record folders visited and definition mapping per cache key, ordered
+        # from the least recently used to the most recently used.
+        self._cache = collections.OrderedDict()
+
+    def server_bind(self):
+        """Bind the Unix socket and restrict its access to the current user."""
+        six.moves.socketserver.ThreadingUnixStreamServer.server_bind(self)
+        os.chmod(self.server_address, 0o600)
+
+    def process(self, request):
+        """Return response mapping for *request* mapping.
+
+        :param request: Mapping received from client.
+
+        :return: Response mapping.
+
+        """
+        if request.get("version") != __version__:
+            return {"version": __version__}
+
+        action = request.get("action")
+
+        if action == "ping":
+            return {}
+
+        if action == "resolve":
+            try:
+                return self._resolve(request)
+            except wiz.exception.WizError as error:
+                return {"error": _serialize_error(error)}
+
+        return {
+            "error": _serialize_error(
+                wiz.exception.DaemonError(
+                    "Unknown action: {!r}".format(action)
+                )
+            )
+        }
+
+    def fetch_definition_mapping(
+        self, registry_paths, system_mapping=None, max_depth=None, **options
+    ):
+        """Return definition mapping from cache or from *registry_paths*.
+
+        :param registry_paths: List of registry paths.
+
+        :param system_mapping: Mapping of the current system. Default is None.
+
+        :param max_depth: Limited recursion value to search for definitions.
+            Default is None.
+
+        :param options: Other keyword arguments passed to
+            :func:`wiz.fetch_definition_mapping`. As they only change how
+            definitions are fetched, a cached mapping is returned whatever
+            the options used to fetch it.
+
+        :return: Definition mapping.
+
+        """
+        logger = logging.getLogger(__name__ + ".fetch_definition_mapping")
+
+        key = ujson.dumps(
+            [registry_paths, system_mapping, max_depth], sort_keys=True
+        )
+
+        with self._lock:
+            if key in self._cache:
+                folder_mapping, mapping = self._cache.pop(key)
+                if not _is_modified(folder_mapping):
+                    self._cache[key] = (folder_mapping, mapping)
+                    return mapping
+
+            logger.debug("Fetch definitions from: {}".format(registry_paths))
+
+            # Record folders before fetching definitions, so that the mapping
+            # is considered as outdated if a file is modified in the meantime.
+            folder_mapping = _stat_folders(registry_paths, max_depth=max_depth)
+
+            mapping = wiz.fetch_definition_mapping(
+                registry_paths, system_mapping=system_mapping,
+                max_depth=max_depth, **options
+            )
+
+            self._cache[key] = (folder_mapping, mapping)
+
+            # Discard least recently used mappings.
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+            return mapping
+
+    def _resolve(self, request):
+        """Return response mapping with packages resolved from *request*."""
+        definition_mapping = self.fetch_definition_mapping(
+            request["registries"],
+            system_mapping=request["system"],
+            max_depth=request["max_depth"],
+            use_index=request["use_index"],
+            workers=request["workers"],
+            lazy=request["lazy"],
+            snapshot_path=request["snapshot_path"]
+        )
+
+        requests = request["requests"]
+
+        if request["from_command"]:
+            requests = [
+                wiz.fetch_package_request_from_command(
+                    requests[0], definition_mapping
+                )
+            ]
+
+        context = wiz.resolve_context(
+            requests, definition_mapping,
+            ignore_implicit=request["ignore_implicit"],
+            maximum_combinations=request["maximum_combinations"],
+            maximum_attempts=request["maximum_attempts"],
+            engine=request["engine"],
+        )
+
+        return {
+            "packages": [
+                _serialize_package(_package)
+                for _package in context["packages"]
+            ],
+            "registries": context["registries"],
+        }
+
+
+class _RequestHandler(six.moves.socketserver.StreamRequestHandler):
+    """Handler processing one request per connection."""
+
+    def handle(self):
+        """Read request from connection and write response."""
+        logger = logging.getLogger(__name__ + "._RequestHandler.handle")
+
+        try:
+            request = ujson.loads(self.rfile.readline().decode("utf-8"))
+        except ValueError:
+            logger.debug("Incorrect request received.")
+            return
+
+        response = self.server.process(request)
+        self.wfile.write(ujson.dumps(response).encode("utf-8") + b"\n")
+
+
+def _send(request, socket_path=None):
+    """Send *request* mapping to daemon and return response mapping.
+
+    :param request: Mapping to send.
+
+    :param socket_path: Path to the Unix socket. Default is None, which means
+        that the path will be returned by :func:`get_socket_path`.
+
+    :return: Response mapping.
+
+    :raise: :exc:`wiz.exception.DaemonError` if the daemon cannot be reached or
+        if its response is incorrect.
+
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise wiz.exception.DaemonError(
+            "Unix sockets are not supported on this platform."
+        )
+
+    socket_path = socket_path or get_socket_path()
+
+    # Avoid waiting for a connection when no daemon has been started.
+    if not os.path.exists(socket_path):
+        raise wiz.exception.DaemonError(
+            "No daemon listening to {!r}.".format(socket_path)
+        )
+
+    request = dict(request, version=__version__)
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        connection.settimeout(CONNECTION_TIMEOUT)
+        connection.connect(socket_path)
+        connection.settimeout(None)
+
+        connection.sendall(ujson.dumps(request).encode("utf-8") + b"\n")
+
+        stream = connection.makefile("rb")
+        try:
+            line = stream.readline()
+        finally:
+            stream.close()
+
+    except (IOError, OSError, socket.error) as error:
+        raise wiz.exception.DaemonError(
+            "Impossible to reach daemon [{}]".format(error)
+        )
+
+    finally:
+        connection.close()
+
+    try:
+        response = ujson.loads(line.decode("utf-8"))
+    except ValueError:
+        raise wiz.exception.DaemonError("Incorrect response from daemon.")
+
+    if response.get("version", __version__) != __version__:
+        raise wiz.exception.DaemonError(
+            "Daemon is running another version of Wiz: {}".format(
+                response["version"]
+            )
+        )
+
+    return response
+
+
+def _stat_folders(registry_paths, max_depth=None):
+    """Return modification time per folder visited under *registry_paths*.
+
+    :param registry_paths: List of registry paths.
+
+    :param max_depth: Limited recursion value to search for definitions.
+        Default is None.
+
+    :return: Mapping of modification time per folder path. The modification
+        time is None if the folder does not exist.
+
+    """
+    mapping = {}
+
+    for path in registry_paths:
+        path = path.strip()
+        if not path:
+            continue
+
+        path = os.path.abspath(path)
+        mapping[path] = _stat_folder(path)
+
+        for folder in wiz.definition.discover_folders(
+            path, max_depth=max_depth
+        ):
+            mapping[folder] = _stat_folder(folder)
+
+    return mapping
+
+
+def _stat_folder(path):
+    """Return modification time of folder *path* or None if it is missing."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return
+
+
+def _is_modified(folder_mapping):
+    """Indicate whether a folder from *folder_mapping* has been modified.
+
+    :param folder_mapping: Mapping returned by :func:`_stat_folders`.
+
+    :return: Boolean value.
+
+    """
+    return any(
+        _stat_folder(path) != mtime
+        for path, mtime in folder_mapping.items()
+    )
+
+
+def _serialize_error(error):
+    """Return serializable mapping from *error*."""
+    mapping = {"type": type(error).__name__, "message": error.message}
+
+    if isinstance(error, wiz.exception.GraphConflictsError):
+        mapping["conflicts"] = [
+            [str(requirement), sorted(identifiers)]
+            for requirement, identifiers in error.conflicts
+        ]
+
+    elif isinstance(error, wiz.exception.GraphInvalidNodesError):
+        mapping["error_mapping"] = {
+            identifier: [
+                _serialize_error(_error)
+                if isinstance(_error, wiz.exception.WizError) else str(_error)
+                for _error in errors
+            ]
+            for identifier, errors in error.error_mapping.items()
+        }
+
+    elif isinstance(error, wiz.exception.DefinitionsExist):
+        mapping["definitions"] = error.definitions
+
+    return mapping
+
+
+def _deserialize_error(mapping):
+    """Return error from serialized *mapping*.
+
+    The error is created with the same type as the error raised by the
+    daemon, or as :exc:`wiz.exception.WizError` if this type is unknown.
+
+    """
+    error_type = getattr(wiz.exception, mapping.get("type", ""), None)
+
+    if not (
+        isinstance(error_type, type)
+        and issubclass(error_type, wiz.exception.WizError)
+    ):
+        error_type = wiz.exception.WizError
+
+    # Errors are initialized with the message formatted by the daemon, as
+    # each error type is initialized with different arguments.
+    error = error_type.__new__(error_type)
+    wiz.exception.WizError.__init__(error, mapping.get("message"))
+
+    if "conflicts" in mapping:
+        error.conflicts = [
+            (wiz.utility.get_requirement(requirement), set(identifiers))
+            for requirement, identifiers in mapping["conflicts"]
+        ]
+
+    if "error_mapping" in mapping:
+        error.error_mapping = {
+            identifier: [
+                _deserialize_error(_error) if isinstance(_error, dict)
+                else _error
+                for _error in errors
+            ]
+            for identifier, errors in mapping["error_mapping"].items()
+        }
+
+    if "definitions" in mapping:
+        error.definitions = mapping["definitions"]
+
+    return error
+
+
+def _serialize_package(package):
+    """Return serializable mapping from *package*."""
+    definition = package.definition
+
+    return {
+        "definition": definition.data(copy_data=False),
+        "path": definition.path,
+        "registry_path": definition.registry_path,
+        "variant": package.variant_identifier,
+    }
+
+
+def _deserialize_package(mapping):
+    """Return package from serialized *mapping*."""
+    # Data has been validated by the daemon.
+    definition = wiz.definition.Definition(
+        mapping["definition"],
+        path=mapping["path"],
+        registry_path=mapping["registry_path"],
+        copy_data=False,
+        validate_data=False
+    )
+
+    return wiz.package.create(
+        definition, variant_identifier=mapping["variant"]
+    )
@@ -1,25 +1,55 @@
 # :coding: utf-8
 
 from __future__ import absolute_import
+import bisect
 import os
-import copy
 import json
 import collections
+import fnmatch
+import functools
 import logging
+import multiprocessing.pool
 
+from packaging.specifiers import Specifier
+from packaging.version import Version
+import six
 import ujson
 
+try:
+    from os import scandir as _scandir
+except ImportError:
+    # Python 2.7 requires the backported scandir package.
+    from scandir import scandir as _scandir
+
+import wiz.config
 import wiz.exception
 import wiz.filesystem
 import wiz.history
+import wiz.index
 import wiz.package
+import wiz.snapshot
 import wiz.symbol
 import wiz.system
 import wiz.utility
+import wiz.validation_cache
 import wiz.validator
 
+#: Keywords which are only validated when accessed for the first time when a
+#: :class:`Definition` is lazily loaded.
+DEFERRED_KEYWORDS = (
+    "install-root", "install-location", "environ", "requirements",
+    "conditions", "variants"
+)
+
+#: Keywords which string values are interned to be shared between definitions
+#: loaded from registries.
+INTERNED_KEYWORDS = ("identifier", "version", "namespace")
 
-def fetch(paths, system_mapping=None, max_depth=None):
+
+def fetch(
+    paths, system_mapping=None, max_depth=None, use_index=False, workers=None,
+    lazy=False, snapshot_path=None, targeted=False
+):
     """Return mapping from all definitions available under *paths*.
 
     A definition mapping should be in the form of::
@@ -62,9 +92,56 @@ def fetch(paths, system_mapping=None, max_depth=None):
         <Definition>`. Default is None, which means that all  sub-trees will be
         visited.
 
+    :param use_index: Indicate whether a persistent :class:`~wiz.index.Index`
+        should be used for each registry to prevent parsing definition files
+        which have not been modified since the previous discovery. Default is
+        False.
+
+    :param workers: Number of threads used to discover definitions
+        concurrently. Default is None, which means that definitions are
+        discovered sequentially.
+
+    :param lazy: Indicate whether definitions should be :func:`lazily loaded
+        <load>` so that :data:`deferred keywords <DEFERRED_KEYWORDS>` are only
+        validated when accessed. Default is False.
+
+    :param snapshot_path: Path to a registry :class:`snapshot
+        <wiz.snapshot.Snapshot>` to fetch definitions from if it is valid for
+        *paths*. Definitions are discovered from *paths* if the snapshot is
+        outdated or incorrect. Default is None.
+
+    :param targeted: Indicate whether definitions should only be loaded from
+        file names matching identifiers requested while using the mapping.
+        Definitions are queried by identifier from the snapshot instead if
+        *snapshot_path* is valid. *workers* is ignored when it is True.
+        Default is False.
+
+        .. seealso:: :ref:`registry/targeted_fetch`
+
     :return: Definition mapping.
 
     """
+    if targeted:
+        snapshot = None
+
+        # Query definitions from snapshot if it is still valid.
+        if snapshot_path is not None:
+            snapshot = wiz.snapshot.fetch(
+                snapshot_path, paths, max_depth=max_depth
+            )
+
+        mapping = _TargetedLoader(
+            paths, system_mapping=system_mapping, max_depth=max_depth,
+            use_index=use_index, lazy=lazy, snapshot=snapshot
+        ).mapping
+
+        wiz.history.record_action(
+            wiz.symbol.DEFINITIONS_COLLECTION_ACTION,
+            registries=paths, max_depth=max_depth, definition_mapping=mapping
+        )
+
+        return mapping
+
     mapping = {
         wiz.symbol.PACKAGE_REQUEST_TYPE: {},
         wiz.symbol.COMMAND_REQUEST_TYPE: {},
@@ -75,7 +152,9 @@ def fetch(paths, system_mapping=None, max_depth=None):
     implicit_package_mapping = {}
 
     for definition in discover(
-        paths, system_mapping=system_mapping, max_depth=max_depth
+        paths, system_mapping=system_mapping, max_depth=max_depth,
+        use_index=use_index, workers=workers, lazy=lazy,
+        snapshot_path=snapshot_path
     ):
         _add_to_mapping(definition, mapping[wiz.symbol.PACKAGE_REQUEST_TYPE])
 
@@ -132,8 +211,9 @@ def _add_to_mapping(definition, mapping):
     qualified_identifier = definition.qualified_identifier
     version = str(definition.version or wiz.symbol.UNSET_VALUE)
 
-    mapping.setdefault(qualified_identifier, {})
-    mapping[qualified_identifier].setdefault(version, {})
+    if qualified_identifier not in mapping:
+        mapping[qualified_identifier] = _VersionMapping()
+
     mapping[qualified_identifier][version] = definition
 
 
@@ -200,14 +280,92 @@ def query(requirement, definition_mapping, namespace_counter=None):
         be resolved.
 
     """
-    identifier = requirement.name
+    variant_identifier = None
 
+    # Extract variant if necessary.
+    if len(requirement.extras) > 0:
+        variant_identifier = next(iter(requirement.extras))
+
+    index = _fetch_version_index(
+        requirement, definition_mapping, namespace_counter=namespace_counter
+    )
+
+    # Get the best matching definition from highest version.
+    definition = index.find(
+        requirement.specifier, variant_identifier=variant_identifier
+    )
+
+    if definition is None:
+        raise wiz.exception.RequestNotFound(
+            "The requirement '{}' could not be resolved.".format(requirement)
+        )
+
+    return definition
+
+
+def query_all(requirement, definition_mapping, namespace_counter=None):
+    """Return all definition versions matching *requirement*.
+
+    :param requirement: Instance of :class:`packaging.requirements.Requirement`.
+
+    :param definition_mapping: Mapping regrouping all available definitions
+        associated with their unique identifier.
+
+    :param namespace_counter: instance of :class:`collections.Counter`
+        which indicates occurrence of namespaces used as hints for package
+        identification. Default is None.
+
+    :return: List of :class:`Definition` instances sorted from the highest
+        version to the lowest.
+
+    :raise: :exc:`wiz.exception.RequestNotFound` if the requirement can not
+        be resolved.
+
+    """
     variant_identifier = None
 
     # Extract variant if necessary.
     if len(requirement.extras) > 0:
         variant_identifier = next(iter(requirement.extras))
 
+    index = _fetch_version_index(
+        requirement, definition_mapping, namespace_counter=namespace_counter
+    )
+
+    definitions = list(
+        index.iterate(
+            requirement.specifier, variant_identifier=variant_identifier
+        )
+    )
+
+    if len(definitions) == 0:
+        raise wiz.exception.RequestNotFound(
+            "The requirement '{}' could not be resolved.".format(requirement)
+        )
+
+    return definitions
+
+
+def _fetch_version_index(requirement, definition_mapping, namespace_counter):
+    """Return version index of definition corresponding to *requirement*.
+
+    :param requirement: Instance of :class:`packaging.requirements.Requirement`.
+
+    :param definition_mapping: Mapping regrouping all available definitions
+        associated with their unique identifier.
+
+    :param namespace_counter: instance of :class:`collections.Counter`
+        which indicates occurrence of namespaces used as hints for package
+        identification, or None.
+
+    :return: Instance of :class:`_VersionIndex`.
+
+    :raise: :exc:`wiz.exception.RequestNotFound` if the definition can not
+        be found or if non-versioned and versioned definitions are mixed.
+
+    """
+    identifier = requirement.name
+
     # Extend identifier with namespace if necessary.
     if wiz.symbol.NAMESPACE_SEPARATOR not in identifier:
         identifier = _guess_qualified_identifier(
@@ -224,49 +382,21 @@ def query(requirement, definition_mapping, namespace_counter=None):
             "The requirement '{}' could not be resolved.".format(requirement)
         )
 
-    definition = None
-
-    # Extract all versions from definitions.
-    versions = [
-        _definition.version or wiz.symbol.UNSET_VALUE
-        for _definition in definition_mapping[identifier].values()
-    ]
+    # Fetch version index from mapping or create it if necessary.
+    versions = definition_mapping[identifier]
+    index = (
+        versions.index if isinstance(versions, _VersionMapping)
+        else _VersionIndex(versions)
+    )
 
-    if wiz.symbol.UNSET_VALUE in versions and len(versions) > 1:
+    if index.mixed:
         raise wiz.exception.RequestNotFound(
             "Impossible to retrieve the best matching definition for "
             "'{}' as non-versioned and versioned definitions have "
             "been fetched.".format(identifier)
         )
 
-    # Sort the definition versions so that the highest one is first.
-    versions = sorted(versions, reverse=True)
-
-    # Get the best matching definition by sorting versions so that the highest
-    # one is first.
-    for version in sorted(versions, reverse=True):
-        _definition = definition_mapping[identifier][str(version)]
-
-        # Skip if the variant identifier required is not found in definition.
-        if variant_identifier and not any(
-            variant_identifier == variant.identifier
-            for variant in _definition.variants
-        ):
-            continue
-
-        if (
-            _definition.version is None
-            or _definition.version in requirement.specifier
-        ):
-            definition = _definition
-            break
-
-    if definition is None:
-        raise wiz.exception.RequestNotFound(
-            "The requirement '{}' could not be resolved.".format(requirement)
-        )
-
-    return definition
+    return index
 
 
 def _guess_qualified_identifier(
@@ -414,7 +544,10 @@ def export(path, data, overwrite=False):
     return file_path
 
 
-def discover(paths, system_mapping=None, max_depth=None):
+def discover(
+    paths, system_mapping=None, max_depth=None, use_index=False, workers=None,
+    lazy=False, snapshot_path=None
+):
     """Discover and yield all definitions found under *paths*.
 
     :param paths: List of registry paths to recursively fetch
@@ -428,47 +561,101 @@ def discover(paths, system_mapping=None, max_depth=None):
         <Definition>`. Default is None, which means that all  sub-trees will be
         visited.
 
+    :param use_index: Indicate whether a persistent :class:`~wiz.index.Index`
+        should be used for each registry to prevent parsing definition files
+        which have not been modified since the previous discovery. Default is
+        False.
+
+    :param workers: Number of threads used to scan registry sub-folders and
+        load definition files concurrently. Default is None, which means that
+        definitions are discovered sequentially. Definitions are always yielded
+        in the same order, whatever the number of workers.
+
+    :param lazy: Indicate whether definitions should be :func:`lazily loaded
+        <load>` so that :data:`deferred keywords <DEFERRED_KEYWORDS>` are only
+        validated when accessed. Default is False.
+
+    :param snapshot_path: Path to a registry :class:`snapshot
+        <wiz.snapshot.Snapshot>` to fetch definitions from if it is valid for
+        *paths*. Definitions are discovered from *paths* if the snapshot is
+        outdated or incorrect. Default is None.
+
     :return: Generator which yield all :class:`definitions <Definition>`.
 
     """
     logger = logging.getLogger(__name__ + ".discover")
 
-    for path in paths:
+    # Fetch definitions from snapshot if it is still valid.
+    if snapshot_path is not None:
+        snapshot = wiz.snapshot.fetch(
+            snapshot_path, paths, max_depth=max_depth
+        )
 
-        # Ignore empty paths that could resolve to current directory.
-        path = path.strip()
-        if not path:
-            logger.debug("Skipping empty path.")
-            continue
+        if snapshot is not None:
+            logger.debug(
+                "Fetch definitions from snapshot {!r}".format(snapshot_path)
+            )
+
+            with snapshot:
+                for definition in snapshot.discover(
+                    system_mapping=system_mapping
+                ):
+                    yield definition
+
+            return
 
-        path = os.path.abspath(path)
-        logger.debug("Searching under {!r} for definition files.".format(path))
+    # Fetch validation cache before loading definitions concurrently.
+    cache = wiz.validation_cache.fetch()
 
-        initial_depth = path.rstrip(os.sep).count(os.sep)
-        for base, _, filenames in os.walk(path):
-            depth = base.count(os.sep)
-            if max_depth is not None and (depth - initial_depth) > max_depth:
+    # Skip files which name indicates an incompatible system if requested.
+    prefilter = None
+
+    config = wiz.config.fetch()
+    if (
+        system_mapping is not None
+        and config.get("registry", {}).get("system_prefilter", False)
+    ):
+        prefilter = _SystemPrefilter(system_mapping)
+
+    pool = None
+    if workers is not None and workers > 1:
+        logger.debug("Discover definitions with {} workers.".format(workers))
+        pool = multiprocessing.pool.ThreadPool(workers)
+
+    try:
+        for path in paths:
+
+            # Ignore empty paths that could resolve to current directory.
+            path = path.strip()
+            if not path:
+                logger.debug("Skipping empty path.")
                 continue
 
-            for filename in filenames:
-                _, extension = os.path.splitext(filename)
-                if extension != ".json":
-                    continue
+            path = os.path.abspath(path)
+            logger.debug(
+                "Searching under {!r} for definition files.".format(path)
+            )
 
-                _path = os.path.join(base, filename)
+            index = wiz.index.Index(path) if use_index else None
 
-                # Load and validate the definition.
-                try:
-                    definition = load(_path, registry_path=path)
+            _load = functools.partial(
+                _load_definition, registry_path=path, index=index, lazy=lazy,
+                prefilter=prefilter
+            )
 
-                except (
-                    IOError, ValueError, TypeError,
-                    wiz.exception.WizError
-                ):
-                    logger.warning(
-                        "Error occurred trying to load definition from {!r}"
-                        .format(_path)
-                    )
+            if pool is None:
+                _paths = discover_paths(path, max_depth=max_depth)
+                definitions = six.moves.map(_load, _paths)
+
+            else:
+                _paths = _discover_paths_concurrently(
+                    path, pool, max_depth=max_depth
+                )
+                # Definitions are yielded in the same order as the paths.
+                definitions = pool.imap(_load, _paths)
+
+            for definition in definitions:
+                if definition is None:
                     continue
 
                 # Skip definition if an incompatible system if set.
@@ -486,8 +673,243 @@ def discover(paths, system_mapping=None, max_depth=None):
 
                 yield definition
 
+            # Only prune index entries if all sub-trees have been visited.
+            if index is not None:
+                index.save(prune=max_depth is None)
+
+        if cache is not None:
+            cache.save()
 
-def load(path, mapping=None, registry_path=None):
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def discover_paths(path, max_depth=None, ignore_patterns=None):
+    """Discover and yield all definition file paths found under *path*.
+
+    Sub-folders deeper than *max_depth* are not visited, and the type of each
+    entry is fetched from the folder listing to prevent extra :func:`os.stat`
+    calls whenever possible. As with :func:`os.walk`, symbolic links to
+    folders are not followed.
+
+    :param path: Registry path to recursively search definition files from.
+
+    :param max_depth: Limited recursion value to search for definition files.
+        Default is None, which means that all  sub-trees will be visited.
+
+    :param ignore_patterns: List of :mod:`fnmatch` patterns used to skip
+        folders and files by name (e.g. [".git", "*.archive"]). Default is
+        None, which means that the patterns defined by
+        ``registry.ignore_patterns`` in the :ref:`configuration
+        <configuration>` are used.
+
+    :return: Generator which yield all :term:`JSON` file paths.
+
+    """
+    for _, paths in _walk(path, max_depth, ignore_patterns):
+        for _path in paths:
+            yield _path
+
+
+def discover_folders(path, max_depth=None, ignore_patterns=None):
+    """Discover and yield all folder paths visited under *path*.
+
+    Folders are visited as with :func:`discover_paths`, so that adding,
+    removing or renaming a definition file which could be discovered updates
+    the modification time of one of the folders yielded.
+
+    :param path: Registry path to recursively search folders from.
+
+    :param max_depth: Limited recursion value to search for folders. Default
+        is None, which means that all  sub-trees will be visited.
+
+    :param ignore_patterns: List of :mod:`fnmatch` patterns used to skip
+        folders by name. Default is None, which means that the patterns
+        defined by ``registry.ignore_patterns`` in the :ref:`configuration
+        <configuration>` are used.
+
+    :return: Generator which yield all folder paths, starting with *path*.
+
+    """
+    for folder, _ in _walk(path, max_depth, ignore_patterns):
+        yield folder
+
+
+def _walk(path, max_depth, ignore_patterns):
+    """Yield folder paths visited under *path* with their definition files.
+
+    :param path: Registry path to recursively visit.
+
+    :param max_depth: Limited recursion value, or None.
+
+    :param ignore_patterns: List of :mod:`fnmatch` patterns used to skip
+        folders and files by name, or None to use the :ref:`configuration
+        <configuration>`.
+
+    :return: Generator which yield tuples with folder path and list of
+        :term:`JSON` file paths within this folder.
+
+    """
+    if ignore_patterns is None:
+        config = wiz.config.fetch()
+        ignore_patterns = config.get("registry", {}).get("ignore_patterns", [])
+
+    if max_depth is not None and max_depth < 0:
+        return
+
+    # Visit folders depth-first in the same order as os.walk.
+    stack = [(path, 0)]
+
+    while len(stack) > 0:
+        folder, depth = stack.pop()
+
+        paths, folders = _scan_folder(folder, ignore_patterns)
+        yield folder, paths
+
+        if max_depth is None or depth < max_depth:
+            stack.extend((_folder, depth + 1) for _folder in reversed(folders))
+
+
+def _scan_folder(path, ignore_patterns):
+    """Return definition file paths and sub-folders paths within *path*.
+
+    :param path: Folder path to scan.
+
+    :param ignore_patterns: List of :mod:`fnmatch` patterns used to skip
+        folders and files by name.
+
+    :return: Tuple with list of :term:`JSON` file paths and list of sub-folder
+        paths. Symbolic links to folders are not included.
+
+    """
+    paths = []
+    folders = []
+
+    try:
+        entries = list(_scandir(path))
+    except OSError:
+        return paths, folders
+
+    for entry in entries:
+        if any(
+            fnmatch.fnmatch(entry.name, pattern) for pattern in ignore_patterns
+        ):
+            continue
+
+        try:
+            is_folder = entry.is_dir()
+        except OSError:
+            is_folder = False
+
+        if is_folder:
+            if not entry.is_symlink():
+                folders.append(entry.path)
+
+        elif os.path.splitext(entry.name)[1] == ".json":
+            paths.append(entry.path)
+
+    return paths, folders
+
+
+def _discover_paths_concurrently(path, pool, max_depth=None):
+    """Return all definition file paths found under *path* using *pool*.
+
+    Each immediate sub-folder of *path* is scanned by a separate worker and
+    the results are concatenated so that paths are returned in the same order
+    as with :func:`discover_paths`.
+
+    :param path: Registry path to recursively search definition files from.
+
+    :param pool: Instance of :class:`multiprocessing.pool.ThreadPool`.
+
+    :param max_depth: Limited recursion value to search for definition files.
+        Default is None, which means that all  sub-trees will be visited.
+
+    :return: List of :term:`JSON` file paths.
+
+    """
+    if max_depth is not None and max_depth < 1:
+        return list(discover_paths(path, max_depth=max_depth))
+
+    config = wiz.config.fetch()
+    ignore_patterns = config.get("registry", {}).get("ignore_patterns", [])
+
+    paths, folders = _scan_folder(path, ignore_patterns)
+
+    _max_depth = max_depth - 1 if max_depth is not None else None
+
+    for _paths in pool.map(
+        lambda folder: list(
+            discover_paths(
+                folder, max_depth=_max_depth, ignore_patterns=ignore_patterns
+            )
+        ),
+        folders
+    ):
+        paths.extend(_paths)
+
+    return paths
+
+
+def _load_definition(
+    path, registry_path, index=None, lazy=False, prefilter=None
+):
+    """Return definition loaded from *path*.
+
+    :param path: :term:`JSON` file path which contains a definition.
+
+    :param registry_path: Path to registry containing the definition.
+
+    :param index: Instance of :class:`wiz.index.Index` used to fetch the
+        definition if the file is unchanged. Default is None.
+
+    :param lazy: Indicate whether the definition should be lazily loaded.
+        Default is False.
+
+    :param prefilter: Instance of :class:`_SystemPrefilter` used to skip the
+        file if its name indicates an incompatible system. Default is None.
+
+    :return: Instance of :class:`Definition` or None if the definition could
+        not be loaded or has been skipped.
+
+    """
+    logger = logging.getLogger(__name__ + ".discover")
+
+    if prefilter is not None and prefilter.skip(path):
+        return
+
+    # Fetch definition from index if file is unchanged. Indexed definitions
+    # which have been lazily loaded are loaded again if a fully validated
+    # definition is required.
+    if index is not None:
+        definition = index.fetch(path)
+        if definition is not None and (lazy or definition.validated):
+            if prefilter is not None:
+                prefilter.record(path, definition)
+
+            return definition
+
+    # Load and validate the definition.
+    try:
+        definition = load(path, registry_path=registry_path, lazy=lazy)
+
+    except (IOError, ValueError, TypeError, wiz.exception.WizError):
+        logger.warning(
+            "Error occurred trying to load definition from {!r}".format(path)
+        )
+        return
+
+    if index is not None:
+        index.update(path, definition)
+
+    if prefilter is not None:
+        prefilter.record(path, definition)
+
+    return definition
+
+
+def load(path, mapping=None, registry_path=None, lazy=False):
     """Load and return a definition from *path*.
 
     :param path: :term:`JSON` file path which contains a definition.
@@ -498,32 +920,710 @@ def load(path, mapping=None, registry_path=None):
     :param registry_path: Path to the registry which contains the definition.
         Default is None.
 
+    :param lazy: Indicate whether the validation of :data:`deferred keywords
+        <DEFERRED_KEYWORDS>` should be postponed until they are accessed for
+        the first time. Default is False.
+
     :return: Instance of :class:`Definition`.
 
     :raise: :exc:`wiz.exception.IncorrectDefinition` if the definition is
         incorrect.
 
+    .. note::
+
+        Validation is skipped if the content of the file is recorded in the
+        :ref:`validation cache <registry/validation_cache>`.
+
     """
     if mapping is None:
         mapping = {}
 
-    with open(path, "r") as stream:
-        definition_data = ujson.load(stream)
-        definition_data.update(mapping)
+    with open(path, "rb") as stream:
+        content = stream.read()
 
+    definition_data = ujson.loads(content)
+    definition_data.update(mapping)
+    _intern_data(definition_data)
+
+    cache = wiz.validation_cache.fetch()
+    if cache is None:
         return Definition(
             definition_data,
             path=path,
             registry_path=registry_path,
-            copy_data=False
+            copy_data=False,
+            lazy=lazy
+        )
+
+    key = wiz.validation_cache.compute_key(content, mapping=mapping)
+    validated = cache.contains(key)
+
+    definition = Definition(
+        definition_data,
+        path=path,
+        registry_path=registry_path,
+        copy_data=False,
+        validate_data=not validated,
+        lazy=lazy and not validated
+    )
+
+    if not validated and definition.validated:
+        cache.record(key)
+
+    return definition
+
+
+class _SystemPrefilter(object):
+    """Skip definition files which name indicates an incompatible system.
+
+    The name of a definition file with a :ref:`system requirement
+    <definition/system>` ends with a :func:`hash
+    <wiz.utility.compute_system_hash>` of its system label. The compatibility
+    of each hash with the current system is recorded when the first definition
+    with this system is loaded, so that following files ending with the same
+    hash can be skipped without being opened.
+
+    .. seealso:: :ref:`registry/system_prefilter`
+
+    """
+
+    def __init__(self, system_mapping):
+        """Initialize filter.
+
+        :param system_mapping: Mapping of the current system as returned by
+            :func:`wiz.system.query`.
+
+        """
+        self._system_mapping = system_mapping
+
+        # Record whether system is compatible per system hash.
+        self._compatibility_mapping = {}
+
+    def skip(self, path):
+        """Indicate whether definition file *path* can be skipped.
+
+        :param path: :term:`JSON` file path which contains a definition.
+
+        :return: Boolean value.
+
+        """
+        key = _extract_system_hash(path)
+        return self._compatibility_mapping.get(key, True) is False
+
+    def record(self, path, definition):
+        """Record whether the system of *definition* is compatible.
+
+        The compatibility is only recorded if *path* has been
+        :func:`computed <wiz.utility.compute_file_name>` from *definition*
+        system.
+
+        :param path: :term:`JSON` file path which contains *definition*.
+
+        :param definition: Instance of :class:`Definition` loaded from *path*.
+
+        """
+        key = _extract_system_hash(path)
+        if key is None or key in self._compatibility_mapping:
+            return
+
+        if (
+            not definition.system
+            or wiz.utility.compute_system_hash(definition) != key
+        ):
+            return
+
+        self._compatibility_mapping[key] = wiz.system.validate(
+            definition, self._system_mapping
+        )
+
+
+def _extract_system_hash(path):
+    """Return system hash from definition file *path* if possible.
+
+    :param path: :term:`JSON` file path which contains a definition.
+
+    :return: String value or None if file name does not end with a
+        :func:`system hash <wiz.utility.compute_system_hash>`.
+
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    length = wiz.utility.SYSTEM_HASH_LENGTH
+
+    if len(name) <= length or name[-length - 1] != "-":
+        return
+
+    return name[-length:]
+
+
+class _LazyMapping(dict):
+    """Mapping calling a function with each key before looking it up.
+
+    The function can add missing items to the mapping when they are requested,
+    so that values are only computed when needed.
+
+    """
+
+    def __init__(self, callback):
+        """Initialize mapping.
+
+        :param callback: Function called with each key looked up.
+
+        """
+        super(_LazyMapping, self).__init__()
+        self._callback = callback
+
+    def __contains__(self, key):
+        """Indicate whether *key* is in mapping."""
+        self._callback(key)
+        return super(_LazyMapping, self).__contains__(key)
+
+    def __getitem__(self, key):
+        """Return value corresponding to *key*."""
+        self._callback(key)
+        return super(_LazyMapping, self).__getitem__(key)
+
+    def get(self, key, default=None):
+        """Return value corresponding to *key* or *default*."""
+        self._callback(key)
+        return super(_LazyMapping, self).get(key, default)
+
+
+class _VersionMapping(dict):
+    """Mapping of definitions per version with a sorted version index.
+
+    The :class:`version index <_VersionIndex>` is created when the mapping is
+    queried for the first time, and discarded when the mapping is modified.
+
+    """
+
+    #: Version index or None if it has not been created yet.
+    _index = None
+
+    @property
+    def index(self):
+        """Return :class:`_VersionIndex` instance for mapping."""
+        if self._index is None:
+            self._index = _VersionIndex(self)
+        return self._index
+
+    def __setitem__(self, key, value):
+        """Set *value* for *key*."""
+        self._index = None
+        super(_VersionMapping, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        """Remove *key* from mapping."""
+        self._index = None
+        super(_VersionMapping, self).__delitem__(key)
+
+    def clear(self):
+        """Remove all items from mapping."""
+        self._index = None
+        super(_VersionMapping, self).clear()
+
+    def pop(self, *args):
+        """Remove *key* from mapping and return its value."""
+        self._index = None
+        return super(_VersionMapping, self).pop(*args)
+
+    def popitem(self):
+        """Remove and return an item from mapping."""
+        self._index = None
+        return super(_VersionMapping, self).popitem()
+
+    def setdefault(self, key, default=None):
+        """Return value for *key* and set it to *default* if necessary."""
+        self._index = None
+        return super(_VersionMapping, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        """Update mapping from other mapping or iterable."""
+        self._index = None
+        super(_VersionMapping, self).update(*args, **kwargs)
+
+
+class _VersionIndex(object):
+    """Definitions of a version mapping sorted by version.
+
+    Definitions are sorted in ascending order so that the range of versions
+    allowed by a specifier can be located by bisection. Variant identifiers
+    are recorded per definition when first needed, so that lazy definitions
+    are only validated when visited.
+
+    """
+
+    __slots__ = ("definitions", "versions", "mixed", "_variants", "_local")
+
+    def __init__(self, mapping):
+        """Initialize index.
+
+        :param mapping: Mapping of :class:`definitions <Definition>` per
+            version.
+
+        """
+        definitions = [
+            definition for definition in mapping.values()
+            if definition.version is not None
+        ]
+
+        #: Indicate whether non-versioned and versioned definitions are mixed.
+        self.mixed = 0 < len(definitions) < len(mapping)
+
+        if len(definitions) == 0:
+            definitions = list(mapping.values())
+
+        else:
+            # Definitions with equal versions are kept in mapping order when
+            # visited from the highest version.
+            definitions.sort(key=lambda _def: _def.version, reverse=True)
+            definitions.reverse()
+
+        #: Definitions sorted in ascending order of version.
+        self.definitions = definitions
+
+        #: Versions sorted in ascending order.
+        self.versions = [definition.version for definition in definitions]
+
+        self._variants = [None] * len(definitions)
+        self._local = any(
+            version is not None and version.local is not None
+            for version in self.versions
+        )
+
+    def find(self, specifier, variant_identifier=None):
+        """Return definition with highest version matching *specifier*.
+
+        :param specifier: Instance of
+            :class:`packaging.specifiers.SpecifierSet`.
+
+        :param variant_identifier: Variant identifier which must be contained
+            in the definition. Default is None.
+
+        :return: Instance of :class:`Definition` or None if no definition
+            matches.
+
+        """
+        for definition in self.iterate(
+            specifier, variant_identifier=variant_identifier
+        ):
+            return definition
+
+    def iterate(self, specifier, variant_identifier=None):
+        """Yield definitions matching *specifier* from highest version.
+
+        :param specifier: Instance of
+            :class:`packaging.specifiers.SpecifierSet`.
+
+        :param variant_identifier: Variant identifier which must be contained
+            in the definitions. Default is None.
+
+        :return: Generator of :class:`Definition` instances.
+
+        """
+        start, stop = self._locate(specifier)
+
+        for position in range(stop - 1, start - 1, -1):
+            if (
+                variant_identifier is not None
+                and variant_identifier not in self._fetch_variants(position)
+            ):
+                continue
+
+            definition = self.definitions[position]
+            if (
+                definition.version is None
+                or definition.version in specifier
+            ):
+                yield definition
+
+    def _locate(self, specifier):
+        """Return range of positions of versions which could match.
+
+        The range is computed from inclusive lower bounds and upper bounds of
+        *specifier* as definitions matching it cannot be found outside of it.
+
+        """
+        start, stop = 0, len(self.versions)
+
+        # Non-versioned definition is compatible with any specifier.
+        if stop == 1 and self.versions[0] is None:
+            return start, stop
+
+        for _specifier in specifier:
+            if not isinstance(_specifier, Specifier):
+                continue
+
+            operator = _specifier.operator
+            if operator not in ("<", "<=", ">", ">=", "==", "~="):
+                continue
+
+            if _specifier.version.endswith(".*"):
+                continue
+
+            version = Version(_specifier.version)
+
+            if operator in (">", ">=", "==", "~="):
+                start = max(start, bisect.bisect_left(self.versions, version))
+
+            if operator == "<":
+                stop = min(stop, bisect.bisect_left(self.versions, version))
+
+            # Versions with local label are equal to version without local
+            # label with the '==' operator.
+            elif operator == "<=" or (
+                operator == "==" and (version.local or not self._local)
+            ):
+                stop = min(stop, bisect.bisect_right(self.versions, version))
+
+        return start, stop
+
+    def _fetch_variants(self, position):
+        """Return variant identifiers of definition at *position*."""
+        variants = self._variants[position]
+
+        if variants is None:
+            variants = frozenset(
+                variant.identifier
+                for variant in self.definitions[position].variants
+            )
+            self._variants[position] = variants
+
+        return variants
+
+
+class _TargetedLoader(object):
+    """Load definitions from file names matching identifiers requested.
+
+    Definition files are listed without being loaded. When an identifier is
+    looked up in the package mapping, only the files which name could have
+    been :func:`computed <wiz.utility.compute_file_name>` from a definition
+    with this identifier are loaded, so that the number of definitions loaded
+    is proportional to the number of identifiers requested.
+
+    Command and implicit requests cannot be deduced from file names, so they
+    are looked up in the :class:`~wiz.index.Index` of each registry if
+    available. Only files which are not indexed or have been modified since
+    are read to find the ones containing the command requested or the
+    :ref:`auto-use <definition/auto-use>` keyword.
+
+    When a :class:`~wiz.snapshot.Snapshot` is used, definitions are queried
+    from the snapshot instead, so that only the definitions requested are
+    deserialized.
+
+    .. seealso:: :ref:`registry/targeted_fetch`
+
+    """
+
+    def __init__(
+        self, paths, system_mapping=None, max_depth=None, use_index=False,
+        lazy=False, snapshot=None
+    ):
+        """Initialize loader.
+
+        :param paths: List of registry paths to recursively fetch
+            :class:`definitions <Definition>` from.
+
+        :param system_mapping: Mapping of the current system which will filter
+            out non compatible definitions. Default is None.
+
+        :param max_depth: Limited recursion value to search for definition
+            files. Default is None.
+
+        :param use_index: Indicate whether a persistent
+            :class:`~wiz.index.Index` should be used for each registry to look
+            up commands and implicit packages, and to prevent parsing
+            definition files which have not been modified since they were
+            indexed. Default is False.
+
+        :param lazy: Indicate whether definitions should be :func:`lazily
+            loaded <load>`. Default is False.
+
+        :param snapshot: Instance of :class:`wiz.snapshot.Snapshot` valid for
+            *paths* to query definitions from. Default is None, which means
+            that definitions are loaded from definition files.
+
+        """
+        self._logger = logging.getLogger(__name__ + "._TargetedLoader")
+
+        # Definitions are loaded while the mapping is used, so the validation
+        # cache is saved once when the process exits.
+        if wiz.validation_cache.fetch() is not None:
+            wiz.validation_cache.save_on_exit()
+
+        self._system_mapping = system_mapping
+        self._lazy = lazy
+        self._snapshot = snapshot
+
+        # Record definition file paths with registry path and file name in
+        # order of discovery.
+        self._paths = []
+
+        # Record indices of file paths per token of file name.
+        self._token_mapping = {}
+
+        # Record definitions loaded per index of file path. The value is None
+        # if the definition cannot be used.
+        self._definitions = {}
+
+        # Record registry indexes per registry path.
+        self._indexes = {}
+
+        # Record identifiers and commands already fetched.
+        self._identifiers = set()
+        self._commands = set()
+
+        # Definition files do not need to be listed when using a snapshot.
+        if snapshot is not None:
+            paths = []
+
+        for path in paths:
+
+            # Ignore empty paths that could resolve to current directory.
+            path = path.strip()
+            if not path:
+                continue
+
+            path = os.path.abspath(path)
+
+            if use_index:
+                self._indexes[path] = wiz.index.Index(path)
+
+            for _path in discover_paths(path, max_depth=max_depth):
+                name = os.path.splitext(os.path.basename(_path))[0]
+
+                for token in set(name.split("-")):
+                    self._token_mapping.setdefault(token, [])
+                    self._token_mapping[token].append(len(self._paths))
+
+                self._paths.append((_path, path, name))
+
+        self.mapping = _LazyMapping(self._fetch_implicit_requests)
+        self.mapping[wiz.symbol.PACKAGE_REQUEST_TYPE] = _LazyMapping(
+            self._fetch_package
+        )
+        self.mapping[wiz.symbol.PACKAGE_REQUEST_TYPE]["__namespace__"] = (
+            _LazyMapping(self._fetch_identifier)
+        )
+        self.mapping[wiz.symbol.COMMAND_REQUEST_TYPE] = _LazyMapping(
+            self._fetch_command
+        )
+
+    def _fetch_package(self, key):
+        """Load definitions corresponding to package mapping *key*."""
+        if key == "__namespace__":
+            return
+
+        identifier = key.split(wiz.symbol.NAMESPACE_SEPARATOR)[-1]
+        self._fetch_identifier(identifier)
+
+    def _fetch_identifier(self, identifier):
+        """Load definitions with *identifier* into package mapping."""
+        if identifier in self._identifiers:
+            return
+
+        self._identifiers.add(identifier)
+
+        if self._snapshot is not None:
+            definitions = self._snapshot.query(
+                identifier, system_mapping=self._system_mapping
+            )
+
+        else:
+            # As the identifier can contain dashes, file names are filtered by
+            # the first token of the identifier.
+            token = identifier.split("-")[0]
+
+            definitions = self._load([
+                index for index in self._token_mapping.get(token, [])
+                if _match_file_name(self._paths[index][2], identifier)
+            ])
+
+        # Use dictionary methods to prevent calling callbacks recursively.
+        mapping = dict.__getitem__(
+            self.mapping, wiz.symbol.PACKAGE_REQUEST_TYPE
         )
 
+        for definition in definitions:
+            if definition.identifier == identifier:
+                _add_to_mapping(definition, mapping)
+
+    def _fetch_command(self, command):
+        """Load definitions containing *command* into command mapping."""
+        if command in self._commands:
+            return
+
+        self._commands.add(command)
+
+        mapping = dict.__getitem__(
+            self.mapping, wiz.symbol.COMMAND_REQUEST_TYPE
+        )
+
+        for definition in self._search(command):
+            if command in definition.command:
+                dict.__setitem__(
+                    mapping, command, definition.qualified_identifier
+                )
+
+    def _fetch_implicit_requests(self, key):
+        """Compute implicit requests if *key* requires them."""
+        if (
+            key != wiz.symbol.IMPLICIT_PACKAGE
+            or dict.__contains__(self.mapping, key)
+        ):
+            return
+
+        identifiers = []
+        mapping = {}
+
+        for definition in self._search("auto-use"):
+            if definition.auto_use:
+                identifiers.append(definition.qualified_identifier)
+                _add_to_mapping(definition, mapping)
+
+        dict.__setitem__(
+            self.mapping, key, _extract_implicit_requests(identifiers, mapping)
+        )
+
+    def _search(self, keyword):
+        """Return definitions which can be used containing *keyword* string."""
+        if self._snapshot is not None:
+            return self._snapshot.search(
+                keyword, system_mapping=self._system_mapping
+            )
+
+        pattern = '"{}"'.format(keyword).encode("utf-8")
+        indices = []
+
+        # Index definitions which are not indexed or have been modified, so
+        # that they are not read again during the next fetch.
+        for path, registry_path, _ in self._paths:
+            registry_index = self._indexes.get(registry_path)
+            if registry_index is not None and not registry_index.contains(path):
+                _load_definition(
+                    path, registry_path, index=registry_index, lazy=self._lazy
+                )
+
+        # Record paths containing keyword per registry path.
+        path_mapping = {
+            registry_path: registry_index.search(keyword)
+            for registry_path, registry_index in self._indexes.items()
+        }
+
+        for index, (path, registry_path, _) in enumerate(self._paths):
+            if registry_path in path_mapping:
+                if path in path_mapping[registry_path]:
+                    indices.append(index)
+
+                continue
+
+            try:
+                with open(path, "rb") as stream:
+                    if pattern in stream.read():
+                        indices.append(index)
+
+            except (IOError, OSError):
+                continue
+
+        definitions = self._load(indices)
+
+        for registry_index in self._indexes.values():
+            registry_index.save(prune=False)
+
+        return definitions
+
+    def _load(self, indices):
+        """Return definitions which can be used from file path *indices*."""
+        definitions = []
+
+        for index in indices:
+            if index not in self._definitions:
+                path, registry_path, _ = self._paths[index]
+                self._definitions[index] = self._load_definition(
+                    path, registry_path
+                )
+
+            if self._definitions[index] is not None:
+                definitions.append(self._definitions[index])
+
+        return definitions
+
+    def _load_definition(self, path, registry_path):
+        """Return definition from *path* or None if it cannot be used."""
+        definition = _load_definition(
+            path, registry_path, index=self._indexes.get(registry_path),
+            lazy=self._lazy
+        )
+        if definition is None:
+            return
+
+        # Skip definition if an incompatible system if set.
+        if (
+            self._system_mapping is not None and
+            not wiz.system.validate(definition, self._system_mapping)
+        ):
+            return
+
+        # Skip definition if "disabled" keyword is set to True.
+        if definition.disabled:
+            _id = definition.qualified_version_identifier
+            self._logger.warning("Definition '{}' is disabled".format(_id))
+            return
+
+        return definition
+
+
+def _match_file_name(name, identifier):
+    """Indicate whether file *name* could contain definition *identifier*.
+
+    :param name: File name without extension, as returned by
+        :func:`wiz.utility.compute_file_name` (e.g. "namespace-foo-0.1.0").
+
+    :param identifier: Definition identifier (e.g. "foo").
+
+    :return: Boolean value.
+
+    """
+    return (
+        name == identifier
+        or name.startswith(identifier + "-")
+        or name.endswith("-" + identifier)
+        or "-{}-".format(identifier) in name
+    )
+
+
+def _intern_data(data):
+    """Intern string values of :data:`INTERNED_KEYWORDS` in *data*.
+
+    Strings are interned with :func:`sys.intern`, so that they are released
+    once no definitions reference them anymore. Unicode strings are not
+    interned with Python 2.7.
+
+    :param data: Data definition mapping which is mutated in place. It should
+        only be a mapping owned by the caller (e.g. just loaded from a file).
+
+    """
+    for keyword in INTERNED_KEYWORDS:
+        value = data.get(keyword)
+        if type(value) is str:
+            data[keyword] = six.moves.intern(value)
+
 
 class Definition(object):
-    """Definition object."""
+    """Definition object.
+
+    Attributes are stored in slots instead of an instance dictionary to reduce
+    the memory footprint when a large number of definitions are discovered.
+
+    """
+
+    __slots__ = (
+        "_data", "_path", "_registry_path", "_deferred_keywords", "_version",
+        "_requirements", "_conditions", "_variants"
+    )
 
     def __init__(
-        self, data, path=None, registry_path=None, copy_data=True
+        self, data, path=None, registry_path=None, copy_data=True,
+        validate_data=True, lazy=False
     ):
         """Initialize definition from input *data* mapping.
 
@@ -535,8 +1635,21 @@ class Definition(object):
         :param registry_path: Path to the registry from which the definition
             where fetched if available. Default is None.
 
-        :param copy_data: Indicate whether input *data* will be copied to
-            prevent mutating it. Default is True.
+        :param copy_data: Indicate whether input *data* will be copied into a
+            :func:`read-only <wiz.utility.freeze>` structure to prevent
+            mutating it. Sub-structures which are already read-only are shared
+            instead of being copied. Default is True.
+
+        :param validate_data: Indicate whether input *data* will be validated.
+            It should only be set to False when *data* is known to be valid
+            (e.g. when fetched from a registry :class:`~wiz.index.Index`).
+            Default is True.
+
+        :param lazy: Indicate whether the validation of :data:`deferred
+            keywords <DEFERRED_KEYWORDS>` should be postponed until they are
+            accessed for the first time. It is useful when only a few
+            definitions will be used out of a large number of definitions
+            discovered. Default is False.
 
         :raise: :exc:`wiz.exception.IncorrectDefinition` if the *data* mapping
             is incorrect.
@@ -558,18 +1671,33 @@ class Definition(object):
         .. seealso:: :ref:`definition`
 
         """
-        wiz.validator.validate_definition(data)
+        # Record keywords which validation is postponed.
+        self._deferred_keywords = frozenset()
+
+        if validate_data and lazy:
+            wiz.validator.validate_definition(
+                data, deferred_keywords=DEFERRED_KEYWORDS
+            )
+            self._deferred_keywords = set(
+                keyword for keyword in DEFERRED_KEYWORDS if keyword in data
+            )
+
+        elif validate_data:
+            wiz.validator.validate_definition(data)
 
         # Ensure that input data is not mutated if requested.
         if copy_data:
-            data = copy.deepcopy(data)
+            data = wiz.utility.freeze(data)
 
         self._data = data
         self._path = path
         self._registry_path = registry_path
 
         # Store values that needs to be constructed.
-        self._cache = {}
+        self._version = None
+        self._requirements = None
+        self._conditions = None
+        self._variants = None
 
     def __repr__(self):
         """Representing a Definition."""
@@ -598,6 +1726,52 @@ class Definition(object):
         """
         return self._registry_path
 
+    @property
+    def validated(self):
+        """Indicate whether definition data has been entirely validated.
+
+        :return: Boolean value. It is False when the definition has been lazily
+            loaded and some :data:`deferred keywords <DEFERRED_KEYWORDS>` have
+            not been accessed yet.
+
+        """
+        return not self._deferred_keywords
+
+    def validate(self):
+        """Validate all :data:`deferred keywords <DEFERRED_KEYWORDS>`.
+
+        :raise: :exc:`wiz.exception.IncorrectDefinition` if the data mapping
+            is incorrect.
+
+        """
+        for keyword in DEFERRED_KEYWORDS:
+            self._validate_deferred_keyword(keyword)
+
+    def _validate_deferred_keyword(self, keyword):
+        """Validate *keyword* if its validation has been postponed.
+
+        :param keyword: Keyword to validate (e.g. "environ").
+
+        :raise: :exc:`wiz.exception.IncorrectDefinition` if the data mapping
+            is incorrect.
+
+        """
+        if keyword not in self._deferred_keywords:
+            return
+
+        try:
+            wiz.validator.validate_definition_keyword(self._data, keyword)
+
+        except wiz.exception.DefinitionError as error:
+            raise wiz.exception.DefinitionError(
+                "Definition '{}' is incorrect: {}".format(
+                    self.qualified_identifier, error
+                )
+            )
+
+        # Keyword could be validated concurrently by another thread.
+        self._deferred_keywords.discard(keyword)
+
     @property
     def identifier(self):
         """Return definition identifier.
@@ -628,11 +1802,11 @@ class Definition(object):
         version = self._data.get("version")
 
         # Create cache value if necessary.
-        if version is not None and self._cache.get("version") is None:
-            self._cache["version"] = wiz.utility.get_version(version)
+        if version is not None and self._version is None:
+            self._version = wiz.utility.get_version(version)
 
         # Return cached value.
-        return self._cache.get("version")
+        return self._version
 
     @property
     def qualified_identifier(self):
@@ -720,6 +1894,7 @@ class Definition(object):
         .. seealso:: :ref:`definition/install_root`
 
         """
+        self._validate_deferred_keyword("install-root")
         return self._data.get("install-root")
 
     @property
@@ -731,6 +1906,7 @@ class Definition(object):
         .. seealso:: :ref:`definition/install_location`
 
         """
+        self._validate_deferred_keyword("install-location")
         return self._data.get("install-location")
 
     @property
@@ -742,6 +1918,7 @@ class Definition(object):
         .. seealso:: :ref:`definition/environ`
 
         """
+        self._validate_deferred_keyword("environ")
         return self._data.get("environ", {})
 
     @property
@@ -783,17 +1960,20 @@ class Definition(object):
         .. seealso:: :ref:`definition/requirements`
 
         """
+        self._validate_deferred_keyword("requirements")
         requirements = self._data.get("requirements")
 
         # Create cache value if necessary.
-        if requirements is not None and self._cache.get("requirements") is None:
-            self._cache["requirements"] = [
+        if requirements is not None and self._requirements is None:
+            self._requirements = [
                 wiz.utility.get_requirement(requirement)
                 for requirement in requirements
             ]
 
         # Return cached value.
-        return self._cache.get("requirements", [])
+        if self._requirements is None:
+            return []
+        return self._requirements
 
     @property
     def conditions(self):
@@ -812,17 +1992,20 @@ class Definition(object):
         .. seealso:: :ref:`definition/conditions`
 
         """
+        self._validate_deferred_keyword("conditions")
         conditions = self._data.get("conditions")
 
         # Create cache value if necessary.
-        if conditions is not None and self._cache.get("conditions") is None:
-            self._cache["conditions"] = [
+        if conditions is not None and self._conditions is None:
+            self._conditions = [
                 wiz.utility.get_requirement(condition)
                 for condition in conditions
             ]
 
         # Return cached value.
-        return self._cache.get("conditions", [])
+        if self._conditions is None:
+            return []
+        return self._conditions
 
     @property
     def variants(self):
@@ -838,17 +2021,20 @@ class Definition(object):
         .. seealso:: :ref:`definition/variants`
 
         """
+        self._validate_deferred_keyword("variants")
         variants = self._data.get("variants")
 
         # Create cache value if necessary.
-        if variants is not None and self._cache.get("variants") is None:
-            self._cache["variants"] = [
+        if variants is not None and self._variants is None:
+            self._variants = [
                 Variant(variant, definition_identifier=self.identifier)
                 for variant in variants
             ]
 
         # Return cached value.
-        return self._cache.get("variants", [])
+        if self._variants is None:
+            return []
+        return self._variants
 
     def set(self, element, value):
         """Returns copy of instance with *element* set to *value*.
@@ -860,13 +2046,12 @@ class Definition(object):
         :return: New updated mapping.
 
         """
-        data = self.data()
+        data = dict(self.data())
         data[element] = value
 
         return Definition(
             data, path=self._path,
-            registry_path=self._registry_path,
-            copy_data=False
+            registry_path=self._registry_path
         )
 
     def update(self, element, value):
@@ -881,15 +2066,16 @@ class Definition(object):
         :raise: :exc:`ValueError` if *element* is not a dictionary.
 
         """
-        data = self.data()
-        data.setdefault(element, {})
+        data = dict(self.data())
+        mapping = data.get(element, {})
 
-        if not isinstance(data[element], dict):
+        if not isinstance(mapping, dict):
             raise ValueError(
                 "Impossible to update '{}' as it is not a "
                 "dictionary.".format(element)
             )
 
+        data[element] = dict(mapping)
         data[element].update(value)
 
         return Definition(
@@ -910,14 +2096,15 @@ class Definition(object):
         :raise: :exc:`ValueError` if *element* is not a list.
 
         """
-        data = self.data()
-        data.setdefault(element, [])
+        data = dict(self.data())
+        _values = data.get(element, [])
 
-        if not isinstance(data[element], list):
+        if not isinstance(_values, list):
             raise ValueError(
                 "Impossible to extend '{}' as it is not a list.".format(element)
             )
 
+        data[element] = list(_values)
         data[element].extend(values)
 
         return Definition(
@@ -940,15 +2127,16 @@ class Definition(object):
         :raise: :exc:`ValueError` if *element* is not a list.
 
         """
-        data = self.data()
-        data.setdefault(element, [])
+        data = dict(self.data())
+        values = data.get(element, [])
 
-        if not isinstance(data[element], list):
+        if not isinstance(values, list):
             raise ValueError(
                 "Impossible to insert '{}' in '{}' as it is not "
                 "a list.".format(value, element)
             )
 
+        data[element] = list(values)
         data[element].insert(index, value)
 
         return Definition(
@@ -966,10 +2154,10 @@ class Definition(object):
             mapping.
 
         """
-        data = self.data()
-        if element not in data.keys():
+        if element not in self._data:
             return self
 
+        data = dict(self.data())
         del data[element]
 
         return Definition(
@@ -993,19 +2181,21 @@ class Definition(object):
         :raise: :exc:`ValueError` if *element* is not a dictionary.
 
         """
-        data = self.data()
-        if element not in data.keys():
+        if element not in self._data:
             return self
 
-        if not isinstance(data[element], dict):
+        if not isinstance(self._data[element], dict):
             raise ValueError(
                 "Impossible to remove key from '{}' as it is not a "
                 "dictionary.".format(element)
             )
 
-        if value not in data[element].keys():
+        if value not in self._data[element]:
             return self
 
+        data = dict(self.data())
+        data[element] = dict(data[element])
+
         del data[element][value]
         if len(data[element]) == 0:
             del data[element]
@@ -1031,19 +2221,21 @@ class Definition(object):
         :raise: :exc:`ValueError` if *element* is not a list.
 
         """
-        data = self.data()
-        if element not in data.keys():
+        if element not in self._data:
             return self
 
-        if not isinstance(data[element], list):
+        if not isinstance(self._data[element], list):
             raise ValueError(
                 "Impossible to remove index from '{}' as it is not a "
                 "list.".format(element)
             )
 
-        if index >= len(data[element]):
+        if index >= len(self._data[element]):
             return self
 
+        data = dict(self.data())
+        data[element] = list(data[element])
+
         del data[element][index]
         if len(data[element]) == 0:
             del data[element]
@@ -1054,20 +2246,31 @@ class Definition(object):
             copy_data=False
         )
 
-    def data(self, copy_data=True):
+    def data(self, copy_data=False):
         """Return definition data used to created the definition instance.
 
-        :param copy_data: Indicate whether definition data will be copied to
-            prevent mutating it. Default is True.
+        :param copy_data: Indicate whether a mutable copy of the definition
+            data should be returned. Default is False, which means that a
+            :func:`read-only <wiz.utility.freeze>` mapping is returned.
 
         :return: Definition data mapping.
 
+        .. note::
+
+            The read-only mapping is created only once and its sub-structures
+            are shared with definitions created from it via :meth:`set`,
+            :meth:`update`, :meth:`extend`, :meth:`insert`, :meth:`remove`,
+            :meth:`remove_key` and :meth:`remove_index`, so only the modified
+            elements are copied.
+
         """
-        if not copy_data:
-            return self._data
-        return copy.deepcopy(self._data)
+        if copy_data:
+            return wiz.utility.thaw(self._data)
+
+        self._data = wiz.utility.freeze(self._data)
+        return self._data
 
-    def ordered_data(self, copy_data=True):
+    def ordered_data(self, copy_data=False):
         """Return copy of definition data as :class:`collections.OrderedDict`.
 
         Definition keywords will be sorted as follows:
@@ -1102,8 +2305,8 @@ class Definition(object):
             4. environ
             5. requirements
 
-        :param copy_data: Indicate whether definition data will be copied to
-            prevent mutating it. Default is True.
+        :param copy_data: Indicate whether a mutable copy of the definition
+            data should be used. Default is False.
 
         :return: Instance of :class:`collections.OrderedDict`.
 
@@ -1176,6 +2379,8 @@ class Definition(object):
 class Variant(object):
     """Definition variant object."""
 
+    __slots__ = ("_data", "_definition_identifier", "_requirements")
+
     def __init__(self, data, definition_identifier):
         """Initialize definition variant.
 
@@ -1208,7 +2413,7 @@ class Variant(object):
         self._definition_identifier = definition_identifier
 
         # Store values that needs to be constructed.
-        self._cache = {}
+        self._requirements = None
 
     @property
     def identifier(self):
@@ -1281,24 +2486,29 @@ class Variant(object):
         requirements = self._data.get("requirements")
 
         # Create cache value if necessary.
-        if requirements is not None and self._cache.get("requirements") is None:
-            self._cache["requirements"] = [
+        if requirements is not None and self._requirements is None:
+            self._requirements = [
                 wiz.utility.get_requirement(requirement)
                 for requirement in requirements
             ]
 
         # Return cached value.
-        return self._cache.get("requirements", [])
+        if self._requirements is None:
+            return []
+        return self._requirements
 
-    def data(self, copy_data=True):
+    def data(self, copy_data=False):
         """Return variant data used to created the variant instance.
 
-        :param copy_data: Indicate whether definition data will be copied to
-            prevent mutating it. Default is True.
+        :param copy_data: Indicate whether a mutable copy of the variant data
+            should be returned. Default is False, which means that a
+            :func:`read-only <wiz.utility.freeze>` mapping is returned.
 
         :return: Variant data mapping.
 
         """
-        if not copy_data:
-            return self._data
-        return copy.deepcopy(self._data)
+        if copy_data:
+            return wiz.utility.thaw(self._data)
+
+        self._data = wiz.utility.freeze(self._data)
+        return self._data
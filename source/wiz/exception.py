@@ -271,3 +271,27 @@ class InstallNoChanges(WizError):
     def __init__(self):
         """Initialize Error."""
         super(InstallNoChanges, self).__init__(message="Nothing to install.")
+
+
+class SnapshotError(WizError):
+    """Raise when a registry snapshot is incorrect."""
+
+    def __init__(self, message):
+        """Initialize with *message*.
+
+        :param message: Message describing the issue.
+
+        """
+        super(SnapshotError, self).__init__(message=message)
+
+
+class DaemonError(WizError):
+    """Raise when the daemon cannot be started or reached."""
+
+    def __init__(self, message):
+        """Initialize with *message*.
+
+        :param message: Message describing the issue.
+
+        """
+        super(DaemonError, self).__init__(message=message)
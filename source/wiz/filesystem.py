@@ -1,6 +1,7 @@
 # :coding: utf-8
 
 import os
+import contextlib
 import errno
 import io
 import unicodedata
@@ -8,6 +9,7 @@ import re
 import gzip
 import pwd
 import getpass
+import uuid
 
 import six
 
@@ -42,6 +44,11 @@ def export(path, content, compressed=False, overwrite=False):
     :raise: :exc:`wiz.exception.FileExists` if overwrite is False and *path*
         already exists.
 
+    .. note::
+
+        Uncompressed files are :func:`written atomically <atomic_write>`, so
+        that replacing a file updates the modification time of its folder.
+
     """
     # Ensure that "~" is resolved if necessary and that the relative path is
     # always converted into a absolute path.
@@ -50,17 +57,60 @@ def export(path, content, compressed=False, overwrite=False):
     if os.path.isfile(path) and not overwrite:
         raise wiz.exception.FileExists("{!r} already exists.".format(path))
 
-    ensure_directory(os.path.dirname(path))
-
     if compressed:
+        ensure_directory(os.path.dirname(path))
+
         with gzip.open(path, "wb") as outfile:
             outfile.write(content)
 
     else:
-        with io.open(path, "w", encoding="utf8") as outfile:
+        with atomic_write(path, encoding="utf8") as outfile:
             outfile.write(six.text_type(content))
 
 
+@contextlib.contextmanager
+def atomic_write(path, mode="w", encoding=None):
+    """Return context manager to write file in *path* atomically.
+
+    Content is written into a temporary file next to *path*, which is then
+    renamed to prevent concurrent processes from reading a partial file::
+
+        >>> with atomic_write("/path/to/file.json") as stream:
+        ...     stream.write("{}")
+
+    The temporary file is removed if an error is raised while writing.
+
+    :param path: Target path to save the file.
+
+    :param mode: Mode used to open the temporary file. Default is "w".
+
+    :param encoding: Encoding used to open the temporary file in text mode.
+        Default is None, which means that the file is opened with
+        :func:`open`.
+
+    :raise: :exc:`OSError` if the file can not be written in *path*.
+
+    """
+    temporary_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+
+    try:
+        ensure_directory(os.path.dirname(os.path.abspath(path)))
+
+        if encoding is None:
+            with open(temporary_path, mode) as stream:
+                yield stream
+
+        else:
+            with io.open(temporary_path, mode, encoding=encoding) as stream:
+                yield stream
+
+        os.rename(temporary_path, path)
+
+    finally:
+        if os.path.isfile(temporary_path):
+            os.remove(temporary_path)
+
+
 def is_accessible(folder_path):
     """Indicate whether the folder path is accessible.
 
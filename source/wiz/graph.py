@@ -1,10 +1,13 @@
 # :coding: utf-8
 
 from __future__ import absolute_import
+import array
 import collections
 import copy
 import itertools
 import logging
+import multiprocessing
+import threading
 from heapq import heapify, heappush, heappop
 
 import six.moves
@@ -14,7 +17,7 @@ import wiz.package
 import wiz.exception
 import wiz.symbol
 import wiz.history
-from wiz.utility import Requirement
+from wiz._requirement import Requirement
 
 
 class Resolver(object):
@@ -43,11 +46,24 @@ class Resolver(object):
     no solutions are found, other versions of the conflicting packages will be
     fetched to attempt to resolve the graph.
 
+    When several speculative workers are requested, the next combinations are
+    resolved concurrently in forked processes. Results are consumed in the
+    original order, so the packages returned are identical to the ones returned
+    by a sequential resolution.
+
+    When a combination fails because of conflicting requirements, pairs of
+    nodes whose own requirements cannot be fulfilled together are learned as
+    nogoods. Following combinations which still contain all nodes of a nogood,
+    including combinations extracted after downgrading conflicting versions,
+    are skipped. A skipped combination is only resolved locally if its own
+    conflicts are required to discover new combinations or to report the
+    resolution error.
+
     """
 
     def __init__(
         self, definition_mapping, maximum_combinations=None,
-        maximum_attempts=None,
+        maximum_attempts=None, speculative_workers=None,
     ):
         """Initialize Resolver.
 
@@ -63,6 +79,12 @@ class Resolver(object):
             raising an error. Default is None, which means  that the default
             value will be picked from the :ref:`configuration <configuration>`.
 
+        :param speculative_workers: Number of processes used to resolve the
+            next combinations speculatively. Default is None, which means that
+            the default value will be picked from the :ref:`configuration
+            <configuration>`. Combinations are resolved sequentially if the
+            value is lower than 2.
+
         """
         self._logger = logging.getLogger(__name__ + ".Resolver")
 
@@ -76,6 +98,9 @@ class Resolver(object):
         default_value = config.get("maximum_attempts", 10)
         self._maximum_attempts = maximum_attempts or default_value
 
+        default_value = config.get("speculative_workers", 1)
+        self._speculative_workers = speculative_workers or default_value
+
         # Iterator containing Combination instances to resolve.
         self._iterator = iter([])
 
@@ -88,6 +113,37 @@ class Resolver(object):
         # used as it is a FIFO queue.
         self._conflicting_combinations = collections.deque()
 
+        # Record packages extracted per requirement and namespace hints.
+        self._package_cache = {}
+
+        # Record package instances per definition and variant identifier.
+        self._package_mapping = {}
+
+        # Record resolution errors raised by combinations resolved
+        # speculatively, or None if the combination must be resolved locally.
+        self._speculations = {}
+
+        # Record combinations which failed to be resolved speculatively with
+        # conflicting variants used at the time. These combinations are only
+        # resolved locally if required to discover new combinations.
+        self._deferred_combinations = {}
+
+        # Record initial requirements used to learn nogoods involving the root
+        # level of the graph.
+        self._requirements = []
+
+        # Record qualified identifiers of definitions requiring each definition
+        # identifier, which is only extracted when nogoods are used.
+        self._requirers = None
+
+        # Record conflicting requirements mapping per nogood. A nogood is a
+        # frozenset of node identifiers which are incompatible together.
+        self._nogoods = collections.OrderedDict()
+
+        # Record errors raised by combinations skipped from nogoods once
+        # resolved locally, or None if the combination has been resolved.
+        self._skipped_combinations = {}
+
     @property
     def definition_mapping(self):
         """Return definition mapping used by resolver.
@@ -106,6 +162,82 @@ class Resolver(object):
         """
         return self._conflicting_variants
 
+    def extract_packages(self, requirement, namespace_counter=None):
+        """Return packages extracted from *requirement*.
+
+        Packages extracted are cached per requirement and namespace
+        occurrences which can be used to guess the requirement namespace, and
+        :class:`~wiz.package.Package` instances are shared for each definition
+        and variant, so that the same packages are returned each time a
+        requirement is extracted during the resolution.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            which indicates occurrence of namespaces used as hints for package
+            identification. Default is None.
+
+        :return: Tuple of :class:`~wiz.package.Package` instances.
+
+        :raise: :exc:`wiz.exception.RequestNotFound` if the requirement can
+            not be resolved.
+
+        .. seealso:: :func:`wiz.package.extract`
+
+        """
+        key = (
+            str(requirement),
+            self._extract_namespace_hints(requirement, namespace_counter)
+        )
+
+        packages = self._package_cache.get(key)
+
+        if packages is None:
+            options = {}
+            if namespace_counter is not None:
+                options["namespace_counter"] = namespace_counter
+
+            packages = tuple(
+                self._package_mapping.setdefault(
+                    (package.definition, package.variant_identifier), package
+                )
+                for package in wiz.package.extract(
+                    requirement, self._definition_mapping, **options
+                )
+            )
+            self._package_cache[key] = packages
+
+        return packages
+
+    def _extract_namespace_hints(self, requirement, namespace_counter):
+        """Return namespace occurrences which can qualify *requirement*.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            which indicates occurrence of namespaces or None.
+
+        :return: Tuple of occurrence numbers for each namespace available for
+            *requirement* name, or None if namespace cannot be guessed from
+            occurrences.
+
+        """
+        if (
+            namespace_counter is None
+            or wiz.symbol.NAMESPACE_SEPARATOR in requirement.name
+        ):
+            return
+
+        namespaces = self._definition_mapping.get("__namespace__", {}).get(
+            requirement.name
+        )
+        if not namespaces:
+            return
+
+        return tuple(namespace_counter[name] for name in sorted(namespaces))
+
     def compute_packages(self, requirements, namespace_counter=None):
         """Return resolved packages from *requirements*.
 
@@ -122,6 +254,12 @@ class Resolver(object):
         """
         graph = Graph(self, namespace_counter=namespace_counter)
 
+        # Reset nogoods as they depend on initial requirements.
+        self._requirements = requirements
+        self._requirers = None
+        self._nogoods.clear()
+        self._skipped_combinations.clear()
+
         wiz.history.record_action(
             wiz.symbol.GRAPH_CREATION_ACTION,
             graph=graph, requirements=requirements
@@ -132,8 +270,10 @@ class Resolver(object):
 
         self.initiate_combinations(graph)
 
-        # Store latest exception to raise if necessary.
+        # Store latest exception to raise if necessary, or latest combination
+        # if it has been skipped from nogoods.
         latest_error = None
+        latest_combination = None
 
         # Record the number of failed resolution attempts.
         nb_failures = 0
@@ -141,13 +281,35 @@ class Resolver(object):
         while True:
             combination = self.fetch_next_combination()
             if combination is None or nb_failures >= self._maximum_attempts:
+
+                # Resolve latest combination locally if it has been skipped
+                # from nogoods to report its own error.
+                if latest_error is None:
+                    latest_error = self._fetch_skipped_error(latest_combination)
+
+                    if latest_error is None:
+                        return latest_combination.extract_packages()
+
                 latest_error.message = (
                     "Failed to resolve graph at combination #{}:\n\n"
                     "{}".format(nb_failures, latest_error.message)
                 )
                 raise latest_error
 
+            # Skip combination if it contains nogoods previously learned.
+            if self._skip_combination(combination):
+                latest_error = None
+                latest_combination = combination
+                nb_failures += 1
+                continue
+
+            # Fetch error raised by combination if resolved speculatively.
+            known_error = self._fetch_speculative_error(combination)
+
             try:
+                if known_error is not None:
+                    raise known_error
+
                 combination.resolve_conflicts()
                 combination.validate()
 
@@ -161,6 +323,17 @@ class Resolver(object):
 
                 # Extract conflicting identifiers and requirements if possible.
                 if isinstance(error, wiz.exception.GraphConflictsError):
+
+                    # Combination resolved speculatively will only be resolved
+                    # locally if conflicts are used to discover new
+                    # combinations.
+                    if error is known_error:
+                        self._deferred_combinations[combination] = set(
+                            self._conflicting_variants
+                        )
+
+                    self._learn_nogoods(combination.graph, error)
+
                     self._conflicting_combinations.extend([
                         (combination, identifiers)
                         for _, identifiers in error.conflicts
@@ -174,6 +347,174 @@ class Resolver(object):
                 latest_error = error
                 nb_failures += 1
 
+    def _fetch_nogood(self, graph):
+        """Return nogood learned which is contained in *graph*.
+
+        A nogood is contained in *graph* when each of its node identifiers is
+        :func:`fixed <_is_fixed_node>`, so that it would not be removed when
+        conflicts are resolved.
+
+        :param graph: Instance of :class:`Graph`.
+
+        :return: Frozenset of node identifiers, or None if no nogoods learned
+            are contained in *graph*.
+
+        """
+        if len(self._nogoods) == 0:
+            return
+
+        if self._requirers is None:
+            self._requirers = _extract_requirers(
+                self._requirements, self._definition_mapping
+            )
+
+        for nogood in self._nogoods.keys():
+            if all(
+                _is_fixed_node(graph, identifier, self._requirers)
+                for identifier in nogood
+            ):
+                return nogood
+
+    def _learn_nogoods(self, graph, error):
+        """Learn nogoods from conflicts raised while resolving *graph*.
+
+        :param graph: Instance of :class:`Graph`.
+
+        :param error: Instance of :exc:`wiz.exception.GraphConflictsError`.
+
+        """
+        nogoods = _extract_nogoods(graph, error.conflicts, self._requirements)
+
+        for nogood in nogoods:
+            if nogood in self._nogoods:
+                continue
+
+            self._logger.debug(
+                "Learn nogood: {}".format(", ".join(sorted(nogood)))
+            )
+
+            self._nogoods[nogood] = dict(error.conflicts)
+
+            wiz.history.record_action(
+                wiz.symbol.GRAPH_NOGOOD_LEARNING_ACTION,
+                graph=graph, nogood=sorted(nogood)
+            )
+
+    def _skip_combination(self, combination):
+        """Indicate whether *combination* can be skipped from nogoods.
+
+        A skipped combination is not resolved. A placeholder is recorded
+        instead of its conflicts, so that the combination is only resolved
+        locally if its own conflicts are required to discover new
+        combinations.
+
+        :param combination: Instance of :class:`Combination`.
+
+        :return: Boolean value.
+
+        """
+        # Combination resolved locally after being skipped must be resolved
+        # as usual.
+        if combination in self._skipped_combinations:
+            return False
+
+        nogood = self._fetch_nogood(combination.graph)
+        if nogood is None:
+            return False
+
+        self._logger.debug(
+            "Skip combination containing nogood: {}".format(
+                ", ".join(sorted(nogood))
+            )
+        )
+
+        wiz.history.record_action(
+            wiz.symbol.GRAPH_NOGOOD_USAGE_ACTION,
+            graph=combination.graph, nogood=sorted(nogood)
+        )
+
+        self._speculations.pop(combination, None)
+        self._deferred_combinations[combination] = set(
+            self._conflicting_variants
+        )
+        self._conflicting_combinations.append((combination, None))
+        return True
+
+    def _fetch_skipped_error(self, combination):
+        """Return error raised by *combination* skipped from nogoods.
+
+        *combination* is resolved locally the first time with the conflicting
+        variants used when it was skipped. Nogoods are learned from conflicts
+        raised.
+
+        :param combination: Instance of :class:`Combination`.
+
+        :return: Instance of :exc:`wiz.exception.GraphResolutionError`, or
+            None if *combination* is resolved.
+
+        """
+        if combination not in self._skipped_combinations:
+            error = self._resolve_deferred(
+                combination, self._deferred_combinations.pop(combination)
+            )
+
+            if error is not None:
+                wiz.history.record_action(
+                    wiz.symbol.GRAPH_RESOLUTION_FAILURE_ACTION,
+                    graph=combination.graph, error=error
+                )
+
+            if isinstance(error, wiz.exception.GraphConflictsError):
+                self._learn_nogoods(combination.graph, error)
+
+            self._skipped_combinations[combination] = error
+
+        return self._skipped_combinations[combination]
+
+    def _fetch_speculative_error(self, combination):
+        """Return error raised by *combination* when resolved speculatively.
+
+        If *combination* has not been resolved speculatively yet, it is resolved
+        concurrently with the next combinations from the iterator, so that
+        following calls return the errors raised by these combinations without
+        resolving them again.
+
+        Graph variants errors are never returned as the divided graph is
+        required to extract new combinations. Speculative resolution is skipped
+        when the history is recorded as actions cannot be recorded from other
+        processes.
+
+        :param combination: Instance of :class:`Combination`.
+
+        :return: Instance of :exc:`wiz.exception.GraphResolutionError` or None
+            if *combination* must be resolved locally.
+
+        """
+        if self._speculative_workers < 2 or wiz.history.is_recording():
+            return
+
+        if combination not in self._speculations:
+            combinations = [combination] + list(
+                itertools.islice(self._iterator, self._speculative_workers - 1)
+            )
+
+            # Put back fetched combinations in front of the iterator.
+            self._iterator = itertools.chain(combinations[1:], self._iterator)
+
+            if len(combinations) < 2:
+                return
+
+            self._logger.debug(
+                "Resolve {} combinations speculatively".format(
+                    len(combinations)
+                )
+            )
+
+            errors = _resolve_speculatively(combinations)
+            self._speculations.update(zip(combinations, errors))
+
+        return self._speculations.pop(combination)
+
     def initiate_combinations(self, graph):
         """Initiate combinations iterator from *graph*.
 
@@ -208,6 +549,9 @@ class Resolver(object):
         identifiers = {_id for group in groups for ids in group for _id in ids}
         self._conflicting_variants.update(identifiers)
 
+        # Discard speculative results as they depend on conflicting variants.
+        self._speculations.clear()
+
         self._logger.debug(
             "Conflicting variant groups:\n{}\n".format(
                 "\n".join([" * {!r}".format(g) for g in groups])
@@ -241,68 +585,551 @@ class Resolver(object):
                     graph, nodes_to_remove=identifiers.difference(permutation)
                 )
 
-        self._iterator = itertools.chain(
-            _generate_combinations(),
-            self._iterator
-        )
-        return True
+        self._iterator = itertools.chain(
+            _generate_combinations(),
+            self._iterator
+        )
+        return True
+
+    def fetch_next_combination(self):
+        """Return next combination from the iterator.
+
+        :return: Instance of :class:`Combination` or None if iterator is empty.
+
+        """
+        try:
+            return next(self._iterator)
+
+        except StopIteration:
+
+            # If iterator is empty, check the requirement conflicts to find
+            # out if a new graph could be computed with different versions.
+            if self.discover_combinations():
+                return next(self._iterator)
+
+            self._logger.debug(
+                "Impossible to find new graph combinations by downgrading "
+                "conflicting versions"
+            )
+
+    def discover_combinations(self):
+        """Discover new combinations from unsolvable conflicts recorded.
+
+        After exhausting all graph combinations, the unsolvable conflicts
+        previously recorded are being used to create new combinations with
+        different package versions.
+
+        :return: Boolean value indicating whether :class:`Combination` instances
+            have been extracted.
+
+        """
+        while True:
+            try:
+                queue = self._conflicting_combinations
+                combination, identifiers = queue.popleft()
+
+            except IndexError:
+                return False
+
+            # Replace placeholder recorded for combination skipped from nogoods
+            # with its own conflicts.
+            if identifiers is None:
+                error = self._fetch_skipped_error(combination)
+
+                if isinstance(error, wiz.exception.GraphConflictsError):
+                    queue.extendleft(reversed([
+                        (combination, _identifiers)
+                        for _, _identifiers in error.conflicts
+                    ]))
+
+                elif isinstance(error, wiz.exception.GraphVariantsError):
+                    if self.extract_combinations(combination.graph):
+                        return True
+
+                # Combination must be returned as it is resolved.
+                elif error is None:
+                    self._iterator = iter([combination])
+                    return True
+
+                continue
+
+            # Resolve combination locally if conflicts have been identified
+            # speculatively.
+            conflicting_variants = self._deferred_combinations.pop(
+                combination, None
+            )
+            if conflicting_variants is not None:
+                self._resolve_deferred(combination, conflicting_variants)
+
+            # Prevent mutating original combination as it might be reused to
+            # downgrade other conflicting nodes.
+            combination = copy.deepcopy(combination)
+
+            # Iterator can be initialized only if all identifiers can be
+            # replaced with lower version.
+            if not combination.graph.downgrade_versions(identifiers):
+                continue
+
+            # Prune unreachable nodes in graph.
+            combination.prune_graph()
+
+            # Reset the iterator.
+            self.initiate_combinations(combination.graph)
+
+            return True
+
+    def _resolve_deferred(self, combination, conflicting_variants):
+        """Resolve *combination* resolved speculatively or skipped.
+
+        Conflicts are resolved with the conflicting variants recorded when
+        *combination* was resolved speculatively or skipped from nogoods to
+        ensure that the graph is updated as it would have been during a
+        sequential resolution.
+
+        :param combination: Instance of :class:`Combination`.
+
+        :param conflicting_variants: Set of node identifiers with variant used
+            to divide graph when *combination* was resolved speculatively or
+            skipped.
+
+        :return: Instance of :exc:`wiz.exception.GraphResolutionError`, or
+            None if *combination* is resolved.
+
+        """
+        _conflicting_variants = self._conflicting_variants
+        self._conflicting_variants = conflicting_variants
+
+        try:
+            combination.resolve_conflicts()
+            combination.validate()
+
+        except wiz.exception.GraphResolutionError as error:
+            return error
+
+        finally:
+            self._conflicting_variants = _conflicting_variants
+
+
+#: List of :class:`Combination` instances resolved by forked processes.
+_SPECULATIVE_COMBINATIONS = []
+
+#: Lock preventing threads from resolving combinations speculatively at the
+#: same time, as :data:`_SPECULATIVE_COMBINATIONS` is shared.
+_SPECULATIVE_LOCK = threading.Lock()
+
+
+def _resolve_speculatively(combinations):
+    """Resolve *combinations* concurrently in forked processes.
+
+    Each process inherits the state of the current process, so combinations do
+    not need to be serialized. Only the errors raised are returned.
+
+    :param combinations: List of :class:`Combination` instances.
+
+    :return: List containing for each combination an instance of
+        :exc:`wiz.exception.GraphResolutionError`, or None if the combination
+        must be resolved locally.
+
+    """
+    try:
+        context = multiprocessing.get_context("fork")
+
+    # Combinations will be resolved locally if processes cannot be forked.
+    except (AttributeError, ValueError):
+        return [None] * len(combinations)
+
+    with _SPECULATIVE_LOCK:
+        _SPECULATIVE_COMBINATIONS[:] = combinations
+
+        pool = context.Pool(len(combinations))
+
+        try:
+            return pool.map(
+                _resolve_combination, range(len(combinations)), chunksize=1
+            )
+
+        finally:
+            pool.terminate()
+            del _SPECULATIVE_COMBINATIONS[:]
+
+
+def _resolve_combination(index):
+    """Return error raised by resolving combination at *index*.
+
+    :param index: Index of combination in :data:`_SPECULATIVE_COMBINATIONS`.
+
+    :return: Instance of :exc:`wiz.exception.GraphResolutionError`, or None if
+        the combination must be resolved locally.
+
+    """
+    combination = _SPECULATIVE_COMBINATIONS[index]
+
+    try:
+        combination.resolve_conflicts()
+        combination.validate()
+
+    except wiz.exception.GraphVariantsError:
+        return
+
+    except wiz.exception.GraphResolutionError as error:
+        return error
+
+    # Other errors are raised locally, if the combination is reached.
+    except wiz.exception.WizError:
+        return
+
+
+def _extract_nogoods(graph, conflicts, requirements):
+    """Return nogoods extracted from *conflicts* in *graph*.
+
+    A nogood is a pair of node identifiers whose own requirements cannot be
+    fulfilled together. Requirements recorded in the graph may have been
+    combined with other requirements when parents were relinked, so a nogood
+    is only extracted if the requirements defined by each package, or the
+    initial *requirements* for the :attr:`root <Graph.ROOT>` level of the
+    graph, are not overlapping.
+
+    :param graph: Instance of :class:`Graph`.
+
+    :param conflicts: List of tuples containing conflicting requirements with
+        corresponding set of node identifiers, as recorded by
+        :exc:`wiz.exception.GraphConflictsError`.
+
+    :param requirements: List of :class:`packaging.requirements.Requirement`
+        instances used to create the *graph*.
+
+    :return: List of frozensets of node identifiers.
+
+    """
+    nogoods = []
+
+    for (requirement1, identifiers1), (requirement2, identifiers2) in (
+        itertools.combinations(conflicts, 2)
+    ):
+        if requirement1.name != requirement2.name:
+            continue
+
+        for identifier1, identifier2 in itertools.product(
+            sorted(identifiers1), sorted(identifiers2)
+        ):
+            nogood = frozenset([identifier1, identifier2])
+            if len(nogood) < 2 or nogood in nogoods:
+                continue
+
+            _requirements = [
+                _own_requirement(
+                    graph, identifier, requirement1.name, requirements
+                ) for identifier in (identifier1, identifier2)
+            ]
+
+            if None in _requirements:
+                continue
+
+            if _is_incompatible(*_requirements):
+                nogoods.append(nogood)
+
+    return nogoods
+
+
+def _own_requirement(graph, identifier, name, requirements):
+    """Return requirement defined by node *identifier* for *name*.
+
+    :param graph: Instance of :class:`Graph`.
+
+    :param identifier: Node identifier.
+
+    :param name: Qualified requirement name, as recorded in the *graph*.
+
+    :param requirements: List of :class:`packaging.requirements.Requirement`
+        instances used to create the *graph*.
+
+    :return: Instance of :class:`packaging.requirements.Requirement` with
+        qualified *name*, or None if the node does not exist or does not
+        define a requirement for *name*.
+
+    """
+    if identifier == graph.ROOT:
+        _requirements = requirements
+
+    else:
+        node = graph.node(identifier)
+        if node is None:
+            return
+
+        _requirements = node.package.requirements
+
+    for requirement in _requirements:
+        if requirement.name == name or name.endswith(
+            wiz.symbol.NAMESPACE_SEPARATOR + requirement.name
+        ):
+            requirement = copy.copy(requirement)
+            requirement.name = name
+            return requirement
+
+
+def _is_incompatible(requirement1, requirement2):
+    """Indicate whether requirements cannot be fulfilled by the same package.
+
+    Contrary to :func:`wiz.utility.is_overlapping`, a requirement without
+    variant is compatible with requirements for any variant.
+
+    :param requirement1: Instance of
+        :class:`packaging.requirements.Requirement`.
+
+    :param requirement2: Instance of
+        :class:`packaging.requirements.Requirement` with the same name as
+        *requirement1*.
+
+    :return: Boolean value.
+
+    """
+    if (
+        len(requirement1.extras) > 0 and len(requirement2.extras) > 0
+        and requirement1.extras != requirement2.extras
+    ):
+        return True
+
+    ranges = wiz.utility.fetch_version_ranges(requirement1)
+    return not ranges.overlaps(wiz.utility.fetch_version_ranges(requirement2))
+
+
+def _extract_descendants(graph, identifiers):
+    """Return node *identifiers* in *graph* with all their descendants.
+
+    :param graph: Instance of :class:`Graph`.
+
+    :param identifiers: Set of node identifiers.
+
+    :return: Set of node identifiers.
+
+    """
+    descendants = set(identifiers)
+    queue = collections.deque(identifiers)
+
+    while len(queue) > 0:
+        for identifier in graph.outcoming(queue.popleft()):
+            if identifier not in descendants:
+                descendants.add(identifier)
+                queue.append(identifier)
+
+    return descendants
+
+
+def _extract_constraint(graph, requirement, excluded):
+    """Return constraint recorded in *graph* for definition of *requirement*.
+
+    The constraint is the intersection of all requirements linking nodes
+    which belong to the definition targeted by *requirement* to their parents,
+    except parents included in the *excluded* set.
+
+    :param graph: Instance of :class:`Graph`.
+
+    :param requirement: Instance of
+        :class:`packaging.requirements.Requirement`.
+
+    :param excluded: Set of node identifiers whose requirements are ignored.
+
+    :return: Tuple containing a frozenset of variant identifiers required and
+        an instance of :class:`wiz.utility.VersionRanges`, or None if the
+        constraint cannot be determined.
+
+    """
+    identifiers = graph.find(Requirement(requirement.name))
+
+    # Ignore if requirement could target several definitions.
+    definitions = set(
+        graph.node(identifier).definition.qualified_identifier
+        for identifier in identifiers
+    )
+    if len(definitions) != 1:
+        return
+
+    variants = set()
+    ranges = None
+
+    for identifier in identifiers:
+        for parent_identifier in graph.incoming(identifier):
+            if parent_identifier in excluded:
+                continue
+
+            _requirement = graph.link_requirement(
+                identifier, parent_identifier
+            )
+            variants.update(_requirement.extras)
+
+            _ranges = wiz.utility.fetch_version_ranges(_requirement)
+            ranges = _ranges if ranges is None else ranges.intersection(
+                _ranges
+            )
+
+    # Ignore if constraints are already conflicting with each other.
+    if ranges is None or len(ranges) == 0 or len(variants) > 1:
+        return
+
+    return frozenset(variants), ranges
+
+
+def _is_compatible(graph, package, excluded, constraints):
+    """Indicate whether *package* is compatible with constraints in *graph*.
+
+    :param graph: Instance of :class:`Graph`.
+
+    :param package: Instance of :class:`~wiz.package.Package`.
+
+    :param excluded: Set of node identifiers whose requirements are ignored.
+
+    :param constraints: Mapping recording :func:`constraints
+        <_extract_constraint>` per requirement name, which is updated with
+        constraints extracted.
+
+    :return: Boolean value.
+
+    """
+    for requirement in package.requirements:
+        if requirement.name not in constraints:
+            constraints[requirement.name] = _extract_constraint(
+                graph, requirement, excluded
+            )
+
+        constraint = constraints[requirement.name]
+        if constraint is None:
+            continue
+
+        variants, ranges = constraint
+
+        if (
+            len(variants) > 0 and len(requirement.extras) > 0
+            and not variants.issuperset(requirement.extras)
+        ):
+            return False
+
+        _ranges = wiz.utility.fetch_version_ranges(requirement)
+        if len(ranges.intersection(_ranges)) == 0:
+            return False
+
+    return True
+
+
+def _extract_requirers(requirements, definition_mapping):
+    """Return definitions requiring each definition identifier.
+
+    Definitions are fetched from *requirements* and from requirements of all
+    versions and variants of definitions fetched, so that all definitions which
+    could be added to a graph created from *requirements* are recorded.
+
+    :param requirements: List of :class:`packaging.requirements.Requirement`
+        instances.
+
+    :param definition_mapping: Mapping regrouping all available definitions
+        associated with their unique identifier.
+
+    :return: Mapping of sets of qualified definition identifiers per
+        definition identifier without namespace.
+
+    """
+    requirers = {}
+    queue = collections.deque([
+        (None, requirement.name) for requirement in requirements
+    ])
+    visited = set()
+
+    namespace_mapping = definition_mapping.get("__namespace__", {})
+
+    while len(queue) > 0:
+        requirer, name = queue.popleft()
+
+        identifier = name.split(wiz.symbol.NAMESPACE_SEPARATOR)[-1]
+        requirers.setdefault(identifier, set())
+
+        if requirer is not None:
+            requirers[identifier].add(requirer)
+
+        # Fetch definitions with any namespace for identifier.
+        qualified_identifiers = [identifier] + [
+            namespace + wiz.symbol.NAMESPACE_SEPARATOR + identifier
+            for namespace in namespace_mapping.get(identifier, [])
+        ]
+
+        for qualified_identifier in qualified_identifiers:
+            if (
+                qualified_identifier in visited
+                or qualified_identifier not in definition_mapping
+            ):
+                continue
+
+            visited.add(qualified_identifier)
+
+            for definition in definition_mapping[qualified_identifier].values():
+                _requirements = list(definition.requirements) + [
+                    requirement for variant in definition.variants
+                    for requirement in variant.requirements
+                ]
+
+                queue.extend([
+                    (qualified_identifier, requirement.name)
+                    for requirement in _requirements
+                ])
+
+    return requirers
 
-    def fetch_next_combination(self):
-        """Return next combination from the iterator.
 
-        :return: Instance of :class:`Combination` or None if iterator is empty.
+def _is_fixed_node(graph, identifier, requirers):
+    """Indicate whether node *identifier* is fixed in *graph*.
 
-        """
-        try:
-            return next(self._iterator)
+    A node is fixed if it is the :attr:`root <Graph.ROOT>` level of the graph,
+    or if it cannot be removed from *graph* when conflicts are resolved. It
+    must be the only existing node of its definition without conditions, only
+    be required by definitions of its parents, and all its parents must be
+    fixed.
 
-        except StopIteration:
+    :param graph: Instance of :class:`Graph`.
 
-            # If iterator is empty, check the requirement conflicts to find
-            # out if a new graph could be computed with different versions.
-            if self.discover_combinations():
-                return next(self._iterator)
+    :param identifier: Node identifier.
 
-            self._logger.debug(
-                "Impossible to find new graph combinations by downgrading "
-                "conflicting versions"
-            )
+    :param requirers: Mapping of sets of qualified definition identifiers per
+        definition identifier as returned by :func:`_extract_requirers`.
 
-    def discover_combinations(self):
-        """Discover new combinations from unsolvable conflicts recorded.
+    :return: Boolean value.
 
-        After exhausting all graph combinations, the unsolvable conflicts
-        previously recorded are being used to create new combinations with
-        different package versions.
+    """
+    queue = collections.deque([identifier])
+    visited = {identifier}
 
-        :return: Boolean value indicating whether :class:`Combination` instances
-            have been extracted.
+    while len(queue) > 0:
+        _identifier = queue.popleft()
+        if _identifier == graph.ROOT:
+            continue
 
-        """
-        while True:
-            try:
-                queue = self._conflicting_combinations
-                combination, identifiers = queue.popleft()
+        node = graph.node(_identifier)
+        if node is None or len(node.package.conditions) > 0:
+            return False
 
-            except IndexError:
-                return False
+        definition_id = node.definition.qualified_identifier
+        if len(graph.nodes(definition_identifier=definition_id)) != 1:
+            return False
 
-            # Prevent mutating original combination as it might be reused to
-            # downgrade other conflicting nodes.
-            combination = copy.deepcopy(combination)
+        parent_identifiers = graph.incoming(_identifier)
+        if len(parent_identifiers) == 0:
+            return False
 
-            # Iterator can be initialized only if all identifiers can be
-            # replaced with lower version.
-            if not combination.graph.downgrade_versions(identifiers):
-                continue
+        # Ensure that no other definitions could require another version.
+        definitions = set(
+            graph.node(parent_identifier).definition.qualified_identifier
+            for parent_identifier in parent_identifiers
+            if parent_identifier != graph.ROOT
+        )
 
-            # Prune unreachable nodes in graph.
-            combination.prune_graph()
+        if not requirers.get(node.definition.identifier, set()).issubset(
+            definitions
+        ):
+            return False
 
-            # Reset the iterator.
-            self.initiate_combinations(combination.graph)
+        for parent_identifier in parent_identifiers:
+            if parent_identifier not in visited:
+                visited.add(parent_identifier)
+                queue.append(parent_identifier)
 
-            return True
+    return True
 
 
 def _compute_distance_mapping(graph):
@@ -380,6 +1207,108 @@ def _compute_distance_mapping(graph):
     return distance_mapping
 
 
+def _update_distance_mapping(graph, distance_mapping, removed, updated):
+    """Update *distance_mapping* for nodes affected by changes in *graph*.
+
+    Removing nodes can only increase distances of nodes which were reached
+    through removed nodes, so only these nodes are reset. Adding nodes or
+    links can only decrease distances, so only the nodes added or linked to
+    new parents are considered. Distances are then propagated from these nodes
+    using `Dijkstra's shortest path algorithm
+    <https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm>`_, which gives the
+    same distances as :func:`_compute_distance_mapping`.
+
+    :param graph: Instance of :class:`Graph`.
+
+    :param distance_mapping: Distance mapping previously computed for *graph*,
+        which will be mutated.
+
+    :param removed: Set of node identifiers removed from *graph* since
+        *distance_mapping* has been computed.
+
+    :param updated: Set of node identifiers added to *graph* or linked to new
+        parents since *distance_mapping* has been computed.
+
+    :return: Distance mapping.
+
+    """
+    logger = logging.getLogger(__name__ + "._update_distance_mapping")
+    logger.debug("Update distance mapping.")
+
+    # Identify nodes reached through removed nodes.
+    children = {}
+    for identifier, value in distance_mapping.items():
+        if identifier != graph.ROOT and value["parent"] is not None:
+            children.setdefault(value["parent"], []).append(identifier)
+
+    affected = set(removed)
+    identifiers = list(removed)
+
+    while len(identifiers) > 0:
+        for child_identifier in children.get(identifiers.pop(), []):
+            if child_identifier not in affected:
+                affected.add(child_identifier)
+                identifiers.append(child_identifier)
+
+    # Reset distances of affected nodes and initiate new nodes.
+    for identifier in affected.union(updated):
+        if not graph.exists(identifier):
+            distance_mapping.pop(identifier, None)
+
+        elif identifier in affected or identifier not in distance_mapping:
+            distance_mapping[identifier] = {"distance": None, "parent": None}
+
+    queue = _DistanceQueue()
+
+    # Compute shortest distance of each node from parents not affected.
+    for identifier in affected.union(updated):
+        if not graph.exists(identifier):
+            continue
+
+        last_distance = distance_mapping[identifier]["distance"]
+        mapping = distance_mapping[identifier]
+
+        for parent_identifier in graph.incoming(identifier):
+            parent_distance = distance_mapping[parent_identifier]["distance"]
+            if parent_distance is None:
+                continue
+
+            distance = parent_distance + graph.link_weight(
+                identifier, parent_identifier
+            )
+
+            if mapping["distance"] is None or mapping["distance"] > distance:
+                mapping = {"distance": distance, "parent": parent_identifier}
+
+        if mapping["distance"] != last_distance:
+            distance_mapping[identifier] = mapping
+            queue[identifier] = mapping["distance"]
+
+    # Propagate new distances.
+    while not queue.empty():
+        identifier = queue.pop_smallest()
+        current_distance = distance_mapping[identifier]["distance"]
+
+        for child_identifier in graph.outcoming(identifier):
+            distance = current_distance + graph.link_weight(
+                child_identifier, identifier
+            )
+
+            last_distance = distance_mapping[child_identifier]["distance"]
+            if last_distance is None or last_distance > distance:
+                distance_mapping[child_identifier] = {
+                    "distance": distance, "parent": identifier
+                }
+                queue[child_identifier] = distance
+
+    wiz.history.record_action(
+        wiz.symbol.GRAPH_DISTANCE_COMPUTATION_ACTION,
+        graph=graph, distance_mapping=distance_mapping
+    )
+
+    return distance_mapping
+
+
 def _generate_variant_permutations(graph, variant_groups):
     """Yield valid permutations of the variant groups.
 
@@ -830,8 +1759,9 @@ class Graph(object):
         # All nodes created per node identifier.
         self._node_mapping = {}
 
-        # Record the weight and requirement of each link in the graph.
-        self._link_mapping = {}
+        # Record liveness of each node, and the weight and requirement of each
+        # link in the graph per node index.
+        self._core = _GraphCore(self.ROOT)
 
         # List of exception raised per node identifier.
         self._error_mapping = {}
@@ -842,6 +1772,10 @@ class Graph(object):
         # Cached set of node identifiers organised per definition identifier.
         self._definition_cache = {}
 
+        # Cached set of node identifiers organised per definition identifier
+        # without namespace.
+        self._identifier_cache = {}
+
         # Cached list of node identifiers with variant organised per definition
         # identifier.
         self._variant_cache = {}
@@ -851,28 +1785,73 @@ class Graph(object):
         # e.g. Counter({'maya': 2, 'houdini': 1})
         self._namespace_count = namespace_counter or collections.Counter()
 
+        # Identifiers of containers nested in mappings which are not shared
+        # with a copy of the graph and can be updated in place.
+        self._owned = set()
+
+        # Node identifiers removed, and node identifiers added or linked to
+        # new parents since the last call to :meth:`pop_updates`.
+        self._removed_identifiers = set()
+        self._updated_identifiers = set()
+
     def __deepcopy__(self, memo):
         """Ensure that only necessary elements are copied in the new graph.
 
         Resolver should only be referenced in each copy.
 
+        Nodes are copied, but containers nested in mappings (links, errors and
+        caches) are shared between both graphs until one of them needs to
+        update it, so that copying a graph does not copy requirements and
+        links which might never change.
+
         """
         result = Graph(self._resolver)
-        result._node_mapping = copy.deepcopy(self._node_mapping)
-        result._link_mapping = copy.deepcopy(self._link_mapping)
-        result._conditioned_nodes = copy.deepcopy(self._conditioned_nodes)
-        result._definition_cache = copy.deepcopy(self._definition_cache)
-        result._variant_cache = copy.deepcopy(self._variant_cache)
-        result._namespace_count = copy.deepcopy(self._namespace_count)
-
-        # Deepcopy doesn't work on instances inheriting from Exception in
-        # Python 2.7, so we need to use shallow copy for mapping containing
-        # exceptions until we can switch completely to Python 3.
-        result._error_mapping = copy.copy(self._error_mapping)
+        result._node_mapping = {
+            identifier: copy.copy(node)
+            for identifier, node in self._node_mapping.items()
+        }
+        result._core = copy.copy(self._core)
+        result._conditioned_nodes = list(self._conditioned_nodes)
+        result._definition_cache = dict(self._definition_cache)
+        result._identifier_cache = dict(self._identifier_cache)
+        result._variant_cache = dict(self._variant_cache)
+        result._namespace_count = copy.copy(self._namespace_count)
+        result._error_mapping = dict(self._error_mapping)
+        result._removed_identifiers = set(self._removed_identifiers)
+        result._updated_identifiers = set(self._updated_identifiers)
+
+        # Nested containers are now shared with the new graph.
+        self._owned.clear()
 
         memo[id(self)] = result
         return result
 
+    def _fetch_owned(self, mapping, key, factory):
+        """Return container from *mapping* which can be updated in place.
+
+        If the container recorded under *key* is shared with a copy of the
+        graph, it is replaced by a copy owned by the graph. If no container is
+        recorded under *key*, a new one is created from *factory*.
+
+        :param mapping: Mapping of the graph containing containers.
+
+        :param key: Key of the container within *mapping*.
+
+        :param factory: Type of the container (e.g. :class:`set`).
+
+        :return: Container instance.
+
+        """
+        container = mapping.get(key)
+        if container is not None and id(container) in self._owned:
+            return container
+
+        container = factory(container or ())
+        mapping[key] = container
+
+        self._owned.add(id(container))
+        return container
+
     @property
     def resolver(self):
         """Return resolver instance used to create Graph.
@@ -941,11 +1920,14 @@ class Graph(object):
         :return: Set of matching node identifiers.
 
         """
+        matcher = wiz.utility.RequirementMatcher(requirement)
         identifiers = set()
 
-        for node in self.nodes():
-            if wiz.utility.match(requirement, node.package):
-                identifiers.add(node.package.identifier)
+        # Only inspect nodes created from definitions with same identifier.
+        for identifier in self._identifier_cache.get(matcher.identifier, []):
+            node = self._node_mapping.get(identifier)
+            if node is not None and matcher.match(node.package):
+                identifiers.add(identifier)
 
         return identifiers
 
@@ -1052,11 +2034,41 @@ class Graph(object):
         :return: List of dependent node identifiers.
 
         """
-        return [
-            _identifier for _identifier
-            in self._link_mapping.get(identifier, {}).keys()
-            if self.exists(_identifier)
-        ]
+        index = self._core.indices.get(identifier)
+        if index is None:
+            return []
+
+        return self._core.outcoming(index)
+
+    def incoming(self, identifier):
+        """Return incoming node identifiers for node *identifier*.
+
+        :param identifier: Unique identifier of the targeted node.
+
+        :return: List of parent node identifiers, including the :attr:`root
+            <Graph.ROOT>` level of the graph if a link is recorded from it.
+
+        """
+        index = self._core.indices.get(identifier)
+        if index is None:
+            return []
+
+        return self._core.incoming(index)
+
+    def pop_updates(self):
+        """Return node identifiers updated since the last call.
+
+        :return: Tuple containing a set of node identifiers removed from the
+            graph, and a set of node identifiers added to the graph or linked
+            to new parents.
+
+        """
+        updates = (self._removed_identifiers, self._updated_identifiers)
+
+        self._removed_identifiers = set()
+        self._updated_identifiers = set()
+
+        return updates
 
     def link_weight(self, identifier, parent_identifier):
         """Return weight from link between parent and node identifier.
@@ -1071,12 +2083,13 @@ class Graph(object):
             *parent_identifier* and *identifier*.
 
         """
-        key = "weight"
         try:
-            return self._link_mapping[parent_identifier][identifier][key]
+            link = self._core.link(identifier, parent_identifier)
         except KeyError as error:
             raise ValueError("No link recorded for node: {}".format(error))
 
+        return self._core.weights[link]
+
     def link_requirement(self, identifier, parent_identifier):
         """Return requirement from link between parent and node identifier.
 
@@ -1090,12 +2103,13 @@ class Graph(object):
             *parent_identifier* and *identifier*.
 
         """
-        key = "requirement"
         try:
-            return self._link_mapping[parent_identifier][identifier][key]
+            link = self._core.link(identifier, parent_identifier)
         except KeyError as error:
             raise ValueError("No link recorded for node: {}.".format(error))
 
+        return self._core.requirements[link]
+
     def update_from_requirements(self, requirements, detached=False):
         """Update graph from *requirements*.
 
@@ -1123,7 +2137,7 @@ class Graph(object):
         parent_identifier = self.ROOT if not detached else None
 
         # If not detached, initiate weight depending on existing connections.
-        total_connections = len(self._link_mapping.get(self.ROOT, {}).keys())
+        total_connections = len(self._core.children[0] or ())
         weight = total_connections + 1 if not detached else 1
 
         # Fill up queue from requirements and update the graph accordingly.
@@ -1165,7 +2179,7 @@ class Graph(object):
         parent_identifier = self.ROOT if not detached else None
 
         # If not detached, initiate weight depending on existing connections.
-        total_connections = len(self._link_mapping.get(self.ROOT, {}).keys())
+        total_connections = len(self._core.children[0] or ())
         weight = total_connections + 1 if not detached else 1
 
         # Add package to queue to start updating.
@@ -1203,7 +2217,8 @@ class Graph(object):
                         data.get("package"), data.get("requirement"),
                         data.get("parent_identifier"),
                         queue,
-                        weight=data.get("weight")
+                        weight=data.get("weight"),
+                        conditioned=data.get("conditioned", False)
                     )
 
             # Then update graph with conditioned nodes stored if necessary.
@@ -1212,7 +2227,8 @@ class Graph(object):
                     "requirement": stored_node.requirement,
                     "package": stored_node.package,
                     "parent_identifier": stored_node.parent_identifier,
-                    "weight": stored_node.weight
+                    "weight": stored_node.weight,
+                    "conditioned": True
                 })
 
     def _required_stored_nodes(self):
@@ -1269,14 +2285,15 @@ class Graph(object):
 
         # Get packages from requirement.
         try:
-            packages = wiz.package.extract(
-                requirement, self.resolver.definition_mapping,
-                namespace_counter=self._namespace_count
+            packages = self.resolver.extract_packages(
+                requirement, namespace_counter=self._namespace_count
             )
 
         except wiz.exception.WizError as error:
-            self._error_mapping.setdefault(parent_identifier, [])
-            self._error_mapping[parent_identifier].append(error)
+            errors = self._fetch_owned(
+                self._error_mapping, parent_identifier, list
+            )
+            errors.append(error)
             return
 
         # Create a node for each package if necessary.
@@ -1287,7 +2304,8 @@ class Graph(object):
             )
 
     def _process_package(
-        self, package, requirement, parent_identifier, queue, weight=1
+        self, package, requirement, parent_identifier, queue, weight=1,
+        conditioned=False
     ):
         """Update graph from *package*.
 
@@ -1305,6 +2323,10 @@ class Graph(object):
             link from the node to its parent. The lesser this number, the higher
             is the importance of the link. Default is 1.
 
+        :param conditioned: Indicate whether *package* conditions have been
+            processed and fulfilled. Packages are shared between graphs, so
+            this state cannot be recorded on the package. Default is False.
+
         """
         # Ensure that requirement contains namespace.
         requirement = wiz.utility.sanitize_requirement(requirement, package)
@@ -1314,9 +2336,7 @@ class Graph(object):
             try:
                 # Do not add node to the graph if conditions are unprocessed.
                 has_conditions = len(package.conditions) > 0
-                if has_conditions and not package.conditions_processed:
-                    package.conditions_processed = True
-
+                if has_conditions and not conditioned:
                     self._conditioned_nodes.append(
                         StoredNode(
                             requirement, package,
@@ -1361,18 +2381,30 @@ class Graph(object):
         """
         self._logger.debug("Adding package: {}".format(package.identifier))
         self._node_mapping[package.identifier] = Node(package)
+        self._core.alive[self._core.register(package.identifier)] = 1
+        self._updated_identifiers.add(package.identifier)
 
         # Update definition cache for quick access to group of nodes
         # belonging to one definition identifier.
         definition_id = package.definition.qualified_identifier
-        self._definition_cache.setdefault(definition_id, set())
-        self._definition_cache[definition_id].add(package.identifier)
+        identifiers = self._fetch_owned(
+            self._definition_cache, definition_id, set
+        )
+        identifiers.add(package.identifier)
+
+        # Update identifier cache for quick access to group of nodes
+        # belonging to definitions with one identifier in any namespace.
+        identifier = package.definition.identifier
+        identifiers = self._fetch_owned(self._identifier_cache, identifier, set)
+        identifiers.add(package.identifier)
 
         # Update variant cache if necessary for quick access to group of nodes
         # with variants belonging to one definition identifier.
         if package.variant_identifier is not None:
-            self._variant_cache.setdefault(definition_id, [])
-            self._variant_cache[definition_id].append(package.identifier)
+            identifiers = self._fetch_owned(
+                self._variant_cache, definition_id, list
+            )
+            identifiers.append(package.identifier)
 
         # Update namespace counter from identify namespace if necessary.
         if package.namespace is not None:
@@ -1402,6 +2434,9 @@ class Graph(object):
         except KeyError:
             raise ValueError("Node can not be removed: {}".format(identifier))
 
+        self._core.alive[self._core.indices[identifier]] = 0
+        self._removed_identifiers.add(identifier)
+
         wiz.history.record_action(
             wiz.symbol.GRAPH_NODE_REMOVAL_ACTION,
             graph=self, node=identifier
@@ -1471,10 +2506,10 @@ class Graph(object):
                     self, nodes + [node_removed]
                 )
 
-                self._error_mapping.setdefault(_identifier, [])
-                self._error_mapping[_identifier].append(
-                    wiz.exception.GraphConflictsError(conflicts)
+                errors = self._fetch_owned(
+                    self._error_mapping, _identifier, list
                 )
+                errors.append(wiz.exception.GraphConflictsError(conflicts))
                 continue
 
             for _node in _nodes:
@@ -1509,12 +2544,17 @@ class Graph(object):
             *parent_identifier*, the same weight will be preserved.
 
         """
-        self._link_mapping.setdefault(parent_identifier, {})
+        link, created = self._core.add_link(
+            self._core.register(identifier),
+            self._core.register(parent_identifier),
+            requirement, weight
+        )
 
         # Keep same weight if link exists.
-        _link = self._link_mapping[parent_identifier].get(identifier)
-        if _link is not None:
-            weight = _link["weight"]
+        weight = self._core.weights[link]
+
+        if created:
+            self._updated_identifiers.add(identifier)
 
         self._logger.debug(
             "Add dependency link from '{parent}' to '{child}' "
@@ -1525,9 +2565,6 @@ class Graph(object):
             )
         )
 
-        link = {"requirement": requirement, "weight": weight}
-        self._link_mapping[parent_identifier][identifier] = link
-
         # Record link creation to history if necessary.
         wiz.history.record_action(
             wiz.symbol.GRAPH_LINK_CREATION_ACTION,
@@ -1545,11 +2582,17 @@ class Graph(object):
         and altered to skip current package version. These new requirements
         are used to extract lower package versions.
 
+        Lower versions whose requirements are incompatible with constraints
+        recorded in the graph for the same definitions are skipped, so that
+        the highest version compatible with these constraints is directly
+        extracted. Constraints recorded by node *identifiers* and their
+        descendants are ignored as these nodes might be removed from the graph.
+
         If the identifier does not correspond to any node in the graph or if
         the embedded package is not versioned, the identifier is skipped.
 
-        If no packages can be extracted from new requirements, the identifier
-        is also skipped.
+        If no compatible packages can be extracted from new requirements, the
+        identifier is also skipped.
 
         :param identifiers: Set of node identifiers.
 
@@ -1563,6 +2606,12 @@ class Graph(object):
         replacement = {}
         operations = []
 
+        # Ignore constraints from nodes which might be removed.
+        excluded = _extract_descendants(self, identifiers)
+
+        # Record constraints extracted per requirement name.
+        constraints = {}
+
         for identifier in identifiers:
             node = self._node_mapping.get(identifier)
 
@@ -1581,9 +2630,20 @@ class Graph(object):
                 requirement.extras = {node.package.variant_identifier}
 
             try:
-                packages = wiz.package.extract(
-                    requirement, self.resolver.definition_mapping
-                )
+                packages = self.resolver.extract_packages(requirement)
+
+                # Skip versions incompatible with constraints in graph.
+                while not any(
+                    _is_compatible(self, package, excluded, constraints)
+                    for package in packages
+                ):
+                    self._logger.debug(
+                        "Skip incompatible version for '{0}': {1}".format(
+                            identifier, packages[0].version
+                        )
+                    )
+                    requirement.specifier &= "< {}".format(packages[0].version)
+                    packages = self.resolver.extract_packages(requirement)
 
             except wiz.exception.RequestNotFound:
                 self._logger.debug(
@@ -1637,7 +2697,7 @@ class Graph(object):
         """
         return {
             "node_mapping": self._node_mapping,
-            "link_mapping": self._link_mapping,
+            "link_mapping": self._core.data(),
             "conditioned_nodes": self._conditioned_nodes,
             "error_mapping": self._error_mapping
         }
@@ -1651,6 +2711,8 @@ class Node(object):
 
     """
 
+    __slots__ = ("_package", "_parent_identifiers")
+
     def __init__(self, package, parent_identifiers=None):
         """Initialize Node.
 
@@ -1662,6 +2724,12 @@ class Node(object):
         self._package = package
         self._parent_identifiers = copy.deepcopy(parent_identifiers) or set()
 
+    def __copy__(self):
+        """Return copy of node with a copy of parent identifiers."""
+        node = Node(self._package)
+        node._parent_identifiers = set(self._parent_identifiers)
+        return node
+
     def __eq__(self, other):
         """Compare with *other*."""
         if isinstance(other, Node):
@@ -1749,6 +2817,8 @@ class StoredNode(object):
 
     """
 
+    __slots__ = ("_requirement", "_package", "_parent_identifier", "_weight")
+
     def __init__(self, requirement, package, parent_identifier, weight=1):
         """Initialize StoredNode.
 
@@ -1914,6 +2984,11 @@ class Combination(object):
         # parent node identifier.
         self._distance_mapping = None
 
+        # Indicate whether distance mapping should be entirely recomputed
+        # when the graph is updated instead of being updated incrementally.
+        config = wiz.config.fetch().get("resolver", {})
+        self._full_distance_update = config.get("full_distance_update", False)
+
         # Remove node identifiers from graph if required.
         if nodes_to_remove is not None:
             self._remove_nodes(nodes_to_remove)
@@ -1933,7 +3008,7 @@ class Combination(object):
         """
         result = Combination(self._graph)
         result._nodes_removed = self._nodes_removed
-        result._distance_mapping = self._distance_mapping
+        result._distance_mapping = copy.copy(self._distance_mapping)
 
         memo[id(self)] = result
         return result
@@ -2148,9 +3223,7 @@ class Combination(object):
 
         """
         try:
-            return wiz.package.extract(
-                requirement, self._graph.resolver.definition_mapping
-            )
+            return self._graph.resolver.extract_packages(requirement)
 
         except wiz.exception.RequestNotFound:
             conflicting = _extract_conflicting_requirements(self._graph, nodes)
@@ -2390,15 +3463,30 @@ class Combination(object):
         If no distance mapping is available, a new one is generated from
         embedded graph via :func:`_compute_distance_mapping`.
 
-        :param force_update: Indicate whether a new distance mapping should be
-            computed, even if one cached mapping is available.
+        If a cached distance mapping is available and must be updated, only
+        distances of nodes affected by changes in embedded graph are updated
+        via :func:`_update_distance_mapping`, unless the "full_distance_update"
+        option is set in the :ref:`configuration <configuration>`.
+
+        :param force_update: Indicate whether the distance mapping should be
+            updated, even if one cached mapping is available.
 
         :return: Distance mapping.
 
         """
-        if self._distance_mapping is None or force_update:
+        if self._distance_mapping is None or (
+            force_update and self._full_distance_update
+        ):
+            self._graph.pop_updates()
             self._distance_mapping = _compute_distance_mapping(self._graph)
 
+        elif force_update:
+            removed, updated = self._graph.pop_updates()
+            if len(removed) > 0 or len(updated) > 0:
+                self._distance_mapping = _update_distance_mapping(
+                    self._graph, self._distance_mapping, removed, updated
+                )
+
         return self._distance_mapping
 
 
@@ -2480,3 +3568,221 @@ class _DistanceQueue(dict):
 
         del self[identifier]
         return identifier
+
+
+class _GraphCore(object):
+    """Integer-indexed storage of node liveness and links of a :class:`Graph`.
+
+    Each node identifier is mapped to a dense integer index when it is first
+    registered, and the :attr:`root <Graph.ROOT>` level of the graph is always
+    recorded with index 0. Liveness of each node is recorded in a
+    :class:`bytearray` and links are recorded in arrays of weights and
+    requirements, indexed per link number. Children and parents of each
+    node are recorded as mappings of node index to link number.
+
+    Node removal is lazy: links are kept so that they are restored if a node
+    with the same identifier is added again to the graph.
+
+    Mappings of children and parents are shared between copies of the
+    storage until one of them needs to update it.
+
+    """
+
+    __slots__ = (
+        "indices", "identifiers", "alive", "children", "parents", "weights",
+        "requirements", "_owned"
+    )
+
+    def __init__(self, root):
+        """Initialize storage.
+
+        :param root: Identifier of the :attr:`root <Graph.ROOT>` level of the
+            graph.
+
+        """
+        self.indices = {root: 0}
+        self.identifiers = [root]
+        self.alive = bytearray([1])
+        self.children = [None]
+        self.parents = [None]
+        self.weights = array.array("l")
+        self.requirements = []
+
+        # Identifiers of mappings of children and parents which are not
+        # shared with a copy of the storage.
+        self._owned = set()
+
+    def __copy__(self):
+        """Return copy of storage sharing mappings of children and parents.
+        """
+        result = _GraphCore.__new__(_GraphCore)
+        result.indices = dict(self.indices)
+        result.identifiers = list(self.identifiers)
+        result.alive = bytearray(self.alive)
+        result.children = list(self.children)
+        result.parents = list(self.parents)
+        result.weights = array.array("l", self.weights)
+        result.requirements = list(self.requirements)
+        result._owned = set()
+
+        # Mappings of children and parents are now shared with the copy.
+        self._owned.clear()
+
+        return result
+
+    def register(self, identifier):
+        """Return index of node *identifier*, registering it if necessary.
+
+        :param identifier: Unique identifier of the node.
+
+        :return: Integer value.
+
+        """
+        index = self.indices.get(identifier)
+        if index is None:
+            index = len(self.identifiers)
+            self.indices[identifier] = index
+            self.identifiers.append(identifier)
+            self.alive.append(0)
+            self.children.append(None)
+            self.parents.append(None)
+
+        return index
+
+    def link(self, identifier, parent_identifier):
+        """Return link number between *parent_identifier* and *identifier*.
+
+        :param identifier: Unique identifier of the child node.
+
+        :param parent_identifier: Unique identifier of the parent node.
+
+        :return: Integer value.
+
+        :raise: :exc:`KeyError` if no link is recorded.
+
+        """
+        children = self.children[self.indices[parent_identifier]]
+        if children is None:
+            raise KeyError(parent_identifier)
+
+        link = children.get(self.indices.get(identifier))
+        if link is None:
+            raise KeyError(identifier)
+
+        return link
+
+    def add_link(self, index, parent_index, requirement, weight):
+        """Add or update link between *parent_index* and *index*.
+
+        If a link is already recorded, its weight is preserved and only its
+        requirement is updated.
+
+        :param index: Index of the child node.
+
+        :param parent_index: Index of the parent node.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param weight: Number indicating the importance of the link.
+
+        :return: Tuple containing the link number and a boolean value
+            indicating whether a new link was created.
+
+        """
+        children = self._fetch_owned(self.children, parent_index)
+
+        link = children.get(index)
+        if link is not None:
+            self.requirements[link] = requirement
+            return link, False
+
+        link = len(self.requirements)
+        self.weights.append(weight)
+        self.requirements.append(requirement)
+
+        children[index] = link
+        self._fetch_owned(self.parents, index)[parent_index] = link
+        return link, True
+
+    def outcoming(self, index):
+        """Return identifiers of existing children of node *index*.
+
+        :param index: Index of the node.
+
+        :return: List of node identifiers.
+
+        """
+        alive = self.alive
+        identifiers = self.identifiers
+
+        return [
+            identifiers[_index] for _index in self.children[index] or ()
+            if alive[_index]
+        ]
+
+    def incoming(self, index):
+        """Return identifiers of existing parents of node *index*.
+
+        :param index: Index of the node.
+
+        :return: List of node identifiers.
+
+        """
+        alive = self.alive
+        identifiers = self.identifiers
+
+        return [
+            identifiers[_index] for _index in self.parents[index] or ()
+            if alive[_index]
+        ]
+
+    def data(self):
+        """Return mapping of links per parent and child node identifiers.
+
+        :return: Mapping in the form of
+            ::
+
+                {
+                    "root": {
+                        "A": {"requirement": Requirement("A"), "weight": 1}
+                    },
+                    ...
+                }
+
+        """
+        mapping = {}
+
+        for index, children in enumerate(self.children):
+            if children is None:
+                continue
+
+            mapping[self.identifiers[index]] = {
+                self.identifiers[_index]: {
+                    "requirement": self.requirements[link],
+                    "weight": self.weights[link]
+                }
+                for _index, link in children.items()
+            }
+
+        return mapping
+
+    def _fetch_owned(self, mappings, index):
+        """Return mapping from *mappings* which can be updated in place.
+
+        :param mappings: List of mappings of children or parents.
+
+        :param index: Index of the node.
+
+        :return: Mapping of node index to link number.
+
+        """
+        mapping = mappings[index]
+        if mapping is not None and id(mapping) in self._owned:
+            return mapping
+
+        mapping = dict(mapping or {})
+        mappings[index] = mapping
+
+        self._owned.add(id(mapping))
+        return mapping
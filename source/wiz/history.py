@@ -8,7 +8,8 @@ import time
 import traceback
 import json
 
-from wiz.utility import Requirement, Version
+from wiz._requirement import Requirement
+from wiz.utility import Version
 from ._version import __version__
 
 #: Indicate whether the history should be recorded.
@@ -99,6 +100,15 @@ def stop_recording():
     _IS_HISTORY_RECORDED = False
 
 
+def is_recording():
+    """Indicate whether the history is being recorded.
+
+    :return: Boolean value.
+
+    """
+    return _IS_HISTORY_RECORDED
+
+
 def record_action(identifier, **kwargs):
     """Add an action to the history.
 
@@ -143,7 +153,7 @@ def _json_default(_object):
     from wiz.graph import Graph, Node, StoredNode
 
     if isinstance(_object, Definition):
-        data = _object.data()
+        data = _object.data(copy_data=True)
         data["path"] = _object.path
         data["registry_path"] = _object.registry_path
         return data
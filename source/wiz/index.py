@@ -0,0 +1,332 @@
+# :coding: utf-8
+
+from __future__ import absolute_import
+import hashlib
+import logging
+import os
+
+import ujson
+
+import wiz.config
+import wiz.definition
+import wiz.filesystem
+from ._version import __version__
+
+#: Version of the index format. It should be incremented each time the
+#: structure of the index file is modified.
+FORMAT_VERSION = 1
+
+
+def get_directory():
+    """Return directory containing the registry indexes.
+
+    :return: Value of ``registry.index_directory`` in the :ref:`configuration
+        <configuration>` or :file:`~/.wiz/index`.
+
+    .. seealso:: :ref:`registry/index`
+
+    """
+    config = wiz.config.fetch()
+    path = config.get("registry", {}).get("index_directory")
+    if path is not None:
+        return os.path.abspath(os.path.expanduser(path))
+
+    return os.path.join(os.path.expanduser("~"), ".wiz", "index")
+
+
+def get_path(registry_path):
+    """Return path to the index file corresponding to *registry_path*.
+
+    The file name is computed from a hash of the absolute registry path so that
+    each registry gets its own index.
+
+    :param registry_path: Path to a registry.
+
+    :return: Path to index file.
+
+    """
+    registry_path = os.path.abspath(registry_path)
+    name = hashlib.sha1(registry_path.encode("utf-8")).hexdigest()
+    return os.path.join(get_directory(), "{}.json".format(name))
+
+
+def compute_signature(path):
+    """Return stat signature of file *path*.
+
+    :param path: Path to a file.
+
+    :return: List containing modification time and size of the file, or None
+        if the file cannot be accessed.
+
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+
+    return [stat.st_mtime, stat.st_size]
+
+
+class Index(object):
+    """Persistent index of definitions found in a registry.
+
+    The index records the data of each definition file discovered in a
+    registry with its stat signature (modification time and size), so that
+    unchanged files do not have to be opened, parsed and validated again::
+
+        >>> index = Index("/path/to/registry")
+        >>> definition = index.fetch("/path/to/registry/foo.json")
+        >>> if definition is None:
+        ...     definition = wiz.definition.load("/path/to/registry/foo.json")
+        ...     index.update("/path/to/registry/foo.json", definition)
+        >>> index.save()
+
+    The index is rebuilt if it has been created by another version of Wiz.
+
+    .. seealso:: :ref:`registry/index`
+
+    """
+
+    def __init__(self, registry_path, path=None):
+        """Initialize index.
+
+        :param registry_path: Path to the registry indexed.
+
+        :param path: Path to the index file. Default is None, which means that
+            the path will be :func:`computed <get_path>` from *registry_path*.
+
+        """
+        self._logger = logging.getLogger(__name__ + ".Index")
+
+        self._registry_path = os.path.abspath(registry_path)
+        self._path = path or get_path(self._registry_path)
+
+        # Mapping of index entries per definition path.
+        self._entries = self._load()
+
+        # Record stat signatures computed per definition path.
+        self._signatures = {}
+
+        # Record all definition paths visited.
+        self._visited = set()
+
+        # Record indexed definition paths per command name and "auto-use"
+        # keyword. It is only computed when searching the index.
+        self._keyword_mapping = None
+
+        # Indicate whether the index needs to be saved.
+        self._modified = False
+
+    @property
+    def path(self):
+        """Return path to index file.
+
+        :return: File path.
+
+        """
+        return self._path
+
+    @property
+    def registry_path(self):
+        """Return path to the registry indexed.
+
+        :return: Directory path.
+
+        """
+        return self._registry_path
+
+    def _load(self):
+        """Return index entries from index file.
+
+        :return: Mapping of index entries per definition path. The mapping is
+            empty if the index file does not exist, is corrupted or has been
+            created with another version of Wiz.
+
+        """
+        if not os.path.isfile(self._path):
+            return {}
+
+        try:
+            with open(self._path, "r") as stream:
+                data = ujson.load(stream)
+
+        except (IOError, OSError, ValueError) as error:
+            self._logger.debug(
+                "Failed to load index {!r} [{}]".format(self._path, error)
+            )
+            return {}
+
+        if (
+            not isinstance(data, dict)
+            or data.get("format") != FORMAT_VERSION
+            or data.get("version") != __version__
+            or data.get("registry") != self._registry_path
+        ):
+            self._logger.debug("Index {!r} is outdated.".format(self._path))
+            return {}
+
+        return data.get("entries", {})
+
+    def contains(self, path):
+        """Indicate whether file *path* is indexed and unchanged.
+
+        :param path: Path to a definition file within the registry.
+
+        :return: Boolean value.
+
+        """
+        signature = self._signatures.get(path)
+        if signature is None:
+            signature = compute_signature(path)
+            self._signatures[path] = signature
+
+        entry = self._entries.get(path)
+        if entry is None or signature is None:
+            return False
+
+        return entry.get("signature") == signature
+
+    def search(self, keyword):
+        """Return paths of indexed definitions which could contain *keyword*.
+
+        Command names and the :ref:`auto-use <definition/auto-use>` keyword
+        are recorded for each indexed definition, so that definitions
+        providing a command or used implicitly can be found without loading
+        all definition files::
+
+            >>> index.search("app")
+            {"/path/to/registry/foo-0.1.0.json"}
+            >>> index.search("auto-use")
+            {"/path/to/registry/bar-0.1.0.json"}
+
+        :param keyword: Command name or "auto-use".
+
+        :return: Set of definition paths. Paths of files modified since they
+            were indexed can be included, so :meth:`contains` should be used
+            to ensure that an entry is still valid.
+
+        """
+        if self._keyword_mapping is None:
+            self._keyword_mapping = {}
+
+            for path, entry in self._entries.items():
+                self._record_keywords(path, entry["data"])
+
+        return self._keyword_mapping.get(keyword, set())
+
+    def _record_keywords(self, path, data):
+        """Record command names and "auto-use" keyword from definition *data*.
+        """
+        keywords = list(data.get("command", {}).keys())
+        if data.get("auto-use"):
+            keywords.append("auto-use")
+
+        for keyword in keywords:
+            self._keyword_mapping.setdefault(keyword, set()).add(path)
+
+    def fetch(self, path):
+        """Return definition from index if file *path* is unchanged.
+
+        :param path: Path to a definition file within the registry.
+
+        :return: Instance of :class:`wiz.definition.Definition` or None if
+            *path* is not indexed or if the file has been modified since.
+
+        """
+        self._visited.add(path)
+
+        signature = compute_signature(path)
+        self._signatures[path] = signature
+
+        entry = self._entries.get(path)
+        if entry is None or signature is None:
+            return
+
+        if entry.get("signature") != signature:
+            return
+
+        # Data has been validated before being indexed, unless the definition
+        # was lazily loaded.
+        validated = entry.get("validated", True)
+
+        return wiz.definition.Definition(
+            entry["data"], path=path,
+            registry_path=self._registry_path,
+            copy_data=False,
+            validate_data=not validated,
+            lazy=not validated
+        )
+
+    def update(self, path, definition):
+        """Record *definition* loaded from file *path* into the index.
+
+        The stat signature computed when :meth:`fetching <fetch>` the path is
+        used so that a file modified while being loaded will be re-indexed
+        during the next discovery.
+
+        :param path: Path to a definition file within the registry.
+
+        :param definition: Instance of :class:`wiz.definition.Definition`.
+
+        """
+        self._visited.add(path)
+
+        signature = self._signatures.get(path) or compute_signature(path)
+        if signature is None:
+            return
+
+        self._entries[path] = {
+            "signature": signature,
+            "validated": definition.validated,
+            "data": definition.data(copy_data=False)
+        }
+        self._modified = True
+
+        if self._keyword_mapping is not None:
+            self._record_keywords(path, self._entries[path]["data"])
+
+    def save(self, prune=True):
+        """Save index into index file if necessary.
+
+        :param prune: Indicate whether entries which have not been visited
+            since the index was loaded should be removed. It should be False
+            when only part of the registry has been visited (e.g. when a
+            maximum depth is used). Default is True.
+
+        :return: Boolean value indicating whether the index file was written.
+
+        .. note::
+
+            The index is written into a temporary file which is then renamed
+            to prevent concurrent processes from reading a partial file.
+            Errors are logged and ignored as the index is only an optimization.
+
+        """
+        if prune:
+            removed = set(self._entries.keys()).difference(self._visited)
+            for path in removed:
+                del self._entries[path]
+                self._modified = True
+
+        if not self._modified:
+            return False
+
+        data = {
+            "format": FORMAT_VERSION,
+            "version": __version__,
+            "registry": self._registry_path,
+            "entries": self._entries
+        }
+
+        try:
+            with wiz.filesystem.atomic_write(self._path) as stream:
+                ujson.dump(data, stream)
+
+        except (IOError, OSError) as error:
+            self._logger.debug(
+                "Failed to save index {!r} [{}]".format(self._path, error)
+            )
+            return False
+
+        self._modified = False
+        return True
@@ -273,7 +273,17 @@ def create(definition, variant_identifier=None):
 
 
 class Package(object):
-    """Package object."""
+    """Package object.
+
+    Attributes are stored in slots instead of an instance dictionary to reduce
+    the memory footprint when a large number of packages are created.
+
+    """
+
+    __slots__ = (
+        "_definition", "_variant_index", "_identifier", "_environ",
+        "_command", "_requirements"
+    )
 
     def __init__(self, definition, variant_index=None):
         """Initialize package.
@@ -291,11 +301,10 @@ class Package(object):
         self._variant_index = variant_index
 
         # Store values that needs to be constructed.
-        self._cache = {}
-
-        # Store boolean value indicating whether the package conditions have
-        # been processed
-        self._conditions_processed = False
+        self._identifier = None
+        self._environ = None
+        self._command = None
+        self._requirements = None
 
         if self._variant_index is None and len(self._definition.variants) > 0:
             raise wiz.exception.PackageError(
@@ -321,6 +330,19 @@ class Package(object):
         """Representing a Package."""
         return "<Package id='{0}'>".format(self.identifier)
 
+    def __copy__(self):
+        """Return package instance as it can be shared."""
+        return self
+
+    def __deepcopy__(self, memo):
+        """Return package instance as it can be shared.
+
+        Packages only cache values computed from their definition, so the same
+        instance can be shared between graphs instead of being copied.
+
+        """
+        return self
+
     @property
     def definition(self):
         """Return definition used to create package.
@@ -343,7 +365,7 @@ class Package(object):
 
         """
         # Create cache value if necessary.
-        if self._cache.get("identifier") is None:
+        if self._identifier is None:
             identifier = self._definition.identifier
 
             if self.variant_identifier is not None:
@@ -353,10 +375,10 @@ class Package(object):
             if self.namespace is not None:
                 identifier = "{}::{}".format(self.namespace, identifier)
 
-            self._cache["identifier"] = identifier
+            self._identifier = identifier
 
         # Return cached value.
-        return self._cache["identifier"]
+        return self._identifier
 
     @property
     def variant(self):
@@ -437,19 +459,19 @@ class Package(object):
 
         """
         # Create cache value if necessary.
-        if self._cache.get("environ") is None:
+        if self._environ is None:
             if self.variant is not None and len(self.variant.environ) > 0:
-                self._cache["environ"] = combine_environ_mapping(
+                self._environ = combine_environ_mapping(
                     self.identifier,
                     self._definition.environ,
                     self.variant.environ
                 )
 
             else:
-                self._cache["environ"] = self._definition.environ
+                self._environ = self._definition.environ
 
         # Return cached value.
-        return self._cache.get("environ", {})
+        return self._environ
 
     @property
     def command(self):
@@ -468,19 +490,19 @@ class Package(object):
 
         """
         # Create cache value if necessary.
-        if self._cache.get("command") is None:
+        if self._command is None:
             if self.variant is not None and len(self.variant.command) > 0:
-                self._cache["command"] = combine_command_mapping(
+                self._command = combine_command_mapping(
                     self.identifier,
                     self._definition.command,
                     self.variant.command
                 )
 
             else:
-                self._cache["command"] = self._definition.command
+                self._command = self._definition.command
 
         # Return cached value.
-        return self._cache.get("command", {})
+        return self._command
 
     @property
     def requirements(self):
@@ -499,18 +521,18 @@ class Package(object):
 
         """
         # Create cache value if necessary.
-        if self._cache.get("requirements") is None:
+        if self._requirements is None:
             if self.variant is not None and len(self.variant.requirements) > 0:
-                self._cache["requirements"] = (
+                self._requirements = (
                     # To prevent mutating the the original requirement list.
                     self._definition.requirements[:]
                     + self.variant.requirements
                 )
             else:
-                self._cache["requirements"] = self._definition.requirements
+                self._requirements = self._definition.requirements
 
         # Return cached value.
-        return self._cache.get("requirements", [])
+        return self._requirements
 
     @property
     def conditions(self):
@@ -521,24 +543,6 @@ class Package(object):
         """
         return self._definition.conditions
 
-    @property
-    def conditions_processed(self):
-        """Indicate whether the package conditions have been processed.
-
-        :return: Boolean value.
-
-        """
-        return self._conditions_processed
-
-    @conditions_processed.setter
-    def conditions_processed(self, value):
-        """Set whether the package conditions have been processed.
-
-        :param value: Boolean value.
-
-        """
-        self._conditions_processed = value
-
     def localized_environ(self):
         """Return localized environ mapping.
 
@@ -579,7 +583,7 @@ class Package(object):
         :return: Dictionary value.
 
         """
-        data = self._definition.data()
+        data = self._definition.data(copy_data=True)
         data["identifier"] = self.identifier
 
         if self.environ:
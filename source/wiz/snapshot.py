@@ -0,0 +1,626 @@
+# :coding: utf-8
+
+from __future__ import absolute_import
+import functools
+import hashlib
+import logging
+import mmap
+import os
+import struct
+
+import ujson
+
+import wiz.definition
+import wiz.exception
+import wiz.filesystem
+import wiz.system
+import wiz.utility
+from ._version import __version__
+
+#: Bytes sequence starting each snapshot file.
+MAGIC = b"WIZSNAP\0"
+
+#: Version of the snapshot format. It should be incremented each time the
+#: binary layout of the snapshot file is modified.
+FORMAT_VERSION = 1
+
+#: Structure of the snapshot header: magic bytes, format version and size of
+#: the metadata mapping.
+_HEADER = struct.Struct("<8sII")
+
+#: Structure of a counter preceding each table.
+_COUNT = struct.Struct("<I")
+
+#: Structure of the size of the string blob.
+_SIZE = struct.Struct("<Q")
+
+#: Structure of an entry of the string table: offset and size within the
+#: string blob.
+_STRING = struct.Struct("<QI")
+
+#: Structure of an entry of the record table: index of the identifier,
+#: namespace, version and path in the string table, index of the registry in
+#: the metadata mapping, offset and size of the system mapping and of the
+#: definition data within the payload blob. Optional values are set to -1.
+_RECORD = struct.Struct("<iiiiiQIQI")
+
+#: Structure of an entry of the sorted index table: record index.
+_INDEX = struct.Struct("<I")
+
+
+def compute_fingerprint(paths, max_depth=None):
+    """Return fingerprint of all definition files under registry *paths*.
+
+    The fingerprint is computed from the path of each definition file and the
+    modification time of each folder containing definition files, so that only
+    folders are stat. As adding, removing or renaming a file updates the
+    modification time of its folder, definition files do not have to be
+    stat or opened.
+
+    :param paths: List of registry paths.
+
+    :param max_depth: Limited recursion value to search for definition files.
+        Default is None, which means that all sub-trees will be visited.
+
+    :return: Hexadecimal fingerprint.
+
+    .. warning::
+
+        Definition files modified in place are not detected. Definitions
+        :func:`exported <wiz.definition.export>` by Wiz are written into a
+        temporary file which is then renamed, so that the modification time
+        of their folder is updated.
+
+    """
+    hasher = hashlib.sha1()
+
+    for path in paths:
+        hasher.update(u"{}\0".format(path).encode("utf-8"))
+
+        _paths = sorted(
+            wiz.definition.discover_paths(path, max_depth=max_depth)
+        )
+
+        folders = set([path] + [os.path.dirname(_path) for _path in _paths])
+
+        for folder in sorted(folders):
+            try:
+                stat = os.stat(folder)
+            except OSError:
+                continue
+
+            hasher.update(
+                u"{}\0{}\0".format(folder, stat.st_mtime).encode("utf-8")
+            )
+
+        for _path in _paths:
+            hasher.update(u"{}\0".format(_path).encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+def pack(path, registry_paths, max_depth=None):
+    """Pack all definitions found under *registry_paths* into a snapshot.
+
+    Snapshot file is a binary file which can be memory-mapped and queried
+    without deserializing all definitions::
+
+        >>> pack("/path/to/snapshot", ["/path/to/registry"])
+        >>> snapshot = Snapshot("/path/to/snapshot")
+        >>> snapshot.query("foo")
+
+        [<Definition id='foo' version='0.2.0'>, <Definition id='foo' ...]
+
+    All definitions are packed, whatever their system requirements, so that
+    the snapshot can be shared between several platforms.
+
+    :param path: Path to the snapshot file to create. An existing file will be
+        overwritten.
+
+    :param registry_paths: List of registry paths to recursively fetch
+        :class:`definitions <wiz.definition.Definition>` from.
+
+    :param max_depth: Limited recursion value to search for :class:`definitions
+        <wiz.definition.Definition>`. Default is None, which means that all
+        sub-trees will be visited.
+
+    :return: Number of definitions packed.
+
+    :raise: :exc:`IOError` if the snapshot file cannot be written.
+
+    .. seealso:: :ref:`registry/snapshot`
+
+    """
+    logger = logging.getLogger(__name__ + ".pack")
+
+    registry_paths = _normalize_paths(registry_paths)
+
+    # Compute fingerprint before discovering definitions, so that the snapshot
+    # is considered as outdated if a file is modified in the meantime.
+    fingerprint = compute_fingerprint(registry_paths, max_depth=max_depth)
+
+    definitions = list(
+        wiz.definition.discover(registry_paths, max_depth=max_depth)
+    )
+
+    strings = []
+    string_mapping = {}
+
+    def _register(value):
+        """Return index of *value* in string table."""
+        if value is None:
+            return -1
+
+        if value not in string_mapping:
+            string_mapping[value] = len(strings)
+            strings.append(value)
+
+        return string_mapping[value]
+
+    records = []
+    payloads = []
+    versions = []
+    offset = 0
+
+    for definition in definitions:
+        data = definition.data(copy_data=False)
+        versions.append(data.get("version", ""))
+
+        system = ujson.dumps(definition.system).encode("utf-8")
+        payload = ujson.dumps(data).encode("utf-8")
+
+        records.append((
+            _register(definition.identifier),
+            _register(definition.namespace),
+            _register(data.get("version")),
+            _register(definition.path),
+            registry_paths.index(definition.registry_path),
+            offset, len(system),
+            offset + len(system), len(payload),
+        ))
+
+        payloads.extend([system, payload])
+        offset += len(system) + len(payload)
+
+    # Sort records per identifier, namespace and descending version.
+    indices = sorted(
+        range(len(records)),
+        key=functools.cmp_to_key(
+            lambda index1, index2: wiz.utility.compare_versions(
+                versions[index2], versions[index1]
+            )
+        )
+    )
+    indices.sort(
+        key=lambda index: (
+            definitions[index].identifier, definitions[index].namespace or ""
+        )
+    )
+
+    metadata = ujson.dumps({
+        "version": __version__,
+        "fingerprint": fingerprint,
+        "registries": registry_paths,
+        "max_depth": max_depth,
+    }).encode("utf-8")
+
+    encoded_strings = [string.encode("utf-8") for string in strings]
+
+    with wiz.filesystem.atomic_write(path, mode="wb") as stream:
+        stream.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(metadata)))
+        stream.write(metadata)
+
+        # Write string table.
+        stream.write(_COUNT.pack(len(encoded_strings)))
+
+        string_offset = 0
+        for string in encoded_strings:
+            stream.write(_STRING.pack(string_offset, len(string)))
+            string_offset += len(string)
+
+        stream.write(_SIZE.pack(string_offset))
+        for string in encoded_strings:
+            stream.write(string)
+
+        # Write record table and sorted index.
+        stream.write(_COUNT.pack(len(records)))
+        for record in records:
+            stream.write(_RECORD.pack(*record))
+
+        for index in indices:
+            stream.write(_INDEX.pack(index))
+
+        # Write definition payloads.
+        for payload in payloads:
+            stream.write(payload)
+
+    logger.debug(
+        "{} definition(s) packed into {!r}".format(len(records), path)
+    )
+
+    return len(records)
+
+
+def fetch(path, registry_paths, max_depth=None):
+    """Return snapshot from *path* if it is valid for *registry_paths*.
+
+    :param path: Path to the snapshot file.
+
+    :param registry_paths: List of registry paths which should have been used
+        to create the snapshot.
+
+    :param max_depth: Limited recursion value used to create the snapshot.
+        Default is None.
+
+    :return: Instance of :class:`Snapshot` or None if the snapshot does not
+        exist, is incorrect or is outdated.
+
+    """
+    logger = logging.getLogger(__name__ + ".fetch")
+
+    if not os.path.isfile(path):
+        logger.debug("Snapshot {!r} does not exist.".format(path))
+        return
+
+    try:
+        snapshot = Snapshot(path)
+    except wiz.exception.SnapshotError as error:
+        logger.debug("Snapshot {!r} is incorrect [{}]".format(path, error))
+        return
+
+    if not snapshot.is_valid(registry_paths, max_depth=max_depth):
+        logger.debug("Snapshot {!r} is outdated.".format(path))
+        snapshot.close()
+        return
+
+    return snapshot
+
+
+class Snapshot(object):
+    """Memory-mapped registry snapshot.
+
+    The snapshot file is memory-mapped so that concurrent processes share the
+    same pages of the file system cache. Definitions are only deserialized
+    when requested::
+
+        >>> with Snapshot("/path/to/snapshot") as snapshot:
+        ...     snapshot.query("foo")
+
+        [<Definition id='foo' version='0.2.0'>, <Definition id='foo' ...]
+
+    .. seealso:: :ref:`registry/snapshot`
+
+    """
+
+    def __init__(self, path):
+        """Initialize snapshot from *path*.
+
+        :param path: Path to a snapshot file created with :func:`pack`.
+
+        :raise: :exc:`wiz.exception.SnapshotError` if the snapshot file is
+            incorrect or has been created by another version of Wiz.
+
+        """
+        self._path = path
+
+        try:
+            with open(path, "rb") as stream:
+                self._buffer = mmap.mmap(
+                    stream.fileno(), 0, access=mmap.ACCESS_READ
+                )
+
+        except (IOError, OSError, ValueError) as error:
+            raise wiz.exception.SnapshotError(
+                "Snapshot cannot be opened [{}]".format(error)
+            )
+
+        try:
+            self._initialize()
+
+        except (struct.error, ValueError, KeyError) as error:
+            self.close()
+            raise wiz.exception.SnapshotError(
+                "Snapshot is corrupted [{}]".format(error)
+            )
+
+        except wiz.exception.SnapshotError:
+            self.close()
+            raise
+
+    def _initialize(self):
+        """Read tables offsets from snapshot header."""
+        magic, format_version, size = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise wiz.exception.SnapshotError("Invalid snapshot file.")
+
+        if format_version != FORMAT_VERSION:
+            raise wiz.exception.SnapshotError(
+                "Incompatible format version: {}".format(format_version)
+            )
+
+        offset = _HEADER.size
+        self._metadata = ujson.loads(
+            self._buffer[offset:offset + size].decode("utf-8")
+        )
+        offset += size
+
+        if self._metadata.get("version") != __version__:
+            raise wiz.exception.SnapshotError(
+                "Snapshot created with another version of Wiz."
+            )
+
+        self._string_count = _COUNT.unpack_from(self._buffer, offset)[0]
+        self._string_table_offset = offset + _COUNT.size
+        offset = self._string_table_offset + (
+            self._string_count * _STRING.size
+        )
+
+        blob_size = _SIZE.unpack_from(self._buffer, offset)[0]
+        self._string_blob_offset = offset + _SIZE.size
+        offset = self._string_blob_offset + blob_size
+
+        self._record_count = _COUNT.unpack_from(self._buffer, offset)[0]
+        self._record_table_offset = offset + _COUNT.size
+        offset = self._record_table_offset + (
+            self._record_count * _RECORD.size
+        )
+
+        self._index_table_offset = offset
+        self._payload_offset = offset + self._record_count * _INDEX.size
+
+        if self._payload_offset > len(self._buffer):
+            raise ValueError("Snapshot is truncated.")
+
+    def __enter__(self):
+        """Enter context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit context manager and close the snapshot."""
+        self.close()
+
+    def __len__(self):
+        """Return number of definitions in snapshot."""
+        return self._record_count
+
+    @property
+    def path(self):
+        """Return path to snapshot file.
+
+        :return: File path.
+
+        """
+        return self._path
+
+    @property
+    def fingerprint(self):
+        """Return fingerprint of registries when the snapshot was created.
+
+        :return: Hexadecimal fingerprint.
+
+        """
+        return self._metadata["fingerprint"]
+
+    @property
+    def registry_paths(self):
+        """Return registry paths packed in the snapshot.
+
+        :return: List of registry paths.
+
+        """
+        return self._metadata["registries"]
+
+    @property
+    def max_depth(self):
+        """Return recursion value used to create the snapshot.
+
+        :return: Integer value or None.
+
+        """
+        return self._metadata.get("max_depth")
+
+    def close(self):
+        """Close memory-mapped snapshot file."""
+        self._buffer.close()
+
+    def is_valid(self, registry_paths, max_depth=None):
+        """Indicate whether snapshot is valid for *registry_paths*.
+
+        The snapshot is valid if it has been created from the same registry
+        paths with the same recursion value, and if no definition files have
+        been added, removed or replaced since.
+
+        .. seealso:: :func:`compute_fingerprint`
+
+        :param registry_paths: List of registry paths.
+
+        :param max_depth: Limited recursion value. Default is None.
+
+        :return: Boolean value.
+
+        """
+        registry_paths = _normalize_paths(registry_paths)
+
+        if registry_paths != self.registry_paths:
+            return False
+
+        if max_depth != self.max_depth:
+            return False
+
+        return self.fingerprint == compute_fingerprint(
+            registry_paths, max_depth=max_depth
+        )
+
+    def discover(self, system_mapping=None):
+        """Yield all definitions from snapshot in discovery order.
+
+        :param system_mapping: Mapping of the current system which will filter
+            out non compatible definitions. The mapping should have been
+            retrieved via :func:`wiz.system.query`.
+
+        :return: Generator which yield all :class:`definitions
+            <wiz.definition.Definition>`.
+
+        """
+        for index in range(self._record_count):
+            definition = self._create_definition(
+                index, system_mapping=system_mapping
+            )
+            if definition is not None:
+                yield definition
+
+    def query(self, identifier, system_mapping=None):
+        """Return all definitions corresponding to *identifier*.
+
+        Only the definitions returned are deserialized.
+
+        :param identifier: Definition identifier (e.g. "foo").
+
+        :param system_mapping: Mapping of the current system which will filter
+            out non compatible definitions. The mapping should have been
+            retrieved via :func:`wiz.system.query`.
+
+        :return: List of :class:`definitions <wiz.definition.Definition>`
+            sorted by namespace and descending version.
+
+        """
+        # Find first position of identifier in sorted index with bisection.
+        low, high = 0, self._record_count
+
+        while low < high:
+            middle = (low + high) // 2
+            if self._identifier_at(middle) < identifier:
+                low = middle + 1
+            else:
+                high = middle
+
+        definitions = []
+
+        for position in range(low, self._record_count):
+            if self._identifier_at(position) != identifier:
+                break
+
+            index = _INDEX.unpack_from(
+                self._buffer, self._index_table_offset + position * _INDEX.size
+            )[0]
+
+            definition = self._create_definition(
+                index, system_mapping=system_mapping
+            )
+            if definition is not None:
+                definitions.append(definition)
+
+        return definitions
+
+    def search(self, keyword, system_mapping=None):
+        """Return all definitions containing *keyword* string.
+
+        Only the definitions which data contain *keyword* as a :term:`JSON`
+        string (e.g. a command or a keyword) are deserialized.
+
+        :param keyword: String to search (e.g. "auto-use").
+
+        :param system_mapping: Mapping of the current system which will filter
+            out non compatible definitions. The mapping should have been
+            retrieved via :func:`wiz.system.query`.
+
+        :return: List of :class:`definitions <wiz.definition.Definition>` in
+            discovery order.
+
+        """
+        pattern = '"{}"'.format(keyword).encode("utf-8")
+        definitions = []
+
+        for index in range(self._record_count):
+            offset, size = self._record(index)[-2:]
+            offset += self._payload_offset
+
+            if self._buffer.find(pattern, offset, offset + size) == -1:
+                continue
+
+            definition = self._create_definition(
+                index, system_mapping=system_mapping
+            )
+            if definition is not None:
+                definitions.append(definition)
+
+        return definitions
+
+    def _identifier_at(self, position):
+        """Return identifier of record at *position* in sorted index."""
+        index = _INDEX.unpack_from(
+            self._buffer, self._index_table_offset + position * _INDEX.size
+        )[0]
+        return self._string(self._record(index)[0])
+
+    def _record(self, index):
+        """Return record at *index* in record table."""
+        return _RECORD.unpack_from(
+            self._buffer, self._record_table_offset + index * _RECORD.size
+        )
+
+    def _string(self, index):
+        """Return string at *index* in string table."""
+        if index < 0:
+            return
+
+        offset, size = _STRING.unpack_from(
+            self._buffer, self._string_table_offset + index * _STRING.size
+        )
+
+        offset += self._string_blob_offset
+        return self._buffer[offset:offset + size].decode("utf-8")
+
+    def _load(self, offset, size):
+        """Return deserialized payload at *offset* in payload blob."""
+        offset += self._payload_offset
+        return ujson.loads(self._buffer[offset:offset + size].decode("utf-8"))
+
+    def _create_definition(self, index, system_mapping=None):
+        """Return definition from record at *index*.
+
+        :param index: Index of record in record table.
+
+        :param system_mapping: Mapping of the current system which will filter
+            out non compatible definitions. Default is None.
+
+        :return: Instance of :class:`wiz.definition.Definition` or None if it
+            is not compatible with *system_mapping*.
+
+        """
+        (
+            identifier, _, _, path, registry,
+            system_offset, system_size, payload_offset, payload_size
+        ) = self._record(index)
+
+        # Filter system before deserializing the definition data.
+        if system_mapping is not None:
+            system = self._load(system_offset, system_size)
+            header = wiz.definition.Definition(
+                {"identifier": self._string(identifier), "system": system},
+                copy_data=False,
+                validate_data=False
+            )
+
+            if not wiz.system.validate(header, system_mapping):
+                return
+
+        # Data has been validated before being packed.
+        return wiz.definition.Definition(
+            self._load(payload_offset, payload_size),
+            path=self._string(path),
+            registry_path=self.registry_paths[registry],
+            copy_data=False,
+            validate_data=False
+        )
+
+
+def _normalize_paths(paths):
+    """Return absolute registry paths without empty paths.
+
+    :param paths: List of registry paths.
+
+    :return: List of absolute registry paths.
+
+    """
+    return [os.path.abspath(path.strip()) for path in paths if path.strip()]
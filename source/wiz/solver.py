@@ -0,0 +1,964 @@
+# :coding: utf-8
+
+from __future__ import absolute_import
+import collections
+import heapq
+import logging
+
+import wiz.definition
+import wiz.exception
+import wiz.graph
+import wiz.package
+
+
+class Resolver(object):
+    """Package dependency resolver based on boolean satisfiability.
+
+    Compute a ordered list of packages from an initial list of
+    :class:`packaging.requirements.Requirement` instances::
+
+        >>> resolver = Resolver(definition_mapping)
+        >>> resolver.compute_packages([Requirement("foo"), Requirement("bar")])
+
+    Instead of dividing a graph into combinations of variants and downgrading
+    conflicting versions one step at a time like :class:`wiz.graph.Resolver`,
+    every version and variant which can be reached from the initial
+    requirements is encoded as a boolean variable. Requirements, conditions and
+    the uniqueness of each package definition are encoded as clauses solved by
+    a :class:`Solver` instance, so the resolution does not depend on a maximum
+    number of combinations or attempts.
+
+    Decisions follow the priority used by :class:`wiz.graph.Resolver`:
+    requirements closer to the root level are fulfilled first, with the highest
+    version and the first variant available.
+
+    .. note::
+
+        Namespaces are guessed from the namespace counter given to
+        :meth:`compute_packages` only, whereas :class:`wiz.graph.Resolver`
+        also counts namespaces of packages added to the graph.
+
+    """
+
+    def __init__(self, definition_mapping):
+        """Initialize Resolver.
+
+        :param definition_mapping: Mapping regrouping all available definitions
+            associated with their unique identifier.
+
+        """
+        self._logger = logging.getLogger(__name__ + ".Resolver")
+
+        self._definition_mapping = definition_mapping
+
+    @property
+    def definition_mapping(self):
+        """Return definition mapping used by resolver.
+
+        :return: Mapping containing of all available definitions
+
+        """
+        return self._definition_mapping
+
+    def compute_packages(self, requirements, namespace_counter=None):
+        """Return resolved packages from *requirements*.
+
+        Packages are sorted per descending order of distance to the root level,
+        like packages extracted by
+        :meth:`wiz.graph.Combination.extract_packages`.
+
+        :param requirements: List of :class:`packaging.requirements.Requirement`
+            instances.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            which indicates occurrence of namespaces used as hints for package
+            identification. Default is None.
+
+        :return: Sorted list of :class:`wiz.package.Package` instances.
+
+        :raise: :exc:`wiz.exception.GraphInvalidNodesError` if initial
+            requirements cannot be extracted, or if no combination of package
+            versions and variants fulfills all requirements while some
+            requirements could not be extracted.
+
+        :raise: :exc:`wiz.exception.GraphResolutionError` if no combination of
+            package versions and variants fulfills all requirements. The error
+            is :meth:`diagnosed <_diagnose>` to report conflicting
+            requirements when possible.
+
+        """
+        problem = _Problem(
+            self._definition_mapping, namespace_counter=namespace_counter
+        )
+        problem.encode(requirements)
+
+        self._logger.debug(
+            "Encoded {} packages into {} variables and {} clauses.".format(
+                len(problem.packages), problem.solver.variables,
+                len(problem.solver.clauses)
+            )
+        )
+
+        if problem.errors.get(_Problem.ROOT):
+            raise wiz.exception.GraphInvalidNodesError({
+                _Problem.ROOT: problem.errors[_Problem.ROOT]
+            })
+
+        if not problem.solver.solve(problem.decide):
+            if len(problem.errors) > 0:
+                raise wiz.exception.GraphInvalidNodesError(problem.errors)
+
+            raise self._diagnose(requirements, namespace_counter)
+
+        self._logger.debug(
+            "Solved with {} decisions and {} conflicts.".format(
+                problem.solver.decisions, problem.solver.conflicts
+            )
+        )
+
+        packages = problem.extract_packages()
+
+        self._logger.debug(
+            "Sorted packages: {}".format(
+                ", ".join([package.identifier for package in packages])
+            )
+        )
+
+        return packages
+
+    def _diagnose(self, requirements, namespace_counter=None):
+        """Return error explaining why *requirements* cannot be resolved.
+
+        Unsatisfiable clauses do not indicate which requirements are
+        conflicting, so *requirements* are resolved again with
+        :class:`wiz.graph.Resolver` to report the conflicting requirements
+        and the packages requiring them.
+
+        :param requirements: List of :class:`packaging.requirements.Requirement`
+            instances.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            which indicates occurrence of namespaces used as hints for package
+            identification. Default is None.
+
+        :return: Instance of :exc:`wiz.exception.GraphResolutionError`.
+
+        """
+        self._logger.debug(
+            "Resolve requirements with graph resolver to report conflicts."
+        )
+
+        resolver = wiz.graph.Resolver(self._definition_mapping)
+
+        try:
+            resolver.compute_packages(
+                requirements, namespace_counter=namespace_counter
+            )
+
+        except wiz.exception.GraphResolutionError as error:
+            return error
+
+        return wiz.exception.GraphResolutionError(
+            "The dependency graph could not be resolved as no "
+            "combination of package versions and variants fulfills all "
+            "requirements."
+        )
+
+
+class _Problem(object):
+    """Satisfiability problem encoding the resolution of requirements.
+
+    Each package version and variant is encoded as a variable which is true
+    when the package is included in the resolved context. The following
+    clauses are added to the :class:`Solver` instance:
+
+    * Each requirement of an included package must be fulfilled by one of its
+      candidate packages, or dropped if the conditions of its best matching
+      version are not fulfilled;
+    * Each included package must be required by another included package;
+    * Conditioned packages can only be included if each condition is fulfilled
+      by an included package;
+    * Only one package can be included per definition identifier.
+
+    """
+
+    #: Identify the root level of the requirements.
+    ROOT = "root"
+
+    def __init__(self, definition_mapping, namespace_counter=None):
+        """Initialize problem.
+
+        :param definition_mapping: Mapping regrouping all available definitions
+            associated with their unique identifier.
+
+        :param namespace_counter: instance of :class:`collections.Counter`
+            which indicates occurrence of namespaces used as hints for package
+            identification. Default is None.
+
+        """
+        self._definition_mapping = definition_mapping
+        self._namespace_counter = namespace_counter
+
+        self.solver = Solver()
+
+        # Variable indicating the root level, which is always included.
+        self._root = self.solver.new_variable()
+        self.solver.add_clause([self._root])
+
+        #: Mapping of package per variable.
+        self.packages = {}
+
+        #: Mapping of errors raised during encoding per package identifier.
+        self.errors = {}
+
+        # Record variable per package identifier.
+        self._variables = {}
+
+        # Record package variables per qualified definition identifier.
+        self._groups = collections.OrderedDict()
+
+        # Record variables of packages requiring each package variable.
+        self._owners = {}
+
+        # Record candidate packages or error per requirement.
+        self._candidates = {}
+
+        # Record package instances per definition and variant identifier.
+        self._package_mapping = {}
+
+        # Record variable indicating whether a condition is fulfilled.
+        self._conditions = {}
+
+        # Record requirements in order of priority. Each requirement is a tuple
+        # containing the variable of the package requiring it, the literals
+        # which fulfill it and the weight of the requirement.
+        self._requirements = []
+
+        # Record requirement indices per variable of the requiring package.
+        self._requirement_indices = {}
+
+        # Record packages to encode in breadth-first order.
+        self._queue = collections.deque()
+
+        # State of decisions.
+        self._scanned = 0
+        self._tracked = set()
+        self._pending = []
+        self._fulfilled = []
+        self._free = 1
+
+    def encode(self, requirements):
+        """Encode resolution of *requirements* into solver clauses.
+
+        :param requirements: List of :class:`packaging.requirements.Requirement`
+            instances ordered from the most important to the least important.
+
+        """
+        for index, requirement in enumerate(requirements):
+            self._add_requirement(
+                requirement, self._root, self.ROOT, weight=index + 1
+            )
+
+        while len(self._queue) > 0:
+            package, variable = self._queue.popleft()
+
+            for index, requirement in enumerate(package.requirements):
+                self._add_requirement(
+                    requirement, variable, package.identifier,
+                    weight=index + 1
+                )
+
+            for condition in package.conditions:
+                self.solver.add_clause([
+                    -variable, self._fetch_condition(condition)
+                ])
+
+        # Ensure that each package is required by an included package.
+        for variable in self.packages:
+            self.solver.add_clause(
+                [-variable] + self._owners.get(variable, [])
+            )
+
+        # Ensure that only one package is included per definition.
+        for variables in self._groups.values():
+            self._add_at_most_one(variables)
+
+    def _add_requirement(self, requirement, variable, identifier, weight):
+        """Encode *requirement* of package corresponding to *variable*.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :param variable: Variable of the package requiring *requirement*.
+
+        :param identifier: Identifier of the package requiring *requirement*.
+
+        :param weight: Number indicating the importance of the requirement.
+
+        """
+        try:
+            packages = self._extract_packages(requirement)
+
+        except wiz.exception.WizError as error:
+            self.errors.setdefault(identifier, []).append(error)
+            self.solver.add_clause([-variable])
+            return
+
+        literals = [self._fetch_variable(package) for package in packages]
+
+        for literal in literals:
+            self._owners.setdefault(literal, []).append(variable)
+
+        # Like packages extracted by wiz.graph.Resolver, the requirement can be
+        # dropped if conditions of the best matching version are not fulfilled.
+        # Lower versions are only used when this version is excluded.
+        best = [
+            package for package in packages
+            if package.definition is packages[0].definition
+        ]
+
+        if any(len(package.conditions) > 0 for package in best):
+            drop = self.solver.new_variable()
+
+            for package in best:
+                self.solver.add_clause([-drop] + [
+                    -self._fetch_condition(condition)
+                    for condition in package.conditions
+                ])
+
+            literals.insert(len(best), drop)
+
+        self.solver.add_clause([-variable] + literals)
+
+        self._requirement_indices.setdefault(variable, []).append(
+            len(self._requirements)
+        )
+        self._requirements.append((variable, literals, weight))
+
+    def _extract_packages(self, requirement):
+        """Return all packages which could fulfill *requirement*.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :return: List of :class:`~wiz.package.Package` instances sorted from
+            the highest version, and following the variant order.
+
+        :raise: :exc:`wiz.exception.RequestNotFound` if the requirement can
+            not be resolved.
+
+        """
+        key = str(requirement)
+
+        packages = self._candidates.get(key)
+
+        if packages is None:
+            try:
+                definitions = wiz.definition.query_all(
+                    requirement, self._definition_mapping,
+                    namespace_counter=self._namespace_counter
+                )
+
+                packages = [
+                    self._package_mapping.setdefault(
+                        (package.definition, package.variant_identifier),
+                        package
+                    )
+                    for definition in definitions
+                    for package in _create_packages(definition, requirement)
+                ]
+
+            except wiz.exception.WizError as error:
+                packages = error
+
+            self._candidates[key] = packages
+
+        if isinstance(packages, wiz.exception.WizError):
+            raise packages
+
+        return packages
+
+    def _fetch_variable(self, package):
+        """Return variable corresponding to *package*.
+
+        Package requirements will be encoded if the variable is created.
+
+        :param package: Instance of :class:`wiz.package.Package`.
+
+        :return: Variable number.
+
+        """
+        variable = self._variables.get(package.identifier)
+
+        if variable is None:
+            variable = self.solver.new_variable()
+            self._variables[package.identifier] = variable
+            self.packages[variable] = package
+
+            identifier = package.definition.qualified_identifier
+            self._groups.setdefault(identifier, []).append(variable)
+
+            self._queue.append((package, variable))
+
+        return variable
+
+    def _fetch_condition(self, condition):
+        """Return variable indicating whether *condition* is fulfilled.
+
+        :param condition: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        :return: Variable number.
+
+        """
+        key = str(condition)
+
+        variable = self._conditions.get(key)
+
+        if variable is None:
+            variable = self.solver.new_variable()
+            self._conditions[key] = variable
+
+            try:
+                packages = self._extract_packages(condition)
+
+            except wiz.exception.WizError:
+                packages = []
+
+            literals = [self._fetch_variable(package) for package in packages]
+
+            self.solver.add_clause([-variable] + literals)
+
+            for literal in literals:
+                self.solver.add_clause([-literal, variable])
+
+        return variable
+
+    def _add_at_most_one(self, variables):
+        """Ensure that only one of *variables* can be true.
+
+        A sequential counter encoding is used for large groups to prevent
+        adding a clause for each pair of variables.
+
+        :param variables: List of variable numbers.
+
+        """
+        if len(variables) <= 4:
+            for index, variable in enumerate(variables):
+                for other in variables[index + 1:]:
+                    self.solver.add_clause([-variable, -other])
+            return
+
+        previous = None
+
+        for index, variable in enumerate(variables):
+            if previous is not None:
+                self.solver.add_clause([-variable, -previous])
+
+            if index == len(variables) - 1:
+                break
+
+            counter = self.solver.new_variable()
+            self.solver.add_clause([-variable, counter])
+
+            if previous is not None:
+                self.solver.add_clause([-previous, counter])
+
+            previous = counter
+
+    def decide(self, solver):
+        """Return next literal to assign in *solver*.
+
+        The requirement with the highest priority which is not fulfilled yet
+        is fulfilled with its first candidate package which is not excluded.
+        Once all requirements of included packages are fulfilled, remaining
+        variables are set to false.
+
+        :param solver: Instance of :class:`Solver`.
+
+        :return: Literal or None if all variables are assigned.
+
+        """
+        position = solver.pop_stable_position()
+
+        # Reconsider requirements which could be unfulfilled after a backjump.
+        if position < self._scanned:
+            self._scanned = position
+            self._free = 1
+
+            while len(self._fulfilled) and -self._fulfilled[0][0] >= position:
+                _, index = heapq.heappop(self._fulfilled)
+                heapq.heappush(self._pending, index)
+
+        # Record requirements of packages included since the last decision.
+        trail = solver.trail
+        for literal in trail[self._scanned:]:
+            for index in self._requirement_indices.get(literal, []):
+                if index not in self._tracked:
+                    self._tracked.add(index)
+                    heapq.heappush(self._pending, index)
+
+        self._scanned = len(trail)
+
+        while len(self._pending) > 0:
+            index = self._pending[0]
+            variable, literals, _ = self._requirements[index]
+
+            if solver.value(variable) != 1:
+                heapq.heappop(self._pending)
+                self._tracked.discard(index)
+                continue
+
+            positions = [
+                solver.position(literal) for literal in literals
+                if solver.value(literal) == 1
+            ]
+
+            if len(positions) > 0:
+                heapq.heappop(self._pending)
+                heapq.heappush(self._fulfilled, (-min(positions), index))
+                continue
+
+            for literal in literals:
+                if solver.value(literal) == 0:
+                    return literal
+
+        while self._free <= solver.variables:
+            if solver.value(self._free) == 0:
+                return -self._free
+            self._free += 1
+
+    def extract_packages(self):
+        """Return included packages sorted by distance to the root level.
+
+        The distance of each package is the shortest accumulated weight of
+        requirements leading to it. Packages are sorted per descending order
+        of distance, and per descending identifier for equal distances.
+
+        :return: Sorted list of :class:`wiz.package.Package` instances.
+
+        """
+        links = {}
+
+        for variable, literals, weight in self._requirements:
+            if self.solver.value(variable) != 1:
+                continue
+
+            for literal in literals:
+                if literal in self.packages and self.solver.value(literal) == 1:
+                    links.setdefault(variable, []).append((literal, weight))
+                    break
+
+        distances = {self._root: 0}
+        queue = [(0, self._root)]
+
+        while len(queue) > 0:
+            distance, variable = heapq.heappop(queue)
+            if distance > distances[variable]:
+                continue
+
+            for child, weight in links.get(variable, []):
+                _distance = distance + weight
+                if _distance < distances.get(child, _distance + 1):
+                    distances[child] = _distance
+                    heapq.heappush(queue, (_distance, child))
+
+        packages = [
+            self.packages[variable] for variable in distances
+            if variable != self._root
+        ]
+
+        return sorted(
+            packages, reverse=True,
+            key=lambda _package: (
+                distances[self._variables[_package.identifier]],
+                _package.identifier
+            )
+        )
+
+
+def _create_packages(definition, requirement):
+    """Return packages created from *definition* fulfilling *requirement*.
+
+    :param definition: Instance of :class:`wiz.definition.Definition`.
+
+    :param requirement: Instance of
+        :class:`packaging.requirements.Requirement`.
+
+    :return: List of :class:`wiz.package.Package` instances.
+
+    """
+    if len(requirement.extras) > 0:
+        variant = next(iter(requirement.extras))
+        return [wiz.package.create(definition, variant_identifier=variant)]
+
+    elif len(definition.variants) == 0:
+        return [wiz.package.create(definition)]
+
+    return [
+        wiz.package.create(definition, variant_identifier=variant.identifier)
+        for variant in definition.variants
+    ]
+
+
+class Solver(object):
+    """Conflict-driven clause learning solver.
+
+    Variables are positive numbers, and literals are variable numbers which are
+    negative when the variable is negated::
+
+        >>> solver = Solver()
+        >>> a, b = solver.new_variable(), solver.new_variable()
+        >>> solver.add_clause([a, b])
+        >>> solver.add_clause([-a])
+        >>> solver.solve()
+        True
+        >>> solver.value(b)
+        1
+
+    Each clause watches two of its literals so that it is only visited when one
+    of them is assigned to false. When a conflict is found, a clause is learned
+    from the first unique implication point and the solver jumps back to the
+    second highest decision level of this clause.
+
+    """
+
+    def __init__(self):
+        """Initialize solver."""
+        # Record value, decision level, reason clause and trail position per
+        # variable. Index 0 is not used.
+        self._values = [0]
+        self._levels = [0]
+        self._reasons = [None]
+        self._positions = [0]
+
+        # Record clauses as lists of literals, with watched literals first.
+        self._clauses = []
+
+        # Record clause indices per watched literal.
+        self._watches = {}
+
+        # Record assigned literals in order of assignment.
+        self._trail = []
+
+        # Record trail length at the beginning of each decision level.
+        self._trail_limits = []
+
+        # Position of next literal to propagate in trail.
+        self._head = 0
+
+        # Lowest trail length since stable position was last fetched.
+        self._stable_position = 0
+
+        # Indicate whether the clauses can be satisfied.
+        self._satisfiable = True
+
+        #: Number of decisions made.
+        self.decisions = 0
+
+        #: Number of conflicts encountered.
+        self.conflicts = 0
+
+    @property
+    def variables(self):
+        """Return number of variables.
+
+        :return: Integer.
+
+        """
+        return len(self._values) - 1
+
+    @property
+    def clauses(self):
+        """Return clauses added or learned.
+
+        :return: List of literal lists.
+
+        """
+        return self._clauses
+
+    @property
+    def trail(self):
+        """Return literals assigned in order of assignment.
+
+        :return: List of literals.
+
+        """
+        return self._trail
+
+    def new_variable(self):
+        """Create a new variable.
+
+        :return: Variable number.
+
+        """
+        self._values.append(0)
+        self._levels.append(0)
+        self._reasons.append(None)
+        self._positions.append(0)
+        return len(self._values) - 1
+
+    def value(self, literal):
+        """Return value of *literal*.
+
+        :param literal: Literal number.
+
+        :return: 1 if *literal* is true, -1 if it is false, or 0 if it is not
+            assigned.
+
+        """
+        value = self._values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def position(self, literal):
+        """Return position of assigned *literal* in the trail.
+
+        :param literal: Literal number.
+
+        :return: Integer.
+
+        """
+        return self._positions[abs(literal)]
+
+    def pop_stable_position(self):
+        """Return trail position below which assignments did not change.
+
+        Assignments from the returned position may have been unassigned or
+        replaced since the last call.
+
+        :return: Integer.
+
+        """
+        position = self._stable_position
+        self._stable_position = len(self._trail)
+        return position
+
+    def add_clause(self, literals):
+        """Add clause from *literals*.
+
+        Clauses must be added before solving.
+
+        :param literals: List of literal numbers, at least one of which must be
+            true.
+
+        """
+        if not self._satisfiable:
+            return
+
+        clause = []
+
+        for literal in literals:
+            value = self.value(literal)
+
+            # Clause already satisfied, or tautology.
+            if value == 1 or -literal in clause:
+                return
+
+            if value == 0 and literal not in clause:
+                clause.append(literal)
+
+        if len(clause) == 0:
+            self._satisfiable = False
+
+        elif len(clause) == 1:
+            self._assign(clause[0], None)
+
+        else:
+            self._attach(clause)
+
+    def solve(self, decide=None):
+        """Return whether clauses can be satisfied.
+
+        :param decide: Callable which receives the solver and returns the next
+            literal to assign as a decision, or None when all variables are
+            assigned. Default is None, which means that the first unassigned
+            variable is set to false.
+
+        :return: Boolean value.
+
+        """
+        decide = decide or _decide_false
+
+        if not self._satisfiable:
+            return False
+
+        while True:
+            conflict = self._propagate()
+
+            if conflict is not None:
+                self.conflicts += 1
+
+                if len(self._trail_limits) == 0:
+                    self._satisfiable = False
+                    return False
+
+                clause, level = self._analyze(conflict)
+                self._backjump(level)
+
+                if len(clause) == 1:
+                    self._assign(clause[0], None)
+                else:
+                    self._assign(clause[0], self._attach(clause))
+
+                continue
+
+            literal = decide(self)
+            if literal is None:
+                return True
+
+            self.decisions += 1
+            self._trail_limits.append(len(self._trail))
+            self._assign(literal, None)
+
+    def _attach(self, clause):
+        """Record *clause* and watch its first two literals.
+
+        :return: Index of clause.
+
+        """
+        index = len(self._clauses)
+        self._clauses.append(clause)
+        self._watches.setdefault(clause[0], []).append(index)
+        self._watches.setdefault(clause[1], []).append(index)
+        return index
+
+    def _assign(self, literal, reason):
+        """Assign *literal* to true with *reason* clause index."""
+        variable = abs(literal)
+        self._values[variable] = 1 if literal > 0 else -1
+        self._levels[variable] = len(self._trail_limits)
+        self._reasons[variable] = reason
+        self._positions[variable] = len(self._trail)
+        self._trail.append(literal)
+
+    def _propagate(self):
+        """Propagate assignments from the trail.
+
+        :return: Index of conflicting clause or None.
+
+        """
+        values = self._values
+        clauses = self._clauses
+
+        while self._head < len(self._trail):
+            false_literal = -self._trail[self._head]
+            self._head += 1
+
+            watchers = self._watches.get(false_literal)
+            if not watchers:
+                continue
+
+            kept = []
+
+            for position, index in enumerate(watchers):
+                clause = clauses[index]
+
+                # Ensure that the false literal is the second one.
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                first = clause[0]
+                value = values[abs(first)]
+                if (value if first > 0 else -value) == 1:
+                    kept.append(index)
+                    continue
+
+                # Look for a new literal to watch.
+                for _position in range(2, len(clause)):
+                    literal = clause[_position]
+                    value = values[abs(literal)]
+                    if (value if literal > 0 else -value) != -1:
+                        clause[1], clause[_position] = literal, clause[1]
+                        self._watches.setdefault(literal, []).append(index)
+                        break
+
+                else:
+                    kept.append(index)
+
+                    value = values[abs(first)]
+                    if (value if first > 0 else -value) == -1:
+                        kept.extend(watchers[position + 1:])
+                        self._watches[false_literal] = kept
+                        return index
+
+                    self._assign(first, index)
+
+            self._watches[false_literal] = kept
+
+    def _analyze(self, conflict):
+        """Return clause learned from *conflict* with backjump level.
+
+        The learned clause contains the negation of the first unique
+        implication point as its first literal, and a literal of the backjump
+        level as its second literal.
+
+        """
+        level = len(self._trail_limits)
+        learned = [None]
+        seen = set()
+        counter = 0
+        literal = None
+        position = len(self._trail) - 1
+        clause = self._clauses[conflict]
+
+        while True:
+            for _literal in clause:
+                variable = abs(_literal)
+                if _literal == literal or variable in seen:
+                    continue
+
+                if self._levels[variable] == 0:
+                    continue
+
+                seen.add(variable)
+
+                if self._levels[variable] == level:
+                    counter += 1
+                else:
+                    learned.append(_literal)
+
+            # Find latest assigned literal of the conflict at current level.
+            while abs(self._trail[position]) not in seen:
+                position -= 1
+
+            literal = self._trail[position]
+            position -= 1
+            counter -= 1
+
+            if counter == 0:
+                break
+
+            clause = self._clauses[self._reasons[abs(literal)]]
+
+        learned[0] = -literal
+
+        if len(learned) == 1:
+            return learned, 0
+
+        # Watch literal with the highest level as second literal.
+        index = max(
+            range(1, len(learned)), key=lambda i: self._levels[abs(learned[i])]
+        )
+        learned[1], learned[index] = learned[index], learned[1]
+        return learned, self._levels[abs(learned[1])]
+
+    def _backjump(self, level):
+        """Unassign all literals above decision *level*."""
+        limit = self._trail_limits[level]
+
+        for literal in self._trail[limit:]:
+            self._values[abs(literal)] = 0
+            self._reasons[abs(literal)] = None
+
+        del self._trail[limit:]
+        del self._trail_limits[level:]
+
+        self._head = limit
+        self._stable_position = min(self._stable_position, limit)
+
+
+def _decide_false(solver):
+    """Return negation of first unassigned variable in *solver* or None."""
+    for variable in range(1, solver.variables + 1):
+        if solver.value(variable) == 0:
+            return -variable
@@ -68,6 +68,12 @@ GRAPH_ERROR_IDENTIFICATION_ACTION = "IDENTIFY_ERROR"
 #: History action for resolution error within graph.
 GRAPH_RESOLUTION_FAILURE_ACTION = "RESOLUTION_ERROR"
 
+#: History action for nogood learned from resolution error.
+GRAPH_NOGOOD_LEARNING_ACTION = "LEARN_NOGOOD"
+
+#: History action for nogood used to skip resolution.
+GRAPH_NOGOOD_USAGE_ACTION = "USE_NOGOOD"
+
 #: History action for package extraction from graph.
 GRAPH_PACKAGES_EXTRACTION_ACTION = "EXTRACT_PACKAGES"
 
@@ -3,6 +3,7 @@
 import platform as _platform
 
 import distro
+import six
 
 import wiz.exception
 import wiz.history
@@ -14,6 +15,9 @@ OS_MAPPING = {
     "el": ["centos", "redhat"]
 }
 
+#: Latest system filter fetched.
+_FILTER = None
+
 
 def query(platform=None, architecture=None, os_name=None, os_version=None):
     """Return system mapping.
@@ -187,45 +191,185 @@ def validate(definition, system_mapping):
 
     :return: Boolean value.
 
+    .. seealso:: :func:`fetch_filter`
+
     """
-    system = definition.system
+    return fetch_filter(system_mapping).validate(definition)
 
-    # If no system is set on the definition, it is considered compatible with
-    # any platform.
-    if len(system) == 0:
-        return True
 
-    # Filter platform if necessary.
-    platform_identifier = system_mapping.get("platform")
-    if system.get("platform", platform_identifier) != platform_identifier:
-        return False
-
-    # Filter architecture if necessary.
-    architecture = system_mapping.get("arch")
-    if system.get("arch", architecture) != architecture:
-        return False
-
-    # Filter operating system version if necessary.
-    os_system = system.get("os")
-    if os_system is not None:
-        try:
-            requirement = wiz.utility.get_requirement(os_system)
-        except wiz.exception.RequirementError:
-            raise wiz.exception.DefinitionError(
-                "The operating system requirement is incorrect: {}".format(
-                    os_system
-                )
-            )
+def fetch_filter(system_mapping):
+    """Fetch system filter for *system_mapping*.
+
+    The filter created is cached so that the filter previously fetched is
+    returned as long as the same *system_mapping* instance is used. Results
+    are therefore memoized while fetching all definitions from registries.
+
+    :param system_mapping: System mapping as returned by :func:`query`.
+
+    :return: Instance of :class:`Filter`.
+
+    .. note::
+
+        The filter returned is always created for *system_mapping*, even when
+        the cached filter is replaced concurrently for another system mapping
+        (e.g. by the :ref:`daemon <daemon>`).
+
+    """
+    global _FILTER
+
+    system_filter = _FILTER
+
+    if (
+        system_filter is None
+        or system_filter.system_mapping is not system_mapping
+    ):
+        system_filter = Filter(system_mapping)
+        _FILTER = system_filter
+
+    return system_filter
+
+
+class Filter(object):
+    """Validate definitions against a system mapping.
+
+    Registries usually contain a few distinct :ref:`system requirements
+    <definition/system>` shared by many definitions, so the result of each
+    system requirement is memoized and only evaluated once.
+
+    Example::
+
+        >>> system_filter = Filter(query())
+        >>> definitions = [
+        ...     definition for definition in definitions
+        ...     if system_filter.validate(definition)
+        ... ]
+        >>> system_filter.hits, system_filter.misses
+        (49982, 18)
+
+    .. warning::
+
+        The :attr:`hits` and :attr:`misses` counters are not thread-safe, so
+        they can be approximate when definitions are discovered concurrently.
+
+    """
+
+    def __init__(self, system_mapping):
+        """Initialize filter.
+
+        :param system_mapping: System mapping as returned by :func:`query`.
+
+        """
+        #: System mapping as returned by :func:`query`.
+        self.system_mapping = system_mapping
 
         os_mapping = system_mapping.get("os", {})
 
-        if not (
-            requirement.name == os_mapping.get("name") or
-            os_mapping.get("name") in OS_MAPPING.get(requirement.name, [])
-        ):
+        self._platform = system_mapping.get("platform")
+        self._architecture = system_mapping.get("arch")
+        self._os_name = os_mapping.get("name")
+        self._os_version = os_mapping.get("version")
+
+        # Record result per system requirement and canonical system
+        # requirement.
+        self._results = {}
+
+        #: Number of system requirements fetched from memoized results.
+        self.hits = 0
+
+        #: Number of system requirements evaluated.
+        self.misses = 0
+
+    def validate(self, definition):
+        """Validate *definition* against system mapping.
+
+        :param definition: Instance of :class:`wiz.definition.Definition`.
+
+        :return: Boolean value.
+
+        :raise: :exc:`wiz.exception.DefinitionError` if the operating system
+            requirement of *definition* is incorrect.
+
+        """
+        system = definition.system
+
+        # If no system is set on the definition, it is considered compatible
+        # with any platform.
+        if len(system) == 0:
+            return True
+
+        key = tuple(sorted(system.items()))
+
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        # Share result between equivalent system requirements.
+        canonical_key = _canonicalize(system)
+
+        result = self._results.get(canonical_key)
+        if result is not None:
+            self.hits += 1
+
+        else:
+            self.misses += 1
+            result = self._evaluate(system)
+            self._results[canonical_key] = result
+
+        self._results[key] = result
+        return result
+
+    def _evaluate(self, system):
+        """Return whether *system* requirement is compatible."""
+        # Filter platform if necessary.
+        if system.get("platform", self._platform) != self._platform:
             return False
 
-        if os_mapping.get("version") not in requirement.specifier:
+        # Filter architecture if necessary.
+        if system.get("arch", self._architecture) != self._architecture:
             return False
 
-    return True
+        # Filter operating system version if necessary.
+        os_system = system.get("os")
+        if os_system is not None:
+            try:
+                requirement = wiz.utility.get_requirement(os_system)
+            except wiz.exception.RequirementError:
+                raise wiz.exception.DefinitionError(
+                    "The operating system requirement is incorrect: {}".format(
+                        os_system
+                    )
+                )
+
+            if not (
+                requirement.name == self._os_name or
+                self._os_name in OS_MAPPING.get(requirement.name, [])
+            ):
+                return False
+
+            if self._os_version not in requirement.specifier:
+                return False
+
+        return True
+
+
+def _canonicalize(system):
+    """Return hashable key from *system* requirement mapping.
+
+    The operating system requirement is normalized so that equivalent
+    requirements such as "el >= 7, < 8" and "el<8,>=7" share the same key.
+    Other values are kept unchanged as they are compared as is.
+
+    """
+    items = []
+
+    for key, value in system.items():
+        if key == "os" and isinstance(value, six.string_types):
+            try:
+                value = str(wiz.utility.get_requirement(value))
+            except wiz.exception.RequirementError:
+                pass
+
+        items.append((key, value))
+
+    return tuple(sorted(items))
@@ -6,6 +6,7 @@ import copy
 import functools
 import hashlib
 import re
+import weakref
 import zlib
 
 from packaging.requirements import InvalidRequirement
@@ -15,11 +16,17 @@ import ujson
 
 import wiz.exception
 import wiz.symbol
-from ._requirement import Requirement
+import wiz._requirement
 
 # Arbitrary number which indicates a very high version number
 _INFINITY_VERSION = 9999
 
+#: Number of characters of the hash returned by :func:`compute_system_hash`.
+SYSTEM_HASH_LENGTH = 27
+
+#: Version ranges computed per specifier set by :func:`fetch_version_ranges`.
+_VERSION_RANGES = weakref.WeakKeyDictionary()
+
 
 def get_requirement(content):
     """Return the corresponding requirement instance from *content*.
@@ -33,9 +40,14 @@ def get_requirement(content):
     :raise: :exc:`wiz.exception.InvalidRequirement` if the requirement is
         incorrect.
 
+    .. note::
+
+        Requirements are parsed with a dedicated parser which memoizes
+        results per string.
+
     """
     try:
-        return Requirement(content)
+        return wiz._requirement.parse(content)
     except InvalidRequirement:
         raise wiz.exception.RequirementError(
             "The requirement '{}' is incorrect".format(content)
@@ -113,12 +125,42 @@ def is_overlapping(requirement1, requirement2):
     if requirement1.extras != requirement2.extras:
         return False
 
-    r1 = extract_version_ranges(requirement1)
-    r2 = extract_version_ranges(requirement2)
-    return (
-        (r2[-1][1] is None or r1[0][0] is None or r2[-1][1] >= r1[0][0]) and
-        (r1[-1][1] is None or r2[0][0] is None or r1[-1][1] >= r2[0][0])
-    )
+    ranges = fetch_version_ranges(requirement1)
+    return ranges.overlaps(fetch_version_ranges(requirement2))
+
+
+def fetch_version_ranges(requirement):
+    """Return version ranges from *requirement*.
+
+    Version ranges are :func:`extracted <extract_version_ranges>` once per
+    specifier set, so requirements sharing the same specifiers share the same
+    version ranges.
+
+    Example::
+
+        >>> fetch_version_ranges(Requirement("foo >= 2, < 3"))
+        VersionRanges([((2,), (2, 9999))])
+
+    :param requirement: Instance of :class:`packaging.requirements.Requirement`.
+
+    :return: Instance of :class:`VersionRanges`.
+
+    :raise: :exc:`wiz.exception.InvalidVersion` if the version extracted from
+        the specifier is incorrect.
+
+    :raise: :exc:`wiz.exception.InvalidRequirement` if the specifier operator
+        is not accepted or if the requirement does not allow any versions to be
+        reached.
+
+    """
+    specifier = requirement.specifier
+
+    ranges = _VERSION_RANGES.get(specifier)
+    if ranges is None:
+        ranges = VersionRanges(extract_version_ranges(requirement))
+        _VERSION_RANGES[specifier] = ranges
+
+    return ranges
 
 
 def extract_version_ranges(requirement):
@@ -226,6 +268,96 @@ def extract_version_ranges(requirement):
     return version_ranges
 
 
+class VersionRanges(tuple):
+    """Immutable sequence of version ranges.
+
+    Each range is a tuple containing the minimum and maximum version release
+    tuples allowed (e.g. ``((2,), (2, 9999))``), both inclusive. A None value
+    indicates that the range is not bounded. Ranges are sorted and do not
+    overlap with each other. An empty instance indicates that no versions are
+    allowed.
+
+    Example::
+
+        >>> ranges = VersionRanges([(None, (2, 9999)), ((3,), None)])
+        >>> ranges.intersection(VersionRanges([((2, 5), (3, 5))]))
+        VersionRanges([((2, 5), (2, 9999)), ((3,), (3, 5))])
+
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        """Return representation of instance."""
+        return "{}({!r})".format(self.__class__.__name__, list(self))
+
+    def overlaps(self, other):
+        """Indicate whether version ranges are overlapping with *other*.
+
+        Version ranges are overlapping when the span between their lowest and
+        highest versions are overlapping.
+
+        :param other: Instance of :class:`VersionRanges`.
+
+        :return: Boolean value.
+
+        """
+        if not self or not other:
+            return False
+
+        return (
+            (
+                other[-1][1] is None or self[0][0] is None
+                or other[-1][1] >= self[0][0]
+            ) and (
+                self[-1][1] is None or other[0][0] is None
+                or self[-1][1] >= other[0][0]
+            )
+        )
+
+    def intersection(self, other):
+        """Return version ranges allowed by both instance and *other*.
+
+        :param other: Instance of :class:`VersionRanges`.
+
+        :return: Instance of :class:`VersionRanges`.
+
+        """
+        ranges = []
+        index1 = index2 = 0
+
+        while index1 < len(self) and index2 < len(other):
+            minimum1, maximum1 = self[index1]
+            minimum2, maximum2 = other[index2]
+
+            if minimum1 is None or (
+                minimum2 is not None and minimum2 > minimum1
+            ):
+                minimum = minimum2
+            else:
+                minimum = minimum1
+
+            if maximum1 is None or (
+                maximum2 is not None and maximum2 < maximum1
+            ):
+                maximum = maximum2
+            else:
+                maximum = maximum1
+
+            if minimum is None or maximum is None or minimum <= maximum:
+                ranges.append((minimum, maximum))
+
+            # Move forward the range which ends first.
+            if maximum1 is None or (
+                maximum2 is not None and maximum2 < maximum1
+            ):
+                index2 += 1
+            else:
+                index1 += 1
+
+        return VersionRanges(ranges)
+
+
 def compare_versions(version1, version2):
     """Compare two versions following logic defined in :term:`PEP 440`.
 
@@ -588,14 +720,30 @@ def compute_file_name(definition):
         name += "-{}".format(definition.version)
 
     if definition.system:
-        system_identifier = wiz.utility.compute_system_label(definition)
-        data = re.sub(r"(\s+|:+)", "", system_identifier).encode("utf-8")
-        encoded = base64.urlsafe_b64encode(hashlib.sha1(data).digest())
-        name += "-{}".format(encoded.rstrip(b"=").decode("utf-8"))
+        name += "-{}".format(compute_system_hash(definition))
 
     return "{}.json".format(name)
 
 
+def compute_system_hash(definition):
+    """Return hash of :func:`system label <compute_system_label>` from
+    *definition*.
+
+    The hash is used as a suffix of the :func:`file name <compute_file_name>`
+    of definitions with a :ref:`system requirement <definition/system>`
+    (e.g. "M2Uq9Esezm-m00VeWkTzkQIu3T4").
+
+    :param definition: Instance of :class:`wiz.definition.Definition`.
+
+    :return: String of :data:`SYSTEM_HASH_LENGTH` characters.
+
+    """
+    system_identifier = compute_system_label(definition)
+    data = re.sub(r"(\s+|:+)", "", system_identifier).encode("utf-8")
+    encoded = base64.urlsafe_b64encode(hashlib.sha1(data).digest())
+    return encoded.rstrip(b"=").decode("utf-8")
+
+
 def combine_command(elements):
     """Return command *elements* as a string.
 
@@ -647,6 +795,139 @@ def deep_update(mapping1, mapping2):
     return mapping1
 
 
+def freeze(data):
+    """Return read-only version of *data*.
+
+    Dictionaries and lists are recursively converted into :class:`FrozenDict`
+    and :class:`FrozenList` instances. Sub-structures which are already
+    read-only are returned as-is so that they can be shared between several
+    structures without being copied::
+
+        >>> data = freeze({"A": {"B": [1, 2]}})
+        >>> _data = freeze(dict(data, C=3))
+        >>> _data["A"] is data["A"]
+        True
+
+    :param data: Mapping, list or value to freeze.
+
+    :return: Read-only version of *data*.
+
+    .. note::
+
+        *data* is not mutated.
+
+    """
+    if isinstance(data, (FrozenDict, FrozenList)):
+        return data
+
+    if isinstance(data, dict):
+        return FrozenDict(
+            (key, freeze(value)) for key, value in data.items()
+        )
+
+    if isinstance(data, list):
+        return FrozenList(freeze(value) for value in data)
+
+    return data
+
+
+def thaw(data):
+    """Return mutable copy of *data*.
+
+    Dictionaries and lists are recursively copied, including the read-only
+    versions returned by :func:`freeze`.
+
+    :param data: Mapping, list or value to copy.
+
+    :return: Mutable copy of *data*.
+
+    """
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+
+    if isinstance(data, list):
+        return [thaw(value) for value in data]
+
+    return data
+
+
+def _raise_read_only(self, *args, **kwargs):
+    """Raise error when attempting to mutate a read-only structure."""
+    raise TypeError(
+        "'{}' object is read-only.".format(type(self).__name__)
+    )
+
+
+class FrozenDict(dict):
+    """Read-only dictionary returned by :func:`freeze`.
+
+    It behaves as a :class:`dict` for comparison, lookup and serialization,
+    but any attempt to mutate it raises a :exc:`TypeError`.
+
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _raise_read_only
+    __delitem__ = _raise_read_only
+    clear = _raise_read_only
+    pop = _raise_read_only
+    popitem = _raise_read_only
+    setdefault = _raise_read_only
+    update = _raise_read_only
+    __ior__ = _raise_read_only
+
+    def __copy__(self):
+        """Return shallow mutable copy."""
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        """Return deep mutable copy."""
+        return thaw(self)
+
+    def __reduce__(self):
+        """Return pickling information."""
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """Read-only list returned by :func:`freeze`.
+
+    It behaves as a :class:`list` for comparison, lookup and serialization,
+    but any attempt to mutate it raises a :exc:`TypeError`.
+
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _raise_read_only
+    __delitem__ = _raise_read_only
+    __setslice__ = _raise_read_only
+    __delslice__ = _raise_read_only
+    __iadd__ = _raise_read_only
+    __imul__ = _raise_read_only
+    append = _raise_read_only
+    extend = _raise_read_only
+    insert = _raise_read_only
+    pop = _raise_read_only
+    remove = _raise_read_only
+    reverse = _raise_read_only
+    sort = _raise_read_only
+    clear = _raise_read_only
+
+    def __copy__(self):
+        """Return shallow mutable copy."""
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        """Return deep mutable copy."""
+        return thaw(self)
+
+    def __reduce__(self):
+        """Return pickling information."""
+        return FrozenList, (list(self),)
+
+
 def sanitize_requirement(requirement, package):
     """Return qualified *requirement* depending on *package*'s namespace.
 
@@ -719,34 +1000,67 @@ def match(requirement, package):
 
     :return: Boolean value.
 
+    .. seealso:: :class:`RequirementMatcher`
+
     """
-    namespace, identifier = extract_namespace(requirement)
+    return RequirementMatcher(requirement).match(package)
 
-    # Ignore if package identifier doesn't match requirement name.
-    if package.definition.identifier != identifier:
-        return False
 
-    # Ignore if package namespace doesn't match requirement name.
-    if namespace is not None and package.definition.namespace != namespace:
-        return False
+class RequirementMatcher(object):
+    """Match packages against a requirement.
+
+    Namespace, identifier, variants and specifier are extracted once from the
+    requirement so that many packages can be matched without copying the
+    requirement.
+
+    Example::
+
+        >>> matcher = RequirementMatcher(Requirement("foo::bar[V1] >=1"))
+        >>> [package for package in packages if matcher.match(package)]
+
+    """
+
+    __slots__ = ("namespace", "identifier", "variants", "specifier")
 
-    # Ignore if package variant doesn't match any requirement extras.
-    variants_requested = list(requirement.extras)
-    if len(variants_requested) > 0:
-        variant_identifier = package.variant_identifier
-        if not any(_id == variant_identifier for _id in variants_requested):
+    def __init__(self, requirement):
+        """Initialize matcher.
+
+        :param requirement: Instance of
+            :class:`packaging.requirements.Requirement`.
+
+        """
+        self.namespace, self.identifier = extract_namespace(requirement)
+        self.variants = frozenset(requirement.extras)
+        self.specifier = requirement.specifier
+
+    def match(self, package):
+        """Return whether *package* is compatible with requirement.
+
+        :param package: Instance of :class:`wiz.package.Package`.
+
+        :return: Boolean value.
+
+        """
+        definition = package.definition
+
+        # Ignore if package identifier doesn't match requirement name.
+        if definition.identifier != self.identifier:
             return False
 
-    # Node is matching if package has no version.
-    if package.version is not None:
-        # Remove namespace from requirement so specifier can be used.
-        _requirement = copy.deepcopy(requirement)
-        _requirement.name = identifier
+        # Ignore if package namespace doesn't match requirement name.
+        if (
+            self.namespace is not None
+            and definition.namespace != self.namespace
+        ):
+            return False
 
-        if not _requirement.specifier.contains(package.version):
+        # Ignore if package variant doesn't match any requirement extras.
+        if self.variants and package.variant_identifier not in self.variants:
             return False
 
-    return True
+        # Node is matching if package has no version.
+        version = package.version
+        return version is None or self.specifier.contains(version)
 
 
 def extract_namespace(requirement):
@@ -0,0 +1,282 @@
+# :coding: utf-8
+
+from __future__ import absolute_import
+import atexit
+import hashlib
+import logging
+import os
+import time
+
+import ujson
+
+import wiz.config
+import wiz.filesystem
+from ._version import __version__
+
+#: Version of the cache format. It should be incremented each time the
+#: structure of the cache file is modified.
+FORMAT_VERSION = 1
+
+#: Default maximum number of verdicts kept in the cache.
+DEFAULT_MAX_ENTRIES = 50000
+
+#: Global validation cache.
+_CACHE = None
+
+#: Indicate whether the global validation cache is saved at exit.
+_SAVE_ON_EXIT = False
+
+
+def get_path():
+    """Return path to the validation cache file.
+
+    :return: Value of ``validation_cache.path`` in the :ref:`configuration
+        <configuration>` or :file:`~/.wiz/cache/validation.json`.
+
+    .. seealso:: :ref:`registry/validation_cache`
+
+    """
+    config = wiz.config.fetch()
+    path = config.get("validation_cache", {}).get("path")
+    if path is not None:
+        return os.path.abspath(os.path.expanduser(path))
+
+    return os.path.join(
+        os.path.expanduser("~"), ".wiz", "cache", "validation.json"
+    )
+
+
+def compute_key(content, mapping=None):
+    """Return cache key from definition file *content*.
+
+    :param content: Bytes content of a definition file.
+
+    :param mapping: Mapping which augments the data loaded from *content*.
+        Default is None.
+
+    :return: Hexadecimal key.
+
+    """
+    hasher = hashlib.sha1(content)
+
+    if mapping:
+        hasher.update(b"\0")
+        hasher.update(ujson.dumps(mapping, sort_keys=True).encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+def fetch(refresh=False):
+    """Fetch validation cache if enabled.
+
+    The cache created is kept for future usage so that the cache file is only
+    loaded once per process.
+
+    :param refresh: Indicate whether the cache should be re-created instead of
+        using the cache previously created whenever possible. Default is False.
+
+    :return: Instance of :class:`ValidationCache`, or None if the cache is not
+        enabled in the :ref:`configuration <configuration>`.
+
+    """
+    global _CACHE
+
+    config = wiz.config.fetch().get("validation_cache", {})
+    if not config.get("enabled", False):
+        return
+
+    if _CACHE is None or refresh:
+        _CACHE = ValidationCache(
+            path=get_path(),
+            max_entries=config.get("max_entries", DEFAULT_MAX_ENTRIES)
+        )
+
+    return _CACHE
+
+
+def save_on_exit():
+    """Save global validation cache once when the process exits.
+
+    This should be used when definitions keep being loaded after being
+    fetched, so that the cache file is written once instead of each time a
+    definition is loaded. The cache is only written if it has been modified.
+
+    """
+    global _SAVE_ON_EXIT
+
+    if not _SAVE_ON_EXIT:
+        atexit.register(_save)
+        _SAVE_ON_EXIT = True
+
+
+def _save():
+    """Save global validation cache if it has been created."""
+    if _CACHE is not None:
+        _CACHE.save()
+
+
+class ValidationCache(object):
+    """Persistent cache of definition files successfully validated.
+
+    Each entry is identified by a :func:`key <compute_key>` computed from the
+    content of a definition file, so that the file can be loaded without
+    validating its data again as long as its content is unchanged::
+
+        >>> cache = ValidationCache()
+        >>> key = compute_key(content)
+        >>> if not cache.contains(key):
+        ...     wiz.validator.validate_definition(ujson.loads(content))
+        ...     cache.record(key)
+        >>> cache.save()
+
+    The cache is emptied if it has been created by another version of Wiz, as
+    validation rules might be different. When the maximum number of entries is
+    reached, the least recently used entries are removed.
+
+    .. seealso:: :ref:`registry/validation_cache`
+
+    """
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        """Initialize cache.
+
+        :param path: Path to the cache file. Default is None, which means that
+            the path will be returned by :func:`get_path`.
+
+        :param max_entries: Maximum number of entries kept when saving the
+            cache. Default is :data:`DEFAULT_MAX_ENTRIES`.
+
+        """
+        self._logger = logging.getLogger(__name__ + ".ValidationCache")
+
+        self._path = path or get_path()
+        self._max_entries = max_entries
+
+        # Record the day of the last usage per key, which is precise enough
+        # to evict entries without rewriting the cache for each usage.
+        self._today = int(time.time() // 86400)
+        self._entries = self._load()
+
+        # Indicate whether the cache needs to be saved.
+        self._modified = False
+
+    def __len__(self):
+        """Return number of entries in cache."""
+        return len(self._entries)
+
+    @property
+    def path(self):
+        """Return path to cache file.
+
+        :return: File path.
+
+        """
+        return self._path
+
+    def _load(self):
+        """Return cache entries from cache file.
+
+        :return: Mapping of last usage day per key. The mapping is empty if the
+            cache file does not exist, is corrupted or has been created with
+            another version of Wiz.
+
+        """
+        if not os.path.isfile(self._path):
+            return {}
+
+        try:
+            with open(self._path, "r") as stream:
+                data = ujson.load(stream)
+
+        except (IOError, OSError, ValueError) as error:
+            self._logger.debug(
+                "Failed to load validation cache {!r} [{}]".format(
+                    self._path, error
+                )
+            )
+            return {}
+
+        if (
+            not isinstance(data, dict)
+            or data.get("format") != FORMAT_VERSION
+            or data.get("version") != __version__
+        ):
+            self._logger.debug(
+                "Validation cache {!r} is outdated.".format(self._path)
+            )
+            return {}
+
+        return data.get("entries", {})
+
+    def contains(self, key):
+        """Indicate whether data identified by *key* has been validated.
+
+        :param key: Key returned by :func:`compute_key`.
+
+        :return: Boolean value.
+
+        """
+        day = self._entries.get(key)
+        if day is None:
+            return False
+
+        if day != self._today:
+            self._entries[key] = self._today
+            self._modified = True
+
+        return True
+
+    def record(self, key):
+        """Record that data identified by *key* has been validated.
+
+        :param key: Key returned by :func:`compute_key`.
+
+        """
+        if self._entries.get(key) != self._today:
+            self._entries[key] = self._today
+            self._modified = True
+
+    def save(self):
+        """Save cache into cache file if necessary.
+
+        :return: Boolean value indicating whether the cache file was written.
+
+        .. note::
+
+            The cache is written into a temporary file which is then renamed
+            to prevent concurrent processes from reading a partial file.
+            Errors are logged and ignored as the cache is only an optimization.
+
+        """
+        if not self._modified:
+            return False
+
+        # Evict least recently used entries.
+        if len(self._entries) > self._max_entries:
+            keys = sorted(
+                self._entries, key=lambda _key: self._entries[_key],
+                reverse=True
+            )
+            for key in keys[self._max_entries:]:
+                del self._entries[key]
+
+        data = {
+            "format": FORMAT_VERSION,
+            "version": __version__,
+            "entries": self._entries
+        }
+
+        try:
+            with wiz.filesystem.atomic_write(self._path) as stream:
+                ujson.dump(data, stream)
+
+        except (IOError, OSError) as error:
+            self._logger.debug(
+                "Failed to save validation cache {!r} [{}]".format(
+                    self._path, error
+                )
+            )
+            return False
+
+        self._modified = False
+        return True
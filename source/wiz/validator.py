@@ -1,5 +1,6 @@
 # :coding: utf-8
 
+import collections
 import re
 
 import six
@@ -12,47 +13,109 @@ _REGEXP_VERSION = re.compile(
 )
 
 
-def validate_definition(data):
+def validate_definition(data, deferred_keywords=None):
     """Validate *data* mapping used to create a definition.
 
     An error will be raised if the *data* mapping cannot be used to create an
     instance of :class:`wiz.definition.Definition`..
 
+    The *data* mapping is first checked with compiled checkers which only
+    indicate whether the mapping is valid. Keyword validators are only used to
+    identify the error when the mapping is rejected.
+
     :param data: Mapping to validate.
 
+    :param deferred_keywords: Keywords which should not be validated. Each of
+        these keywords can be validated later on with
+        :func:`validate_definition_keyword`. Default is None, which means that
+        all keywords will be validated.
+
     :raise: :exc:`wiz.exception.IncorrectDefinition` if the *data* mapping
         is incorrect.
 
     """
-    keywords = {
-        "identifier", "version", "namespace", "description", "auto-use",
-        "disabled", "install-root", "install-location", "system", "command",
-        "environ", "requirements", "conditions", "variants"
-    }
+    deferred_keywords = deferred_keywords or []
+
+    if _check_definition(data, deferred_keywords):
+        return
+
+    _validate_definition(data, deferred_keywords)
+
+
+def validate_definition_keyword(data, keyword):
+    """Validate *keyword* within *data* mapping used to create a definition.
+
+    :param data: Mapping to validate. The mapping type and keywords are
+        expected to have been validated by :func:`validate_definition`.
+
+    :param keyword: Keyword to validate (e.g. "environ").
+
+    :raise: :exc:`wiz.exception.IncorrectDefinition` if the *data* mapping
+        is incorrect.
+
+    """
+    if _KEYWORD_CHECKERS[keyword](data.get(keyword)):
+        return
+
+    try:
+        _KEYWORD_VALIDATORS[keyword](data)
+
+    except ValueError as error:
+        raise wiz.exception.DefinitionError(str(error))
+
+
+def _validate_definition(data, deferred_keywords):
+    """Validate *data* mapping with keyword validators.
+
+    :param data: Mapping to validate.
 
+    :param deferred_keywords: Keywords which should not be validated.
+
+    :raise: :exc:`wiz.exception.IncorrectDefinition` if the *data* mapping
+        is incorrect.
+
+    """
     try:
         validate_type(data, dict)
-        validate_keywords(data, keywords)
-
-        validate_identifier_keyword(data)
-        validate_version_keyword(data)
-        validate_namespace_keyword(data)
-        validate_description_keyword(data)
-        validate_auto_use_keyword(data)
-        validate_disabled_keyword(data)
-        validate_install_root_keyword(data)
-        validate_install_location_keyword(data)
-        validate_system_keyword(data)
-        validate_command_keyword(data)
-        validate_environ_keyword(data)
-        validate_requirements_keyword(data)
-        validate_conditions_keyword(data)
-        validate_variants_keyword(data)
+        validate_keywords(data, _KEYWORD_VALIDATORS.keys())
+
+        for keyword, validator in _KEYWORD_VALIDATORS.items():
+            if keyword not in deferred_keywords:
+                validator(data)
 
     except ValueError as error:
         raise wiz.exception.DefinitionError(str(error))
 
 
+def _check_definition(data, deferred_keywords):
+    """Indicate whether *data* mapping used to create a definition is valid.
+
+    Contrary to :func:`validate_definition`, no error message is computed, so
+    that valid mappings can be checked as fast as possible. Only keywords
+    present in *data* are checked.
+
+    :param data: Mapping to check.
+
+    :param deferred_keywords: Keywords which should not be checked.
+
+    :return: Boolean value. False might be returned for mappings which would
+        be accepted by :func:`validate_definition`.
+
+    """
+    if not isinstance(data, dict):
+        return False
+
+    for keyword, value in data.items():
+        checker = _KEYWORD_CHECKERS.get(keyword)
+        if checker is None:
+            return False
+
+        if keyword not in deferred_keywords and not checker(value):
+            return False
+
+    return "identifier" in data or "identifier" in deferred_keywords
+
+
 def validate_identifier_keyword(data, variant_index=None):
     """Validate 'identifier' keyword within *data* mapping.
 
@@ -469,3 +532,158 @@ def validate_not_empty(data, label="Data"):
     """
     if data is not None and not len(data):
         raise ValueError("{} should not be empty.".format(label))
+
+
+#: Ordered mapping of validators per definition keyword.
+_KEYWORD_VALIDATORS = collections.OrderedDict([
+    ("identifier", validate_identifier_keyword),
+    ("version", validate_version_keyword),
+    ("namespace", validate_namespace_keyword),
+    ("description", validate_description_keyword),
+    ("auto-use", validate_auto_use_keyword),
+    ("disabled", validate_disabled_keyword),
+    ("install-root", validate_install_root_keyword),
+    ("install-location", validate_install_location_keyword),
+    ("system", validate_system_keyword),
+    ("command", validate_command_keyword),
+    ("environ", validate_environ_keyword),
+    ("requirements", validate_requirements_keyword),
+    ("conditions", validate_conditions_keyword),
+    ("variants", validate_variants_keyword),
+])
+
+
+def _compile_checker(data_type, not_empty=False, regexp=None):
+    """Return function indicating whether a value is valid.
+
+    The function returned accepts None values, which correspond to missing
+    keywords.
+
+    :param data_type: Type expected for the value. It can be a tuple if
+        several types are authorized.
+
+    :param not_empty: Indicate whether the value should be a non-empty
+        container. Default is False.
+
+    :param regexp: Compiled regular expression that the value should match.
+        Default is None.
+
+    :return: Function which takes a value and returns a boolean value.
+
+    """
+    if regexp is not None:
+        match = regexp.match
+
+        def _checker(value):
+            """Indicate whether *value* is a valid string."""
+            return value is None or (
+                isinstance(value, data_type) and match(value) is not None
+            )
+
+    elif not_empty:
+        def _checker(value):
+            """Indicate whether *value* is a valid non-empty container."""
+            return value is None or (
+                isinstance(value, data_type) and len(value) > 0
+            )
+
+    else:
+        def _checker(value):
+            """Indicate whether *value* has a valid type."""
+            return value is None or isinstance(value, data_type)
+
+    return _checker
+
+
+def _compile_mapping_checker(checkers, required=None):
+    """Return function indicating whether a mapping is valid.
+
+    The function returned rejects None values, empty mappings and mappings
+    containing keywords not included in *checkers*.
+
+    :param checkers: Mapping of functions returned by :func:`_compile_checker`
+        per authorized keyword.
+
+    :param required: Keyword which is required in the mapping. Default is
+        None.
+
+    :return: Function which takes a value and returns a boolean value.
+
+    """
+    def _checker(value):
+        """Indicate whether *value* is a valid mapping."""
+        if not isinstance(value, dict) or not len(value):
+            return False
+
+        for keyword, item in value.items():
+            checker = checkers.get(keyword)
+            if checker is None or not checker(item):
+                return False
+
+        return required is None or value.get(required) is not None
+
+    return _checker
+
+
+def _compile_list_checker(item_checker):
+    """Return function indicating whether a list of items is valid.
+
+    :param item_checker: Function indicating whether an item is valid.
+
+    :return: Function which takes a value and returns a boolean value.
+
+    """
+    def _checker(value):
+        """Indicate whether *value* is a valid list."""
+        if value is None:
+            return True
+
+        if not isinstance(value, list) or not len(value):
+            return False
+
+        for item in value:
+            if not item_checker(item):
+                return False
+
+        return True
+
+    return _checker
+
+
+def _check_identifier(value):
+    """Indicate whether identifier *value* is valid."""
+    return isinstance(value, six.string_types)
+
+
+#: Mapping of compiled checkers per definition keyword.
+_KEYWORD_CHECKERS = {
+    "identifier": _check_identifier,
+    "version": _compile_checker(six.string_types, regexp=_REGEXP_VERSION),
+    "namespace": _compile_checker(six.string_types),
+    "description": _compile_checker(six.string_types),
+    "auto-use": _compile_checker(bool),
+    "disabled": _compile_checker(bool),
+    "install-root": _compile_checker(six.string_types),
+    "install-location": _compile_checker(six.string_types),
+    "system": _compile_mapping_checker({
+        "platform": _compile_checker(six.string_types),
+        "os": _compile_checker(six.string_types),
+        "arch": _compile_checker(six.string_types),
+    }),
+    "command": _compile_checker(dict, not_empty=True),
+    "environ": _compile_checker(dict, not_empty=True),
+    "requirements": _compile_checker(list, not_empty=True),
+    "conditions": _compile_checker(list, not_empty=True),
+    "variants": _compile_list_checker(
+        _compile_mapping_checker(
+            {
+                "identifier": _check_identifier,
+                "install-location": _compile_checker(six.string_types),
+                "command": _compile_checker(dict, not_empty=True),
+                "environ": _compile_checker(dict, not_empty=True),
+                "requirements": _compile_checker(list, not_empty=True),
+            },
+            required="identifier"
+        )
+    ),
+}
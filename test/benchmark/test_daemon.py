@@ -0,0 +1,99 @@
+# :coding: utf-8
+
+"""
+Resolving a context with the daemon should avoid discovering definitions for
+each request, so the latency should only depend on the resolution.
+
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+import pytest
+import ujson
+
+import wiz
+import wiz.config
+import wiz.daemon
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.fixture(scope="module")
+def registry(request):
+    """Return mocked registry path with 1500 definitions."""
+    path = tempfile.mkdtemp()
+
+    for index in range(1500):
+        data = {
+            "identifier": "foo{}".format(index),
+            "version": "0.1.0",
+            "command": {"app{}".format(index): "App{}".format(index)},
+            "environ": {"KEY{}".format(index): "VALUE{}".format(index)},
+        }
+
+        # Create chains of 10 dependent definitions.
+        if index % 10:
+            data["requirements"] = ["foo{}".format(index - 1)]
+
+        sub_path = os.path.join(path, "level{}".format(index % 10))
+        if not os.path.isdir(sub_path):
+            os.makedirs(sub_path)
+
+        file_path = os.path.join(sub_path, "foo{}.json".format(index))
+        with open(file_path, "w") as stream:
+            stream.write(ujson.dumps(data))
+
+    def cleanup():
+        """Remove temporary directory."""
+        shutil.rmtree(path)
+
+    request.addfinalizer(cleanup)
+    return path
+
+
+@pytest.fixture()
+def socket_path(temporary_directory):
+    """Return path to socket of daemon running in a thread."""
+    path = os.path.join(temporary_directory, "daemon.sock")
+    server = wiz.daemon.Server(path)
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield path
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _resolve_cold(registry):
+    """Resolve context after discovering definitions from *registry*."""
+    definition_mapping = wiz.fetch_definition_mapping([registry])
+    return wiz.resolve_context(["foo1499"], definition_mapping)
+
+
+def test_resolve_context_cold(registry, benchmark):
+    """Test performance when resolving context within current process."""
+    benchmark(_resolve_cold, registry)
+
+
+def test_resolve_context_with_daemon(registry, socket_path, benchmark):
+    """Test performance when resolving context with the daemon."""
+    # Warm up daemon.
+    wiz.daemon.resolve_context(["foo1499"], [registry], socket_path=socket_path)
+
+    benchmark(
+        wiz.daemon.resolve_context, ["foo1499"], [registry],
+        socket_path=socket_path
+    )
@@ -0,0 +1,61 @@
+# :coding: utf-8
+
+"""
+Editing a definition should only copy the element modified, as definitions
+with hundreds of variants are edited when installing packages.
+
+"""
+
+import os
+
+import pytest
+
+import wiz.config
+import wiz.definition
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.fixture()
+def definition():
+    """Return definition with 500 variants."""
+    return wiz.definition.Definition({
+        "identifier": "foo",
+        "version": "0.1.0",
+        "environ": {"KEY": "VALUE"},
+        "variants": [
+            {
+                "identifier": "V{}".format(index),
+                "command": {"app{}".format(index): "App{}".format(index)},
+                "environ": {"VARIANT": "V{}".format(index)},
+                "requirements": ["bar{} >= 1, < 2".format(index)],
+            }
+            for index in range(500)
+        ]
+    })
+
+
+def _edit(definition):
+    """Edit *definition* as with :option:`wiz edit` operations."""
+    definition = definition.set("install-root", "/path/to/root")
+    definition = definition.update("environ", {"KEY2": "VALUE2"})
+    definition = definition.extend("requirements", ["bim"])
+    definition = definition.remove_key("environ", "KEY")
+    return definition.data()
+
+
+def test_edit_definition(definition, benchmark):
+    """Test performance when editing a definition with 500 variants."""
+    benchmark(_edit, definition)
+
+
+def test_fetch_definition_data(definition, benchmark):
+    """Test performance when fetching data from a definition."""
+    benchmark(definition.data)
@@ -276,3 +276,39 @@ def test_load_complex(temporary_directory, benchmark):
         ujson.dump(data, stream)
 
     benchmark(wiz.definition.load, path)
+
+
+def test_load_complex_lazy(temporary_directory, benchmark):
+    """Load a complex definition with deferred validation."""
+    data = {
+        "identifier": "foo",
+        "version": "0.1.0",
+        "description": "This is a definition.",
+        "command": {
+            "foo": "FooExe"
+        },
+        "environ": {
+            "KEY{}".format(index): "VALUE{}".format(index)
+            for index in range(1000)
+        },
+        "requirements": [
+            "fee{}".format(index) for index in range(100)
+        ],
+        "variants": [
+            {
+                "identifier": "V{}".format(index),
+                "requirements": ["bew{}".format(index) for index in range(100)],
+                "environ": {
+                    "VAR_KEY{}".format(index): "VALUE{}".format(index)
+                    for index in range(100)
+                }
+            }
+            for index in range(100)
+        ]
+    }
+
+    path = os.path.join(temporary_directory, "definition.json")
+    with open(path, "w") as stream:
+        ujson.dump(data, stream)
+
+    benchmark(wiz.definition.load, path, lazy=True)
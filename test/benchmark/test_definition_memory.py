@@ -0,0 +1,98 @@
+# :coding: utf-8
+
+"""
+Definitions fetched should be kept in memory with a small footprint, as long
+running processes such as the :ref:`daemon <daemon>` hold the whole definition
+mapping.
+
+The number of bytes allocated per definition is reported in the
+``bytes_per_definition`` field of the benchmark extra information.
+
+"""
+
+import gc
+import os
+import shutil
+import tempfile
+
+import pytest
+import ujson
+
+import wiz
+import wiz.config
+
+tracemalloc = pytest.importorskip("tracemalloc")
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.fixture(scope="module")
+def registry(request):
+    """Return mocked registry path with 2000 definitions."""
+    path = tempfile.mkdtemp()
+
+    for index in range(2000):
+        data = {
+            "identifier": "foo{}".format(index // 10),
+            "version": "0.{}.0".format(index % 10),
+            "namespace": "test",
+            "command": {"app{}".format(index): "App{}".format(index)},
+            "environ": {"KEY{}".format(index): "VALUE{}".format(index)},
+            "requirements": ["bar >= 1, < 2"],
+            "variants": [
+                {"identifier": "V1", "environ": {"VARIANT": "V1"}},
+                {"identifier": "V2", "environ": {"VARIANT": "V2"}},
+            ]
+        }
+
+        file_path = os.path.join(path, "foo{}.json".format(index))
+        with open(file_path, "w") as stream:
+            stream.write(ujson.dumps(data))
+
+    def cleanup():
+        """Remove temporary directory."""
+        shutil.rmtree(path)
+
+    request.addfinalizer(cleanup)
+    return path
+
+
+def _measure(registry):
+    """Return number of bytes allocated per definition fetched."""
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        mapping = wiz.fetch_definition_mapping([registry], workers=1)
+        count = 0
+
+        for identifier, _mapping in mapping["package"].items():
+            if identifier == "__namespace__":
+                continue
+
+            # Create values cached when definitions are used for resolution.
+            for definition in _mapping.values():
+                _ = definition.version, definition.requirements
+                _ = [variant.requirements for variant in definition.variants]
+                count += 1
+
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return current // count
+
+
+def test_fetch_definition_mapping_memory(registry, benchmark):
+    """Test memory footprint of a definition mapping with 2000 definitions."""
+    result = benchmark.pedantic(_measure, args=(registry,), rounds=3)
+    benchmark.extra_info["bytes_per_definition"] = result
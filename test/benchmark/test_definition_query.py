@@ -0,0 +1,59 @@
+# :coding: utf-8
+
+"""
+Querying definitions with many versions should not require to sort and scan
+all versions for each requirement.
+
+"""
+
+import pytest
+
+import wiz.definition
+from wiz._requirement import Requirement
+
+
+@pytest.fixture(scope="module")
+def mapping():
+    """Return package mapping with 1000 versions of one definition."""
+    mapping = {}
+
+    for major in range(100):
+        for minor in range(10):
+            wiz.definition._add_to_mapping(
+                wiz.definition.Definition({
+                    "identifier": "foo",
+                    "version": "{}.{}.0".format(major, minor),
+                }), mapping
+            )
+
+    return mapping
+
+
+@pytest.fixture(scope="module")
+def requirements():
+    """Return 100 requirements with version ranges."""
+    return [
+        Requirement("foo >= {0}, < {1}".format(major, major + 1))
+        for major in range(100)
+    ]
+
+
+def _query(requirements, mapping):
+    """Query definitions for all *requirements* from *mapping*."""
+    return [
+        wiz.definition.query(requirement, mapping)
+        for requirement in requirements
+    ]
+
+
+def test_query(requirements, mapping, benchmark):
+    """Test performance when querying definitions with version index."""
+    result = benchmark(_query, requirements, mapping)
+    assert len(result) == 100
+
+
+def test_query_without_index(requirements, mapping, benchmark):
+    """Test performance when querying definitions with plain mapping."""
+    _mapping = {"foo": dict(mapping["foo"])}
+    result = benchmark(_query, requirements, _mapping)
+    assert len(result) == 100
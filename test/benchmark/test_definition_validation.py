@@ -0,0 +1,129 @@
+# :coding: utf-8
+
+"""
+Validating a definition should take a few microseconds, as each definition
+discovered is validated before being used.
+
+Compiled checkers are compared with keyword validators, which are only used
+when a definition is incorrect.
+
+"""
+
+import os
+
+import pytest
+
+import wiz.config
+import wiz.exception
+import wiz.validator
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.fixture()
+def simple_data():
+    """Return simple definition data."""
+    return {
+        "identifier": "foo",
+        "version": "0.1.0",
+        "description": "This is a definition.",
+        "system": {
+            "platform": "linux",
+            "os": "el >= 7, < 8",
+        },
+        "command": {
+            "foo": "FooExe"
+        },
+        "environ": {
+            "Key1": "Value1",
+            "Key2": "Value2",
+            "Key3": "Value3",
+        },
+        "requirements": [
+            "fee >= 0.1.0, < 1",
+            "bar >= 2.3, < 3",
+            "bim != 6.0.0",
+        ]
+    }
+
+
+@pytest.fixture()
+def complex_data():
+    """Return complex definition data."""
+    return {
+        "identifier": "foo",
+        "version": "0.1.0",
+        "description": "This is a definition.",
+        "command": {
+            "foo": "FooExe"
+        },
+        "environ": {
+            "KEY{}".format(index): "VALUE{}".format(index)
+            for index in range(1000)
+        },
+        "requirements": [
+            "fee{}".format(index) for index in range(100)
+        ],
+        "variants": [
+            {
+                "identifier": "V{}".format(index),
+                "requirements": ["bew{}".format(index) for index in range(100)],
+                "environ": {
+                    "VAR_KEY{}".format(index): "VALUE{}".format(index)
+                    for index in range(100)
+                }
+            }
+            for index in range(100)
+        ]
+    }
+
+
+def test_validate_minimal(benchmark):
+    """Validate a minimal definition."""
+    benchmark(wiz.validator.validate_definition, {"identifier": "foo"})
+
+
+def test_validate_minimal_with_keyword_validators(benchmark):
+    """Validate a minimal definition with keyword validators."""
+    benchmark(wiz.validator._validate_definition, {"identifier": "foo"}, [])
+
+
+def test_validate_simple(simple_data, benchmark):
+    """Validate a simple definition."""
+    benchmark(wiz.validator.validate_definition, simple_data)
+
+
+def test_validate_simple_with_keyword_validators(simple_data, benchmark):
+    """Validate a simple definition with keyword validators."""
+    benchmark(wiz.validator._validate_definition, simple_data, [])
+
+
+def test_validate_complex(complex_data, benchmark):
+    """Validate a complex definition."""
+    benchmark(wiz.validator.validate_definition, complex_data)
+
+
+def test_validate_complex_with_keyword_validators(complex_data, benchmark):
+    """Validate a complex definition with keyword validators."""
+    benchmark(wiz.validator._validate_definition, complex_data, [])
+
+
+def test_validate_incorrect(simple_data, benchmark):
+    """Fail to validate an incorrect definition."""
+    simple_data["variants"] = [{"identifier": "V1", "environ": {}}]
+
+    def _validate():
+        """Validate incorrect definition."""
+        try:
+            wiz.validator.validate_definition(simple_data)
+        except wiz.exception.DefinitionError:
+            pass
+
+    benchmark(_validate)
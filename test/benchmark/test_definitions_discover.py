@@ -10,6 +10,10 @@ import pytest
 
 import wiz
 import wiz.config
+import wiz.definition
+import wiz.index
+import wiz.snapshot
+import wiz.validation_cache
 
 
 @pytest.fixture(autouse=True)
@@ -138,3 +142,218 @@ def test_discover_4500_definitions_windows_only(registries, benchmark):
         wiz.fetch_definition_mapping, registries,
         system_mapping={"platform": "windows"}
     )
+
+
+@pytest.fixture(scope="module")
+def indexed_registry(request):
+    """Return mocked registry path with many valid definitions."""
+    registry = tempfile.mkdtemp()
+
+    for index in range(1500):
+        identifier = "foo{}".format(index)
+
+        data = {
+            "identifier": identifier,
+            "version": "0.1.0",
+            "environ": {
+                "KEY{}".format(_index): "VALUE{}".format(_index)
+                for _index in range(100)
+            },
+            "requirements": ["bar{}".format(_index) for _index in range(20)],
+            "variants": [
+                {
+                    "identifier": "Variant{}".format(_index),
+                    "requirements": ["baz >= {}".format(_index)],
+                }
+                for _index in range(10)
+            ]
+        }
+
+        path = os.path.join(registry, identifier)
+        file_path = os.path.join(path, "{}.json".format(identifier))
+        os.makedirs(path)
+
+        with open(file_path, "w") as stream:
+            stream.write(ujson.dumps(data))
+
+    def cleanup():
+        """Remove temporary directory."""
+        shutil.rmtree(registry)
+
+    request.addfinalizer(cleanup)
+    return registry
+
+
+@pytest.fixture()
+def index_directory(mocker, temporary_directory):
+    """Ensure that registry indexes are saved in a temporary directory."""
+    mocker.patch.object(
+        wiz.index, "get_directory", return_value=temporary_directory
+    )
+    return temporary_directory
+
+
+def test_discover_1500_definitions_without_index(indexed_registry, benchmark):
+    """Test performance when fetching 1500 definitions without index."""
+    benchmark(wiz.fetch_definition_mapping, [indexed_registry])
+
+
+def test_discover_1500_definitions_with_cold_index(
+    indexed_registry, index_directory, benchmark
+):
+    """Test performance when fetching 1500 definitions with an empty index."""
+    def _setup():
+        """Remove index files before each round."""
+        for name in os.listdir(index_directory):
+            os.remove(os.path.join(index_directory, name))
+
+    benchmark.pedantic(
+        wiz.fetch_definition_mapping, args=([indexed_registry],),
+        kwargs={"use_index": True}, setup=_setup, rounds=5
+    )
+
+
+def test_discover_1500_definitions_with_warm_index(
+    indexed_registry, index_directory, benchmark
+):
+    """Test performance when fetching 1500 definitions with a full index."""
+    wiz.fetch_definition_mapping([indexed_registry], use_index=True)
+
+    benchmark(
+        wiz.fetch_definition_mapping, [indexed_registry], use_index=True
+    )
+
+
+@pytest.mark.parametrize("workers", [2, 4, 8], ids=[
+    "2-workers",
+    "4-workers",
+    "8-workers",
+])
+def test_discover_1500_definitions_with_workers(
+    indexed_registry, benchmark, workers
+):
+    """Test performance when fetching 1500 definitions concurrently."""
+    benchmark(
+        wiz.fetch_definition_mapping, [indexed_registry], workers=workers
+    )
+
+
+def test_discover_1500_definitions_with_validation_cache(
+    mocker, indexed_registry, temporary_directory, benchmark
+):
+    """Test performance when fetching 1500 definitions already validated."""
+    cache = wiz.validation_cache.ValidationCache(
+        path=os.path.join(temporary_directory, "validation.json")
+    )
+    mocker.patch.object(wiz.validation_cache, "fetch", return_value=cache)
+
+    wiz.fetch_definition_mapping([indexed_registry])
+
+    benchmark(wiz.fetch_definition_mapping, [indexed_registry])
+
+
+def test_discover_1500_definitions_lazy(indexed_registry, benchmark):
+    """Test performance when fetching 1500 definitions lazily."""
+    benchmark(wiz.fetch_definition_mapping, [indexed_registry], lazy=True)
+
+
+@pytest.fixture()
+def snapshot_path(indexed_registry, temporary_directory):
+    """Return path to snapshot packed from registry."""
+    path = os.path.join(temporary_directory, "registry.snapshot")
+    wiz.snapshot.pack(path, [indexed_registry])
+    return path
+
+
+def test_discover_1500_definitions_from_snapshot(
+    indexed_registry, snapshot_path, benchmark
+):
+    """Test performance when fetching 1500 definitions from a snapshot."""
+    benchmark(
+        wiz.fetch_definition_mapping, [indexed_registry],
+        snapshot_path=snapshot_path
+    )
+
+
+def test_query_definitions_from_snapshot(snapshot_path, benchmark):
+    """Test performance when querying definitions from a snapshot."""
+    with wiz.snapshot.Snapshot(snapshot_path) as snapshot:
+        benchmark(snapshot.query, "foo1000")
+
+
+@pytest.fixture(scope="module")
+def deep_registry(request):
+    """Return mocked registry path with a deep tree of sub-folders."""
+    registry = tempfile.mkdtemp()
+
+    def _create_tree(path, depth):
+        """Create tree of sub-folders under *path* down to *depth*."""
+        with open(os.path.join(path, "definition.json"), "w") as stream:
+            stream.write(ujson.dumps({"identifier": str(uuid.uuid4())}))
+
+        # Add a version control folder which should be ignored.
+        os.makedirs(os.path.join(path, ".git", "objects"))
+
+        if depth == 0:
+            return
+
+        for index in range(4):
+            sub_path = os.path.join(path, "folder{}".format(index))
+            os.makedirs(sub_path)
+            _create_tree(sub_path, depth - 1)
+
+    _create_tree(registry, 6)
+
+    def cleanup():
+        """Remove temporary directory."""
+        shutil.rmtree(registry)
+
+    request.addfinalizer(cleanup)
+    return registry
+
+
+def _walk(path, max_depth=None):
+    """Yield definition paths from *path* with :func:`os.walk`."""
+    prefix_length = len(path.rstrip(os.sep).split(os.sep))
+
+    for root, dirs, files in os.walk(path, followlinks=True):
+        depth = len(root.rstrip(os.sep).split(os.sep)) - prefix_length
+        if max_depth is not None and depth > max_depth:
+            continue
+
+        for name in files:
+            if name.endswith(".json"):
+                yield os.path.join(root, name)
+
+
+@pytest.mark.parametrize("max_depth", [None, 2], ids=[
+    "unlimited",
+    "max-depth-2",
+])
+def test_walk_deep_registry_with_os_walk(deep_registry, max_depth, benchmark):
+    """Test performance when walking deep registry with os.walk."""
+    benchmark(lambda: list(_walk(deep_registry, max_depth=max_depth)))
+
+
+@pytest.mark.parametrize("max_depth", [None, 2], ids=[
+    "unlimited",
+    "max-depth-2",
+])
+def test_walk_deep_registry(deep_registry, max_depth, benchmark):
+    """Test performance when walking deep registry."""
+    benchmark(
+        lambda: list(
+            wiz.definition.discover_paths(deep_registry, max_depth=max_depth)
+        )
+    )
+
+
+def test_walk_deep_registry_with_ignore_patterns(deep_registry, benchmark):
+    """Test performance when walking deep registry with ignored folders."""
+    benchmark(
+        lambda: list(
+            wiz.definition.discover_paths(
+                deep_registry, ignore_patterns=[".git"]
+            )
+        )
+    )
@@ -7,7 +7,7 @@ import pytest
 import wiz.config
 import wiz.graph
 import wiz.definition
-from wiz.utility import Requirement
+from wiz._requirement import Requirement
 
 
 @pytest.fixture(autouse=True)
@@ -109,3 +109,26 @@ def test_10000_nodes(benchmark):
         assert len(graph.nodes()) == 10000
 
     benchmark(_build_graph)
+
+
+def test_50000_nodes(benchmark):
+    """Build a graph with 50000 nodes."""
+    definition_mapping = {
+        "foo{}".format(index-1): {
+            "-":  wiz.definition.Definition({
+                "identifier": "foo{}".format(index-1),
+                "requirements": ["foo{}".format(index)]
+            })
+        }
+        for index in range(2, 50002)
+    }
+
+    resolver = wiz.graph.Resolver(definition_mapping)
+
+    def _build_graph():
+        """Build graph."""
+        graph = wiz.graph.Graph(resolver)
+        graph.update_from_requirements([Requirement("foo1")], graph.ROOT)
+        assert len(graph.nodes()) == 50000
+
+    benchmark(_build_graph)
@@ -0,0 +1,76 @@
+# :coding: utf-8
+
+"""
+Copying a large graph for each combination should not copy links and
+requirements which are shared with the original graph.
+
+"""
+
+import copy
+import os
+
+import pytest
+
+import wiz.config
+import wiz.definition
+import wiz.graph
+from wiz._requirement import Requirement
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.fixture(scope="module")
+def graph():
+    """Return graph with 5000 nodes and 9991 links."""
+    definition_mapping = {}
+
+    for index in range(1, 5001):
+        data = {"identifier": "foo{}".format(index), "version": "0.1.0"}
+        if index <= 4995:
+            data["requirements"] = [
+                "foo{} >=0.1.0, <1".format(index + 1),
+                "foo{} >=0.1.0, <1".format(index + 5)
+            ]
+
+        definition_mapping["foo{}".format(index)] = {
+            "0.1.0": wiz.definition.Definition(data)
+        }
+
+    resolver = wiz.graph.Resolver(definition_mapping)
+
+    graph = wiz.graph.Graph(resolver)
+    graph.update_from_requirements([Requirement("foo1")])
+    assert len(graph.nodes()) == 5000
+    return graph
+
+
+def test_copy(graph, benchmark):
+    """Copy a graph with 5000 nodes."""
+    result = benchmark(copy.deepcopy, graph)
+    assert result.data() == graph.data()
+
+
+def test_copy_and_update(graph, benchmark):
+    """Copy a graph with 5000 nodes and remove one node from the copy."""
+    def _copy_and_update():
+        """Copy graph and relink parents of node removed."""
+        _graph = copy.deepcopy(graph)
+        node = _graph.node("foo10==0.1.0")
+        _graph.remove_node(node.identifier)
+        _graph.relink_parents(node, requirement=Requirement("foo11"))
+        return _graph
+
+    result = benchmark(_copy_and_update)
+    assert sorted(result.outcoming("foo9==0.1.0")) == [
+        "foo11==0.1.0", "foo14==0.1.0"
+    ]
+    assert sorted(graph.outcoming("foo9==0.1.0")) == [
+        "foo10==0.1.0", "foo14==0.1.0"
+    ]
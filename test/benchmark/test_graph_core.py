@@ -0,0 +1,98 @@
+# :coding: utf-8
+
+"""
+Traversing large graphs should not go through links of removed nodes
+recorded as nested mappings of node identifiers.
+
+"""
+
+import copy
+import os
+
+import pytest
+
+import wiz.config
+import wiz.definition
+import wiz.graph
+from wiz._requirement import Requirement
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+def _create_graph(number):
+    """Return graph with *number* nodes, each linked to two parents.
+
+    One node out of ten is removed from the graph, while links to and from
+    removed nodes are preserved.
+
+    """
+    definition_mapping = {}
+
+    for index in range(1, number + 1):
+        data = {"identifier": "foo{}".format(index)}
+
+        requirements = [
+            "foo{}".format(_index) for _index in (index + 1, index + 2)
+            if _index <= number
+        ]
+        if len(requirements) > 0:
+            data["requirements"] = requirements
+
+        definition_mapping["foo{}".format(index)] = {
+            "-": wiz.definition.Definition(data)
+        }
+
+    resolver = wiz.graph.Resolver(definition_mapping)
+
+    graph = wiz.graph.Graph(resolver)
+    graph.update_from_requirements([Requirement("foo1")])
+    assert len(graph.nodes()) == number
+
+    for index in range(5, number + 1, 10):
+        graph.remove_node("foo{}".format(index))
+
+    return graph
+
+
+@pytest.fixture(scope="module", params=[10000, 50000], ids=["10k", "50k"])
+def graph(request):
+    """Return graph with 10000 or 50000 nodes."""
+    return _create_graph(request.param)
+
+
+@pytest.fixture()
+def links(graph):
+    """Return number of links between existing nodes of *graph*."""
+    return {9000: 15997, 45000: 79997}[len(graph.nodes())]
+
+
+def _traverse(graph):
+    """Return number of links from all existing nodes."""
+    return sum(
+        len(graph.outcoming(node.identifier)) for node in graph.nodes()
+    )
+
+
+def test_traverse(graph, links, benchmark):
+    """Fetch children of all nodes in graph."""
+    result = benchmark(_traverse, graph)
+    assert result == links
+
+
+def test_compute_distance_mapping(graph, benchmark):
+    """Compute distance mapping of graph."""
+    result = benchmark(wiz.graph._compute_distance_mapping, graph)
+    assert len(result) == len(graph.nodes()) + 1
+
+
+def test_copy(graph, benchmark):
+    """Copy graph."""
+    result = benchmark(copy.deepcopy, graph)
+    assert len(result.nodes()) == len(graph.nodes())
@@ -0,0 +1,95 @@
+# :coding: utf-8
+
+"""
+Finding nodes in a large graph should only inspect nodes created from
+definitions with the identifier requested.
+
+"""
+
+import os
+
+import pytest
+
+import wiz.config
+import wiz.definition
+import wiz.graph
+from wiz._requirement import Requirement
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.fixture(scope="module")
+def graph():
+    """Return graph with 5000 nodes."""
+    definition_mapping = {
+        "foo{}".format(index-1): {
+            "-":  wiz.definition.Definition({
+                "identifier": "foo{}".format(index-1),
+                "requirements": ["foo{}".format(index)]
+            })
+        }
+        for index in range(2, 5002)
+    }
+
+    resolver = wiz.graph.Resolver(definition_mapping)
+
+    graph = wiz.graph.Graph(resolver)
+    graph.update_from_requirements([Requirement("foo1")])
+    assert len(graph.nodes()) == 5000
+    return graph
+
+
+def test_find(graph, benchmark):
+    """Find nodes for 500 requirements in a graph with 5000 nodes."""
+    requirements = [
+        Requirement("foo{}".format(index * 10)) for index in range(500)
+    ]
+
+    def _find():
+        """Find nodes matching all requirements."""
+        return [graph.find(requirement) for requirement in requirements]
+
+    result = benchmark(_find)
+    assert sum(len(identifiers) for identifiers in result) == 499
+
+
+def test_5000_nodes_with_conditions(benchmark):
+    """Build a graph with 5000 nodes and 1000 conditioned nodes."""
+    definition_mapping = {
+        "foo{}".format(index-1): {
+            "-":  wiz.definition.Definition({
+                "identifier": "foo{}".format(index-1),
+                "requirements": [
+                    "foo{}".format(index), "bar{}".format(index - 1)
+                ] if index % 5 == 0 else ["foo{}".format(index)]
+            })
+        }
+        for index in range(2, 5002)
+    }
+
+    definition_mapping.update({
+        "bar{}".format(index): {
+            "-":  wiz.definition.Definition({
+                "identifier": "bar{}".format(index),
+                "conditions": ["foo{}".format(index // 2)]
+            })
+        }
+        for index in range(4, 5002, 5)
+    })
+
+    resolver = wiz.graph.Resolver(definition_mapping)
+
+    def _build_graph():
+        """Build graph."""
+        graph = wiz.graph.Graph(resolver)
+        graph.update_from_requirements([Requirement("foo1")])
+        assert len(graph.nodes()) == 6000
+
+    benchmark(_build_graph)
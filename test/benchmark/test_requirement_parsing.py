@@ -0,0 +1,60 @@
+# :coding: utf-8
+
+"""
+Parsing requirements should not go through the pyparsing grammar for the
+requirements commonly used in definitions.
+
+"""
+
+import pytest
+
+import wiz._requirement
+import wiz.utility
+from wiz._requirement import Requirement
+
+
+@pytest.fixture(scope="module")
+def contents():
+    """Return 1000 distinct requirement strings."""
+    return [
+        "foo::bar{0}[V{1}] >= {0}.{1}, < {2}".format(
+            index, index % 3, index + 1
+        )
+        for index in range(1000)
+    ]
+
+
+def _parse_with_grammar(contents):
+    """Parse *contents* with the pyparsing grammar."""
+    return [Requirement(content) for content in contents]
+
+
+def _parse(contents):
+    """Parse *contents* with dedicated parser without cache."""
+    wiz._requirement._CACHE.clear()
+    return [wiz.utility.get_requirement(content) for content in contents]
+
+
+def _parse_memoized(contents):
+    """Parse *contents* with dedicated parser."""
+    return [wiz.utility.get_requirement(content) for content in contents]
+
+
+def test_parse_with_grammar(contents, benchmark):
+    """Test performance when parsing requirements with pyparsing grammar."""
+    result = benchmark(_parse_with_grammar, contents)
+    assert len(result) == 1000
+
+
+def test_parse(contents, benchmark):
+    """Test performance when parsing requirements with dedicated parser."""
+    result = benchmark(_parse, contents)
+    assert result == _parse_with_grammar(contents)
+
+
+def test_parse_memoized(contents, benchmark):
+    """Test performance when parsing requirements previously parsed."""
+    _parse_memoized(contents)
+
+    result = benchmark(_parse_memoized, contents)
+    assert result == _parse_with_grammar(contents)
@@ -4,7 +4,7 @@ import os
 
 import pytest
 import wiz.config
-from wiz.utility import Requirement
+from wiz._requirement import Requirement
 
 
 @pytest.fixture(autouse=True)
@@ -3254,3 +3254,472 @@ def test_scenario_43(benchmark):
             pass
 
     benchmark(_resolve)
+
+
+def _large_conflicts_definition_mapping():
+    """Return definition mapping for a graph with 100 version conflicts.
+
+    Root
+     |
+     |--(A0): A0
+     |   |
+     |   `--(A1): A1
+     |       |
+     |       `-- ... --(A1999): A1999
+     |
+     |--(C0): C0==2.0.0
+     |
+     |-- ...
+     |
+     |--(C99): C99==2.0.0
+     |
+     `--(P): P
+         |
+         |--(C0 <2): C0==1.0.0
+         |
+         |-- ...
+         |
+         `--(C99 <2): C99==1.0.0
+
+    Expected: A1999, ..., A0, C0==1.0.0, ..., C99==1.0.0, P
+
+    """
+    definition_mapping = {
+        "A{}".format(index): {
+            "-": wiz.definition.Definition({
+                "identifier": "A{}".format(index),
+                "requirements": ["A{}".format(index + 1)]
+            })
+        }
+        for index in range(1999)
+    }
+
+    definition_mapping["A1999"] = {
+        "-": wiz.definition.Definition({"identifier": "A1999"})
+    }
+
+    for index in range(100):
+        identifier = "C{}".format(index)
+        definition_mapping[identifier] = {
+            version: wiz.definition.Definition({
+                "identifier": identifier,
+                "version": version,
+            })
+            for version in ["1.0.0", "2.0.0"]
+        }
+
+    definition_mapping["P"] = {
+        "-": wiz.definition.Definition({
+            "identifier": "P",
+            "requirements": ["C{} <2".format(index) for index in range(100)]
+        })
+    }
+
+    return definition_mapping
+
+
+def _resolve_large_conflicts(definition_mapping):
+    """Resolve context with 100 version conflicts in a large graph."""
+    resolver = wiz.graph.Resolver(definition_mapping)
+    return resolver.compute_packages(
+        [Requirement("A0")]
+        + [Requirement("C{}".format(index)) for index in range(100)]
+        + [Requirement("P")]
+    )
+
+
+def test_scenario_44(benchmark):
+    """Compute packages for a graph with 2101 nodes and 100 conflicts.
+
+    Distance mapping is updated incrementally after each conflict resolution.
+
+    """
+    definition_mapping = _large_conflicts_definition_mapping()
+
+    packages = benchmark(_resolve_large_conflicts, definition_mapping)
+    assert len(packages) == 2101
+    assert all(
+        package.version is None or str(package.version) == "1.0.0"
+        for package in packages
+    )
+
+
+def test_scenario_44_full_distance_update(benchmark):
+    """Compute packages for a graph with 2101 nodes and 100 conflicts.
+
+    Distance mapping is entirely recomputed after each conflict resolution.
+
+    """
+    config = wiz.config.fetch()
+    config.setdefault("resolver", {})["full_distance_update"] = True
+
+    definition_mapping = _large_conflicts_definition_mapping()
+
+    packages = benchmark(_resolve_large_conflicts, definition_mapping)
+    assert len(packages) == 2101
+    assert all(
+        package.version is None or str(package.version) == "1.0.0"
+        for package in packages
+    )
+
+
+def _large_variants_definition_mapping():
+    """Return definition mapping for a graph with 4 conflicting variants.
+
+    Root
+     |
+     |--(A0): A0
+     |   |
+     |   `--(A1): A1
+     |       |
+     |       `-- ... --(A1999): A1999
+     |
+     |--(C0): C0==2.0.0
+     |
+     |-- ...
+     |
+     |--(C99): C99==2.0.0
+     |
+     |--(P): P
+     |   |
+     |   |--(C0 <2): C0==1.0.0
+     |   |
+     |   |-- ...
+     |   |
+     |   `--(C99 <2): C99==1.0.0
+     |
+     `--(V): V[V4]
+         |
+         `--(M4): Missing
+
+    Variants V[V4], V[V3] and V[V2] require a missing package, so the first
+    three combinations fail once all version conflicts have been resolved.
+
+    Expected: A1999, ..., A0, C0==1.0.0, ..., C99==1.0.0, V[V1], P
+
+    """
+    definition_mapping = _large_conflicts_definition_mapping()
+
+    definition_mapping["V"] = {
+        "-": wiz.definition.Definition({
+            "identifier": "V",
+            "variants": [
+                {"identifier": "V{}".format(index), "requirements": [
+                    "M{}".format(index)
+                ]}
+                for index in range(4, 1, -1)
+            ] + [{"identifier": "V1"}]
+        })
+    }
+
+    return definition_mapping
+
+
+def _resolve_large_variants(definition_mapping, speculative_workers):
+    """Resolve context with 4 conflicting variants in a large graph."""
+    resolver = wiz.graph.Resolver(
+        definition_mapping, speculative_workers=speculative_workers
+    )
+    return resolver.compute_packages(
+        [Requirement("A0")]
+        + [Requirement("C{}".format(index)) for index in range(100)]
+        + [Requirement("P"), Requirement("V")]
+    )
+
+
+@pytest.mark.parametrize("speculative_workers", [1, 4], ids=[
+    "sequential",
+    "speculative",
+])
+def test_scenario_45(benchmark, speculative_workers):
+    """Compute packages for a graph with 2102 nodes and 4 combinations.
+
+    The first three combinations fail, so combinations resolved speculatively
+    with several workers are not resolved again.
+
+    """
+    definition_mapping = _large_variants_definition_mapping()
+
+    packages = benchmark(
+        _resolve_large_variants, definition_mapping, speculative_workers
+    )
+    assert len(packages) == 2102
+    assert "V[V1]" in [package.identifier for package in packages]
+
+
+def test_scenario_46(benchmark):
+    """Compute packages for a graph with 2101 nodes and 100 conflicts.
+
+    Packages are resolved by :class:`wiz.solver.Resolver` to compare with
+    :func:`test_scenario_44`.
+
+    """
+    definition_mapping = _large_conflicts_definition_mapping()
+    expected = _resolve_large_conflicts(definition_mapping)
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+    packages = benchmark(
+        resolver.compute_packages,
+        [Requirement("A0")]
+        + [Requirement("C{}".format(index)) for index in range(100)]
+        + [Requirement("P")]
+    )
+    assert [package.identifier for package in packages] == [
+        package.identifier for package in expected
+    ]
+
+
+def test_scenario_47(benchmark):
+    """Compute packages for a graph with 2102 nodes and 4 combinations.
+
+    Packages are resolved by :class:`wiz.solver.Resolver` to compare with
+    :func:`test_scenario_45`.
+
+    """
+    definition_mapping = _large_variants_definition_mapping()
+    expected = _resolve_large_variants(definition_mapping, 1)
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+    packages = benchmark(
+        resolver.compute_packages,
+        [Requirement("A0")]
+        + [Requirement("C{}".format(index)) for index in range(100)]
+        + [Requirement("P"), Requirement("V")]
+    )
+    assert [package.identifier for package in packages] == [
+        package.identifier for package in expected
+    ]
+
+
+def _large_nogoods_definition_mapping():
+    """Return definition mapping for a graph with 4 combinations failing.
+
+    Root
+     |
+     |--(Q): Q==2.0.0
+     |   |
+     |   `--(R >=2): R==2.0.0
+     |
+     |--(S): S
+     |   |
+     |   `--(R <2): R==1.0.0
+     |
+     |--(A0): A0
+     |   |
+     |   `--(A1): A1
+     |       |
+     |       `-- ... --(A1999): A1999
+     |
+     |--(C0): C0==2.0.0
+     |
+     |-- ...
+     |
+     |--(C99): C99==2.0.0
+     |
+     |--(P): P
+     |   |
+     |   |--(C0 <2): C0==1.0.0
+     |   |
+     |   |-- ...
+     |   |
+     |   `--(C99 <2): C99==1.0.0
+     |
+     `--(V): V[V4]
+         |
+         `--(W4): W4
+
+    'Q==2.0.0' and 'S' are incompatible in each combination, so 'Q' must be
+    downgraded to 'Q==1.0.0' which requires 'R <2'. As 'R' is the nearest
+    conflict to the root level of the graph, this incompatibility is only
+    identified once all other conflicts have been resolved.
+
+    Expected: A1999, ..., A0, C0==1.0.0, ..., C99==1.0.0, W4, V[V4], S, R,
+    Q==1.0.0, P
+
+    """
+    definition_mapping = _large_conflicts_definition_mapping()
+
+    definition_mapping["Q"] = {
+        version: wiz.definition.Definition({
+            "identifier": "Q",
+            "version": version,
+            "requirements": [requirement]
+        })
+        for version, requirement in [("1.0.0", "R <2"), ("2.0.0", "R >=2")]
+    }
+
+    definition_mapping["R"] = {
+        version: wiz.definition.Definition({
+            "identifier": "R",
+            "version": version,
+        })
+        for version in ["1.0.0", "2.0.0"]
+    }
+
+    definition_mapping["S"] = {
+        "-": wiz.definition.Definition({
+            "identifier": "S",
+            "requirements": ["R <2"]
+        })
+    }
+
+    definition_mapping["V"] = {
+        "-": wiz.definition.Definition({
+            "identifier": "V",
+            "variants": [
+                {"identifier": "V{}".format(index), "requirements": [
+                    "W{}".format(index)
+                ]}
+                for index in range(4, 0, -1)
+            ]
+        })
+    }
+
+    for index in range(1, 5):
+        definition_mapping["W{}".format(index)] = {
+            "-": wiz.definition.Definition({
+                "identifier": "W{}".format(index)
+            })
+        }
+
+    return definition_mapping
+
+
+def _resolve_large_nogoods(definition_mapping):
+    """Resolve context with 4 failing combinations in a large graph."""
+    resolver = wiz.graph.Resolver(definition_mapping)
+    return resolver.compute_packages(
+        [Requirement("Q"), Requirement("S"), Requirement("A0")]
+        + [Requirement("C{}".format(index)) for index in range(100)]
+        + [Requirement("P"), Requirement("V")]
+    )
+
+
+def test_scenario_48(benchmark):
+    """Compute packages for a graph with 2106 nodes and 4 failing combinations.
+
+    Nogood learned from the first combination prevents the next combinations
+    from being resolved before 'Q' is downgraded.
+
+    """
+    definition_mapping = _large_nogoods_definition_mapping()
+
+    packages = benchmark(_resolve_large_nogoods, definition_mapping)
+    assert len(packages) == 2106
+    identifiers = [package.identifier for package in packages]
+    assert "Q==1.0.0" in identifiers
+    assert "V[V4]" in identifiers
+
+
+def _long_chains_definition_mapping():
+    """Return definition mapping for a graph with 3 long version chains.
+
+    Root
+     |
+     |--(A0): A0
+     |   |
+     |   `--(A1): A1
+     |       |
+     |       `-- ... --(A1999): A1999
+     |
+     |--(C0): C0==2.0.0
+     |
+     |-- ...
+     |
+     |--(C99): C99==2.0.0
+     |
+     |--(P): P
+     |   |
+     |   |--(C0 <2): C0==1.0.0
+     |   |
+     |   |-- ...
+     |   |
+     |   `--(C99 <2): C99==1.0.0
+     |
+     |--(L0): L0==20.0.0
+     |   |
+     |   `--(M0 >=20): M0==20.0.0
+     |
+     |-- ...
+     |
+     |--(L2): L2==20.0.0
+     |   |
+     |   `--(M2 >=20): M2==20.0.0
+     |
+     `--(N): N
+         |
+         |--(M0 <2): M0==1.0.0
+         |
+         |-- ...
+         |
+         `--(M2 <2): M2==1.0.0
+
+    Each version 'Li==j.0.0' requires 'Mi >=j', except 'Li==1.0.0' which
+    requires 'Mi <2', so each 'Li' must be downgraded 19 versions back.
+
+    Expected: A1999, ..., A0, C0==1.0.0, ..., C99==1.0.0, M0==1.0.0, ...,
+    M2==1.0.0, L0==1.0.0, ..., L2==1.0.0, N, P
+
+    """
+    definition_mapping = _large_conflicts_definition_mapping()
+
+    for index in range(3):
+        definition_mapping["L{}".format(index)] = {
+            "{}.0.0".format(version): wiz.definition.Definition({
+                "identifier": "L{}".format(index),
+                "version": "{}.0.0".format(version),
+                "requirements": [
+                    "M{} >={}".format(index, version) if version > 1
+                    else "M{} <2".format(index)
+                ]
+            })
+            for version in range(1, 21)
+        }
+
+        definition_mapping["M{}".format(index)] = {
+            "{}.0.0".format(version): wiz.definition.Definition({
+                "identifier": "M{}".format(index),
+                "version": "{}.0.0".format(version),
+            })
+            for version in range(1, 21)
+        }
+
+    definition_mapping["N"] = {
+        "-": wiz.definition.Definition({
+            "identifier": "N",
+            "requirements": ["M{} <2".format(index) for index in range(3)]
+        })
+    }
+
+    return definition_mapping
+
+
+def _resolve_long_chains(definition_mapping):
+    """Resolve context with 3 long version chains in a large graph."""
+    resolver = wiz.graph.Resolver(definition_mapping)
+    return resolver.compute_packages(
+        [Requirement("A0")]
+        + [Requirement("C{}".format(index)) for index in range(100)]
+        + [Requirement("P")]
+        + [Requirement("L{}".format(index)) for index in range(3)]
+        + [Requirement("N")]
+    )
+
+
+def test_scenario_49(benchmark):
+    """Compute packages for a graph with 2108 nodes and 3 long version chains.
+
+    Compatible versions of 'L0', 'L1' and 'L2' are directly extracted when
+    downgrading conflicting versions, so only 3 downgrades are necessary
+    instead of 57, which would exceed the maximum number of attempts.
+
+    """
+    definition_mapping = _long_chains_definition_mapping()
+
+    packages = benchmark(_resolve_long_chains, definition_mapping)
+    assert len(packages) == 2108
+
+    identifiers = [package.identifier for package in packages]
+    assert "L0==1.0.0" in identifiers
+    assert "L1==1.0.0" in identifiers
+    assert "L2==1.0.0" in identifiers
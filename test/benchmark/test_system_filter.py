@@ -0,0 +1,64 @@
+# :coding: utf-8
+
+"""
+Filtering definitions from a large registry should only evaluate the few
+distinct system requirements once.
+
+"""
+
+import pytest
+
+import wiz.definition
+import wiz.system
+from wiz.utility import Version
+
+
+@pytest.fixture(scope="module")
+def system_mapping():
+    """Return system mapping for CentOS 7.5."""
+    return {
+        "platform": "linux",
+        "arch": "x86_64",
+        "os": {
+            "name": "centos",
+            "version": Version("7.5")
+        }
+    }
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    """Return 50000 definitions with a few distinct system requirements."""
+    systems = [
+        {"platform": "linux", "arch": "x86_64"},
+        {"platform": "linux", "os": "el >= 7, < 8"},
+        {"platform": "linux", "os": "el >= 8, < 9"},
+        {"platform": "windows", "os": "windows >= 10"},
+        {"platform": "mac", "os": "mac >= 10.13"},
+    ]
+
+    return [
+        wiz.definition.Definition({
+            "identifier": "foo{}".format(index),
+            "version": "0.1.0",
+            "system": systems[index % len(systems)]
+        })
+        for index in range(50000)
+    ]
+
+
+def _filter(definitions, system_mapping):
+    """Return *definitions* compatible with *system_mapping*."""
+    system_filter = wiz.system.Filter(system_mapping)
+    return [
+        definition for definition in definitions
+        if system_filter.validate(definition)
+    ], system_filter
+
+
+def test_validate(definitions, system_mapping, benchmark):
+    """Test performance when filtering definitions with memoized results."""
+    result, system_filter = benchmark(_filter, definitions, system_mapping)
+    assert len(result) == 20000
+    assert system_filter.misses == 5
+    assert system_filter.hits == 49995
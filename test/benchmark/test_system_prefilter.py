@@ -0,0 +1,74 @@
+# :coding: utf-8
+
+"""
+Discovering definitions from a registry shared between several systems should
+not require to open files which name indicates an incompatible system.
+
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+import wiz.config
+import wiz.definition
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.fixture(scope="module")
+def registry(request):
+    """Return mocked registry path with 3000 system-scoped definitions."""
+    path = tempfile.mkdtemp()
+
+    for index in range(1000):
+        for platform in ["linux", "windows", "mac"]:
+            wiz.definition.export(path, {
+                "identifier": "foo{}".format(index),
+                "version": "0.1.0",
+                "system": {"platform": platform},
+                "command": {"app{}".format(index): "App{}".format(index)},
+                "environ": {"KEY{}".format(index): "VALUE{}".format(index)},
+            })
+
+    def cleanup():
+        """Remove temporary directory."""
+        shutil.rmtree(path)
+
+    request.addfinalizer(cleanup)
+    return path
+
+
+def _discover(registry):
+    """Return definitions discovered from *registry* for Linux."""
+    return list(
+        wiz.definition.discover(
+            [registry], system_mapping={"platform": "linux"}
+        )
+    )
+
+
+def test_discover(registry, benchmark):
+    """Test performance when loading all definition files."""
+    result = benchmark(_discover, registry)
+    assert len(result) == 1000
+
+
+def test_discover_with_system_prefilter(mocker, registry, benchmark):
+    """Test performance when skipping files for incompatible systems."""
+    mocker.patch.object(
+        wiz.config, "fetch",
+        return_value={"registry": {"system_prefilter": True}}
+    )
+
+    result = benchmark(_discover, registry)
+    assert len(result) == 1000
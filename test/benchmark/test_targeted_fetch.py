@@ -0,0 +1,102 @@
+# :coding: utf-8
+
+"""
+Resolving a context from a targeted definition mapping should only depend on
+the number of definitions required, whatever the size of the registry.
+
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+import wiz
+import wiz.config
+import wiz.definition
+import wiz.index
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+@pytest.fixture(scope="module")
+def registry(request):
+    """Return mocked registry path with 5000 definitions."""
+    path = tempfile.mkdtemp()
+
+    for index in range(5000):
+        data = {
+            "identifier": "foo{}".format(index // 5),
+            "version": "0.{}.0".format(index % 5),
+            "command": {"app{}".format(index): "App{}".format(index)},
+            "environ": {"KEY{}".format(index): "VALUE{}".format(index)},
+        }
+
+        # Create chains of 10 dependent definitions.
+        if (index // 5) % 10:
+            data["requirements"] = ["foo{}".format(index // 5 - 1)]
+
+        sub_path = os.path.join(path, "level{}".format(index % 10))
+        wiz.definition.export(sub_path, data)
+
+    def cleanup():
+        """Remove temporary directory."""
+        shutil.rmtree(path)
+
+    request.addfinalizer(cleanup)
+    return path
+
+
+@pytest.fixture()
+def index_directory(mocker):
+    """Return temporary directory containing registry indexes."""
+    path = tempfile.mkdtemp()
+    mocker.patch.object(wiz.index, "get_directory", return_value=path)
+
+    yield path
+
+    shutil.rmtree(path)
+
+
+def _resolve(registry, targeted, use_index=False, ignore_implicit=True):
+    """Resolve context from definitions fetched from *registry*."""
+    definition_mapping = wiz.fetch_definition_mapping(
+        [registry], system_mapping={}, use_index=use_index, targeted=targeted
+    )
+    return wiz.resolve_context(
+        ["foo999"], definition_mapping, ignore_implicit=ignore_implicit
+    )
+
+
+def test_resolve_context(registry, benchmark):
+    """Test performance when fetching all definitions."""
+    benchmark(_resolve, registry, False)
+
+
+def test_resolve_context_targeted(registry, benchmark):
+    """Test performance when only fetching definitions requested."""
+    benchmark(_resolve, registry, True)
+
+
+def test_resolve_context_targeted_implicit(registry, benchmark):
+    """Test performance when searching implicit packages in all files."""
+    benchmark(_resolve, registry, True, ignore_implicit=False)
+
+
+def test_resolve_context_targeted_implicit_with_index(
+    registry, index_directory, benchmark
+):
+    """Test performance when searching implicit packages in indexes."""
+    _resolve(registry, True, use_index=True, ignore_implicit=False)
+
+    benchmark(
+        _resolve, registry, True, use_index=True, ignore_implicit=False
+    )
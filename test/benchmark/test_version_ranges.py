@@ -0,0 +1,60 @@
+# :coding: utf-8
+
+"""
+Comparing requirements should not extract version ranges from the same
+specifiers more than once.
+
+"""
+
+import itertools
+
+import pytest
+
+import wiz.utility
+
+
+@pytest.fixture(scope="module")
+def requirements():
+    """Return 200 requirements sharing 20 specifier sets."""
+    return [
+        wiz.utility.get_requirement(
+            "foo >= {0}, != {0}.5.*, < {1}".format(index % 20, index % 20 + 2)
+        )
+        for index in range(200)
+    ]
+
+
+def _compare_uncached(requirements):
+    """Compare all *requirements* pairs while extracting version ranges."""
+    results = []
+
+    for requirement1, requirement2 in itertools.combinations(requirements, 2):
+        r1 = wiz.utility.extract_version_ranges(requirement1)
+        r2 = wiz.utility.extract_version_ranges(requirement2)
+        results.append(
+            (r2[-1][1] is None or r1[0][0] is None or r2[-1][1] >= r1[0][0])
+            and (r1[-1][1] is None or r2[0][0] is None or r1[-1][1] >= r2[0][0])
+        )
+
+    return results
+
+
+def _compare(requirements):
+    """Compare all *requirements* pairs."""
+    return [
+        wiz.utility.is_overlapping(requirement1, requirement2)
+        for requirement1, requirement2
+        in itertools.combinations(requirements, 2)
+    ]
+
+
+def test_compare_uncached(requirements, benchmark):
+    """Test performance when extracting version ranges for each comparison."""
+    result = benchmark(_compare_uncached, requirements)
+    assert len(result) == 19900
+
+
+def test_compare(requirements, benchmark):
+    """Test performance when comparing requirements with cached ranges."""
+    result = benchmark(_compare, requirements)
+    assert result == _compare_uncached(requirements)
@@ -7,7 +7,7 @@ import pytest
 import wiz.config
 import wiz.definition
 import wiz.graph
-from wiz.utility import Requirement
+from wiz._requirement import Requirement
 
 
 @pytest.fixture(autouse=True)
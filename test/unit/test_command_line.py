@@ -11,12 +11,14 @@ from six.moves import reload_module
 
 import wiz.command_line
 import wiz.config
+import wiz.daemon
 import wiz.definition
 import wiz.exception
 import wiz.filesystem
 import wiz.history
 import wiz.package
 import wiz.registry
+import wiz.snapshot
 import wiz.spawn
 import wiz.symbol
 import wiz.utility
@@ -167,6 +169,24 @@ def mocked_registry_install_to_path(mocker):
     return mocker.patch.object(wiz.registry, "install_to_path")
 
 
+@pytest.fixture()
+def mocked_snapshot_pack(mocker):
+    """Return mocked 'wiz.snapshot.pack' function."""
+    return mocker.patch.object(wiz.snapshot, "pack")
+
+
+@pytest.fixture()
+def mocked_daemon_resolve_context(mocker):
+    """Return mocked 'wiz.daemon.resolve_context' function."""
+    return mocker.patch.object(wiz.daemon, "resolve_context")
+
+
+@pytest.fixture()
+def mocked_daemon_serve(mocker):
+    """Return mocked 'wiz.daemon.serve' function."""
+    return mocker.patch.object(wiz.daemon, "serve")
+
+
 @pytest.fixture()
 def definitions():
     """Return mocked definitions."""
@@ -545,10 +565,55 @@ def test_fetch_registry(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=depth
+        max_depth=depth,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
+    )
+
+
+@pytest.mark.parametrize("options, workers", [
+    (["--jobs", "4"], 4),
+    (["-j", "2"], 2),
+], ids=[
+    "jobs",
+    "jobs-short",
+])
+def test_fetch_registry_with_jobs(
+    mocked_system_query, mocked_registry_fetch, mocked_definition_discover,
+    options, workers
+):
+    """Discover definitions with several workers."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+
+    runner = CliRunner()
+    result = runner.invoke(wiz.command_line.main, options + ["list", "package"])
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_definition_discover.assert_called_once_with(
+        ["/registry1", "/registry2"],
+        system_mapping="__SYSTEM__",
+        max_depth=None,
+        use_index=False,
+        workers=workers,
+        lazy=False,
+        snapshot_path=None
     )
 
 
+def test_fetch_registry_with_incorrect_jobs(mocked_definition_discover):
+    """Fail to discover definitions with incorrect number of workers."""
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main, ["-j", "0", "list", "package"]
+    )
+    assert result.exit_code == 2
+    mocked_definition_discover.assert_not_called()
+
+
 @pytest.mark.parametrize("options, recorded", [
     ([], False),
     (["--record", tempfile.gettempdir()], True)
@@ -614,7 +679,11 @@ def test_list_packages_empty(
     )
 
     mocked_definition_discover.assert_called_once_with(
-        [], system_mapping="__SYSTEM__", max_depth=None
+        [], system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -653,7 +722,11 @@ def test_list_packages(
 
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping=None, max_depth=None
+        system_mapping=None, max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -694,7 +767,11 @@ def test_list_packages_with_versions(
 
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping=None, max_depth=None
+        system_mapping=None, max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -781,7 +858,11 @@ def test_list_commands_empty(
     )
 
     mocked_definition_discover.assert_called_once_with(
-        [], system_mapping="__SYSTEM__", max_depth=None
+        [], system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -819,7 +900,11 @@ def test_list_commands(
 
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping=None, max_depth=None
+        system_mapping=None, max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -858,7 +943,11 @@ def test_list_commands_with_versions(
 
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping=None, max_depth=None
+        system_mapping=None, max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -942,7 +1031,11 @@ def test_search_empty(
     logger.warning.assert_called_once_with("No results found.\n")
 
     mocked_definition_discover.assert_called_once_with(
-        [], system_mapping="__SYSTEM__", max_depth=None
+        [], system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -991,7 +1084,11 @@ def test_search(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -1044,7 +1141,11 @@ def test_search_filtered_command(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping=None,
-        max_depth=None
+        max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -1089,7 +1190,11 @@ def test_search_with_versions(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping=None,
-        max_depth=None
+        max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -1125,7 +1230,11 @@ def test_search_packages(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -1163,7 +1272,11 @@ def test_search_packages_with_versions(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -1199,7 +1312,11 @@ def test_search_commands(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -1237,7 +1354,11 @@ def test_search_commands_with_versions(
     mocked_definition_discover.assert_called_once_with(
         ["/registry1", "/registry2"],
         system_mapping="__SYSTEM__",
-        max_depth=None
+        max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None
     )
 
 
@@ -1259,6 +1380,99 @@ def test_search_error(options):
     assert result.exception
 
 
+@pytest.mark.parametrize("options, depth", [
+    ([], None),
+    (["-rd", "2"], 2),
+], ids=[
+    "default",
+    "with-depth",
+])
+@pytest.mark.usefixtures("mocked_system_query")
+def test_registry_pack(
+    mocked_registry_fetch, mocked_snapshot_pack, logger, options, depth
+):
+    """Pack registries into snapshot."""
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_snapshot_pack.return_value = 42
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        options + ["registry", "pack", "-o", "/path/to/snapshot"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+    assert result.output == (
+        "\n"
+        "Registries    \n"
+        "--------------\n"
+        "[0] /registry1\n"
+        "[1] /registry2\n"
+        "\n"
+    )
+
+    mocked_snapshot_pack.assert_called_once_with(
+        "/path/to/snapshot", ["/registry1", "/registry2"], max_depth=depth
+    )
+
+    logger.info.assert_called_once_with(
+        "42 definition(s) packed into '/path/to/snapshot'"
+    )
+    logger.error.assert_not_called()
+
+
+@pytest.mark.usefixtures("mocked_system_query")
+def test_registry_pack_error(
+    mocked_registry_fetch, mocked_snapshot_pack, mocked_history_record_action,
+    logger
+):
+    """Fail to pack registries into snapshot."""
+    mocked_registry_fetch.return_value = ["/registry1"]
+
+    exception = IOError("Permission denied")
+    mocked_snapshot_pack.side_effect = exception
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        ["registry", "pack", "-o", "/path/to/snapshot"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    logger.info.assert_not_called()
+    logger.error.assert_called_once_with(
+        "Impossible to create snapshot [Permission denied]"
+    )
+
+    mocked_history_record_action.assert_called_once_with(
+        wiz.symbol.EXCEPTION_RAISE_ACTION, error=exception
+    )
+
+
+@pytest.mark.parametrize("options", [
+    [],
+    ["-o", "/path/to/snapshot", "--", "--incorrect"],
+    ["-o", "/path/to/snapshot", "--incorrect"],
+], ids=[
+    "missing-output",
+    "extra-arguments",
+    "unknown-arguments",
+])
+@pytest.mark.usefixtures("mocked_system_query")
+@pytest.mark.usefixtures("mocked_registry_fetch")
+def test_registry_pack_incorrect(mocked_snapshot_pack, options):
+    """Fail to pack registries with incorrect arguments."""
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main, ["registry", "pack"] + options
+    )
+    assert result.exit_code == 2
+    assert result.exception
+
+    mocked_snapshot_pack.assert_not_called()
+
+
 @pytest.mark.parametrize("options, recorded", [
     ([], False),
     (["--record", tempfile.gettempdir()], True)
@@ -1320,7 +1534,12 @@ def test_view_not_found(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
 
@@ -1361,7 +1580,12 @@ def test_view_definition(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
 
@@ -1411,7 +1635,12 @@ def test_view_definition_json(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
 
@@ -1437,7 +1666,12 @@ def test_view_definition_from_command(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
 
@@ -1534,13 +1768,19 @@ def test_use_spawn_shell(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -1617,13 +1857,19 @@ def test_use_spawn_shell_view(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -1695,13 +1941,19 @@ def test_use_spawn_shell_view_empty(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -1753,13 +2005,19 @@ def test_use_execute_command(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -1819,13 +2077,19 @@ def test_use_with_resolution_error(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo", "bim==0.1.*"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -1903,6 +2167,7 @@ def test_use_initial_environment(
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False,
         environ_mapping={"PATH": "/path", "PYTHONPATH": "/other-path"},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -1912,6 +2177,122 @@ def test_use_initial_environment(
     )
 
 
+@pytest.mark.usefixtures("mocked_resolve_command")
+@pytest.mark.usefixtures("mocked_spawn_execute")
+def test_use_with_daemon(
+    mocked_system_query, mocked_registry_fetch,
+    mocked_fetch_definition_mapping,
+    mocked_resolve_context, mocked_daemon_resolve_context, mocked_spawn_shell,
+    wiz_context, logger
+):
+    """Use a context resolved by the daemon."""
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_daemon_resolve_context.return_value = wiz_context
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main, ["use", "foo", "-mc", "5", "-ma", "3"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_daemon_resolve_context.assert_called_once_with(
+        ["foo"], ["/registry1", "/registry2"],
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        ignore_implicit=False,
+        environ_mapping={},
+        engine="graph",
+        from_command=False,
+        maximum_combinations=5,
+        maximum_attempts=3,
+    )
+
+    mocked_fetch_definition_mapping.assert_not_called()
+    mocked_resolve_context.assert_not_called()
+
+    mocked_spawn_shell.assert_called_once_with({
+        "KEY1": "value1",
+        "KEY2": "value2"
+    }, {
+        "fooExe": "foo",
+        "fooExeDebug": "foo --debug",
+    })
+
+    logger.error.assert_not_called()
+
+
+@pytest.mark.usefixtures("mocked_spawn_shell")
+def test_use_with_daemon_unreachable(
+    mocked_system_query, mocked_registry_fetch,
+    mocked_fetch_definition_mapping, mocked_resolve_context,
+    mocked_daemon_resolve_context, wiz_context, logger
+):
+    """Use a context resolved in process when daemon is unreachable."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_fetch_definition_mapping.return_value = "__MAPPING__"
+    mocked_resolve_context.return_value = wiz_context
+    mocked_daemon_resolve_context.side_effect = wiz.exception.DaemonError(
+        "No daemon listening to '/path/to/daemon.sock'."
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main, ["use", "foo", "-mc", "5", "-ma", "3"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_daemon_resolve_context.assert_called_once()
+
+    mocked_fetch_definition_mapping.assert_called_once_with(
+        ["/registry1", "/registry2"],
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
+    )
+
+    mocked_resolve_context.assert_called_once_with(
+        ["foo"], "__MAPPING__",
+        ignore_implicit=False,
+        environ_mapping={},
+        engine="graph",
+        maximum_combinations=5,
+        maximum_attempts=3,
+    )
+
+    logger.error.assert_not_called()
+
+
+@pytest.mark.usefixtures("mocked_system_query")
+@pytest.mark.usefixtures("mocked_registry_fetch")
+@pytest.mark.usefixtures("mocked_fetch_definition_mapping")
+@pytest.mark.usefixtures("mocked_resolve_context")
+@pytest.mark.usefixtures("mocked_history_start_recording")
+@pytest.mark.usefixtures("mocked_history_get")
+@pytest.mark.usefixtures("mocked_filesystem_export")
+@pytest.mark.usefixtures("mock_datetime_now")
+def test_use_recorded_without_daemon(mocked_daemon_resolve_context):
+    """Do not use daemon when resolution is recorded."""
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main,
+        ["--record", tempfile.gettempdir(), "use", "foo"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_daemon_resolve_context.assert_not_called()
+
+
 @pytest.mark.parametrize("options, recorded", [
     ([], False),
     (["--record", tempfile.gettempdir()], True)
@@ -1993,7 +2374,12 @@ def test_run(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_fetch_package_request_from_command.assert_called_once_with(
@@ -2004,6 +2390,7 @@ def test_run(
         ["__PACKAGE__"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -2088,7 +2475,12 @@ def test_run_view(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_fetch_package_request_from_command.assert_called_once_with(
@@ -2099,6 +2491,7 @@ def test_run_view(
         ["__PACKAGE__"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -2171,7 +2564,12 @@ def test_run_view_empty(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_fetch_package_request_from_command.assert_called_once_with(
@@ -2182,6 +2580,7 @@ def test_run_view_empty(
         ["__PACKAGE__"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -2225,13 +2624,19 @@ def test_run_with_resolution_error(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["__PACKAGE__"], "__MAPPING__",
         ignore_implicit=False,
         environ_mapping={},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -2292,6 +2697,7 @@ def test_run_initial_environment(
     mocked_resolve_context.assert_called_once_with(
         ["__PACKAGE__"], "__MAPPING__", ignore_implicit=False,
         environ_mapping={"PATH": "/path", "PYTHONPATH": "/other-path"},
+        engine="graph",
         maximum_combinations=max_combinations,
         maximum_attempts=max_attempts,
     )
@@ -2301,6 +2707,58 @@ def test_run_initial_environment(
     )
 
 
+def test_run_with_daemon(
+    mocked_system_query, mocked_registry_fetch, mocked_fetch_definition_mapping,
+    mocked_fetch_package_request_from_command, mocked_resolve_context,
+    mocked_daemon_resolve_context, mocked_resolve_command,
+    mocked_spawn_execute, wiz_context, logger, mocked_click_exit
+):
+    """Execute a command within a context resolved by the daemon."""
+    mocked_system_query.return_value = "__SYSTEM__"
+    mocked_registry_fetch.return_value = ["/registry1", "/registry2"]
+    mocked_daemon_resolve_context.return_value = wiz_context
+    mocked_resolve_command.return_value = "__RESOLVED_COMMAND__"
+    mocked_spawn_execute.return_value = "__RETURN_CODE__"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        wiz.command_line.main, ["run", "fooExe", "-mc", "5", "-ma", "3"]
+    )
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_click_exit.assert_any_call("__RETURN_CODE__")
+
+    mocked_daemon_resolve_context.assert_called_once_with(
+        ["fooExe"], ["/registry1", "/registry2"],
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        ignore_implicit=False,
+        environ_mapping={},
+        engine="graph",
+        from_command=True,
+        maximum_combinations=5,
+        maximum_attempts=3,
+    )
+
+    mocked_fetch_definition_mapping.assert_not_called()
+    mocked_fetch_package_request_from_command.assert_not_called()
+    mocked_resolve_context.assert_not_called()
+
+    mocked_resolve_command.assert_called_once_with(
+        ["fooExe"],
+        {
+            "fooExe": "foo",
+            "fooExeDebug": "foo --debug",
+        }
+    )
+
+    logger.error.assert_not_called()
+
+
 @pytest.mark.parametrize("options, recorded", [
     ([], False),
     (["--record", tempfile.gettempdir()], True)
@@ -2381,11 +2839,17 @@ def test_freeze(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        engine="graph",
     )
 
     mocked_export_definition.assert_called_once_with(
@@ -2440,11 +2904,17 @@ def test_freeze_empty(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        engine="graph",
     )
 
     mocked_export_definition.assert_called_once_with(
@@ -2501,11 +2971,17 @@ def test_freeze_as_script(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        engine="graph",
     )
 
     mocked_export_script.assert_called_once_with(
@@ -2558,11 +3034,17 @@ def test_freeze_as_script_without_commands(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        engine="graph",
     )
 
     mocked_export_script.assert_called_once_with(
@@ -2601,11 +3083,17 @@ def test_freeze_with_resolution_error(
 
     mocked_fetch_definition_mapping.assert_called_once_with(
         ["/registry1", "/registry2"],
-        system_mapping="__SYSTEM__", max_depth=None
+        system_mapping="__SYSTEM__", max_depth=None,
+        use_index=False,
+        workers=1,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False, environ_mapping={},
+        engine="graph",
     )
 
     mocked_click_prompt.assert_not_called()
@@ -2668,9 +3156,69 @@ def test_freeze_initial_environment(
     mocked_resolve_context.assert_called_once_with(
         ["foo"], "__MAPPING__", ignore_implicit=False,
         environ_mapping={"PATH": "/path", "PYTHONPATH": "/other-path"},
+        engine="graph",
     )
 
 
+@pytest.mark.parametrize("options, socket_path", [
+    ([], None),
+    (["--socket", "/path/to/daemon.sock"], "/path/to/daemon.sock"),
+], ids=[
+    "simple",
+    "with-socket",
+])
+@pytest.mark.usefixtures("mocked_system_query")
+@pytest.mark.usefixtures("mocked_registry_fetch")
+def test_daemon(mocked_daemon_serve, logger, options, socket_path):
+    """Start daemon."""
+    runner = CliRunner()
+    result = runner.invoke(wiz.command_line.main, ["daemon"] + options)
+    assert result.exit_code == 0
+    assert not result.exception
+
+    mocked_daemon_serve.assert_called_once_with(socket_path=socket_path)
+    logger.error.assert_not_called()
+
+
+@pytest.mark.usefixtures("mocked_system_query")
+@pytest.mark.usefixtures("mocked_registry_fetch")
+def test_daemon_error(
+    mocked_daemon_serve, mocked_history_record_action, logger
+):
+    """Fail to start daemon."""
+    exception = wiz.exception.DaemonError(
+        "A daemon is already listening to '/path/to/daemon.sock'."
+    )
+    mocked_daemon_serve.side_effect = exception
+
+    runner = CliRunner()
+    result = runner.invoke(wiz.command_line.main, ["daemon"])
+    assert result.exit_code == 0
+    assert not result.exception
+
+    logger.error.assert_called_once_with(
+        "A daemon is already listening to '/path/to/daemon.sock'."
+    )
+
+    mocked_history_record_action.assert_called_once_with(
+        wiz.symbol.EXCEPTION_RAISE_ACTION, error=exception
+    )
+
+
+@pytest.mark.usefixtures("mocked_system_query")
+@pytest.mark.usefixtures("mocked_registry_fetch")
+def test_daemon_interrupted(mocked_daemon_serve, logger):
+    """Stop daemon."""
+    mocked_daemon_serve.side_effect = KeyboardInterrupt
+
+    runner = CliRunner()
+    result = runner.invoke(wiz.command_line.main, ["daemon"])
+    assert result.exit_code == 0
+    assert not result.exception
+
+    logger.info.assert_called_once_with("Daemon stopped.")
+
+
 @pytest.mark.parametrize("options, recorded", [
     ([], False),
     (["--record", tempfile.gettempdir()], True)
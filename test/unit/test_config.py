@@ -68,7 +68,19 @@ def test_fetch():
     config = wiz.config.fetch(refresh=True)
 
     assert config == {
-        "registry":  {"paths": []},
+        "registry": {
+            "paths": [],
+            "use_index": False,
+            "discovery_workers": 1,
+            "lazy_loading": False,
+            "targeted_fetch": False,
+            "system_prefilter": False,
+            "ignore_patterns": [],
+        },
+        "validation_cache": {
+            "enabled": False,
+            "max_entries": 50000,
+        },
         "environ": {
             "initial": {},
             "passthrough": []
@@ -76,6 +88,9 @@ def test_fetch():
         "resolver": {
             "maximum_combinations": 10,
             "maximum_attempts": 15,
+            "full_distance_update": False,
+            "speculative_workers": 1,
+            "engine": "graph",
         },
         "command": {
             "max_content_width": 90,
@@ -130,7 +145,19 @@ def test_fetch_with_personal():
     config = wiz.config.fetch(refresh=True)
 
     assert config == {
-        "registry":  {"paths": ["/registry1"]},
+        "registry": {
+            "paths": ["/registry1"],
+            "use_index": False,
+            "discovery_workers": 1,
+            "lazy_loading": False,
+            "targeted_fetch": False,
+            "system_prefilter": False,
+            "ignore_patterns": [],
+        },
+        "validation_cache": {
+            "enabled": False,
+            "max_entries": 50000,
+        },
         "environ": {
             "initial": {
                 "ENVIRON_TEST1": "VALUE"
@@ -140,6 +167,9 @@ def test_fetch_with_personal():
         "resolver": {
             "maximum_combinations": 10,
             "maximum_attempts": 15,
+            "full_distance_update": False,
+            "speculative_workers": 1,
+            "engine": "graph",
         },
         "command": {
             "max_content_width": 90,
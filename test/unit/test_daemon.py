@@ -0,0 +1,477 @@
+# :coding: utf-8
+
+import os
+import threading
+
+import pytest
+import ujson
+
+import wiz
+import wiz.config
+import wiz.daemon
+import wiz.definition
+import wiz.exception
+import wiz.filesystem
+from wiz import __version__
+from wiz._requirement import Requirement
+
+
+@pytest.fixture()
+def registry(temporary_directory):
+    """Return mocked registry path with definitions."""
+    path = os.path.join(temporary_directory, "registry")
+    os.makedirs(path)
+
+    definitions = [
+        {
+            "identifier": "foo",
+            "version": "0.1.0",
+            "command": {"app": "App"},
+            "environ": {"KEY": "VALUE"},
+        },
+        {
+            "identifier": "bar",
+            "version": "0.2.0",
+            "requirements": ["foo"],
+            "variants": [
+                {"identifier": "V1", "environ": {"VARIANT": "V1"}},
+            ]
+        },
+    ]
+
+    for data in definitions:
+        file_path = os.path.join(path, "{}.json".format(data["identifier"]))
+        with open(file_path, "w") as stream:
+            stream.write(ujson.dumps(data))
+
+    return path
+
+
+@pytest.fixture()
+def socket_path(temporary_directory):
+    """Return path to daemon socket."""
+    return os.path.join(temporary_directory, "daemon.sock")
+
+
+@pytest.fixture()
+def server(socket_path):
+    """Return daemon server running in a thread."""
+    _server = wiz.daemon.Server(socket_path)
+
+    thread = threading.Thread(target=_server.serve_forever)
+    thread.start()
+
+    yield _server
+
+    _server.shutdown()
+    _server.server_close()
+    thread.join()
+
+
+@pytest.fixture()
+def mocked_config_fetch(mocker):
+    """Return mocked config.fetch function."""
+    return mocker.patch.object(wiz.config, "fetch", return_value={})
+
+
+def test_get_socket_path(mocked_config_fetch, mocker):
+    """Return default socket path."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+    assert wiz.daemon.get_socket_path() == os.path.join(
+        "__HOME__", ".wiz", "daemon.sock"
+    )
+
+
+def test_get_socket_path_from_config(mocked_config_fetch):
+    """Return socket path from configuration."""
+    mocked_config_fetch.return_value = {
+        "daemon": {"socket_path": "/path/to/daemon.sock"}
+    }
+    assert wiz.daemon.get_socket_path() == "/path/to/daemon.sock"
+
+
+def test_is_running(socket_path):
+    """Indicate that no daemon is running."""
+    assert wiz.daemon.is_running(socket_path=socket_path) is False
+
+
+@pytest.mark.usefixtures("server")
+def test_is_running_with_server(socket_path):
+    """Indicate that daemon is running."""
+    assert wiz.daemon.is_running(socket_path=socket_path) is True
+
+
+@pytest.mark.usefixtures("server")
+def test_serve_already_running(socket_path):
+    """Fail to start daemon when another one is running."""
+    with pytest.raises(wiz.exception.DaemonError) as error:
+        wiz.daemon.serve(socket_path=socket_path)
+
+    assert "A daemon is already listening to" in str(error.value)
+
+
+@pytest.mark.usefixtures("server")
+@pytest.mark.parametrize("options", [
+    {},
+    {"ignore_implicit": True, "environ_mapping": {"INITIAL": "VALUE"}},
+], ids=[
+    "simple",
+    "with-options",
+])
+def test_resolve_context(registry, socket_path, options):
+    """Resolve context from daemon."""
+    context = wiz.daemon.resolve_context(
+        ["bar"], [registry], socket_path=socket_path, **options
+    )
+
+    expected = wiz.resolve_context(
+        ["bar"], wiz.fetch_definition_mapping([registry]), **options
+    )
+
+    assert context["command"] == expected["command"]
+    assert context["environ"] == expected["environ"]
+    assert context["registries"] == expected["registries"]
+
+    assert [
+        _package.identifier for _package in context["packages"]
+    ] == ["foo==0.1.0", "bar[V1]==0.2.0"]
+
+    for _package, _expected in zip(context["packages"], expected["packages"]):
+        assert _package.data() == _expected.data()
+        assert _package.definition.path == _expected.definition.path
+        assert (
+            _package.definition.registry_path
+            == _expected.definition.registry_path
+        )
+
+
+@pytest.mark.usefixtures("server")
+def test_resolve_context_from_command(registry, socket_path):
+    """Resolve context from command request with daemon."""
+    context = wiz.daemon.resolve_context(
+        ["app"], [registry], socket_path=socket_path, from_command=True
+    )
+
+    assert context["command"] == {"app": "App"}
+    assert [
+        _package.identifier for _package in context["packages"]
+    ] == ["foo==0.1.0"]
+
+
+@pytest.mark.usefixtures("server")
+def test_resolve_context_error(registry, socket_path):
+    """Fail to resolve context from daemon."""
+    with pytest.raises(wiz.exception.WizError) as error:
+        wiz.daemon.resolve_context(
+            ["incorrect"], [registry], socket_path=socket_path
+        )
+
+    assert isinstance(error.value, wiz.exception.GraphInvalidNodesError)
+    assert (
+        "The requirement 'incorrect' could not be resolved."
+        in str(error.value)
+    )
+
+    errors = error.value.error_mapping["root"]
+    assert isinstance(errors[0], wiz.exception.RequestNotFound)
+
+
+@pytest.mark.usefixtures("server")
+def test_resolve_context_conflicts_error(temporary_directory, socket_path):
+    """Fail to resolve context from daemon with conflicting requirements."""
+    registry = os.path.join(temporary_directory, "registry")
+
+    for data in [
+        {"identifier": "A", "requirements": ["C <2"]},
+        {"identifier": "B", "requirements": ["C >=2"]},
+        {"identifier": "C", "version": "1"},
+        {"identifier": "C", "version": "2"},
+    ]:
+        wiz.definition.export(registry, data)
+
+    with pytest.raises(wiz.exception.GraphConflictsError) as error:
+        wiz.daemon.resolve_context(
+            ["A", "B"], [registry], socket_path=socket_path,
+            maximum_attempts=1
+        )
+
+    with pytest.raises(wiz.exception.GraphConflictsError) as expected:
+        wiz.resolve_context(
+            ["A", "B"], wiz.fetch_definition_mapping([registry]),
+            maximum_attempts=1
+        )
+
+    assert str(error.value) == str(expected.value)
+    assert error.value == expected.value
+
+
+def test_resolve_context_without_daemon(registry, socket_path):
+    """Fail to resolve context when daemon is not running."""
+    with pytest.raises(wiz.exception.DaemonError) as error:
+        wiz.daemon.resolve_context(["foo"], [registry], socket_path=socket_path)
+
+    assert "No daemon listening to" in str(error.value)
+
+
+def test_resolve_context_with_stale_socket(registry, socket_path):
+    """Fail to resolve context when daemon did not exit properly."""
+    wiz.daemon.Server(socket_path).server_close()
+    assert os.path.exists(socket_path)
+
+    with pytest.raises(wiz.exception.DaemonError) as error:
+        wiz.daemon.resolve_context(["foo"], [registry], socket_path=socket_path)
+
+    assert "Impossible to reach daemon" in str(error.value)
+
+
+def test_resolve_context_incorrect_version(
+    mocker, server, registry, socket_path
+):
+    """Fail to resolve context when daemon runs another version."""
+    mocker.patch.object(server, "process", return_value={"version": "0.0.0"})
+
+    with pytest.raises(wiz.exception.DaemonError) as error:
+        wiz.daemon.resolve_context(["foo"], [registry], socket_path=socket_path)
+
+    assert "Daemon is running another version of Wiz: 0.0.0" in str(
+        error.value
+    )
+
+
+@pytest.mark.parametrize("request_, expected", [
+    ({"action": "ping"}, {"version": __version__}),
+    ({"action": "ping", "version": __version__}, {}),
+    (
+        {"action": "incorrect", "version": __version__},
+        {
+            "error": {
+                "type": "DaemonError",
+                "message": "Unknown action: 'incorrect'"
+            }
+        }
+    ),
+], ids=[
+    "incorrect-version",
+    "ping",
+    "incorrect-action",
+])
+def test_server_process(server, request_, expected):
+    """Process requests received by daemon."""
+    assert server.process(request_) == expected
+
+
+def test_server_cache(mocker, server, registry, socket_path):
+    """Keep definition mapping in memory until registry is modified."""
+    mocked_fetch = mocker.patch.object(
+        wiz, "fetch_definition_mapping", wraps=wiz.fetch_definition_mapping
+    )
+
+    for _ in range(3):
+        wiz.daemon.resolve_context(["foo"], [registry], socket_path=socket_path)
+
+    assert mocked_fetch.call_count == 1
+
+    # Another system mapping requires another definition mapping.
+    wiz.daemon.resolve_context(
+        ["foo"], [registry], socket_path=socket_path,
+        system_mapping={"platform": "linux"}
+    )
+    assert mocked_fetch.call_count == 2
+
+    wiz.filesystem.export(
+        os.path.join(registry, "foo.json"),
+        ujson.dumps({"identifier": "foo", "version": "0.2.0"}),
+        overwrite=True
+    )
+
+    context = wiz.daemon.resolve_context(
+        ["foo"], [registry], socket_path=socket_path
+    )
+    assert mocked_fetch.call_count == 3
+    assert context["packages"][0].identifier == "foo==0.2.0"
+
+    # Definitions added in a new folder are taken into account.
+    wiz.definition.export(
+        os.path.join(registry, "folder"),
+        {"identifier": "foo", "version": "0.3.0"}
+    )
+
+    context = wiz.daemon.resolve_context(
+        ["foo"], [registry], socket_path=socket_path
+    )
+    assert mocked_fetch.call_count == 4
+    assert context["packages"][0].identifier == "foo==0.3.0"
+
+
+def test_server_cache_options(mocker, socket_path, registry):
+    """Share definition mapping between discovery options."""
+    server = wiz.daemon.Server(socket_path)
+
+    mocked_fetch = mocker.patch.object(
+        wiz, "fetch_definition_mapping", wraps=wiz.fetch_definition_mapping
+    )
+
+    try:
+        mapping = server.fetch_definition_mapping([registry])
+        assert server.fetch_definition_mapping(
+            [registry], workers=4, lazy=True, use_index=False
+        ) is mapping
+        assert mocked_fetch.call_count == 1
+
+        # Another maximum depth requires another definition mapping.
+        assert server.fetch_definition_mapping(
+            [registry], max_depth=1
+        ) is not mapping
+        assert mocked_fetch.call_count == 2
+
+    finally:
+        server.server_close()
+
+
+def test_server_cache_size(mocker, socket_path, temporary_directory):
+    """Discard least recently used definition mappings."""
+    server = wiz.daemon.Server(socket_path, cache_size=2)
+
+    mocked_fetch = mocker.patch.object(
+        wiz, "fetch_definition_mapping", wraps=wiz.fetch_definition_mapping
+    )
+
+    registries = []
+
+    for index in range(3):
+        path = os.path.join(temporary_directory, "registry{}".format(index))
+        wiz.definition.export(path, {"identifier": "foo"})
+        registries.append(path)
+
+    try:
+        server.fetch_definition_mapping([registries[0]])
+        server.fetch_definition_mapping([registries[1]])
+        server.fetch_definition_mapping([registries[0]])
+        server.fetch_definition_mapping([registries[2]])
+        assert mocked_fetch.call_count == 3
+
+        # Least recently used mapping has been discarded.
+        server.fetch_definition_mapping([registries[0]])
+        server.fetch_definition_mapping([registries[2]])
+        assert mocked_fetch.call_count == 3
+
+        server.fetch_definition_mapping([registries[1]])
+        assert mocked_fetch.call_count == 4
+
+    finally:
+        server.server_close()
+
+
+def test_server_cache_without_listing(mocker, server, registry, socket_path):
+    """Only stat folders to check whether cached mapping is outdated."""
+    mocked_discover_folders = mocker.patch.object(
+        wiz.definition, "discover_folders",
+        wraps=wiz.definition.discover_folders
+    )
+    mocked_discover_paths = mocker.patch.object(
+        wiz.definition, "discover_paths", wraps=wiz.definition.discover_paths
+    )
+
+    for _ in range(3):
+        wiz.daemon.resolve_context(["foo"], [registry], socket_path=socket_path)
+
+    assert mocked_discover_folders.call_count == 1
+    assert mocked_discover_paths.call_count == 1
+
+
+def test_server_concurrent_requests(mocker, server, registry, socket_path):
+    """Resolve contexts concurrently."""
+    started = threading.Event()
+    released = threading.Event()
+    resolve_context = wiz.resolve_context
+
+    def _resolve_context(requests, *args, **kwargs):
+        """Block resolution of 'bar' until released."""
+        if requests == ["bar"]:
+            started.set()
+            released.wait(10)
+
+        return resolve_context(requests, *args, **kwargs)
+
+    mocker.patch.object(wiz, "resolve_context", side_effect=_resolve_context)
+
+    thread = threading.Thread(
+        target=wiz.daemon.resolve_context, args=(["bar"], [registry]),
+        kwargs={"socket_path": socket_path}
+    )
+    thread.start()
+    started.wait(10)
+
+    # Request is processed while resolution of 'bar' is still ongoing.
+    context = wiz.daemon.resolve_context(
+        ["foo"], [registry], socket_path=socket_path
+    )
+    assert context["packages"][0].identifier == "foo==0.1.0"
+    assert thread.is_alive() is True
+
+    released.set()
+    thread.join()
+
+
+@pytest.mark.usefixtures("server")
+def test_server_socket_permissions(socket_path):
+    """Restrict socket access to current user."""
+    assert os.stat(socket_path).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.parametrize("error, attributes", [
+    (wiz.exception.RequestNotFound("Request not found."), {}),
+    (
+        wiz.exception.GraphConflictsError({
+            Requirement("::C <4"): {"A==5"},
+            Requirement("::C ==4"): {"D==5", "E"},
+        }),
+        {
+            "conflicts": [
+                (Requirement("::C <4"), {"A==5"}),
+                (Requirement("::C ==4"), {"D==5", "E"}),
+            ]
+        }
+    ),
+    (
+        wiz.exception.GraphInvalidNodesError({
+            "A": ["Error"],
+            "B": [wiz.exception.RequestNotFound("Request not found.")],
+        }),
+        {
+            "error_mapping": {
+                "A": ["Error"],
+                "B": [wiz.exception.RequestNotFound("Request not found.")],
+            }
+        }
+    ),
+    (
+        wiz.exception.DefinitionsExist(["'foo' [0.1.0]"]),
+        {"definitions": ["'foo' [0.1.0]"]}
+    ),
+], ids=[
+    "request-not-found",
+    "graph-conflicts",
+    "graph-invalid-nodes",
+    "definitions-exist",
+])
+def test_error_serialization(error, attributes):
+    """Rebuild error with same type from serialized mapping."""
+    mapping = ujson.loads(ujson.dumps(wiz.daemon._serialize_error(error)))
+    _error = wiz.daemon._deserialize_error(mapping)
+
+    assert type(_error) is type(error)
+    assert str(_error) == str(error)
+    assert _error == error
+
+    for name, value in attributes.items():
+        assert getattr(_error, name) == value
+
+
+def test_error_serialization_unknown():
+    """Rebuild unknown error as generic error."""
+    _error = wiz.daemon._deserialize_error(
+        {"type": "Requirement", "message": "Error"}
+    )
+    assert type(_error) is wiz.exception.WizError
+    assert str(_error) == "Error"
@@ -7,11 +7,17 @@ from collections import OrderedDict, Counter
 
 import pytest
 
+import wiz
+import wiz.config
 import wiz.definition
 import wiz.exception
 import wiz.filesystem
+import wiz.index
 import wiz.system
-from wiz.utility import Requirement, Version
+import wiz.validation_cache
+import wiz.validator
+from wiz._requirement import Requirement
+from wiz.utility import Version
 
 
 @pytest.fixture()
@@ -202,7 +208,11 @@ def test_fetch(mocked_discover, definitions, options):
     mocked_discover.assert_called_once_with(
         ["/path/to/registry-1", "/path/to/registry-2"],
         max_depth=options.get("max_depth"),
-        system_mapping=options.get("system_mapping")
+        system_mapping=options.get("system_mapping"),
+        use_index=False,
+        workers=None,
+        lazy=False,
+        snapshot_path=None
     )
 
     assert result == {
@@ -270,6 +280,10 @@ def test_fetch_with_implicit_packages(mocked_discover, definitions, options):
         ["/path/to/registry-1", "/path/to/registry-2"],
         max_depth=options.get("max_depth"),
         system_mapping=options.get("system_mapping"),
+        use_index=False,
+        workers=None,
+        lazy=False,
+        snapshot_path=None
     )
 
     assert result == {
@@ -316,6 +330,179 @@ def test_fetch_with_implicit_packages(mocked_discover, definitions, options):
     }
 
 
+@pytest.fixture()
+def targeted_registries(temporary_directory, definitions):
+    """Return registry paths with definitions named from identifiers."""
+    definitions[1] = definitions[1].set("auto-use", True)
+    definitions[3] = definitions[3].set("auto-use", True)
+    definitions[8] = definitions[8].set("auto-use", True)
+    definitions[2] = definitions[2].set("requirements", ["bim", "foo"])
+    definitions[4] = definitions[4].set("system", {"platform": "other"})
+
+    registries = [
+        os.path.join(temporary_directory, "registry1"),
+        os.path.join(temporary_directory, "registry2"),
+    ]
+
+    for index, definition in enumerate(definitions):
+        registry_path = registries[0] if index < 6 else registries[1]
+        wiz.definition.export(registry_path, definition)
+
+    return registries
+
+
+def test_fetch_targeted(mocker, targeted_registries):
+    """Fetch definitions matching identifiers requested."""
+    system_mapping = {"platform": "linux"}
+
+    expected = wiz.definition.fetch(
+        targeted_registries, system_mapping=system_mapping
+    )
+
+    mocked_load = mocker.patch.object(
+        wiz.definition, "load", wraps=wiz.definition.load
+    )
+
+    result = wiz.definition.fetch(
+        targeted_registries, system_mapping=system_mapping, targeted=True
+    )
+
+    mocked_load.assert_not_called()
+
+    package_mapping = result["package"]
+    assert list(dict.keys(package_mapping)) == ["__namespace__"]
+
+    # Only files named from requested identifier are loaded.
+    definition = wiz.definition.query(Requirement("bim"), package_mapping)
+    assert definition.path == expected["package"]["bim"]["0.2.1"].path
+    assert mocked_load.call_count == 3
+
+    definition = wiz.definition.query(Requirement("bim"), package_mapping)
+    assert mocked_load.call_count == 3
+
+    # Namespaces are fetched when the identifier is requested.
+    assert package_mapping["__namespace__"].get("foo") == {"test", "other"}
+    assert mocked_load.call_count == 7
+
+    # Identifiers which do not exist do not require any loading.
+    assert "incorrect" not in package_mapping
+    assert mocked_load.call_count == 7
+
+    # Definitions incompatible with the system are skipped.
+    assert "baz" not in package_mapping
+    assert mocked_load.call_count == 8
+
+    # Commands and implicit packages are identical.
+    for command, identifier in expected["command"].items():
+        assert result["command"][command] == identifier
+
+    assert "baz" not in result["command"]
+    assert result["implicit-packages"] == expected["implicit-packages"]
+
+    for identifier, mapping in expected["package"].items():
+        if identifier == "__namespace__":
+            assert package_mapping[identifier] == mapping
+            continue
+
+        assert sorted(package_mapping[identifier].keys()) == sorted(
+            mapping.keys()
+        )
+
+        for version, definition in mapping.items():
+            assert package_mapping[identifier][version].path == definition.path
+
+
+def test_fetch_targeted_with_index(
+    mocker, targeted_registries, temporary_directory
+):
+    """Fetch commands and implicit packages from indexes."""
+    mocker.patch.object(
+        wiz.index, "get_directory",
+        return_value=os.path.join(temporary_directory, "index")
+    )
+
+    system_mapping = {"platform": "linux"}
+
+    expected = wiz.definition.fetch(
+        targeted_registries, system_mapping=system_mapping
+    )
+
+    mocked_load = mocker.patch.object(
+        wiz.definition, "load", wraps=wiz.definition.load
+    )
+
+    # All definitions are indexed when searched for the first time.
+    result = wiz.definition.fetch(
+        targeted_registries, system_mapping=system_mapping, use_index=True,
+        targeted=True
+    )
+    assert result["implicit-packages"] == expected["implicit-packages"]
+    assert mocked_load.call_count == 10
+
+    # Indexed definitions are not loaded again.
+    mocked_load.reset_mock()
+
+    result = wiz.definition.fetch(
+        targeted_registries, system_mapping=system_mapping, use_index=True,
+        targeted=True
+    )
+    assert result["implicit-packages"] == expected["implicit-packages"]
+    assert result["command"]["bim-test"] == "bim"
+    assert "baz" not in result["command"]
+    assert result["command"].get("incorrect") is None
+    mocked_load.assert_not_called()
+
+    # Modified definitions are indexed again.
+    definition = expected["package"]["bar"]["0.9.2"]
+    wiz.definition.export(
+        definition.registry_path, definition.set("auto-use", False),
+        overwrite=True
+    )
+
+    result = wiz.definition.fetch(
+        targeted_registries, system_mapping=system_mapping, use_index=True,
+        targeted=True
+    )
+    assert result["implicit-packages"] == [
+        "other::foo", "test::foo==1.1.0"
+    ]
+    mocked_load.assert_called_once_with(
+        definition.path, registry_path=definition.registry_path, lazy=False
+    )
+
+
+@pytest.mark.parametrize("requests, options", [
+    (["bar"], {}),
+    (["bar"], {"ignore_implicit": True}),
+    (["test::foo", "bim < 0.2"], {}),
+], ids=[
+    "simple",
+    "without-implicit",
+    "with-namespace",
+])
+def test_fetch_targeted_resolution(targeted_registries, requests, options):
+    """Resolve identical context from targeted definition mapping."""
+    system_mapping = {"platform": "linux"}
+
+    expected = wiz.resolve_context(
+        requests, wiz.fetch_definition_mapping(
+            targeted_registries, system_mapping=system_mapping
+        ), **options
+    )
+
+    context = wiz.resolve_context(
+        requests, wiz.fetch_definition_mapping(
+            targeted_registries, system_mapping=system_mapping, targeted=True
+        ), **options
+    )
+
+    assert [_package.identifier for _package in context["packages"]] == [
+        _package.identifier for _package in expected["packages"]
+    ]
+    assert context["command"] == expected["command"]
+    assert context["environ"] == expected["environ"]
+
+
 def test_query_definition():
     """Return best matching definition from requirement."""
     package_mapping = {
@@ -553,6 +740,63 @@ def test_query_definition_with_variant_identifier():
     )
 
 
+def test_query_all_definitions():
+    """Query all definition versions matching requirement."""
+    package_mapping = {
+        "foo": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.1.0",
+                "variants": [{"identifier": "V1"}]
+            }),
+            "0.2.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.2.0",
+                "variants": [{"identifier": "V1"}]
+            }),
+            "0.3.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.3.0",
+            }),
+            "1.0.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "1.0.0",
+            }),
+        },
+    }
+
+    requirement = Requirement("foo <1")
+    assert wiz.definition.query_all(requirement, package_mapping) == [
+        package_mapping["foo"]["0.3.0"],
+        package_mapping["foo"]["0.2.0"],
+        package_mapping["foo"]["0.1.0"],
+    ]
+
+    requirement = Requirement("foo[V1]")
+    assert wiz.definition.query_all(requirement, package_mapping) == [
+        package_mapping["foo"]["0.2.0"],
+        package_mapping["foo"]["0.1.0"],
+    ]
+
+
+def test_query_all_definitions_error():
+    """Fails to query all definition versions matching requirement."""
+    package_mapping = {
+        "foo": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.1.0",
+            }),
+        },
+    }
+
+    with pytest.raises(wiz.exception.RequestNotFound):
+        wiz.definition.query_all(Requirement("foo>10"), package_mapping)
+
+    with pytest.raises(wiz.exception.RequestNotFound):
+        wiz.definition.query_all(Requirement("incorrect"), package_mapping)
+
+
 def test_query_definition_name_error():
     """Fails to query the definition name."""
     package_mapping = {}
@@ -607,6 +851,90 @@ def test_query_definition_mixed_version_error():
     ) in str(error)
 
 
+@pytest.mark.parametrize("request_", [
+    "foo", "foo >= 1", "foo > 1", "foo < 1.5", "foo <= 1.5", "foo == 1.5",
+    "foo == 1.*", "foo ~= 1.1", "foo != 2", "foo >= 1, < 2", "foo > 1, <= 1.4",
+    "foo >= 3", "foo < 0.1", "foo == 2.0", "foo == 2.0+local",
+    "foo[V1]", "foo[V1] < 2", "foo[V2] >= 1", "foo[V3]", "foo === 1.5",
+])
+def test_query_definition_with_version_index(request_):
+    """Query definition from version index as from versions sorted."""
+    mapping = {}
+    versions = [
+        "0.1", "0.5", "1.0", "1.1", "1.2rc1", "1.2", "1.4", "1.5",
+        "1.5.0.post1", "2.0", "2.0+local", "2.1.dev0", "2.2"
+    ]
+
+    for index, version in enumerate(versions):
+        wiz.definition._add_to_mapping(
+            wiz.definition.Definition({
+                "identifier": "foo",
+                "version": version,
+                "variants": [{"identifier": "V{}".format(index % 3)}]
+            }), mapping
+        )
+
+    assert isinstance(mapping["foo"], wiz.definition._VersionMapping)
+    assert mapping["foo"] == dict(mapping["foo"])
+
+    # Find expected definition from all versions sorted.
+    requirement = Requirement(request_)
+    variant = next(iter(requirement.extras), None)
+
+    expected = None
+
+    for version in sorted(mapping["foo"].keys(), key=Version, reverse=True):
+        definition = mapping["foo"][version]
+        if variant is not None and variant not in [
+            _variant.identifier for _variant in definition.variants
+        ]:
+            continue
+
+        if definition.version in requirement.specifier:
+            expected = definition
+            break
+
+    if expected is None:
+        with pytest.raises(wiz.exception.RequestNotFound):
+            wiz.definition.query(requirement, mapping)
+
+    else:
+        assert wiz.definition.query(requirement, mapping) == expected
+
+
+def test_query_definition_with_version_index_updated():
+    """Query definition from version index after updating mapping."""
+    mapping = {}
+
+    for version in ["0.1.0", "0.2.0"]:
+        wiz.definition._add_to_mapping(
+            wiz.definition.Definition(
+                {"identifier": "foo", "version": version}
+            ),
+            mapping
+        )
+
+    requirement = Requirement("foo")
+    definition = wiz.definition.query(requirement, mapping)
+    assert definition.version == Version("0.2.0")
+
+    index = mapping["foo"].index
+    assert mapping["foo"].index is index
+    assert index.versions == [Version("0.1.0"), Version("0.2.0")]
+
+    wiz.definition._add_to_mapping(
+        wiz.definition.Definition({"identifier": "foo", "version": "0.3.0"}),
+        mapping
+    )
+    definition = wiz.definition.query(requirement, mapping)
+    assert definition.version == Version("0.3.0")
+    assert mapping["foo"].index is not index
+
+    del mapping["foo"]["0.3.0"]
+    definition = wiz.definition.query(requirement, mapping)
+    assert definition.version == Version("0.2.0")
+
+
 def test_export_data(mocked_filesystem_export):
     """Export definition data as a JSON file."""
     data = {
@@ -764,32 +1092,32 @@ def test_discover(mocked_load, mocked_system_validate, registries, definitions):
 
     path = os.path.join(r1, "defA.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "defC.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defF.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defE.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r2, "defH.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=False
     )
 
     path = os.path.join(r2, "defI.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=False
     )
 
     assert discovered == definitions[:6]
@@ -815,22 +1143,22 @@ def test_discover_with_max_depth(
 
     path = os.path.join(r1, "defA.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "defC.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r2, "defH.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=False
     )
 
     path = os.path.join(r2, "defI.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=False
     )
 
     assert discovered == definitions[:4]
@@ -857,32 +1185,32 @@ def test_discover_with_system_valid(
 
     path = os.path.join(r1, "defA.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "defC.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defF.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defE.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r2, "defH.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=False
     )
 
     path = os.path.join(r2, "defI.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=False
     )
 
     assert discovered == definitions[:6]
@@ -908,32 +1236,32 @@ def test_discover_with_system_invalid(
 
     path = os.path.join(r1, "defA.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "defC.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defF.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r1, "level1", "level2", "level3", "defE.json")
     mocked_load.assert_any_call(
-        path, registry_path=r1
+        path, registry_path=r1, lazy=False
     )
 
     path = os.path.join(r2, "defH.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=False
     )
 
     path = os.path.join(r2, "defI.json")
     mocked_load.assert_any_call(
-        path, registry_path=r2
+        path, registry_path=r2, lazy=False
     )
 
     assert discovered == []
@@ -941,11 +1269,11 @@ def test_discover_with_system_invalid(
 
 def test_discover_without_disabled(mocked_load, registries, definitions):
     """Discover and yield definitions without disabled definition."""
-    data = definitions[2].data()
+    data = definitions[2].data(copy_data=True)
     data["disabled"] = True
     definitions[2] = wiz.definition.Definition(data)
 
-    data = definitions[4].data()
+    data = definitions[4].data(copy_data=True)
     data["disabled"] = True
     definitions[4] = wiz.definition.Definition(data)
 
@@ -1008,6 +1336,271 @@ def test_discover_error(mocked_load, registries, exception):
         list(wiz.definition.discover(registries))
 
 
+@pytest.mark.parametrize("options", [
+    {},
+    {"max_depth": 0},
+    {"max_depth": 2},
+    {"max_depth": 3},
+], ids=[
+    "without-max-depth",
+    "with-max-depth-0",
+    "with-max-depth-2",
+    "with-max-depth-3",
+])
+def test_discover_with_workers(
+    mocked_load, mocked_system_validate, registries, definitions, options
+):
+    """Discover and yield definitions concurrently in the same order."""
+    mocked_load.side_effect = definitions
+
+    # Record paths loaded sequentially.
+    expected = list(wiz.definition.discover(registries, **options))
+    paths = [_call[0][0] for _call in mocked_load.call_args_list]
+
+    mocked_load.side_effect = (
+        lambda path, **kwargs: definitions[paths.index(path)]
+    )
+    mocked_load.reset_mock()
+
+    result = wiz.definition.discover(registries, workers=4, **options)
+    assert isinstance(result, types.GeneratorType)
+    assert mocked_load.call_count == 0
+
+    discovered = list(result)
+    assert discovered == expected
+    assert mocked_load.call_count == len(paths)
+
+
+@pytest.mark.parametrize("exception", [
+    RuntimeError,
+    Exception
+], ids=[
+    "runtime-error",
+    "generic-error"
+])
+def test_discover_with_workers_error(mocked_load, registries, exception):
+    """Fail to discover and yield definitions concurrently."""
+    mocked_load.side_effect = exception
+
+    with pytest.raises(exception):
+        list(wiz.definition.discover(registries, workers=4))
+
+
+def test_discover_with_index(
+    mocker, mocked_load, mocked_system_validate, registries, definitions,
+    temporary_directory
+):
+    """Discover and yield definitions from index."""
+    mocker.patch.object(
+        wiz.index, "get_directory",
+        return_value=os.path.join(temporary_directory, "index")
+    )
+    mocked_load.side_effect = definitions
+
+    discovered = list(wiz.definition.discover(registries, use_index=True))
+    assert len(discovered) == 6
+    assert mocked_load.call_count == 6
+
+    # Definitions are not loaded again when files are unchanged.
+    mocked_load.reset_mock()
+
+    discovered = list(wiz.definition.discover(registries, use_index=True))
+    assert len(discovered) == 6
+    assert mocked_load.call_count == 0
+
+    assert sorted(
+        definition.qualified_version_identifier for definition in discovered
+    ) == sorted(
+        definition.qualified_version_identifier
+        for definition in definitions[:6]
+    )
+
+    # Modified definition is loaded again.
+    path = os.path.join(registries[1], "defH.json")
+    with open(path, "w") as stream:
+        stream.write("{}")
+
+    mocked_load.side_effect = definitions[4:5]
+
+    discovered = list(wiz.definition.discover(registries, use_index=True))
+    assert len(discovered) == 6
+    mocked_load.assert_called_once_with(
+        path, registry_path=registries[1], lazy=False
+    )
+
+
+def test_discover_lazy_with_index(mocker, temporary_directory):
+    """Discover lazy definitions from index."""
+    mocker.patch.object(
+        wiz.index, "get_directory",
+        return_value=os.path.join(temporary_directory, "index")
+    )
+
+    registry = os.path.join(temporary_directory, "registry")
+    os.makedirs(registry)
+
+    path = os.path.join(registry, "foo.json")
+    with open(path, "w") as stream:
+        stream.write(
+            "{\"identifier\": \"foo\", \"environ\": {\"KEY\": \"VALUE\"}}"
+        )
+
+    paths = [registry]
+
+    discovered = list(
+        wiz.definition.discover(paths, use_index=True, lazy=True)
+    )
+    assert len(discovered) == 1
+    assert discovered[0].validated is False
+
+    mocked_load = mocker.patch.object(
+        wiz.definition, "load", wraps=wiz.definition.load
+    )
+
+    # Lazy definition is fetched from index.
+    discovered = list(
+        wiz.definition.discover(paths, use_index=True, lazy=True)
+    )
+    assert len(discovered) == 1
+    assert discovered[0].validated is False
+    mocked_load.assert_not_called()
+
+    # Lazy definition in index is loaded again when validation is required.
+    discovered = list(wiz.definition.discover(paths, use_index=True))
+    assert len(discovered) == 1
+    assert discovered[0].validated is True
+    mocked_load.assert_called_once_with(
+        path, registry_path=registry, lazy=False
+    )
+
+
+@pytest.mark.parametrize("options, expected", [
+    (
+        {},
+        [
+            "registry1/defA.json",
+            "registry1/level1/level2/defC.json",
+            "registry1/level1/level2/level3/defE.json",
+            "registry1/level1/level2/level3/defF.json",
+        ]
+    ),
+    ({"max_depth": 0}, ["registry1/defA.json"]),
+    ({"max_depth": 1}, ["registry1/defA.json"]),
+    (
+        {"max_depth": 2},
+        ["registry1/defA.json", "registry1/level1/level2/defC.json"]
+    ),
+    ({"max_depth": -1}, []),
+    (
+        {"ignore_patterns": ["level3"]},
+        ["registry1/defA.json", "registry1/level1/level2/defC.json"]
+    ),
+    (
+        {"ignore_patterns": ["*F.json", "defA*"]},
+        [
+            "registry1/level1/level2/defC.json",
+            "registry1/level1/level2/level3/defE.json",
+        ]
+    ),
+], ids=[
+    "all",
+    "max-depth-0",
+    "max-depth-1",
+    "max-depth-2",
+    "max-depth-negative",
+    "ignore-folder",
+    "ignore-files",
+])
+def test_discover_paths(registries, options, expected):
+    """Discover definition paths."""
+    root = os.path.dirname(registries[0])
+
+    result = wiz.definition.discover_paths(registries[0], **options)
+    assert isinstance(result, types.GeneratorType)
+    assert sorted(result) == [
+        os.path.join(root, path) for path in expected
+    ]
+
+
+@pytest.mark.parametrize("options, expected", [
+    (
+        {},
+        [
+            "registry1",
+            "registry1/level1",
+            "registry1/level1/level2",
+            "registry1/level1/level2/level3",
+        ]
+    ),
+    ({"max_depth": 0}, ["registry1"]),
+    ({"max_depth": 1}, ["registry1", "registry1/level1"]),
+    ({"max_depth": -1}, []),
+    (
+        {"ignore_patterns": ["level2"]},
+        ["registry1", "registry1/level1"]
+    ),
+], ids=[
+    "all",
+    "max-depth-0",
+    "max-depth-1",
+    "max-depth-negative",
+    "ignore-folder",
+])
+def test_discover_folders(registries, options, expected):
+    """Discover folders visited."""
+    root = os.path.dirname(registries[0])
+
+    result = wiz.definition.discover_folders(registries[0], **options)
+    assert isinstance(result, types.GeneratorType)
+    assert list(result) == [os.path.join(root, path) for path in expected]
+
+
+def test_discover_paths_pruned(mocker, registries):
+    """Do not visit folders deeper than maximum depth."""
+    mocked_scandir = mocker.patch.object(
+        wiz.definition, "_scandir", wraps=wiz.definition._scandir
+    )
+
+    list(wiz.definition.discover_paths(registries[0], max_depth=1))
+    assert mocked_scandir.call_count == 2
+
+    mocked_scandir.reset_mock()
+
+    list(wiz.definition.discover_paths(registries[0]))
+    assert mocked_scandir.call_count == 4
+
+
+def test_discover_paths_with_config(mocker, registries):
+    """Discover definition paths with ignore patterns from configuration."""
+    mocker.patch.object(
+        wiz.config, "fetch",
+        return_value={"registry": {"ignore_patterns": ["level2"]}}
+    )
+
+    assert list(wiz.definition.discover_paths(registries[0])) == [
+        os.path.join(registries[0], "defA.json")
+    ]
+
+
+def test_discover_paths_with_symlink(registries, temporary_directory):
+    """Do not follow symbolic links to folders."""
+    os.symlink(
+        os.path.join(registries[0], "level1"),
+        os.path.join(registries[1], "link")
+    )
+
+    assert sorted(wiz.definition.discover_paths(registries[1])) == [
+        os.path.join(registries[1], "defH.json"),
+        os.path.join(registries[1], "defI.json"),
+    ]
+
+
+def test_discover_paths_missing(temporary_directory):
+    """Discover no definition paths from missing folder."""
+    path = os.path.join(temporary_directory, "missing")
+    assert list(wiz.definition.discover_paths(path)) == []
+
+
 def test_load(mocked_definition, temporary_file):
     """Load a definition from a path."""
     with open(temporary_file, "w") as stream:
@@ -1020,7 +1613,8 @@ def test_load(mocked_definition, temporary_file):
         {"identifier": "test_definition"},
         path=temporary_file,
         registry_path=None,
-        copy_data=False
+        copy_data=False,
+        lazy=False
     )
 
 
@@ -1036,9 +1630,222 @@ def test_load_with_mapping(mocked_definition, temporary_file):
         {"identifier": "test_definition", "key": "value"},
         path=temporary_file,
         registry_path=None,
-        copy_data=False
+        copy_data=False,
+        lazy=False
+    )
+
+
+def test_load_interned_strings(temporary_directory):
+    """Share identical strings between definitions loaded from paths."""
+    paths = []
+
+    for name in ["foo1", "foo2"]:
+        path = os.path.join(temporary_directory, "{}.json".format(name))
+        paths.append(path)
+
+        with open(path, "w") as stream:
+            stream.write(
+                "{\"identifier\": \"foo\", \"version\": \"0.1.0\", "
+                "\"description\": \"Test\"}"
+            )
+
+    definition1 = wiz.definition.load(paths[0])
+    definition2 = wiz.definition.load(paths[1])
+
+    assert definition1.identifier is definition2.identifier
+    assert definition1.data()["version"] is definition2.data()["version"]
+    assert definition1.description is not definition2.description
+
+
+@pytest.fixture()
+def validation_cache(mocker, temporary_directory):
+    """Return enabled validation cache."""
+    cache = wiz.validation_cache.ValidationCache(
+        path=os.path.join(temporary_directory, "cache", "validation.json")
+    )
+    mocker.patch.object(wiz.validation_cache, "fetch", return_value=cache)
+    return cache
+
+
+def test_load_with_validation_cache(mocker, validation_cache, temporary_file):
+    """Load a definition without validation when recorded in cache."""
+    mocked_validate = mocker.patch.object(
+        wiz.validator, "validate_definition"
+    )
+
+    with open(temporary_file, "w") as stream:
+        stream.write("{\"identifier\": \"test_definition\"}")
+
+    definition = wiz.definition.load(temporary_file)
+    assert definition.identifier == "test_definition"
+    assert definition.validated is True
+    assert mocked_validate.call_count == 1
+    assert len(validation_cache) == 1
+
+    definition = wiz.definition.load(temporary_file)
+    assert definition.identifier == "test_definition"
+    assert definition.validated is True
+    assert mocked_validate.call_count == 1
+
+    # Data augmented by another mapping is validated again.
+    wiz.definition.load(temporary_file, mapping={"description": "test"})
+    assert mocked_validate.call_count == 2
+    assert len(validation_cache) == 2
+
+    # Modified definition is validated again.
+    with open(temporary_file, "w") as stream:
+        stream.write("{\"identifier\": \"test_definition2\"}")
+
+    wiz.definition.load(temporary_file)
+    assert mocked_validate.call_count == 3
+    assert len(validation_cache) == 3
+
+
+def test_load_lazy_with_validation_cache(validation_cache, temporary_file):
+    """Do not record lazy definitions in validation cache."""
+    with open(temporary_file, "w") as stream:
+        stream.write("{\"identifier\": \"foo\", \"environ\": {\"A\": \"B\"}}")
+
+    definition = wiz.definition.load(temporary_file, lazy=True)
+    assert definition.validated is False
+    assert len(validation_cache) == 0
+
+    definition = wiz.definition.load(temporary_file)
+    assert len(validation_cache) == 1
+
+    # Definition recorded in cache is not loaded lazily.
+    definition = wiz.definition.load(temporary_file, lazy=True)
+    assert definition.validated is True
+
+
+def test_load_incorrect_with_validation_cache(validation_cache, temporary_file):
+    """Do not record incorrect definitions in validation cache."""
+    with open(temporary_file, "w") as stream:
+        stream.write("{\"identifier\": \"foo\", \"environ\": {}}")
+
+    with pytest.raises(wiz.exception.DefinitionError):
+        wiz.definition.load(temporary_file)
+
+    assert len(validation_cache) == 0
+
+
+def test_discover_with_validation_cache(validation_cache, temporary_directory):
+    """Save validation cache after discovering definitions."""
+    registry = os.path.join(temporary_directory, "registry")
+    os.makedirs(registry)
+
+    for identifier in ["foo", "bar"]:
+        path = os.path.join(registry, "{}.json".format(identifier))
+        with open(path, "w") as stream:
+            stream.write("{{\"identifier\": \"{}\"}}".format(identifier))
+
+    definitions = list(wiz.definition.discover([registry]))
+    assert len(definitions) == 2
+    assert len(validation_cache) == 2
+    assert os.path.isfile(validation_cache.path)
+
+
+def test_fetch_targeted_with_validation_cache(
+    mocker, validation_cache, temporary_directory
+):
+    """Save validation cache once after targeted fetch."""
+    mocked_save_on_exit = mocker.patch.object(
+        wiz.validation_cache, "save_on_exit"
+    )
+    mocked_save = mocker.patch.object(validation_cache, "save")
+
+    registry = os.path.join(temporary_directory, "registry")
+    os.makedirs(registry)
+
+    for identifier in ["foo", "bar"]:
+        path = os.path.join(registry, "{}.json".format(identifier))
+        with open(path, "w") as stream:
+            stream.write("{{\"identifier\": \"{}\"}}".format(identifier))
+
+    mapping = wiz.definition.fetch([registry], targeted=True)
+    assert mocked_save_on_exit.call_count == 1
+
+    assert list(mapping["package"]["foo"].keys()) == ["-"]
+    assert list(mapping["package"]["bar"].keys()) == ["-"]
+    assert len(validation_cache) == 2
+
+    mocked_save.assert_not_called()
+
+
+def test_discover_with_system_prefilter(mocker, temporary_directory):
+    """Discover definitions while skipping files for incompatible systems."""
+    registry = os.path.join(temporary_directory, "registry")
+
+    for index in range(3):
+        for platform in ["linux", "windows"]:
+            wiz.definition.export(registry, {
+                "identifier": "foo{}".format(index),
+                "system": {"platform": platform},
+            })
+
+    system_mapping = {"platform": "linux"}
+    expected = list(
+        wiz.definition.discover([registry], system_mapping=system_mapping)
+    )
+    assert len(expected) == 3
+
+    mocker.patch.object(
+        wiz.config, "fetch",
+        return_value={"registry": {"system_prefilter": True}}
+    )
+    mocked_load = mocker.patch.object(
+        wiz.definition, "load", wraps=wiz.definition.load
     )
 
+    result = list(
+        wiz.definition.discover([registry], system_mapping=system_mapping)
+    )
+    assert sorted(d.path for d in result) == sorted(d.path for d in expected)
+
+    # Only the first definition for Windows is loaded.
+    assert mocked_load.call_count == 4
+
+
+def test_discover_with_system_prefilter_without_mapping(
+    mocker, temporary_directory
+):
+    """Discover all definitions when no system mapping is given."""
+    registry = os.path.join(temporary_directory, "registry")
+
+    for index in range(3):
+        wiz.definition.export(registry, {
+            "identifier": "foo{}".format(index),
+            "system": {"platform": "windows"},
+        })
+
+    mocker.patch.object(
+        wiz.config, "fetch",
+        return_value={"registry": {"system_prefilter": True}}
+    )
+
+    definitions = list(wiz.definition.discover([registry]))
+    assert len(definitions) == 3
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/path/foo.json", None),
+    ("/path/foo-0.1.0.json", None),
+    ("/path/{}.json".format("A" * 27), None),
+    ("/path/foo-{}.json".format("A" * 27), "A" * 27),
+    ("/path/foo-0.1.0-{}.json".format("A" * 27), "A" * 27),
+    ("/path/foo_{}.json".format("A" * 27), None),
+], ids=[
+    "identifier",
+    "version",
+    "hash-only",
+    "identifier-and-hash",
+    "version-and-hash",
+    "incorrect-separator",
+])
+def test_extract_system_hash(path, expected):
+    """Extract system hash from definition file path."""
+    assert wiz.definition._extract_system_hash(path) == expected
+
 
 def test_minimal_definition():
     """Create a minimal definition."""
@@ -1076,6 +1883,92 @@ def test_minimal_definition():
     )
 
 
+def test_definition_lazy():
+    """Create a definition with deferred validation."""
+    data = {
+        "identifier": "test",
+        "version": "0.1.0",
+        "command": {"app": "App"},
+        "environ": {"KEY": "VALUE"},
+        "requirements": ["foo"],
+        "variants": [{"identifier": "V1"}],
+    }
+
+    definition = wiz.definition.Definition(data, lazy=True)
+    assert definition.validated is False
+    assert definition.identifier == "test"
+    assert definition.command == {"app": "App"}
+    assert definition.validated is False
+
+    assert definition.environ == {"KEY": "VALUE"}
+    assert definition.requirements == [Requirement("foo")]
+    assert definition.validated is False
+
+    assert len(definition.variants) == 1
+    assert definition.validated is True
+
+
+@pytest.mark.parametrize("data, attribute, message", [
+    (
+        {"identifier": "test", "environ": "incorrect"},
+        "environ", "'environ' has incorrect type."
+    ),
+    (
+        {"identifier": "test", "requirements": "incorrect"},
+        "requirements", "'requirements' has incorrect type."
+    ),
+    (
+        {"identifier": "test", "variants": [{"identifier": True}]},
+        "variants", "'variants/0/identifier' has incorrect type."
+    ),
+], ids=[
+    "environ-incorrect",
+    "requirements-incorrect",
+    "variants-incorrect",
+])
+def test_definition_lazy_error(data, attribute, message):
+    """Fail to access incorrect deferred keyword."""
+    definition = wiz.definition.Definition(data, lazy=True)
+    assert definition.identifier == "test"
+
+    with pytest.raises(wiz.exception.DefinitionError) as error:
+        getattr(definition, attribute)
+
+    assert (
+        "Definition 'test' is incorrect: {}".format(message) in str(error)
+    )
+
+    with pytest.raises(wiz.exception.DefinitionError):
+        definition.validate()
+
+    assert definition.validated is False
+
+
+def test_definition_lazy_header_error():
+    """Fail to create lazy definition with incorrect header."""
+    with pytest.raises(wiz.exception.DefinitionError) as error:
+        wiz.definition.Definition(
+            {"identifier": "test", "command": "incorrect"}, lazy=True
+        )
+
+    assert "'command' has incorrect type." in str(error)
+
+
+def test_definition_validate():
+    """Validate all deferred keywords of lazy definition."""
+    definition = wiz.definition.Definition(
+        {"identifier": "test", "environ": {"KEY": "VALUE"}}, lazy=True
+    )
+    assert definition.validated is False
+
+    definition.validate()
+    assert definition.validated is True
+
+    # Non-lazy definition is always validated.
+    definition = wiz.definition.Definition({"identifier": "test"})
+    assert definition.validated is True
+
+
 def test_minimal_definition_with_paths():
     """Create a minimal definition with paths."""
     data = {"identifier": "test"}
@@ -2012,19 +2905,77 @@ def test_definition_without_data_copy():
     assert data == definition.data()
 
 
+def test_definition_not_interned():
+    """Do not replace strings in input data not copied."""
+    wiz.definition.Definition({"identifier": "foo"}, copy_data=False)
+
+    identifier = "".join(["fo", "o"])
+    data = {"identifier": identifier}
+
+    definition = wiz.definition.Definition(data, copy_data=False)
+    assert definition.identifier is identifier
+    assert data["identifier"] is identifier
+
+
 def test_definition_data():
     """Fetch data from definition."""
-    definition = wiz.definition.Definition({"identifier": "test"})
+    definition = wiz.definition.Definition({
+        "identifier": "test", "environ": {"KEY": "VALUE"}
+    })
     data = definition.data()
+    assert data is definition.data()
+
+    with pytest.raises(TypeError) as error:
+        data["key"] = "other"
+
+    assert "'FrozenDict' object is read-only." in str(error.value)
+
+    with pytest.raises(TypeError):
+        data["environ"]["key"] = "other"
+
+    data = definition.data(copy_data=True)
     data["key"] = "other"
+    data["environ"]["key"] = "other"
 
     assert data != definition.data()
+    assert definition.data() == {
+        "identifier": "test", "environ": {"KEY": "VALUE"}
+    }
 
-    definition = wiz.definition.Definition({"identifier": "test"})
-    data = definition.data(copy_data=False)
-    data["key"] = "other"
 
-    assert data == definition.data()
+def test_definition_data_shared():
+    """Share unchanged data between definitions."""
+    definition1 = wiz.definition.Definition({
+        "identifier": "foo",
+        "environ": {"KEY": "VALUE"},
+        "requirements": ["bar"],
+        "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+    })
+    data1 = definition1.data()
+
+    definition2 = definition1.update("environ", {"KEY2": "VALUE2"})
+    data2 = definition2.data()
+
+    assert data2["environ"] is not data1["environ"]
+    assert data2["requirements"] is data1["requirements"]
+    assert data2["variants"] is data1["variants"]
+
+    definition3 = definition2.remove_index("variants", 0)
+    data3 = definition3.data()
+
+    assert data3["environ"] is data2["environ"]
+    assert data3["variants"] is not data2["variants"]
+    assert data3["variants"][0] is data1["variants"][1]
+
+    with pytest.raises(TypeError):
+        data3["variants"].append({"identifier": "V3"})
+
+    assert definition1.data() == {
+        "identifier": "foo",
+        "environ": {"KEY": "VALUE"},
+        "requirements": ["bar"],
+        "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+    }
 
 
 def test_definition_with_error():
@@ -55,20 +55,28 @@ def mocked_gzip_open(mocker):
     "with-user-shortcut"
 ])
 def test_export(
-    path, resolved_path, directory, mocked_io_open, mocked_gzip_open,
+    mocker, path, resolved_path, directory, mocked_io_open, mocked_gzip_open,
     mocked_ensure_directory, monkeypatch
 ):
     """Export a file with content."""
     monkeypatch.setenv("HOME", "/usr/people/me")
+    mocked_rename = mocker.patch.object(os, "rename")
 
     content = "THIS IS\n A TEST.\n"
 
     wiz.filesystem.export(path, content)
 
     mocked_ensure_directory.assert_called_once_with(directory)
+
+    # Content is written into a temporary file which is then renamed.
+    temporary_path = mocked_io_open["func"].call_args[0][0]
+    assert temporary_path.startswith(resolved_path + ".")
+    assert temporary_path.endswith(".tmp")
+
     mocked_io_open["func"].assert_called_once_with(
-        resolved_path, "w", encoding="utf8"
+        temporary_path, "w", encoding="utf8"
     )
+    mocked_rename.assert_called_once_with(temporary_path, resolved_path)
     mocked_gzip_open["func"].assert_not_called()
     mocked_io_open["stream"].write.assert_called_once_with(content)
 
@@ -99,6 +107,45 @@ def test_export_with_compression(
     mocked_gzip_open["stream"].write.assert_called_once_with(content)
 
 
+def test_atomic_write(temporary_directory):
+    """Write file atomically."""
+    path = os.path.join(temporary_directory, "folder", "file.json")
+
+    with wiz.filesystem.atomic_write(path) as stream:
+        stream.write("{}")
+
+        # Content is not visible until the file is closed.
+        assert os.path.isfile(path) is False
+
+    assert os.listdir(os.path.dirname(path)) == ["file.json"]
+    with open(path, "r") as stream:
+        assert stream.read() == "{}"
+
+    with wiz.filesystem.atomic_write(path, mode="wb") as stream:
+        stream.write(b"[]")
+
+    assert os.listdir(os.path.dirname(path)) == ["file.json"]
+    with open(path, "r") as stream:
+        assert stream.read() == "[]"
+
+
+def test_atomic_write_error(temporary_directory):
+    """Remove temporary file when writing fails."""
+    path = os.path.join(temporary_directory, "file.json")
+
+    with open(path, "w") as stream:
+        stream.write("{}")
+
+    with pytest.raises(ValueError):
+        with wiz.filesystem.atomic_write(path) as stream:
+            stream.write("incomplete")
+            raise ValueError()
+
+    assert os.listdir(temporary_directory) == ["file.json"]
+    with open(path, "r") as stream:
+        assert stream.read() == "{}"
+
+
 def test_accessible(temporary_directory, temporary_file, mocked_os_access):
     """Indicate whether directory is accessible."""
     mocked_os_access.return_value = True
@@ -4,14 +4,17 @@ import os
 import collections
 import copy
 import itertools
+import random
 
 import pytest
 
 import wiz.config
+import wiz.definition
 import wiz.graph
+import wiz.history
 import wiz.package
 import wiz.utility
-from wiz.utility import Requirement
+from wiz._requirement import Requirement
 
 
 @pytest.fixture(autouse=True)
@@ -37,8 +40,21 @@ def mocked_check_conflicting_requirements(mocker):
 
 @pytest.fixture()
 def mocked_resolver(mocker):
-    """Return mocked Resolver."""
-    return mocker.Mock()
+    """Return mocked Resolver extracting packages without cache."""
+    resolver = mocker.Mock()
+
+    def _extract_packages(requirement, namespace_counter=None):
+        """Extract packages from *requirement*."""
+        options = {}
+        if namespace_counter is not None:
+            options["namespace_counter"] = namespace_counter
+
+        return wiz.package.extract(
+            requirement, resolver.definition_mapping, **options
+        )
+
+    resolver.extract_packages.side_effect = _extract_packages
+    return resolver
 
 
 @pytest.fixture()
@@ -65,6 +81,14 @@ def mocked_compute_conflicting_matrix(mocker):
     return mocker.patch.object(wiz.graph, "_compute_conflicting_matrix")
 
 
+@pytest.fixture()
+def mocked_extract_nogoods(mocker):
+    """Return mocked wiz.graph._extract_nogoods function."""
+    return mocker.patch.object(
+        wiz.graph, "_extract_nogoods", return_value=[]
+    )
+
+
 @pytest.fixture()
 def mocked_extract_conflicting_requirements(mocker):
     """Return mocked wiz.graph._extract_conflicting_requirements function."""
@@ -75,6 +99,11 @@ def mocked_extract_conflicting_requirements(mocker):
 def mocked_graph(mocker):
     """Return mocked Graph."""
     graph = mocker.MagicMock(ROOT="root")
+    graph.resolver.extract_packages.side_effect = (
+        lambda requirement: wiz.package.extract(
+            requirement, graph.resolver.definition_mapping
+        )
+    )
     mocker.patch.object(wiz.graph, "Graph", return_value=graph)
     return graph
 
@@ -109,6 +138,12 @@ def mocked_prune_graph(mocker):
     return mocker.patch.object(wiz.graph.Combination, "prune_graph")
 
 
+@pytest.fixture()
+def mocked_update_distance_mapping(mocker):
+    """Return mocked wiz.graph._update_distance_mapping function."""
+    return mocker.patch.object(wiz.graph, "_update_distance_mapping")
+
+
 @pytest.fixture()
 def mocked_fetch_distance_mapping(mocker):
     """Return mocked wiz.graph.VariantCombination._fetch_distance_mapping."""
@@ -478,6 +513,100 @@ def test_resolver_empty():
     assert list(resolver._iterator) == []
 
 
+def test_resolver_extract_packages():
+    """Extract packages from requirements with cache."""
+    definitions = {
+        "foo": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.1.0",
+                "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+            }),
+            "0.2.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "version": "0.2.0",
+                "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+            }),
+        },
+    }
+
+    resolver = wiz.graph.Resolver(definitions)
+
+    packages = resolver.extract_packages(Requirement("foo"))
+    assert [package.identifier for package in packages] == [
+        "foo[V1]==0.2.0", "foo[V2]==0.2.0"
+    ]
+
+    # Same packages are returned for the same requirement.
+    assert resolver.extract_packages(Requirement("foo")) is packages
+
+    # Package instances are shared between requirements.
+    _packages = resolver.extract_packages(Requirement("foo[V2] >= 0.2"))
+    assert _packages == (packages[1],)
+    assert _packages[0] is packages[1]
+
+    _packages = resolver.extract_packages(Requirement("foo[V2] < 0.2"))
+    assert [package.identifier for package in _packages] == ["foo[V2]==0.1.0"]
+
+    with pytest.raises(wiz.exception.RequestNotFound):
+        resolver.extract_packages(Requirement("foo > 1"))
+
+
+def test_resolver_extract_packages_with_namespace_counter():
+    """Extract packages from requirements with namespace hints."""
+    definitions = {
+        "__namespace__": {
+            "foo": {"ns1", "ns2"}
+        },
+        "ns1::foo": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "namespace": "ns1",
+                "version": "0.1.0",
+            }),
+        },
+        "ns2::foo": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "foo",
+                "namespace": "ns2",
+                "version": "0.1.0",
+            }),
+        },
+        "bar": {
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "bar",
+                "version": "0.1.0",
+            }),
+        },
+    }
+
+    resolver = wiz.graph.Resolver(definitions)
+
+    packages = resolver.extract_packages(
+        Requirement("foo"), namespace_counter=collections.Counter(["ns1"])
+    )
+    assert [package.identifier for package in packages] == [
+        "ns1::foo==0.1.0"
+    ]
+
+    packages = resolver.extract_packages(
+        Requirement("foo"),
+        namespace_counter=collections.Counter(["ns1", "ns2", "ns2"])
+    )
+    assert [package.identifier for package in packages] == [
+        "ns2::foo==0.1.0"
+    ]
+
+    # Namespace occurrences are ignored when namespace cannot be guessed.
+    packages = resolver.extract_packages(
+        Requirement("bar"), namespace_counter=collections.Counter(["ns1"])
+    )
+    _packages = resolver.extract_packages(
+        Requirement("bar"), namespace_counter=collections.Counter(["ns2"])
+    )
+    assert _packages is packages
+
+
 @pytest.mark.parametrize(
     "combination_number", [1, 2, 3, 4, 5, 10],
     ids=[
@@ -671,7 +800,7 @@ def test_resolver_compute_packages_fail(
 )
 def test_resolver_compute_packages_fail_from_conflicts(
     mocker, mocked_graph, mocked_extract_combinations,
-    mocked_fetch_next_combination, combination_number
+    mocked_fetch_next_combination, mocked_extract_nogoods, combination_number
 ):
     """Fail to resolve packages because of conflicts."""
     combinations = [mocker.Mock() for _ in range(combination_number)]
@@ -721,6 +850,8 @@ def test_resolver_compute_packages_fail_from_conflicts(
     assert mocked_fetch_next_combination.call_count == combination_number + 1
     mocked_extract_combinations.assert_called_once_with(mocked_graph)
 
+    assert mocked_extract_nogoods.call_count == combination_number
+
 
 def test_resolver_compute_packages_reach_maximum(
     mocker, mocked_graph, mocked_extract_combinations,
@@ -763,6 +894,306 @@ def test_resolver_compute_packages_reach_maximum(
     mocked_extract_combinations.assert_called_once_with(mocked_graph)
 
 
+def _speculative_definition_mapping():
+    """Return definition mapping with 6 conflicting variants of 'A'.
+
+    Each variant 'A[Vi]==0.2.0' requires 'B >=i', whereas variants of
+    'A==0.1.0' do not have any requirements.
+
+    """
+    return {
+        "A": {
+            "0.2.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.2.0",
+                "variants": [
+                    {
+                        "identifier": "V{}".format(index),
+                        "requirements": ["B >={}".format(index)]
+                    }
+                    for index in range(6, 0, -1)
+                ]
+            }),
+            "0.1.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "0.1.0",
+                "variants": [
+                    {"identifier": "V{}".format(index)}
+                    for index in range(6, 0, -1)
+                ]
+            }),
+        },
+        "B": {
+            version: wiz.definition.Definition({
+                "identifier": "B",
+                "version": version
+            })
+            for version in ["0.5.0", "1.0.0", "2.0.0", "3.0.0"]
+        }
+    }
+
+
+@pytest.mark.parametrize("requirement", [
+    "B >=1, <2",
+    "B <1",
+], ids=[
+    "last-combination",
+    "with-downgrade",
+])
+def test_resolver_compute_packages_speculative(mocker, requirement):
+    """Resolve packages with speculative workers."""
+    definition_mapping = _speculative_definition_mapping()
+    requirements = [Requirement("A"), Requirement(requirement)]
+
+    resolver = wiz.graph.Resolver(
+        definition_mapping, maximum_combinations=10
+    )
+    expected = resolver.compute_packages(requirements)
+
+    spy = mocker.spy(wiz.graph, "_resolve_speculatively")
+
+    resolver = wiz.graph.Resolver(
+        definition_mapping, maximum_combinations=10, speculative_workers=3
+    )
+    result = resolver.compute_packages(requirements)
+
+    assert [package.identifier for package in result] == [
+        package.identifier for package in expected
+    ]
+    assert spy.call_count == 2
+
+
+def test_resolver_compute_packages_speculative_with_history(mocker):
+    """Resolve packages sequentially when history is recorded."""
+    mocker.patch.object(wiz.history, "is_recording", return_value=True)
+    spy = mocker.spy(wiz.graph, "_resolve_speculatively")
+
+    resolver = wiz.graph.Resolver(
+        _speculative_definition_mapping(), maximum_combinations=10,
+        speculative_workers=3
+    )
+    result = resolver.compute_packages([
+        Requirement("A"), Requirement("B >=1, <2")
+    ])
+
+    assert [package.identifier for package in result] == [
+        "B==1.0.0", "A[V1]==0.2.0"
+    ]
+    spy.assert_not_called()
+
+
+def _nogood_definition_mapping():
+    """Return definition mapping with 4 conflicting variants of 'V'.
+
+    'A==2.0.0' requires 'C >=2' whereas 'A==1.0.0' and 'B' require 'C <2', so
+    each combination fails until 'A' is downgraded.
+
+    """
+    definition_mapping = {
+        "A": {
+            "2.0.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "2.0.0",
+                "requirements": ["C >=2"]
+            }),
+            "1.0.0": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "1.0.0",
+                "requirements": ["C <2"]
+            }),
+        },
+        "B": {
+            "1.0.0": wiz.definition.Definition({
+                "identifier": "B",
+                "version": "1.0.0",
+                "requirements": ["C <2"]
+            }),
+        },
+        "C": {
+            version: wiz.definition.Definition({
+                "identifier": "C",
+                "version": version
+            })
+            for version in ["1.0.0", "2.0.0"]
+        },
+        "V": {
+            "-": wiz.definition.Definition({
+                "identifier": "V",
+                "variants": [
+                    {
+                        "identifier": "V{}".format(index),
+                        "requirements": ["W{}".format(index)]
+                    }
+                    for index in range(4, 0, -1)
+                ]
+            })
+        }
+    }
+
+    for index in range(1, 5):
+        definition_mapping["W{}".format(index)] = {
+            "-": wiz.definition.Definition({
+                "identifier": "W{}".format(index)
+            })
+        }
+
+    return definition_mapping
+
+
+@pytest.mark.parametrize("requirements, expected, learned, used", [
+    (
+        ["A", "B", "V"],
+        ["W4", "V[V4]", "C==1.0.0", "B==1.0.0", "A==1.0.0"], 1, 3
+    ),
+    (
+        ["A", "C <2", "V"],
+        ["W4", "V[V4]", "C==1.0.0", "A==1.0.0"], 1, 3
+    ),
+], ids=[
+    "from-packages",
+    "from-root",
+])
+def test_resolver_compute_packages_with_nogoods(
+    mocker, requirements, expected, learned, used
+):
+    """Resolve packages while skipping combinations with nogoods."""
+    mocked_record_action = mocker.patch.object(wiz.history, "record_action")
+    spy = mocker.spy(wiz.graph.Combination, "resolve_conflicts")
+
+    resolver = wiz.graph.Resolver(_nogood_definition_mapping())
+    result = resolver.compute_packages([
+        Requirement(requirement) for requirement in requirements
+    ])
+
+    assert [package.identifier for package in result] == expected
+
+    # Only the first combination and the combination with downgraded version
+    # are resolved.
+    assert spy.call_count == 2
+
+    actions = [_call[0][0] for _call in mocked_record_action.call_args_list]
+    assert actions.count(wiz.symbol.GRAPH_NOGOOD_LEARNING_ACTION) == learned
+    assert actions.count(wiz.symbol.GRAPH_NOGOOD_USAGE_ACTION) == used
+
+
+def test_resolver_compute_packages_reset_nogoods():
+    """Reset nogoods learned when resolving new requirements."""
+    resolver = wiz.graph.Resolver(_nogood_definition_mapping())
+    resolver.compute_packages([Requirement("A"), Requirement("C <2")])
+    assert list(resolver._nogoods.keys()) == [frozenset(["root", "A==2.0.0"])]
+
+    result = resolver.compute_packages([Requirement("A"), Requirement("V")])
+    assert [package.identifier for package in result] == [
+        "W4", "V[V4]", "C==2.0.0", "A==2.0.0"
+    ]
+    assert list(resolver._nogoods.keys()) == []
+
+
+def _nogood_order_definition_mapping():
+    """Return definition mapping where a nogood is found in 3 combinations.
+
+    Combinations containing the nogood learned must be downgraded from their
+    own conflicts to explore combinations as without nogoods.
+
+    """
+    data = [
+        {
+            "identifier": "A", "version": "3",
+            "requirements": ["G", "B >=3"]
+        },
+        {
+            "identifier": "A", "version": "2",
+            "variants": [
+                {"identifier": "V0"},
+                {"identifier": "V1"},
+                {"identifier": "V2", "requirements": ["D ==5"]},
+            ]
+        },
+        {
+            "identifier": "B", "version": "3",
+            "variants": [
+                {"identifier": "V0", "requirements": ["E ==4", "F"]},
+                {"identifier": "V1", "requirements": ["F <5"]},
+                {"identifier": "V2", "requirements": ["E >=4", "D <4"]},
+            ]
+        },
+        {
+            "identifier": "B", "version": "1",
+            "variants": [
+                {"identifier": "V0", "requirements": ["D >=2"]},
+                {"identifier": "V1", "requirements": ["G >5", "E <1"]},
+                {"identifier": "V2", "requirements": ["E >2", "F <4"]},
+            ]
+        },
+        {
+            "identifier": "C", "version": "1",
+            "requirements": ["G >4", "D <5"]
+        },
+        {
+            "identifier": "D", "version": "1",
+            "requirements": ["G ==1", "E >5"]
+        },
+        {"identifier": "E", "version": "3", "requirements": ["G >1"]},
+        {"identifier": "F", "version": "4", "requirements": ["G <4"]},
+        {"identifier": "F", "version": "2", "requirements": ["G <4"]},
+        {"identifier": "G", "version": "5"},
+        {"identifier": "G", "version": "1"},
+    ]
+
+    definition_mapping = {}
+
+    for _data in data:
+        definition = wiz.definition.Definition(_data)
+        definition_mapping.setdefault(definition.identifier, {})
+        definition_mapping[definition.identifier][
+            str(definition.version)
+        ] = definition
+
+    return definition_mapping
+
+
+@pytest.mark.parametrize("maximum_attempts", [15, 100], ids=[
+    "default",
+    "more-attempts",
+])
+def test_resolver_compute_packages_with_nogoods_identical(
+    mocker, maximum_attempts
+):
+    """Resolve packages identically with and without nogoods."""
+    mocked_record_action = mocker.patch.object(wiz.history, "record_action")
+    requirements = [Requirement("C"), Requirement("B")]
+
+    def _resolve():
+        """Return error message raised when resolving requirements."""
+        resolver = wiz.graph.Resolver(
+            _nogood_order_definition_mapping(), maximum_combinations=50,
+            maximum_attempts=maximum_attempts
+        )
+
+        with pytest.raises(wiz.exception.GraphConflictsError) as error:
+            resolver.compute_packages(requirements)
+
+        return str(error.value)
+
+    message = _resolve()
+
+    actions = [_call[0][0] for _call in mocked_record_action.call_args_list]
+    assert wiz.symbol.GRAPH_NOGOOD_USAGE_ACTION in actions
+
+    assert (
+        "Failed to resolve graph at combination #5:\n\n"
+        "The dependency graph could not be resolved due to the following "
+        "requirement conflicts:\n"
+        "  * ::G <4 \t[F==2]\n"
+        "  * ::G ==1 \t[D==1]\n"
+        "  * ::G >4 \t[C==1]\n"
+    ) in message
+
+    # Compare with resolution without nogoods.
+    mocker.patch.object(wiz.graph.Resolver, "_fetch_nogood", return_value=None)
+    assert _resolve() == message
+
+
 @pytest.mark.parametrize("combinations", [
     [],
     ["__COMB1__", "__COMB2__", "__COMB3__"],
@@ -1060,6 +1491,70 @@ def test_resolver_discover_combinations_fail(
     mocked_extract_combinations.assert_not_called()
 
 
+def test_resolver_discover_combinations_from_skipped(
+    mocker, mocked_deepcopy, mocked_extract_combinations
+):
+    """Discover new combinations from conflicts of skipped combination."""
+    combinations = [
+        mocker.Mock(
+            graph=mocker.Mock(**{"downgrade_versions.return_value": (
+                index == 1
+            )})
+        )
+        for index in range(2)
+    ]
+
+    resolver = wiz.graph.Resolver("__MAPPING__")
+    resolver._conflicting_combinations = collections.deque([
+        ("COMBINATION0", None), ("COMBINATION1", {"N2"})
+    ])
+    mocked_deepcopy.side_effect = combinations
+
+    mocked_fetch_skipped_error = mocker.patch.object(
+        resolver, "_fetch_skipped_error",
+        return_value=wiz.exception.GraphConflictsError({
+            Requirement("::A >=1"): {"N0"},
+            Requirement("::A <1"): {"N1"},
+        })
+    )
+
+    assert resolver.discover_combinations() is True
+
+    mocked_fetch_skipped_error.assert_called_once_with("COMBINATION0")
+
+    # Own conflicts of skipped combination are used first.
+    assert mocked_deepcopy.call_args_list == [
+        mocker.call("COMBINATION0"), mocker.call("COMBINATION0")
+    ]
+    combinations[0].graph.downgrade_versions.assert_called_once_with({"N1"})
+    combinations[1].graph.downgrade_versions.assert_called_once_with({"N0"})
+
+    mocked_extract_combinations.assert_called_once_with(
+        combinations[1].graph
+    )
+    assert list(resolver._conflicting_combinations) == [
+        ("COMBINATION1", {"N2"})
+    ]
+
+
+def test_resolver_discover_combinations_from_skipped_resolved(
+    mocker, mocked_deepcopy, mocked_extract_combinations
+):
+    """Return skipped combination which is resolved."""
+    resolver = wiz.graph.Resolver("__MAPPING__")
+    resolver._conflicting_combinations = collections.deque([
+        ("COMBINATION0", None), ("COMBINATION1", {"N2"})
+    ])
+
+    mocker.patch.object(resolver, "_fetch_skipped_error", return_value=None)
+
+    assert resolver.discover_combinations() is True
+    assert list(resolver._iterator) == ["COMBINATION0"]
+
+    mocked_deepcopy.assert_not_called()
+    mocked_extract_combinations.assert_not_called()
+
+
 def test_compute_distance_mapping_empty(mocked_graph):
     """Compute distance mapping from empty graph."""
     mocked_graph.outcoming.return_value = []
@@ -1280,6 +1775,66 @@ def test_compute_distance_mapping_complex(mocker, mocked_graph):
     }
 
 
+@pytest.mark.parametrize("seed", range(10))
+def test_update_distance_mapping(seed):
+    """Update distance mapping from random graph updates."""
+    randomizer = random.Random(seed)
+
+    packages = [
+        wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": "foo{}".format(index), "version": "0.1.0"
+            })
+        )
+        for index in range(40)
+    ]
+
+    graph = wiz.graph.Graph(None)
+
+    def _link(_package, parent_identifier):
+        """Link *_package* to *parent_identifier* with random weight."""
+        graph._create_link(
+            _package.identifier, parent_identifier,
+            Requirement(_package.definition.identifier),
+            weight=randomizer.randint(1, 5)
+        )
+
+    for index, package in enumerate(packages):
+        graph._create_node(package)
+
+        for parent in randomizer.sample(packages, 3) + ["root"] * (index < 3):
+            if parent == "root" or parent is not package:
+                _link(package, getattr(parent, "identifier", parent))
+
+    distance_mapping = wiz.graph._compute_distance_mapping(graph)
+    graph.pop_updates()
+
+    for _ in range(10):
+        for package in randomizer.sample(packages, 5):
+            if graph.exists(package.identifier):
+                graph.remove_node(package.identifier)
+            else:
+                graph._create_node(package)
+
+        for package in randomizer.sample(packages, 5):
+            if graph.exists(package.identifier):
+                _link(package, randomizer.choice(packages).identifier)
+
+        distance_mapping = wiz.graph._update_distance_mapping(
+            graph, distance_mapping, *graph.pop_updates()
+        )
+
+        expected = wiz.graph._compute_distance_mapping(graph)
+        assert sorted(distance_mapping.keys()) == sorted(expected.keys())
+        assert {
+            identifier: value["distance"]
+            for identifier, value in distance_mapping.items()
+        } == {
+            identifier: value["distance"]
+            for identifier, value in expected.items()
+        }
+
+
 def test_generate_variant_permutations_none_conflicting(
     mocked_graph, mocked_compute_distance_mapping,
     mocked_compute_conflicting_matrix
@@ -2047,6 +2602,187 @@ def test_extract_conflicting_requirements(mocked_graph):
     }
 
 
+def test_extract_nogoods(mocked_graph):
+    """Extract nogoods from conflicting requirements."""
+    packages = {
+        "A==2.0.0": wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": "A",
+                "version": "2.0.0",
+                "requirements": ["foo >=4"]
+            })
+        ),
+        "B==1.0.0": wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": "B",
+                "version": "1.0.0",
+                "requirements": ["foo <3"]
+            })
+        ),
+        "C==1.0.0": wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": "C",
+                "version": "1.0.0",
+                "requirements": ["foo"]
+            })
+        ),
+    }
+
+    mocked_graph.node = lambda _id: (
+        wiz.graph.Node(packages[_id]) if _id in packages else None
+    )
+
+    # Requirement recorded for 'C==1.0.0' has been combined when relinking
+    # parents, and node 'D' does not exist.
+    conflicts = [
+        (Requirement("::foo <3"), {"root", "B==1.0.0"}),
+        (Requirement("::foo >=3, <4"), {"C==1.0.0", "D"}),
+        (Requirement("::foo >=4"), {"A==2.0.0"}),
+    ]
+
+    nogoods = wiz.graph._extract_nogoods(
+        mocked_graph, conflicts, [Requirement("foo ==2.*")]
+    )
+
+    assert nogoods == [
+        frozenset(["A==2.0.0", "B==1.0.0"]),
+        frozenset(["A==2.0.0", "root"]),
+    ]
+
+
+def test_extract_nogoods_with_variants(mocked_graph):
+    """Extract nogoods from conflicting variant requirements."""
+    packages = {
+        "A": wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": "A",
+                "requirements": ["foo[V1]"]
+            })
+        ),
+        "B": wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": "B",
+                "requirements": ["foo[V2]"]
+            })
+        ),
+    }
+
+    mocked_graph.node = lambda _id: wiz.graph.Node(packages[_id])
+
+    # Requirement without variant is compatible with any variant.
+    conflicts = [
+        (Requirement("::foo"), {"root"}),
+        (Requirement("::foo[V1]"), {"A"}),
+        (Requirement("::foo[V2]"), {"B"}),
+    ]
+
+    nogoods = wiz.graph._extract_nogoods(
+        mocked_graph, conflicts, [Requirement("foo")]
+    )
+
+    assert nogoods == [frozenset(["A", "B"])]
+
+
+def _fixed_nodes_definition_mapping():
+    """Return definition mapping to identify fixed nodes."""
+    return {
+        "A": {
+            "1": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "1",
+                "requirements": ["C"]
+            }),
+            "2": wiz.definition.Definition({
+                "identifier": "A",
+                "version": "2",
+                "requirements": ["B"]
+            }),
+        },
+        "B": {"-": wiz.definition.Definition({"identifier": "B"})},
+        "C": {
+            "-": wiz.definition.Definition({
+                "identifier": "C",
+                "variants": [{"identifier": "V1", "requirements": ["ns::G"]}]
+            })
+        },
+        "E": {
+            "-": wiz.definition.Definition({
+                "identifier": "E",
+                "requirements": ["B"]
+            })
+        },
+        "F": {
+            "-": wiz.definition.Definition({
+                "identifier": "F",
+                "conditions": ["A"]
+            })
+        },
+        "ns::G": {
+            "-": wiz.definition.Definition({
+                "identifier": "G",
+                "namespace": "ns"
+            })
+        },
+        "H": {
+            "-": wiz.definition.Definition({
+                "identifier": "H",
+                "requirements": ["B"]
+            })
+        },
+        "__namespace__": {"G": {"ns"}}
+    }
+
+
+def test_extract_requirers():
+    """Extract definitions requiring each definition identifier."""
+    requirements = [
+        Requirement("A"), Requirement("E"), Requirement("F"), Requirement("G")
+    ]
+
+    # 'H' cannot be added to the graph as it is not required.
+    assert wiz.graph._extract_requirers(
+        requirements, _fixed_nodes_definition_mapping()
+    ) == {
+        "A": set(),
+        "B": {"A", "E"},
+        "C": {"A"},
+        "E": set(),
+        "F": set(),
+        "G": {"C"},
+    }
+
+
+@pytest.mark.parametrize("identifier, expected", [
+    ("root", True),
+    ("A==2", True),
+    ("B", True),
+    ("E", True),
+    ("F", False),
+    ("ns::G", False),
+    ("incorrect", False),
+], ids=[
+    "root",
+    "required-from-root",
+    "required-from-fixed-parents",
+    "required-from-root-only",
+    "with-conditions",
+    "required-from-other-definition",
+    "missing",
+])
+def test_is_fixed_node(identifier, expected):
+    """Indicate whether node is fixed in graph."""
+    definition_mapping = _fixed_nodes_definition_mapping()
+    requirements = [
+        Requirement("A"), Requirement("E"), Requirement("F"), Requirement("G")
+    ]
+
+    graph = wiz.graph.Graph(wiz.graph.Resolver(definition_mapping))
+    graph.update_from_requirements(requirements)
+
+    requirers = wiz.graph._extract_requirers(requirements, definition_mapping)
+    assert wiz.graph._is_fixed_node(graph, identifier, requirers) is expected
+
+
 def test_extract_conflicting_requirements_error(mocked_graph):
     """Fail to extract conflicting requirements from nodes."""
     nodes = [
@@ -2110,6 +2846,83 @@ def test_graph_copy():
     assert _graph.resolver == resolver
 
 
+@pytest.mark.parametrize("packages", ["many"], indirect=True)
+def test_graph_copy_update(mocked_resolver, mocked_package_extract, packages):
+    """Update copies of a graph without mutating each other."""
+    mocked_package_extract.side_effect = [
+        [packages["A==0.1.0"]], [packages["B==1.2.3"]], [packages["C"]],
+        [packages["D==4.1.0"]]
+    ]
+
+    graph = wiz.graph.Graph(mocked_resolver)
+    graph.update_from_requirements([Requirement("A")])
+
+    _graph = copy.deepcopy(graph)
+    assert _graph.data() == graph.data()
+    assert _graph.node("C") is not graph.node("C")
+
+    # Update copy.
+    _graph.update_from_package(packages["E==0.1.0"], Requirement("E"))
+    _graph._create_link("C", "E==0.1.0", Requirement("C"), weight=3)
+    _graph.node("C").add_parent("E==0.1.0")
+
+    # Update original graph.
+    mocked_package_extract.side_effect = wiz.exception.RequestNotFound("Z")
+    graph.update_from_requirements([Requirement("Z")])
+
+    assert sorted(graph.outcoming("root")) == ["A==0.1.0"]
+    assert graph.exists("E==0.1.0") is False
+    assert graph.outcoming("E==0.1.0") == []
+    assert graph.node("C").parent_identifiers == {"B==1.2.3"}
+    assert graph.nodes(definition_identifier="E") == []
+    assert graph.find(Requirement("E")) == set()
+    assert list(graph.errors().keys()) == ["root"]
+
+    assert sorted(_graph.outcoming("root")) == ["A==0.1.0", "E==0.1.0"]
+    assert _graph.exists("E==0.1.0") is True
+    assert _graph.outcoming("E==0.1.0") == ["C"]
+    assert _graph.node("C").parent_identifiers == {"B==1.2.3", "E==0.1.0"}
+    assert _graph.nodes(definition_identifier="E") == [
+        wiz.graph.Node(packages["E==0.1.0"], parent_identifiers={"root"})
+    ]
+    assert _graph.find(Requirement("E")) == {"E==0.1.0"}
+    assert _graph.errors() == {}
+
+
+def test_graph_copy_errors(mocked_resolver, mocked_package_extract):
+    """Record errors in copies of a graph without mutating each other."""
+    mocked_package_extract.side_effect = [
+        wiz.exception.RequestNotFound("A"),
+        wiz.exception.RequestNotFound("B"),
+        wiz.exception.RequestNotFound("C"),
+    ]
+
+    graph = wiz.graph.Graph(mocked_resolver)
+    graph.update_from_requirements([Requirement("A")])
+
+    _graph = copy.deepcopy(graph)
+    assert _graph.errors() == graph.errors()
+
+    # Record error in copy for the same parent.
+    _graph.update_from_requirements([Requirement("B")])
+
+    # Record error in original graph for the same parent.
+    graph.update_from_requirements([Requirement("C")])
+
+    assert graph.errors() == {
+        "root": [
+            wiz.exception.RequestNotFound("A"),
+            wiz.exception.RequestNotFound("C"),
+        ]
+    }
+    assert _graph.errors() == {
+        "root": [
+            wiz.exception.RequestNotFound("A"),
+            wiz.exception.RequestNotFound("B"),
+        ]
+    }
+
+
 @pytest.mark.parametrize("packages", ["many"], indirect=True)
 def test_graph_nodes(mocked_resolver, mocked_package_extract, packages):
     """Retrieve nodes within a simple graph."""
@@ -2337,6 +3150,56 @@ def test_graph_outcoming(mocked_resolver, mocked_package_extract, packages):
     assert graph.outcoming("whatever") == []
 
 
+@pytest.mark.parametrize("packages", ["many"], indirect=True)
+def test_graph_incoming(mocked_resolver, mocked_package_extract, packages):
+    """Retrieve incoming of nodes within a simple graph."""
+    # Set requirements and expected package extraction for test.
+    requirements = [Requirement("A==0.1.0")]
+    mocked_package_extract.side_effect = [
+        [packages["A==0.1.0"]], [packages["B==1.2.3"]], [packages["C"]],
+        [packages["D==4.1.0"]]
+    ]
+
+    # Create graph.
+    graph = wiz.graph.Graph(mocked_resolver)
+    graph.update_from_requirements(requirements)
+
+    assert graph.incoming("A==0.1.0") == ["root"]
+    assert graph.incoming("B==1.2.3") == ["A==0.1.0"]
+    assert graph.incoming("C") == ["B==1.2.3"]
+    assert graph.incoming("whatever") == []
+
+    graph.remove_node("B==1.2.3")
+    assert graph.incoming("C") == []
+
+
+@pytest.mark.parametrize("packages", ["many"], indirect=True)
+def test_graph_pop_updates(mocked_resolver, mocked_package_extract, packages):
+    """Retrieve node identifiers updated within a simple graph."""
+    # Set requirements and expected package extraction for test.
+    requirements = [Requirement("A==0.1.0")]
+    mocked_package_extract.side_effect = [
+        [packages["A==0.1.0"]], [packages["B==1.2.3"]], [packages["C"]],
+        [packages["D==4.1.0"]]
+    ]
+
+    # Create graph.
+    graph = wiz.graph.Graph(mocked_resolver)
+    graph.update_from_requirements(requirements)
+
+    assert graph.pop_updates() == (
+        set(), {"A==0.1.0", "B==1.2.3", "C", "D==4.1.0"}
+    )
+    assert graph.pop_updates() == (set(), set())
+
+    graph.remove_node("C")
+    graph.update_from_package(packages["E==0.1.0"], Requirement("E"))
+    _graph = copy.deepcopy(graph)
+
+    assert graph.pop_updates() == ({"C"}, {"E==0.1.0"})
+    assert _graph.pop_updates() == ({"C"}, {"E==0.1.0"})
+
+
 @pytest.mark.parametrize("packages", ["single"], indirect=True)
 def test_graph_find(mocked_resolver, mocked_package_extract, packages):
     """Find nodes from requirement."""
@@ -3929,6 +4792,44 @@ def test_graph_remove(mocked_resolver, mocked_package_extract, packages):
     }
 
 
+@pytest.mark.parametrize("packages", ["many"], indirect=True)
+def test_graph_remove_and_restore(
+    mocked_resolver, mocked_package_extract, packages
+):
+    """Remove one node from graph and add it again with its links."""
+    # Set requirements and expected package extraction for test.
+    requirements = [Requirement("A")]
+    mocked_package_extract.side_effect = [
+        [packages["A==0.1.0"]], [packages["B==1.2.3"]], [packages["C"]],
+        [packages["D==4.1.0"]]
+    ]
+
+    # Create graph.
+    graph = wiz.graph.Graph(mocked_resolver)
+    graph.update_from_requirements(requirements)
+    graph.remove_node("B==1.2.3")
+
+    assert graph.outcoming("A==0.1.0") == []
+    assert graph.outcoming("B==1.2.3") == ["C", "D==4.1.0"]
+    assert graph.incoming("C") == []
+    assert graph.link_weight("B==1.2.3", "A==0.1.0") == 1
+    assert graph.link_requirement("D==4.1.0", "B==1.2.3") == (
+        Requirement("::D >1")
+    )
+
+    mocked_package_extract.side_effect = [
+        [packages["C"]], [packages["D==4.1.0"]]
+    ]
+    graph.update_from_package(
+        packages["B==1.2.3"], Requirement("B"), detached=True
+    )
+
+    assert graph.outcoming("A==0.1.0") == ["B==1.2.3"]
+    assert graph.incoming("C") == ["B==1.2.3"]
+    assert graph.node("B==1.2.3").parent_identifiers == set()
+    assert graph.node("C").parent_identifiers == {"B==1.2.3"}
+
+
 def test_graph_remove_error(mocked_resolver):
     """Fail to remove one node from graph."""
     graph = wiz.graph.Graph(mocked_resolver)
@@ -4303,6 +5204,104 @@ def test_graph_downgrade_versions_fail(
     }
 
 
+def _version_chain_definition_mapping(requirement):
+    """Return definition mapping with a chain of 4 versions of 'A'.
+
+    'A==1.0.0' has *requirement* whereas each other version requires a
+    version of 'C' greater or equal to its own version. 'B' requires
+    'C[V1] <2'.
+
+    """
+    return {
+        "A": {
+            "{}.0.0".format(version): wiz.definition.Definition({
+                "identifier": "A",
+                "version": "{}.0.0".format(version),
+                "requirements": [
+                    "C >={}".format(version) if version > 1 else requirement
+                ]
+            })
+            for version in range(1, 5)
+        },
+        "B": {
+            "-": wiz.definition.Definition({
+                "identifier": "B",
+                "requirements": ["C[V1] <2"]
+            })
+        },
+        "C": {
+            "{}.0.0".format(version): wiz.definition.Definition({
+                "identifier": "C",
+                "version": "{}.0.0".format(version),
+                "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+            })
+            for version in range(1, 5)
+        },
+    }
+
+
+def test_graph_downgrade_versions_skip_incompatible():
+    """Downgrade node versions directly to compatible versions."""
+    resolver = wiz.graph.Resolver(_version_chain_definition_mapping("C <2"))
+
+    graph = wiz.graph.Graph(resolver)
+    graph.update_from_requirements([Requirement("A"), Requirement("B")])
+
+    assert graph.downgrade_versions({"A==4.0.0"}) is True
+
+    # Versions 3.0.0 and 2.0.0 are skipped.
+    assert sorted(graph.data()["node_mapping"].keys()) == [
+        "A==1.0.0", "B", "C[V1]==1.0.0", "C[V1]==4.0.0", "C[V2]==1.0.0",
+        "C[V2]==4.0.0"
+    ]
+    assert graph.data()["link_mapping"]["root"] == {
+        "A==4.0.0": {"requirement": Requirement("::A"), "weight": 1},
+        "A==1.0.0": {"requirement": Requirement("::A"), "weight": 1},
+        "B": {"requirement": Requirement("::B"), "weight": 2},
+    }
+
+
+def test_graph_downgrade_versions_skip_incompatible_fail():
+    """Fail to downgrade node versions without compatible versions."""
+    resolver = wiz.graph.Resolver(
+        _version_chain_definition_mapping("C[V2] <2")
+    )
+
+    graph = wiz.graph.Graph(resolver)
+    graph.update_from_requirements([Requirement("A"), Requirement("B")])
+    data = graph.data()
+
+    # 'A==1.0.0' requires a variant incompatible with 'C[V1] <2'.
+    assert graph.downgrade_versions({"A==4.0.0"}) is False
+    assert graph.data() == data
+
+
+def test_extract_constraint():
+    """Extract constraint recorded in graph for requirement."""
+    resolver = wiz.graph.Resolver(_version_chain_definition_mapping("C <2"))
+
+    graph = wiz.graph.Graph(resolver)
+    graph.update_from_requirements([
+        Requirement("A"), Requirement("B"), Requirement("C >=1")
+    ])
+
+    constraint = wiz.graph._extract_constraint(
+        graph, Requirement("C"), {"A==4.0.0", "C[V1]==4.0.0", "C[V2]==4.0.0"}
+    )
+    assert constraint == (
+        frozenset(["V1"]),
+        wiz.utility.fetch_version_ranges(Requirement("C >=1, <2"))
+    )
+
+    # Constraint is conflicting when 'A==4.0.0' is not excluded.
+    assert wiz.graph._extract_constraint(graph, Requirement("C"), set()) is None
+
+    # No constraint for unknown definition.
+    assert wiz.graph._extract_constraint(
+        graph, Requirement("D"), set()
+    ) is None
+
+
 @pytest.mark.parametrize("options, parent_identifiers", [
     ({}, set()),
     ({"parent_identifiers": {"foo"}}, {"foo"}),
@@ -5154,29 +6153,28 @@ def test_prune_graph_one_unreachable(
 
 @pytest.mark.parametrize("packages", ["many-with-conditions"], indirect=True)
 def test_prune_graph_unfulfilled_conditions_one(
-    mocker, mocked_graph, mocked_compute_distance_mapping, packages
+    mocker, mocked_graph, mocked_compute_distance_mapping,
+    mocked_update_distance_mapping, packages
 ):
     """Prune graph with one unfulfilled conditioned node to remove."""
-    mocked_compute_distance_mapping.side_effect = [
-        {
-            "A==0.1.0": {"distance": 1},
-            "B==1.2.3": {"distance": 2},
-            "C": {"distance": 4},
-            "D==4.1.0": {"distance": None},
-            "E": {"distance": 2},
-            "F==13": {"distance": 3},
-            "G": {"distance": 3},
-        },
-        {
-            "A==0.1.0": {"distance": 1},
-            "B==1.2.3": {"distance": 2},
-            "C": {"distance": 4},
-            "D==4.1.0": {"distance": None},
-            "E": {"distance": 2},
-            "F==13": {"distance": 3},
-            "G": {"distance": None},
-        },
-    ]
+    mocked_compute_distance_mapping.return_value = {
+        "A==0.1.0": {"distance": 1},
+        "B==1.2.3": {"distance": 2},
+        "C": {"distance": 4},
+        "D==4.1.0": {"distance": None},
+        "E": {"distance": 2},
+        "F==13": {"distance": 3},
+        "G": {"distance": 3},
+    }
+    mocked_update_distance_mapping.return_value = {
+        "A==0.1.0": {"distance": 1},
+        "B==1.2.3": {"distance": 2},
+        "C": {"distance": 4},
+        "D==4.1.0": {"distance": None},
+        "E": {"distance": 2},
+        "F==13": {"distance": 3},
+        "G": {"distance": None},
+    }
 
     mocked_graph.nodes.side_effect = [
         [
@@ -5210,10 +6208,18 @@ def test_prune_graph_unfulfilled_conditions_one(
     mocked_graph.exists.side_effect = [True, True, True, False]
     mocked_graph.find.side_effect = [["E"], ["F==13"], [], ["E"]]
 
+    mocked_graph.pop_updates.side_effect = [
+        (set(), set()), ({"D==4.1.0", "G"}, set())
+    ]
+
     combination = wiz.graph.Combination(mocked_graph, copy_data=False)
     combination.prune_graph()
 
-    assert mocked_compute_distance_mapping.call_count == 2
+    mocked_compute_distance_mapping.assert_called_once_with(mocked_graph)
+    mocked_update_distance_mapping.assert_called_once_with(
+        mocked_graph, mocked_compute_distance_mapping.return_value,
+        {"D==4.1.0", "G"}, set()
+    )
 
     assert mocked_graph.remove_node.call_args_list == [
         mocker.call("D==4.1.0"),
@@ -5235,29 +6241,28 @@ def test_prune_graph_unfulfilled_conditions_one(
 
 @pytest.mark.parametrize("packages", ["many-with-conditions"], indirect=True)
 def test_prune_graph_unfulfilled_conditions_two(
-    mocker, mocked_graph, mocked_compute_distance_mapping, packages
+    mocker, mocked_graph, mocked_compute_distance_mapping,
+    mocked_update_distance_mapping, packages
 ):
     """Prune graph with two unfulfilled conditioned nodes to remove."""
-    mocked_compute_distance_mapping.side_effect = [
-        {
-            "A==0.1.0": {"distance": 1},
-            "B==1.2.3": {"distance": 2},
-            "C": {"distance": 4},
-            "D==4.1.0": {"distance": 5},
-            "E": {"distance": None},
-            "F==13": {"distance": None},
-            "G": {"distance": 3},
-        },
-        {
-            "A==0.1.0": {"distance": None},
-            "B==1.2.3": {"distance": None},
-            "C": {"distance": None},
-            "D==4.1.0": {"distance": None},
-            "E": {"distance": None},
-            "F==13": {"distance": None},
-            "G": {"distance": None},
-        },
-    ]
+    mocked_compute_distance_mapping.return_value = {
+        "A==0.1.0": {"distance": 1},
+        "B==1.2.3": {"distance": 2},
+        "C": {"distance": 4},
+        "D==4.1.0": {"distance": 5},
+        "E": {"distance": None},
+        "F==13": {"distance": None},
+        "G": {"distance": 3},
+    }
+    mocked_update_distance_mapping.return_value = {
+        "A==0.1.0": {"distance": None},
+        "B==1.2.3": {"distance": None},
+        "C": {"distance": None},
+        "D==4.1.0": {"distance": None},
+        "E": {"distance": None},
+        "F==13": {"distance": None},
+        "G": {"distance": None},
+    }
 
     mocked_graph.nodes.side_effect = [
         [
@@ -5291,10 +6296,18 @@ def test_prune_graph_unfulfilled_conditions_two(
     mocked_graph.exists.side_effect = [True, True, False, False, False, False]
     mocked_graph.find.side_effect = [[], []]
 
+    mocked_graph.pop_updates.side_effect = [
+        (set(), set()), ({"E", "F==13", "A==0.1.0", "G"}, set())
+    ]
+
     combination = wiz.graph.Combination(mocked_graph, copy_data=False)
     combination.prune_graph()
 
-    assert mocked_compute_distance_mapping.call_count == 2
+    mocked_compute_distance_mapping.assert_called_once_with(mocked_graph)
+    mocked_update_distance_mapping.assert_called_once_with(
+        mocked_graph, mocked_compute_distance_mapping.return_value,
+        {"E", "F==13", "A==0.1.0", "G"}, set()
+    )
 
     assert mocked_graph.remove_node.call_args_list == [
         mocker.call("E"),
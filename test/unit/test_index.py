@@ -0,0 +1,259 @@
+# :coding: utf-8
+
+import os
+
+import pytest
+import ujson
+
+import wiz.config
+import wiz.definition
+import wiz.index
+from wiz import __version__
+
+
+@pytest.fixture()
+def registry(temporary_directory):
+    """Return mocked registry path with two definitions."""
+    path = os.path.join(temporary_directory, "registry")
+    os.makedirs(path)
+
+    for identifier in ["foo", "bar"]:
+        file_path = os.path.join(path, "{}.json".format(identifier))
+        with open(file_path, "w") as stream:
+            stream.write(ujson.dumps({"identifier": identifier}))
+
+    return path
+
+
+@pytest.fixture()
+def index_path(temporary_directory):
+    """Return path to index file."""
+    return os.path.join(temporary_directory, "index", "registry.json")
+
+
+@pytest.fixture()
+def mocked_config_fetch(mocker):
+    """Return mocked config.fetch function."""
+    return mocker.patch.object(wiz.config, "fetch", return_value={})
+
+
+def test_get_directory(mocked_config_fetch, mocker):
+    """Return default index directory."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+    assert wiz.index.get_directory() == os.path.join(
+        "__HOME__", ".wiz", "index"
+    )
+
+
+def test_get_directory_from_config(mocked_config_fetch):
+    """Return index directory from configuration."""
+    mocked_config_fetch.return_value = {
+        "registry": {"index_directory": "/path/to/index"}
+    }
+    assert wiz.index.get_directory() == "/path/to/index"
+
+
+def test_get_path(mocker):
+    """Return index path from registry path."""
+    mocker.patch.object(
+        wiz.index, "get_directory", return_value="/path/to/index"
+    )
+
+    path1 = wiz.index.get_path("/path/to/registry1")
+    path2 = wiz.index.get_path("/path/to/registry2")
+
+    assert os.path.dirname(path1) == "/path/to/index"
+    assert path1.endswith(".json")
+    assert path1 != path2
+    assert path1 == wiz.index.get_path("/path/to/registry1/")
+
+
+def test_compute_signature(temporary_file):
+    """Return stat signature of file."""
+    with open(temporary_file, "w") as stream:
+        stream.write("test")
+
+    signature = wiz.index.compute_signature(temporary_file)
+    assert signature == [os.path.getmtime(temporary_file), 4]
+
+
+def test_compute_signature_missing(temporary_directory):
+    """Return None when file does not exist."""
+    path = os.path.join(temporary_directory, "missing.json")
+    assert wiz.index.compute_signature(path) is None
+
+
+def test_index_empty(registry, index_path):
+    """Fail to fetch definitions from empty index."""
+    index = wiz.index.Index(registry, path=index_path)
+    assert index.path == index_path
+    assert index.registry_path == registry
+
+    path = os.path.join(registry, "foo.json")
+    assert index.fetch(path) is None
+
+    assert index.save() is False
+    assert not os.path.isfile(index_path)
+
+
+def test_index_save_and_fetch(registry, index_path):
+    """Fetch definitions recorded in a saved index."""
+    path1 = os.path.join(registry, "foo.json")
+    path2 = os.path.join(registry, "bar.json")
+
+    index = wiz.index.Index(registry, path=index_path)
+
+    for path in [path1, path2]:
+        assert index.fetch(path) is None
+        index.update(path, wiz.definition.load(path, registry_path=registry))
+
+    assert index.save() is True
+    assert os.path.isfile(index_path)
+    assert os.listdir(os.path.dirname(index_path)) == ["registry.json"]
+
+    index = wiz.index.Index(registry, path=index_path)
+
+    definition = index.fetch(path1)
+    assert isinstance(definition, wiz.definition.Definition)
+    assert definition.identifier == "foo"
+    assert definition.path == path1
+    assert definition.registry_path == registry
+
+    definition = index.fetch(path2)
+    assert definition.identifier == "bar"
+
+    # Nothing changed, so the index is not written again.
+    assert index.save() is False
+
+
+def test_index_modified_file(registry, index_path):
+    """Fail to fetch definition when file has been modified."""
+    path = os.path.join(registry, "foo.json")
+
+    index = wiz.index.Index(registry, path=index_path)
+    index.fetch(path)
+    index.update(path, wiz.definition.load(path))
+    index.save()
+
+    with open(path, "w") as stream:
+        stream.write(ujson.dumps({"identifier": "foo", "version": "0.1.0"}))
+
+    index = wiz.index.Index(registry, path=index_path)
+    assert index.fetch(path) is None
+
+
+def test_index_prune(registry, index_path):
+    """Remove entries which have not been visited."""
+    path1 = os.path.join(registry, "foo.json")
+    path2 = os.path.join(registry, "bar.json")
+
+    index = wiz.index.Index(registry, path=index_path)
+    for path in [path1, path2]:
+        index.fetch(path)
+        index.update(path, wiz.definition.load(path))
+    index.save()
+
+    # Entries are kept when pruning is disabled.
+    index = wiz.index.Index(registry, path=index_path)
+    index.fetch(path1)
+    assert index.save(prune=False) is False
+
+    index = wiz.index.Index(registry, path=index_path)
+    index.fetch(path1)
+    assert index.save() is True
+
+    index = wiz.index.Index(registry, path=index_path)
+    assert index.fetch(path1) is not None
+    assert index.fetch(path2) is None
+
+
+def test_index_contains(registry, index_path):
+    """Indicate whether files are indexed and unchanged."""
+    path1 = os.path.join(registry, "foo.json")
+    path2 = os.path.join(registry, "bar.json")
+
+    index = wiz.index.Index(registry, path=index_path)
+    index.fetch(path1)
+    index.update(path1, wiz.definition.load(path1))
+    index.save()
+
+    with open(path1, "w") as stream:
+        stream.write(ujson.dumps({"identifier": "foo", "version": "0.1.0"}))
+
+    index = wiz.index.Index(registry, path=index_path)
+    assert index.contains(path1) is False
+    assert index.contains(path2) is False
+
+    index.fetch(path1)
+    index.update(path1, wiz.definition.load(path1))
+    assert index.contains(path1) is True
+
+
+def test_index_search(registry, index_path):
+    """Return paths of indexed definitions containing keyword."""
+    path1 = os.path.join(registry, "foo.json")
+    path2 = os.path.join(registry, "bar.json")
+
+    with open(path1, "w") as stream:
+        stream.write(ujson.dumps({
+            "identifier": "foo", "command": {"app": "App", "foo": "Foo"},
+        }))
+
+    index = wiz.index.Index(registry, path=index_path)
+    index.fetch(path1)
+    index.update(path1, wiz.definition.load(path1))
+    index.save()
+
+    index = wiz.index.Index(registry, path=index_path)
+    assert index.search("app") == {path1}
+    assert index.search("foo") == {path1}
+    assert index.search("auto-use") == set()
+
+    # Keywords are recorded for definitions updated after searching.
+    with open(path2, "w") as stream:
+        stream.write(ujson.dumps({
+            "identifier": "bar", "command": {"app": "App"}, "auto-use": True
+        }))
+
+    index.fetch(path2)
+    index.update(path2, wiz.definition.load(path2))
+    assert index.search("app") == {path1, path2}
+    assert index.search("auto-use") == {path2}
+
+
+@pytest.mark.parametrize("data", [
+    "{\"format\": 0, \"version\": \"__VERSION__\", \"entries\": {}}",
+    "{\"format\": 1, \"version\": \"0.0.0\", \"entries\": {}}",
+    "{\"format\": 1, \"version\": \"__VERSION__\", \"registry\": \"/other\"}",
+    "[]",
+    "incorrect",
+], ids=[
+    "incorrect-format",
+    "incorrect-version",
+    "incorrect-registry",
+    "incorrect-type",
+    "corrupted",
+])
+def test_index_outdated(registry, index_path, data):
+    """Ignore outdated or corrupted index."""
+    path = os.path.join(registry, "foo.json")
+
+    os.makedirs(os.path.dirname(index_path))
+    with open(index_path, "w") as stream:
+        stream.write(data.replace("__VERSION__", __version__))
+
+    index = wiz.index.Index(registry, path=index_path)
+    assert index.fetch(path) is None
+
+
+def test_index_save_error(registry, temporary_file):
+    """Fail to save index silently."""
+    path = os.path.join(registry, "foo.json")
+
+    # Index directory cannot be created as a file exists with the same name.
+    index_path = os.path.join(temporary_file, "registry.json")
+
+    index = wiz.index.Index(registry, path=index_path)
+    index.fetch(path)
+    index.update(path, wiz.definition.load(path))
+    assert index.save() is False
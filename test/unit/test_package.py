@@ -6,7 +6,8 @@ import wiz.definition
 import wiz.environ
 import wiz.exception
 import wiz.package
-from wiz.utility import Requirement, Version
+from wiz._requirement import Requirement
+from wiz.utility import Version
 
 
 @pytest.fixture()
@@ -512,7 +513,6 @@ def test_minimal_package():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {"identifier": "test"}
     assert package.localized_environ() == {}
@@ -538,7 +538,6 @@ def test_minimal_variant_package():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]",
@@ -567,7 +566,6 @@ def test_minimal_package_with_namespace():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "foo::test",
@@ -597,7 +595,6 @@ def test_minimal_variant_package_with_namespace():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "foo::test[V1]",
@@ -627,7 +624,6 @@ def test_package_with_version():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test==0.1.0",
@@ -657,7 +653,6 @@ def test_variant_package_with_version():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]==0.1.0",
@@ -688,7 +683,6 @@ def test_package_with_version_and_namespace():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "foo::test==0.1.0",
@@ -720,7 +714,6 @@ def test_variant_package_with_version_and_namespace():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "foo::test[V1]==0.1.0",
@@ -751,7 +744,6 @@ def test_package_with_description():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test",
@@ -781,7 +773,6 @@ def test_variant_package_with_description():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]",
@@ -811,7 +802,6 @@ def test_package_with_install_location():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test",
@@ -843,7 +833,6 @@ def test_variant_package_with_install_location():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]",
@@ -877,7 +866,6 @@ def test_variant_package_with_install_location_overwrite():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]",
@@ -909,7 +897,6 @@ def test_package_with_command():
     assert package.command == {"app": "App0.1"}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test",
@@ -948,7 +935,6 @@ def test_variant_package_with_command(mocked_combine_command):
     assert package.command == mocked_combine_command.return_value
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]",
@@ -980,7 +966,6 @@ def test_package_with_environ():
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test",
@@ -1019,7 +1004,6 @@ def test_variant_package_with_environ(mocked_combine_environ):
     assert package.command == {}
     assert package.requirements == []
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]",
@@ -1057,7 +1041,6 @@ def test_package_with_requirements():
         Requirement("envC")
     ]
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test",
@@ -1101,7 +1084,6 @@ def test_variant_package_with_requirements():
         Requirement("envC"),
     ]
     assert package.conditions == []
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]",
@@ -1142,7 +1124,6 @@ def test_package_with_conditions():
         Requirement("envB >= 3.4.2, < 4"),
         Requirement("envC")
     ]
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test",
@@ -1154,9 +1135,6 @@ def test_package_with_conditions():
     }
     assert package.localized_environ() == {}
 
-    package.conditions_processed = True
-    assert package.conditions_processed is True
-
 
 def test_variant_package_with_conditions():
     """Create a variant package with conditions."""
@@ -1183,7 +1161,6 @@ def test_variant_package_with_conditions():
     assert package.conditions == [
         Requirement("envA >= 1.0.0"),
     ]
-    assert package.conditions_processed is False
 
     assert package.data() == {
         "identifier": "test[V1]",
@@ -1194,9 +1171,6 @@ def test_variant_package_with_conditions():
     }
     assert package.localized_environ() == {}
 
-    package.conditions_processed = True
-    assert package.conditions_processed is True
-
 
 def test_package_localized_environ():
     """Return localized environment."""
@@ -0,0 +1,363 @@
+# :coding: utf-8
+
+import os
+
+import pytest
+import ujson
+
+import wiz.definition
+import wiz.exception
+import wiz.filesystem
+import wiz.snapshot
+
+
+@pytest.fixture()
+def registries(temporary_directory):
+    """Return mocked registry paths with definitions."""
+    mapping = {
+        "registry1": {
+            "foo1.json": {"identifier": "foo", "version": "0.1.0"},
+            "level1": {
+                "foo2.json": {
+                    "identifier": "foo", "version": "1.0.0",
+                    "system": {"platform": "linux"}
+                },
+                "foo3.json": {
+                    "identifier": "foo", "version": "0.2.0",
+                    "system": {"platform": "windows"}
+                },
+            },
+            "bar.json": {"identifier": "bar", "namespace": "test"},
+        },
+        "registry2": {
+            "baz.json": {
+                "identifier": "baz", "version": "0.1.0",
+                "environ": {"KEY": "VALUE"},
+            },
+            "disabled.json": {"identifier": "bim", "disabled": True},
+            "incorrect.json": "",
+        }
+    }
+
+    def _create_structure(root, _mapping):
+        """Create the mocked registry structure *_mapping* in *root*."""
+        for key, value in _mapping.items():
+            path = os.path.join(root, key)
+
+            if key.endswith(".json"):
+                with open(path, "w") as stream:
+                    stream.write(ujson.dumps(value) if value else "")
+
+            else:
+                os.makedirs(path)
+                _create_structure(path, value)
+
+    _create_structure(temporary_directory, mapping)
+
+    return [
+        os.path.join(temporary_directory, "registry1"),
+        os.path.join(temporary_directory, "registry2"),
+    ]
+
+
+@pytest.fixture()
+def snapshot_path(temporary_directory):
+    """Return path to snapshot file."""
+    return os.path.join(temporary_directory, "snapshot", "registry.snapshot")
+
+
+def test_compute_fingerprint(registries):
+    """Compute fingerprint of registries."""
+    fingerprint = wiz.snapshot.compute_fingerprint(registries)
+    assert fingerprint == wiz.snapshot.compute_fingerprint(registries)
+    assert fingerprint != wiz.snapshot.compute_fingerprint(registries[:1])
+    assert fingerprint != wiz.snapshot.compute_fingerprint(
+        registries, max_depth=0
+    )
+
+    # Definition files modified in place are not detected.
+    path = os.path.join(registries[0], "level1", "foo2.json")
+    with open(path, "w") as stream:
+        stream.write(ujson.dumps({"identifier": "foo", "version": "1.0.1"}))
+
+    assert fingerprint == wiz.snapshot.compute_fingerprint(registries)
+
+    # Definition files replaced are detected.
+    wiz.filesystem.export(
+        path, ujson.dumps({"identifier": "foo", "version": "1.0.2"}),
+        overwrite=True
+    )
+
+    _fingerprint = wiz.snapshot.compute_fingerprint(registries)
+    assert fingerprint != _fingerprint
+
+    # Definition files removed are detected.
+    os.remove(os.path.join(registries[1], "baz.json"))
+    assert _fingerprint != wiz.snapshot.compute_fingerprint(registries)
+
+
+def test_pack(registries, snapshot_path):
+    """Pack registries into snapshot."""
+    assert wiz.snapshot.pack(snapshot_path, registries) == 5
+    assert os.path.isfile(snapshot_path)
+    assert os.listdir(os.path.dirname(snapshot_path)) == ["registry.snapshot"]
+
+    with wiz.snapshot.Snapshot(snapshot_path) as snapshot:
+        assert snapshot.path == snapshot_path
+        assert snapshot.registry_paths == registries
+        assert snapshot.max_depth is None
+        assert snapshot.fingerprint == wiz.snapshot.compute_fingerprint(
+            registries
+        )
+        assert len(snapshot) == 5
+        assert snapshot.is_valid(registries) is True
+
+
+def test_snapshot_discover(registries, snapshot_path):
+    """Discover definitions from snapshot in discovery order."""
+    wiz.snapshot.pack(snapshot_path, registries)
+    expected = list(wiz.definition.discover(registries))
+
+    with wiz.snapshot.Snapshot(snapshot_path) as snapshot:
+        definitions = list(snapshot.discover())
+
+        assert len(definitions) == len(expected)
+
+        for definition, _expected in zip(definitions, expected):
+            assert definition.data() == _expected.data()
+            assert definition.path == _expected.path
+            assert definition.registry_path == _expected.registry_path
+
+        definitions = list(
+            snapshot.discover(system_mapping={"platform": "linux"})
+        )
+        assert sorted(
+            definition.qualified_version_identifier
+            for definition in definitions
+        ) == ["baz==0.1.0", "foo==0.1.0", "foo==1.0.0", "test::bar"]
+
+
+def test_snapshot_query(registries, snapshot_path):
+    """Query definitions from snapshot."""
+    wiz.snapshot.pack(snapshot_path, registries)
+
+    with wiz.snapshot.Snapshot(snapshot_path) as snapshot:
+        assert [
+            definition.version_identifier
+            for definition in snapshot.query("foo")
+        ] == ["foo==1.0.0", "foo==0.2.0", "foo==0.1.0"]
+
+        assert [
+            definition.version_identifier
+            for definition in snapshot.query(
+                "foo", system_mapping={"platform": "windows"}
+            )
+        ] == ["foo==0.2.0", "foo==0.1.0"]
+
+        definitions = snapshot.query("baz")
+        assert len(definitions) == 1
+        assert definitions[0].environ == {"KEY": "VALUE"}
+        assert definitions[0].registry_path == registries[1]
+        assert definitions[0].path == os.path.join(registries[1], "baz.json")
+
+        assert snapshot.query("bar")[0].qualified_identifier == "test::bar"
+
+        assert snapshot.query("bim") == []
+        assert snapshot.query("a") == []
+        assert snapshot.query("zzz") == []
+
+
+def test_snapshot_search(registries, snapshot_path):
+    """Search definitions from snapshot."""
+    wiz.snapshot.pack(snapshot_path, registries)
+
+    with wiz.snapshot.Snapshot(snapshot_path) as snapshot:
+        assert [
+            definition.version_identifier
+            for definition in snapshot.search("version")
+        ] == ["foo==0.1.0", "foo==1.0.0", "foo==0.2.0", "baz==0.1.0"]
+
+        assert [
+            definition.version_identifier
+            for definition in snapshot.search(
+                "version", system_mapping={"platform": "windows"}
+            )
+        ] == ["foo==0.1.0", "foo==0.2.0", "baz==0.1.0"]
+
+        definitions = snapshot.search("KEY")
+        assert len(definitions) == 1
+        assert definitions[0].environ == {"KEY": "VALUE"}
+
+        # Only strings are matched.
+        assert snapshot.search("VAL") == []
+        assert snapshot.search("bim") == []
+
+
+def test_snapshot_empty(temporary_directory, snapshot_path):
+    """Pack and query empty registry."""
+    assert wiz.snapshot.pack(snapshot_path, [temporary_directory]) == 0
+
+    with wiz.snapshot.Snapshot(snapshot_path) as snapshot:
+        assert len(snapshot) == 0
+        assert list(snapshot.discover()) == []
+        assert snapshot.query("foo") == []
+        assert snapshot.search("foo") == []
+
+
+@pytest.mark.parametrize("content, message", [
+    (b"", "Snapshot cannot be opened"),
+    (b"WIZ", "Snapshot is corrupted"),
+    (
+        wiz.snapshot.MAGIC + b"\x01\x00\x00\x00\xff\x00\x00\x00",
+        "Snapshot is corrupted"
+    ),
+    (b"INCORRECT" * 10, "Invalid snapshot file."),
+], ids=[
+    "empty",
+    "truncated",
+    "truncated-metadata",
+    "incorrect-magic",
+])
+def test_snapshot_incorrect(temporary_file, content, message):
+    """Fail to open incorrect snapshot."""
+    with open(temporary_file, "wb") as stream:
+        stream.write(content)
+
+    with pytest.raises(wiz.exception.SnapshotError) as error:
+        wiz.snapshot.Snapshot(temporary_file)
+
+    assert message in str(error.value)
+
+
+def test_snapshot_incorrect_version(mocker, registries, snapshot_path):
+    """Fail to open snapshot created by another version."""
+    wiz.snapshot.pack(snapshot_path, registries)
+    mocker.patch.object(wiz.snapshot, "__version__", "0.0.0")
+
+    with pytest.raises(wiz.exception.SnapshotError) as error:
+        wiz.snapshot.Snapshot(snapshot_path)
+
+    assert "Snapshot created with another version of Wiz." in str(error.value)
+
+
+def test_fetch(registries, snapshot_path):
+    """Fetch valid snapshot."""
+    wiz.snapshot.pack(snapshot_path, registries, max_depth=1)
+
+    snapshot = wiz.snapshot.fetch(snapshot_path, registries, max_depth=1)
+    assert isinstance(snapshot, wiz.snapshot.Snapshot)
+    snapshot.close()
+
+    # Registries are different.
+    assert wiz.snapshot.fetch(
+        snapshot_path, registries[:1], max_depth=1
+    ) is None
+
+    # Maximum depth is different.
+    assert wiz.snapshot.fetch(snapshot_path, registries) is None
+
+    # A definition was added.
+    path = os.path.join(registries[1], "new.json")
+    with open(path, "w") as stream:
+        stream.write(ujson.dumps({"identifier": "new"}))
+
+    assert wiz.snapshot.fetch(
+        snapshot_path, registries, max_depth=1
+    ) is None
+
+
+def test_fetch_missing(registries, snapshot_path):
+    """Fail to fetch missing snapshot."""
+    assert wiz.snapshot.fetch(snapshot_path, registries) is None
+
+
+def test_fetch_incorrect(registries, temporary_file):
+    """Fail to fetch incorrect snapshot."""
+    assert wiz.snapshot.fetch(temporary_file, registries) is None
+
+
+def test_discover_from_snapshot(mocker, registries, snapshot_path):
+    """Discover definitions from snapshot or from registries when outdated."""
+    wiz.snapshot.pack(snapshot_path, registries)
+
+    mocked_load = mocker.patch.object(
+        wiz.definition, "load", wraps=wiz.definition.load
+    )
+
+    mapping = wiz.definition.fetch(
+        registries, system_mapping={"platform": "linux"},
+        snapshot_path=snapshot_path
+    )
+    mocked_load.assert_not_called()
+
+    expected = wiz.definition.fetch(
+        registries, system_mapping={"platform": "linux"}
+    )
+    assert mocked_load.call_count == 7
+
+    assert mapping["command"] == expected["command"]
+    assert mapping["implicit-packages"] == expected["implicit-packages"]
+    assert sorted(mapping["package"].keys()) == [
+        "__namespace__", "baz", "foo", "test::bar"
+    ]
+
+    for identifier, versions in expected["package"].items():
+        if identifier == "__namespace__":
+            assert mapping["package"][identifier] == versions
+            continue
+
+        assert sorted(mapping["package"][identifier].keys()) == sorted(
+            versions.keys()
+        )
+
+    # Fall back to registries when snapshot is outdated.
+    mocked_load.reset_mock()
+
+    path = os.path.join(registries[1], "new.json")
+    with open(path, "w") as stream:
+        stream.write(ujson.dumps({"identifier": "new"}))
+
+    mapping = wiz.definition.fetch(
+        registries, system_mapping={"platform": "linux"},
+        snapshot_path=snapshot_path
+    )
+    assert "new" in mapping["package"]
+    assert mocked_load.call_count == 8
+
+
+def test_fetch_targeted_from_snapshot(mocker, registries, snapshot_path):
+    """Query requested definitions from snapshot."""
+    wiz.snapshot.pack(snapshot_path, registries)
+    system_mapping = {"platform": "linux"}
+
+    expected = wiz.definition.fetch(
+        registries, system_mapping=system_mapping
+    )
+
+    mocked_load = mocker.patch.object(
+        wiz.definition, "load", wraps=wiz.definition.load
+    )
+    mocked_query = mocker.patch.object(
+        wiz.snapshot.Snapshot, "query", autospec=True,
+        side_effect=wiz.snapshot.Snapshot.query
+    )
+
+    mapping = wiz.definition.fetch(
+        registries, system_mapping=system_mapping,
+        snapshot_path=snapshot_path, targeted=True
+    )
+
+    package_mapping = mapping["package"]
+    assert list(dict.keys(package_mapping)) == ["__namespace__"]
+    mocked_query.assert_not_called()
+
+    assert sorted(package_mapping["foo"].keys()) == sorted(
+        expected["package"]["foo"].keys()
+    )
+    assert package_mapping["test::bar"]["-"].path == (
+        expected["package"]["test::bar"]["-"].path
+    )
+    assert mocked_query.call_count == 2
+    assert mapping["implicit-packages"] == expected["implicit-packages"]
+
+    mocked_load.assert_not_called()
@@ -0,0 +1,288 @@
+# :coding: utf-8
+
+import itertools
+import os
+
+import pytest
+
+import wiz.config
+import wiz.definition
+import wiz.exception
+import wiz.graph
+import wiz.solver
+from wiz._requirement import Requirement
+
+
+@pytest.fixture(autouse=True)
+def reset_configuration(mocker):
+    """Ensure that no personal configuration is fetched during tests."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+
+    # Reset configuration.
+    wiz.config.fetch(refresh=True)
+
+
+def _definition_mapping(data):
+    """Return definition mapping from list of definition *data*."""
+    mapping = {}
+
+    for _data in data:
+        definition = wiz.definition.Definition(_data)
+        mapping.setdefault(definition.identifier, {})
+        mapping[definition.identifier][str(definition.version)] = definition
+
+    return mapping
+
+
+def _identifiers(packages):
+    """Return list of identifiers from *packages*."""
+    return [package.identifier for package in packages]
+
+
+def test_solver_satisfiable():
+    """Solve satisfiable clauses."""
+    solver = wiz.solver.Solver()
+    a, b, c = [solver.new_variable() for _ in range(3)]
+    assert solver.variables == 3
+
+    solver.add_clause([a, b])
+    solver.add_clause([-a, c])
+    solver.add_clause([-b])
+
+    assert solver.solve() is True
+    assert solver.value(a) == 1
+    assert solver.value(-a) == -1
+    assert solver.value(b) == -1
+    assert solver.value(c) == 1
+
+
+def test_solver_unsatisfiable():
+    """Fail to solve unsatisfiable clauses."""
+    solver = wiz.solver.Solver()
+    a, b = solver.new_variable(), solver.new_variable()
+
+    solver.add_clause([a, b])
+    solver.add_clause([a, -b])
+    solver.add_clause([-a, b])
+    solver.add_clause([-a, -b])
+
+    assert solver.solve() is False
+
+
+def test_solver_empty_clause():
+    """Fail to solve empty clause."""
+    solver = wiz.solver.Solver()
+    solver.new_variable()
+    solver.add_clause([])
+
+    assert solver.solve() is False
+
+
+@pytest.mark.parametrize("holes", [2, 3, 4], ids=[
+    "3-pigeons",
+    "4-pigeons",
+    "5-pigeons",
+])
+def test_solver_pigeonhole(holes):
+    """Fail to place more pigeons than holes with conflict learning."""
+    solver = wiz.solver.Solver()
+    variables = [
+        [solver.new_variable() for _ in range(holes)]
+        for _ in range(holes + 1)
+    ]
+
+    # Each pigeon is in a hole.
+    for pigeon in variables:
+        solver.add_clause(pigeon)
+
+    # Each hole contains at most one pigeon.
+    for hole in range(holes):
+        for first, second in itertools.combinations(variables, 2):
+            solver.add_clause([-first[hole], -second[hole]])
+
+    assert solver.solve() is False
+    assert solver.conflicts > 0
+
+
+def test_solver_with_decide():
+    """Solve clauses with custom decisions."""
+    solver = wiz.solver.Solver()
+    variables = [solver.new_variable() for _ in range(4)]
+
+    # Exactly one variable is true.
+    solver.add_clause(variables)
+    for first, second in itertools.combinations(variables, 2):
+        solver.add_clause([-first, -second])
+
+    def _decide(_solver):
+        """Assign last unassigned variable to true."""
+        for variable in reversed(variables):
+            if _solver.value(variable) == 0:
+                return variable
+
+    assert solver.solve(_decide) is True
+    assert [solver.value(variable) for variable in variables] == [
+        -1, -1, -1, 1
+    ]
+    assert solver.decisions == 1
+    assert solver.trail[0] == variables[-1]
+
+
+def test_resolver():
+    """Resolve packages sorted per distance to the root level."""
+    definition_mapping = _definition_mapping([
+        {"identifier": "A", "version": "0.1.0", "requirements": ["B", "C"]},
+        {"identifier": "B", "version": "0.1.0", "requirements": ["D"]},
+        {"identifier": "B", "version": "0.2.0", "requirements": ["D"]},
+        {"identifier": "C", "version": "0.1.0"},
+        {"identifier": "D", "version": "0.1.0"},
+    ])
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+    assert resolver.definition_mapping == definition_mapping
+
+    packages = resolver.compute_packages([Requirement("A")])
+    assert _identifiers(packages) == [
+        "D==0.1.0", "C==0.1.0", "B==0.2.0", "A==0.1.0"
+    ]
+
+
+def test_resolver_with_variants():
+    """Resolve first variant compatible with all requirements."""
+    definition_mapping = _definition_mapping([
+        {
+            "identifier": "A",
+            "version": "0.1.0",
+            "variants": [
+                {"identifier": "V2", "requirements": ["B >=2"]},
+                {"identifier": "V1", "requirements": ["B <2"]},
+            ]
+        },
+        {"identifier": "B", "version": "1.0.0"},
+        {"identifier": "B", "version": "2.0.0"},
+    ])
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+
+    packages = resolver.compute_packages([Requirement("A")])
+    assert _identifiers(packages) == ["B==2.0.0", "A[V2]==0.1.0"]
+
+    packages = resolver.compute_packages([Requirement("A"), Requirement("B<2")])
+    assert _identifiers(packages) == ["B==1.0.0", "A[V1]==0.1.0"]
+
+
+def test_resolver_with_downgrade():
+    """Resolve lower version to fulfill all requirements."""
+    definition_mapping = _definition_mapping([
+        {"identifier": "A", "version": "0.1.0", "requirements": ["C <1"]},
+        {"identifier": "A", "version": "0.2.0", "requirements": ["C >=1"]},
+        {"identifier": "B", "version": "0.1.0", "requirements": ["C <1"]},
+        {"identifier": "C", "version": "0.5.0"},
+        {"identifier": "C", "version": "1.0.0"},
+    ])
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+
+    packages = resolver.compute_packages([Requirement("A"), Requirement("B")])
+    assert _identifiers(packages) == ["C==0.5.0", "B==0.1.0", "A==0.1.0"]
+
+
+def test_resolver_with_conditions():
+    """Drop package when conditions are not fulfilled."""
+    definition_mapping = _definition_mapping([
+        {"identifier": "A", "version": "0.1.0", "requirements": ["B"]},
+        {"identifier": "B", "version": "0.1.0"},
+        {
+            "identifier": "B",
+            "version": "0.2.0",
+            "conditions": ["C"],
+        },
+        {"identifier": "C", "version": "0.1.0"},
+    ])
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+
+    packages = resolver.compute_packages([Requirement("A")])
+    assert _identifiers(packages) == ["A==0.1.0"]
+
+    packages = resolver.compute_packages([Requirement("A"), Requirement("C")])
+    assert _identifiers(packages) == ["C==0.1.0", "B==0.2.0", "A==0.1.0"]
+
+
+def test_resolver_fail():
+    """Fail to resolve conflicting requirements."""
+    definition_mapping = _definition_mapping([
+        {"identifier": "A", "version": "0.1.0", "requirements": ["C <1"]},
+        {"identifier": "B", "version": "0.1.0", "requirements": ["C >=1"]},
+        {"identifier": "C", "version": "0.5.0"},
+        {"identifier": "C", "version": "1.0.0"},
+    ])
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+
+    with pytest.raises(wiz.exception.GraphConflictsError) as error:
+        resolver.compute_packages([Requirement("A"), Requirement("B")])
+
+    assert (
+        "The dependency graph could not be resolved due to the following "
+        "requirement conflicts:\n"
+        "  * ::C <1 \t[A==0.1.0]\n"
+        "  * ::C >=1 \t[B==0.1.0]\n"
+    ) in str(error.value)
+
+    # Report is identical to the one from the graph resolver.
+    with pytest.raises(wiz.exception.GraphConflictsError) as expected:
+        wiz.graph.Resolver(definition_mapping).compute_packages(
+            [Requirement("A"), Requirement("B")]
+        )
+
+    assert str(error.value) == str(expected.value)
+
+
+def test_resolver_fail_without_diagnosis(mocker):
+    """Fail to resolve requirements without reporting conflicts."""
+    definition_mapping = _definition_mapping([
+        {"identifier": "A", "version": "0.1.0", "requirements": ["C <1"]},
+        {"identifier": "B", "version": "0.1.0", "requirements": ["C >=1"]},
+        {"identifier": "C", "version": "0.5.0"},
+        {"identifier": "C", "version": "1.0.0"},
+    ])
+
+    # Graph resolver used for diagnosis does not fail.
+    mocker.patch.object(
+        wiz.graph.Resolver, "compute_packages", return_value=[]
+    )
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+
+    with pytest.raises(wiz.exception.GraphResolutionError) as error:
+        resolver.compute_packages([Requirement("A"), Requirement("B")])
+
+    assert not isinstance(error.value, wiz.exception.GraphConflictsError)
+    assert (
+        "The dependency graph could not be resolved as no combination of "
+        "package versions and variants fulfills all requirements."
+    ) in str(error.value)
+
+
+def test_resolver_fail_from_invalid_requirements():
+    """Fail to resolve requirements which cannot be extracted."""
+    definition_mapping = _definition_mapping([
+        {"identifier": "A", "version": "0.1.0", "requirements": ["incorrect"]},
+    ])
+
+    resolver = wiz.solver.Resolver(definition_mapping)
+
+    with pytest.raises(wiz.exception.GraphInvalidNodesError) as error:
+        resolver.compute_packages([Requirement("A")])
+
+    assert "The requirement 'incorrect' could not be resolved." in str(
+        error.value
+    )
+
+    with pytest.raises(wiz.exception.GraphInvalidNodesError) as error:
+        resolver.compute_packages([Requirement("incorrect")])
+
+    assert "The requirement 'incorrect' could not be resolved." in str(
+        error.value
+    )
@@ -325,3 +325,110 @@ def test_validate_requirement_error():
 
     with pytest.raises(wiz.exception.DefinitionError):
         wiz.system.validate(definition, {})
+
+
+def test_filter():
+    """Memoize results per system requirement."""
+    system_filter = wiz.system.Filter({
+        "platform": "linux",
+        "arch": "x86_64",
+        "os": {
+            "name": "centos",
+            "version": Version("7.5")
+        }
+    })
+
+    definitions = [
+        wiz.definition.Definition({"identifier": "A"}),
+        wiz.definition.Definition({
+            "identifier": "B", "system": {"os": "el >= 7, < 8"}
+        }),
+        wiz.definition.Definition({
+            "identifier": "C", "system": {"os": "el<8,>=7"}
+        }),
+        wiz.definition.Definition({
+            "identifier": "D", "system": {"os": "el >= 8"}
+        }),
+        wiz.definition.Definition({
+            "identifier": "E",
+            "system": {"os": "el >= 8", "arch": "x86_64"}
+        }),
+        wiz.definition.Definition({
+            "identifier": "F",
+            "system": {"arch": "x86_64", "os": "el >= 8"}
+        }),
+    ]
+
+    results = [system_filter.validate(_def) for _def in definitions]
+    assert results == [True, True, True, False, False, False]
+
+    assert system_filter.hits == 2
+    assert system_filter.misses == 3
+
+
+def test_filter_platform():
+    """Memoize results per platform value without normalizing it."""
+    system_filter = wiz.system.Filter({"platform": "linux"})
+
+    definitions = [
+        wiz.definition.Definition({
+            "identifier": "A", "system": {"platform": "lin ux"}
+        }),
+        wiz.definition.Definition({
+            "identifier": "B", "system": {"platform": "linux"}
+        }),
+    ]
+
+    results = [system_filter.validate(_def) for _def in definitions]
+    assert results == [False, True]
+
+    assert system_filter.hits == 0
+    assert system_filter.misses == 2
+
+
+def test_filter_requirement_error():
+    """Fails to validate definition when os requirement is incorrect."""
+    system_filter = wiz.system.Filter({})
+
+    definition = wiz.definition.Definition({
+        "identifier": "test",
+        "system": {"os": "!!!"}
+    })
+
+    for _ in range(2):
+        with pytest.raises(wiz.exception.DefinitionError):
+            system_filter.validate(definition)
+
+    assert system_filter.hits == 0
+    assert system_filter.misses == 2
+
+
+def test_fetch_filter():
+    """Fetch filter cached per system mapping instance."""
+    system_mapping = {"platform": "linux"}
+
+    system_filter = wiz.system.fetch_filter(system_mapping)
+    assert isinstance(system_filter, wiz.system.Filter)
+    assert system_filter.system_mapping is system_mapping
+
+    assert wiz.system.fetch_filter(system_mapping) is system_filter
+    assert wiz.system.fetch_filter({"platform": "linux"}) is not system_filter
+
+
+def test_fetch_filter_replaced(mocker):
+    """Fetch filter for system mapping while cached filter is replaced."""
+    system_mapping1 = {"platform": "linux"}
+    system_mapping2 = {"platform": "windows"}
+
+    filter1 = wiz.system.Filter(system_mapping1)
+    filter2 = wiz.system.Filter(system_mapping2)
+
+    def _create_filter(system_mapping):
+        """Replace cached filter as another thread would do."""
+        mocker.patch.object(wiz.system, "_FILTER", filter2)
+        return filter1
+
+    mocker.patch.object(wiz.system, "_FILTER", None)
+    mocker.patch.object(wiz.system, "Filter", side_effect=_create_filter)
+
+    assert wiz.system.fetch_filter(system_mapping1) is filter1
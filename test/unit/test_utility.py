@@ -5,14 +5,21 @@ import collections
 import base64
 import hashlib
 import functools
+import json
+import pickle
+import random
 
+from packaging.requirements import InvalidRequirement
 import pytest
 import six
+import ujson
 
+import wiz._requirement
 import wiz.definition
+import wiz.exception
 import wiz.package
 import wiz.utility
-from wiz.utility import Requirement
+from wiz._requirement import Requirement
 
 
 @pytest.fixture()
@@ -27,6 +34,101 @@ def mocked_match(mocker):
     return mocker.patch.object(wiz.utility, "match")
 
 
+@pytest.mark.parametrize("content", [
+    "foo", " foo", "foo ", "foo\n", "foo-bar", "foo_bar.baz", "foo1.0",
+    "foo-", "-foo", "::foo", "foo::bar", "foo::bar::baz", "foo:::bar",
+    "foo::", "foo[V1]", "foo [V1]", "foo[ V1 , V2 ]", "foo[]", "foo[V1",
+    "foo[::V1]", "foo >= 1", "foo>=1", "foo >= 1 , < 2", "foo>=1,,<2",
+    "foo>=1 <2", "foo >=1 ,", "foo>=", "foo ( >=1 )", "foo==1.*",
+    "foo>=1.*", "foo~=1", "foo~=1.0", "foo===1", "foo<==1", "foo==1+local.1",
+    "foo >= 1.0a1.post2", "foo[V1] == 1.0.dev0", "foo[V1]>=1 ",
+    "foo::bar[V1, V2] >= 1, < 2, != 1.5", "foo;python_version>\"3\"",
+    "foo @ http://test.com/foo.zip", "foo == bar", "foo > 1 ; os_name",
+    "", " ", "[V1]", ">=1",
+])
+def test_get_requirement(content):
+    """Parse requirement as packaging parser would."""
+    try:
+        expected = Requirement(content)
+
+    except InvalidRequirement:
+        with pytest.raises(wiz.exception.RequirementError):
+            wiz.utility.get_requirement(content)
+
+    else:
+        requirement = wiz.utility.get_requirement(content)
+        assert requirement.name == expected.name
+        assert requirement.extras == expected.extras
+        assert requirement.specifier == expected.specifier
+        assert requirement.url == expected.url
+        assert str(requirement.marker) == str(expected.marker)
+
+
+def test_get_requirement_random():
+    """Parse random requirements as packaging parser would."""
+    generator = random.Random(42)
+    tokens = [
+        "foo", "bar", "::", ":", "-", ".", "_", "1", "0", " ", "[", "]", ",",
+        "==", "!=", "<=", ">=", "<", ">", "~=", "*", "a", "post", "dev", "+",
+        "(", ")", ";", "@"
+    ]
+
+    for _ in range(3000):
+        content = "".join(
+            generator.choice(tokens) for _ in range(generator.randint(1, 12))
+        )
+
+        try:
+            expected = Requirement(content)
+
+        except InvalidRequirement:
+            with pytest.raises(wiz.exception.RequirementError):
+                wiz.utility.get_requirement(content)
+
+        else:
+            requirement = wiz.utility.get_requirement(content)
+            assert requirement.name == expected.name, content
+            assert requirement.extras == expected.extras, content
+            assert requirement.specifier == expected.specifier, content
+            assert str(requirement.marker) == str(expected.marker), content
+
+
+def test_get_requirement_copy():
+    """Return new requirement instance for each call."""
+    requirement1 = wiz.utility.get_requirement("foo[V1] >= 1")
+    requirement1.extras.add("V2")
+    requirement1.specifier &= "< 2"
+
+    requirement2 = wiz.utility.get_requirement("foo[V1] >= 1")
+    assert requirement2 is not requirement1
+    assert requirement2.extras == {"V1"}
+    assert str(requirement2) == "foo[V1] >=1"
+
+
+def test_get_requirement_cache_size(mocker):
+    """Only memoize requirements most recently parsed."""
+    mocker.patch.object(wiz._requirement, "CACHE_SIZE", 2)
+    mocker.patch.object(wiz._requirement, "_CACHE", collections.OrderedDict())
+    mocked_parse = mocker.patch.object(
+        wiz._requirement, "_parse", wraps=wiz._requirement._parse
+    )
+
+    wiz.utility.get_requirement("A")
+    wiz.utility.get_requirement("B")
+    wiz.utility.get_requirement("A")
+    wiz.utility.get_requirement("C")
+    assert list(wiz._requirement._CACHE.keys()) == ["A", "C"]
+
+    wiz.utility.get_requirement("A")
+    wiz.utility.get_requirement("B")
+    assert list(wiz._requirement._CACHE.keys()) == ["A", "B"]
+
+    assert mocked_parse.call_args_list == [
+        mocker.call("A"), mocker.call("B"), mocker.call("C"),
+        mocker.call("B")
+    ]
+
+
 @pytest.mark.parametrize("element", [
     "This is a string",
     42,
@@ -268,6 +370,105 @@ def test_extract_version_ranges_error(requirement, expected):
     assert expected in str(error)
 
 
+def test_fetch_version_ranges(mocker):
+    """Fetch version ranges once per specifier set."""
+    mocker.patch.object(wiz.utility, "_VERSION_RANGES", {})
+    spy = mocker.spy(wiz.utility, "extract_version_ranges")
+
+    requirement1 = Requirement("foo >=0.1.0, !=0.2.0")
+    requirement2 = Requirement("bar !=0.2.0, >=0.1.0")
+
+    ranges = wiz.utility.fetch_version_ranges(requirement1)
+    assert isinstance(ranges, wiz.utility.VersionRanges)
+    assert list(ranges) == [
+        ((0, 1, 0), (0, 1, 9999)), ((0, 2, 0, 1), None)
+    ]
+
+    assert wiz.utility.fetch_version_ranges(requirement1) is ranges
+    assert wiz.utility.fetch_version_ranges(requirement2) is ranges
+    spy.assert_called_once_with(requirement1)
+
+    ranges = wiz.utility.fetch_version_ranges(Requirement("foo >=0.1.0"))
+    assert list(ranges) == [((0, 1, 0), None)]
+    assert spy.call_count == 2
+
+
+def test_fetch_version_ranges_error():
+    """Fail to fetch version ranges from incorrect requirement."""
+    requirement = Requirement("foo >=2, <1")
+
+    for _ in range(2):
+        with pytest.raises(wiz.exception.RequirementError):
+            wiz.utility.fetch_version_ranges(requirement)
+
+
+@pytest.mark.parametrize("ranges1, ranges2, expected", [
+    (
+        [(None, None)],
+        [((1,), (2,))],
+        [((1,), (2,))]
+    ),
+    (
+        [(None, (1, 9999)), ((2, 0, 1), None)],
+        [((1, 5), (3,))],
+        [((1, 5), (1, 9999)), ((2, 0, 1), (3,))]
+    ),
+    (
+        [(None, (1, 9999)), ((2, 0, 1), None)],
+        [((2,), (2,))],
+        []
+    ),
+    (
+        [((1,), (2,)), ((3,), (4,)), ((5,), None)],
+        [((1, 5), (3, 5)), ((4,), (5,))],
+        [((1, 5), (2,)), ((3,), (3, 5)), ((4,), (4,)), ((5,), (5,))]
+    ),
+    (
+        [((1,), (2,))],
+        [],
+        []
+    ),
+], ids=[
+    "unbounded",
+    "split",
+    "empty",
+    "multiple",
+    "with-empty"
+])
+def test_version_ranges_intersection(ranges1, ranges2, expected):
+    """Compute intersection of version ranges."""
+    ranges1 = wiz.utility.VersionRanges(ranges1)
+    ranges2 = wiz.utility.VersionRanges(ranges2)
+
+    result = ranges1.intersection(ranges2)
+    assert isinstance(result, wiz.utility.VersionRanges)
+    assert list(result) == expected
+    assert list(ranges2.intersection(ranges1)) == expected
+    assert bool(result) is bool(expected)
+
+
+@pytest.mark.parametrize("ranges1, ranges2, expected", [
+    ([(None, None)], [((1,), (2,))], True),
+    ([((1,), (2,))], [((2,), (3,))], True),
+    ([((1,), (1, 9999))], [((2,), (3,))], False),
+    ([(None, (1, 9999)), ((2, 0, 1), None)], [((2,), (2,))], True),
+    ([((1,), (2,))], [], False),
+], ids=[
+    "unbounded",
+    "touching",
+    "disjoint",
+    "within-span",
+    "with-empty"
+])
+def test_version_ranges_overlaps(ranges1, ranges2, expected):
+    """Indicate whether version ranges are overlapping."""
+    ranges1 = wiz.utility.VersionRanges(ranges1)
+    ranges2 = wiz.utility.VersionRanges(ranges2)
+
+    assert ranges1.overlaps(ranges2) is expected
+    assert ranges2.overlaps(ranges1) is expected
+
+
 @pytest.mark.parametrize("version, ranges, expected", [
     (
         (1,),
@@ -600,6 +801,32 @@ def test_compute_file_name(definition, expected):
     assert wiz.utility.compute_file_name(definition) == expected
 
 
+@pytest.mark.parametrize("system, expected", [
+    ({"platform": "linux"}, b"linux"),
+    ({"platform": "linux", "os": "el >= 7, < 8"}, b"linuxel>=7,<8"),
+    (
+        {"platform": "linux", "arch": "x86_64", "os": "el >= 7, < 8"},
+        b"linuxx86_64el>=7,<8"
+    ),
+], ids=[
+    "platform",
+    "platform-and-os",
+    "all",
+])
+def test_compute_system_hash(system, expected):
+    """Compute hash of definition system label."""
+    definition = wiz.definition.Definition({
+        "identifier": "test",
+        "system": system
+    })
+
+    result = wiz.utility.compute_system_hash(definition)
+    assert len(result) == wiz.utility.SYSTEM_HASH_LENGTH
+    assert result == base64.urlsafe_b64encode(
+        hashlib.sha1(expected).digest()
+    ).rstrip(b"=").decode("utf-8")
+
+
 @pytest.mark.parametrize("mapping1, mapping2, expected", [
     ({}, {}, {}),
     ({"A": 1, "B": 2}, {"B": 3}, {"A": 1, "B": 3}),
@@ -633,6 +860,100 @@ def test_deep_update(mapping1, mapping2, expected):
     assert mapping2 == _mapping2
 
 
+def test_freeze():
+    """Return read-only version of data."""
+    data = {"A": {"B": [1, {"C": 2}]}, "D": "value"}
+    _data = copy.deepcopy(data)
+
+    frozen_data = wiz.utility.freeze(data)
+    assert frozen_data == data
+    assert data == _data
+
+    assert isinstance(frozen_data, wiz.utility.FrozenDict)
+    assert isinstance(frozen_data["A"], wiz.utility.FrozenDict)
+    assert isinstance(frozen_data["A"]["B"], wiz.utility.FrozenList)
+    assert isinstance(frozen_data["A"]["B"][1], wiz.utility.FrozenDict)
+
+    # Frozen data is not copied.
+    assert wiz.utility.freeze(frozen_data) is frozen_data
+
+    _frozen_data = wiz.utility.freeze(dict(frozen_data, E=3))
+    assert _frozen_data["A"] is frozen_data["A"]
+
+
+@pytest.mark.parametrize("operation", [
+    lambda data: data.__setitem__("E", 3),
+    lambda data: data.__delitem__("D"),
+    lambda data: data.update({"E": 3}),
+    lambda data: data.setdefault("E", 3),
+    lambda data: data.pop("D"),
+    lambda data: data.popitem(),
+    lambda data: data.clear(),
+    lambda data: data["A"]["B"].append(3),
+    lambda data: data["A"]["B"].extend([3]),
+    lambda data: data["A"]["B"].insert(0, 3),
+    lambda data: data["A"]["B"].remove(1),
+    lambda data: data["A"]["B"].pop(),
+    lambda data: data["A"]["B"].sort(),
+    lambda data: data["A"]["B"].__setitem__(0, 3),
+    lambda data: data["A"]["B"].__delitem__(0),
+    lambda data: data["A"]["B"][1].__setitem__("C", 3),
+], ids=[
+    "dict-set-item",
+    "dict-delete-item",
+    "dict-update",
+    "dict-setdefault",
+    "dict-pop",
+    "dict-popitem",
+    "dict-clear",
+    "list-append",
+    "list-extend",
+    "list-insert",
+    "list-remove",
+    "list-pop",
+    "list-sort",
+    "list-set-item",
+    "list-delete-item",
+    "nested-dict-set-item",
+])
+def test_freeze_mutation_error(operation):
+    """Fail to mutate read-only data."""
+    data = wiz.utility.freeze({"A": {"B": [1, {"C": 2}]}, "D": "value"})
+
+    with pytest.raises(TypeError) as error:
+        operation(data)
+
+    assert "object is read-only." in str(error.value)
+    assert data == {"A": {"B": [1, {"C": 2}]}, "D": "value"}
+
+
+def test_freeze_serialization():
+    """Serialize read-only data."""
+    data = wiz.utility.freeze({"A": {"B": [1, {"C": 2}]}, "D": "value"})
+
+    assert ujson.loads(ujson.dumps(data)) == data
+    assert json.loads(json.dumps(data)) == data
+    assert pickle.loads(pickle.dumps(data)) == data
+    assert isinstance(
+        pickle.loads(pickle.dumps(data)), wiz.utility.FrozenDict
+    )
+
+
+def test_thaw():
+    """Return mutable copy of data."""
+    data = wiz.utility.freeze({"A": {"B": [1, {"C": 2}]}, "D": "value"})
+
+    for _data in [wiz.utility.thaw(data), copy.deepcopy(data)]:
+        assert _data == data
+        assert type(_data) is dict
+        assert type(_data["A"]) is dict
+        assert type(_data["A"]["B"]) is list
+        assert type(_data["A"]["B"][1]) is dict
+
+        _data["A"]["B"].append(3)
+        assert data == {"A": {"B": [1, {"C": 2}]}, "D": "value"}
+
+
 @pytest.mark.parametrize("package_data, variant_index, requirement, expected", [
     ({"identifier": "A"}, None, Requirement("A"), Requirement("::A")),
     (
@@ -745,6 +1066,46 @@ def test_match(package_data, variant_index, requirement, expected):
     assert wiz.utility.match(requirement, package) == expected
 
 
+def test_requirement_matcher():
+    """Match several packages against requirement."""
+    packages = [
+        wiz.package.Package(
+            wiz.definition.Definition({
+                "identifier": "A",
+                "namespace": namespace,
+                "version": version,
+                "variants": [{"identifier": "V1"}, {"identifier": "V2"}]
+            }),
+            variant_index=index
+        )
+        for namespace in ["foo", "bar"]
+        for version in ["0.1.0", "1.0.0"]
+        for index in [0, 1]
+    ]
+
+    requirement = Requirement("foo::A[V2] >= 1")
+    matcher = wiz.utility.RequirementMatcher(requirement)
+    assert matcher.namespace == "foo"
+    assert matcher.identifier == "A"
+    assert matcher.variants == {"V2"}
+    assert matcher.specifier is requirement.specifier
+
+    assert [
+        package.identifier for package in packages if matcher.match(package)
+    ] == ["foo::A[V2]==1.0.0"]
+
+    matcher = wiz.utility.RequirementMatcher(Requirement("A < 1"))
+    assert [
+        package.identifier for package in packages if matcher.match(package)
+    ] == [
+        "foo::A[V1]==0.1.0", "foo::A[V2]==0.1.0",
+        "bar::A[V1]==0.1.0", "bar::A[V2]==0.1.0",
+    ]
+
+    # Requirement is not mutated.
+    assert str(requirement) == "foo::A[V2] >=1"
+
+
 @pytest.mark.parametrize("requirement, namespace, identifier", [
     (Requirement("A"), None, "A"),
     (Requirement("::A"), None, "A"),
@@ -0,0 +1,181 @@
+# :coding: utf-8
+
+import os
+
+import pytest
+
+import wiz.config
+import wiz.validation_cache
+from wiz import __version__
+
+
+@pytest.fixture()
+def cache_path(temporary_directory):
+    """Return path to cache file."""
+    return os.path.join(temporary_directory, "cache", "validation.json")
+
+
+@pytest.fixture()
+def mocked_config_fetch(mocker):
+    """Return mocked config.fetch function."""
+    return mocker.patch.object(wiz.config, "fetch", return_value={})
+
+
+@pytest.fixture()
+def mocked_time(mocker):
+    """Return mocked time.time function."""
+    return mocker.patch.object(
+        wiz.validation_cache.time, "time", return_value=86400 * 10
+    )
+
+
+def test_get_path(mocked_config_fetch, mocker):
+    """Return default cache path."""
+    mocker.patch.object(os.path, "expanduser", return_value="__HOME__")
+    assert wiz.validation_cache.get_path() == os.path.join(
+        "__HOME__", ".wiz", "cache", "validation.json"
+    )
+
+
+def test_get_path_from_config(mocked_config_fetch):
+    """Return cache path from configuration."""
+    mocked_config_fetch.return_value = {
+        "validation_cache": {"path": "/path/to/validation.json"}
+    }
+    assert wiz.validation_cache.get_path() == "/path/to/validation.json"
+
+
+def test_compute_key():
+    """Compute key from content."""
+    key = wiz.validation_cache.compute_key(b"{\"identifier\": \"foo\"}")
+    assert key == wiz.validation_cache.compute_key(
+        b"{\"identifier\": \"foo\"}", mapping={}
+    )
+    assert key != wiz.validation_cache.compute_key(
+        b"{\"identifier\": \"bar\"}"
+    )
+    assert key != wiz.validation_cache.compute_key(
+        b"{\"identifier\": \"foo\"}", mapping={"registry": "/path"}
+    )
+
+
+def test_fetch(mocked_config_fetch, cache_path):
+    """Fetch validation cache when enabled."""
+    assert wiz.validation_cache.fetch(refresh=True) is None
+
+    mocked_config_fetch.return_value = {
+        "validation_cache": {
+            "enabled": True, "path": cache_path, "max_entries": 10
+        }
+    }
+
+    cache = wiz.validation_cache.fetch(refresh=True)
+    assert isinstance(cache, wiz.validation_cache.ValidationCache)
+    assert cache.path == cache_path
+    assert wiz.validation_cache.fetch() is cache
+    assert wiz.validation_cache.fetch(refresh=True) is not cache
+
+
+def test_save_on_exit(mocker, mocked_config_fetch, cache_path):
+    """Save validation cache once at exit."""
+    mocker.patch.object(wiz.validation_cache, "_SAVE_ON_EXIT", False)
+    mocked_register = mocker.patch.object(
+        wiz.validation_cache.atexit, "register"
+    )
+
+    wiz.validation_cache.save_on_exit()
+    wiz.validation_cache.save_on_exit()
+    mocked_register.assert_called_once_with(wiz.validation_cache._save)
+
+    mocked_config_fetch.return_value = {
+        "validation_cache": {"enabled": True, "path": cache_path}
+    }
+
+    cache = wiz.validation_cache.fetch(refresh=True)
+    cache.record("KEY")
+    assert not os.path.isfile(cache_path)
+
+    wiz.validation_cache._save()
+    assert os.path.isfile(cache_path)
+
+
+@pytest.mark.usefixtures("mocked_time")
+def test_cache_record_and_save(cache_path):
+    """Record and save keys into cache."""
+    cache = wiz.validation_cache.ValidationCache(path=cache_path)
+    assert len(cache) == 0
+    assert cache.contains("KEY1") is False
+    assert cache.save() is False
+
+    cache.record("KEY1")
+    cache.record("KEY2")
+    assert cache.contains("KEY1") is True
+    assert cache.save() is True
+    assert os.listdir(os.path.dirname(cache_path)) == ["validation.json"]
+
+    cache = wiz.validation_cache.ValidationCache(path=cache_path)
+    assert len(cache) == 2
+    assert cache.contains("KEY1") is True
+    assert cache.contains("KEY2") is True
+    assert cache.contains("KEY3") is False
+
+    # Nothing changed, so the cache is not written again.
+    cache.record("KEY1")
+    assert cache.save() is False
+
+
+def test_cache_eviction(mocked_time, cache_path):
+    """Evict least recently used entries."""
+    cache = wiz.validation_cache.ValidationCache(
+        path=cache_path, max_entries=2
+    )
+    cache.record("KEY1")
+    cache.record("KEY2")
+    cache.save()
+
+    # Keys used another day are kept.
+    mocked_time.return_value += 86400
+    cache = wiz.validation_cache.ValidationCache(
+        path=cache_path, max_entries=2
+    )
+    assert cache.contains("KEY2") is True
+    cache.record("KEY3")
+    assert cache.save() is True
+
+    cache = wiz.validation_cache.ValidationCache(path=cache_path)
+    assert len(cache) == 2
+    assert cache.contains("KEY1") is False
+    assert cache.contains("KEY2") is True
+    assert cache.contains("KEY3") is True
+
+
+@pytest.mark.parametrize("data", [
+    "{\"format\": 0, \"version\": \"__VERSION__\", \"entries\": {\"KEY\": 0}}",
+    "{\"format\": 1, \"version\": \"0.0.0\", \"entries\": {\"KEY\": 0}}",
+    "[]",
+    "incorrect",
+], ids=[
+    "incorrect-format",
+    "incorrect-version",
+    "incorrect-type",
+    "corrupted",
+])
+def test_cache_outdated(cache_path, data):
+    """Ignore outdated or corrupted cache."""
+    os.makedirs(os.path.dirname(cache_path))
+    with open(cache_path, "w") as stream:
+        stream.write(data.replace("__VERSION__", __version__))
+
+    cache = wiz.validation_cache.ValidationCache(path=cache_path)
+    assert len(cache) == 0
+    assert cache.contains("KEY") is False
+
+
+def test_cache_save_error(temporary_file):
+    """Fail to save cache silently."""
+    # Cache directory cannot be created as a file exists with the same name.
+    cache_path = os.path.join(temporary_file, "validation.json")
+
+    cache = wiz.validation_cache.ValidationCache(path=cache_path)
+    cache.record("KEY")
+    assert cache.save() is False
@@ -197,6 +197,164 @@ def test_validate_definition_failed(value, message):
     assert message in str(error)
 
 
+def test_validate_definition_with_deferred_keywords():
+    """Validate definition data without deferred keywords."""
+    data = {
+        "identifier": "foo",
+        "environ": "incorrect",
+        "variants": [{"identifier": "V1", "requirements": "incorrect"}],
+    }
+
+    wiz.validator.validate_definition(
+        data, deferred_keywords=["environ", "variants"]
+    )
+
+    with pytest.raises(wiz.exception.DefinitionError) as error:
+        wiz.validator.validate_definition_keyword(data, "environ")
+
+    assert "'environ' has incorrect type." in str(error)
+
+    with pytest.raises(wiz.exception.DefinitionError) as error:
+        wiz.validator.validate_definition_keyword(data, "variants")
+
+    assert "'variants/0/requirements' has incorrect type." in str(error)
+
+
+@pytest.mark.parametrize("value, message", [
+    ({"environ": {}}, "'identifier' is required."),
+    ({"identifier": "foo", "other": "test"}, "invalid keywords: other"),
+    ({"identifier": True, "environ": {}}, "'identifier' has incorrect type."),
+], ids=[
+    "identifier-missing",
+    "keyword-incorrect",
+    "identifier-incorrect",
+])
+def test_validate_definition_with_deferred_keywords_failed(value, message):
+    """Raise error when non deferred data is incorrect."""
+    with pytest.raises(wiz.exception.DefinitionError) as error:
+        wiz.validator.validate_definition(
+            value, deferred_keywords=["environ", "variants"]
+        )
+
+    assert message in str(error)
+
+
+def test_validate_definition_keyword():
+    """Validate one keyword of definition data."""
+    wiz.validator.validate_definition_keyword({"identifier": "foo"}, "environ")
+    wiz.validator.validate_definition_keyword(
+        {"identifier": "foo", "environ": {"KEY": "VALUE"}}, "environ"
+    )
+
+
+@pytest.mark.parametrize("value", [
+    {"identifier": "foo"},
+    {
+        "identifier": "foo",
+        "version": "0.1.0",
+        "namespace": "bar",
+        "description": "This is a definition",
+        "auto-use": True,
+        "disabled": False,
+        "install-root": "/path/to/root",
+        "install-location": "${INSTALL_ROOT}/foo",
+        "system": {"platform": "linux", "os": "el >= 7", "arch": "x86_64"},
+        "command": {"foo": "FooExe"},
+        "environ": {"KEY": "VALUE"},
+        "requirements": ["bar"],
+        "conditions": ["baz"],
+        "variants": [
+            {
+                "identifier": "V1",
+                "install-location": "/path/to/V1",
+                "command": {"foo": "FooExe"},
+                "environ": {"KEY": "VALUE"},
+                "requirements": ["bar"],
+            },
+            {"identifier": "V2"},
+        ],
+    },
+    {"identifier": "foo", "version": None, "system": {"platform": None}},
+    42,
+    {},
+    {"identifier": None},
+    {"identifier": "foo", "other": "test"},
+    {"identifier": "foo", "version": "incorrect version"},
+    {"identifier": "foo", "auto-use": "true"},
+    {"identifier": "foo", "system": {}},
+    {"identifier": "foo", "system": {"platform": "linux", "other": "test"}},
+    {"identifier": "foo", "system": {"os": 7}},
+    {"identifier": "foo", "command": {}},
+    {"identifier": "foo", "environ": []},
+    {"identifier": "foo", "requirements": []},
+    {"identifier": "foo", "conditions": "bar"},
+    {"identifier": "foo", "variants": []},
+    {"identifier": "foo", "variants": ["V1"]},
+    {"identifier": "foo", "variants": [{}]},
+    {"identifier": "foo", "variants": [{"identifier": "V1", "other": "test"}]},
+    {"identifier": "foo", "variants": [{"identifier": "V1", "environ": {}}]},
+    {"identifier": "foo", "variants": [{"identifier": 0}]},
+    {"identifier": 0, "environ": {}, "variants": [{"identifier": 0}]},
+], ids=[
+    "minimal",
+    "complete",
+    "none-values",
+    "incorrect-type",
+    "identifier-missing",
+    "identifier-none",
+    "invalid-keywords",
+    "version-incorrect",
+    "auto-use-incorrect",
+    "system-empty",
+    "system-invalid-keywords",
+    "system-os-incorrect",
+    "command-empty",
+    "environ-incorrect",
+    "requirements-empty",
+    "conditions-incorrect",
+    "variants-empty",
+    "variant-incorrect",
+    "variant-empty",
+    "variant-invalid-keywords",
+    "variant-environ-empty",
+    "variant-identifier-incorrect",
+    "several-errors",
+])
+def test_validate_definition_compiled(value):
+    """Validate definition as keyword validators would."""
+    try:
+        wiz.validator._validate_definition(value, [])
+    except wiz.exception.DefinitionError as error:
+        expected = str(error)
+    else:
+        expected = None
+
+    try:
+        wiz.validator.validate_definition(value)
+    except wiz.exception.DefinitionError as error:
+        assert str(error) == expected
+    else:
+        assert expected is None
+
+
+def test_validate_definition_compiled_fast_path(mocker):
+    """Skip keyword validators when definition is valid."""
+    spy = mocker.spy(wiz.validator, "_validate_definition")
+
+    wiz.validator.validate_definition({
+        "identifier": "foo",
+        "version": "0.1.0",
+        "environ": {"KEY": "VALUE"},
+        "variants": [{"identifier": "V1", "requirements": ["bar"]}],
+    })
+    spy.assert_not_called()
+
+    with pytest.raises(wiz.exception.DefinitionError):
+        wiz.validator.validate_definition({"identifier": "foo", "environ": {}})
+
+    spy.assert_called_once_with({"identifier": "foo", "environ": {}}, [])
+
+
 def test_validate_identifier_keyword():
     """Validate 'identifier' keyword within data."""
     wiz.validator.validate_identifier_keyword({"identifier": "foo"})
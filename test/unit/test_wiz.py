@@ -12,6 +12,7 @@ import wiz.environ
 import wiz.exception
 import wiz.graph
 import wiz.package
+import wiz.solver
 import wiz.system
 import wiz.utility
 from wiz._version import __version__
@@ -101,6 +102,12 @@ def mocked_graph_resolver(mocker):
     return mocker.patch.object(wiz.graph, "Resolver")
 
 
+@pytest.fixture()
+def mocked_solver_resolver(mocker):
+    """Return mocked 'wiz.solver.Resolver' class constructor."""
+    return mocker.patch.object(wiz.solver, "Resolver")
+
+
 @pytest.fixture()
 def mocked_utility_encode(mocker):
     """Return mocked 'wiz.utility.encode' function."""
@@ -166,7 +173,12 @@ def test_fetch_definition_mapping(
     mocked_definition_fetch.assert_called_once_with(
         paths,
         max_depth=options.get("max_depth"),
-        system_mapping=options.get("system_mapping", default_system_mapping)
+        system_mapping=options.get("system_mapping", default_system_mapping),
+        use_index=False,
+        workers=None,
+        lazy=False,
+        snapshot_path=None,
+        targeted=False
     )
 
     if options.get("system_mapping"):
@@ -322,6 +334,56 @@ def test_resolve_context(
     )
 
 
+def test_resolve_context_with_sat_engine(
+    mocked_fetch_definition_mapping, mocked_graph_resolver,
+    mocked_solver_resolver, mocked_environ_initiate,
+    mocked_package_extract_context, mocked_utility_encode,
+    mocked_compute_namespace_counter, mocker
+):
+    """Get resolved context mapping with SAT engine."""
+    packages = [mocker.Mock(identifier="test1")]
+
+    mocked_resolver = mocker.Mock(**{"compute_packages.return_value": packages})
+    mocked_solver_resolver.return_value = mocked_resolver
+    mocked_package_extract_context.return_value = {"environ": {}}
+
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": ["/path/to/registry"]
+    }
+
+    result = wiz.resolve_context(
+        ["test1"], definition_mapping, maximum_attempts=1, engine="sat"
+    )
+    assert result["packages"] == packages
+
+    mocked_graph_resolver.assert_not_called()
+    mocked_solver_resolver.assert_called_once_with("__PACKAGE_DEFINITIONS__")
+    mocked_resolver.compute_packages.assert_called_once_with(
+        [Requirement("test1")],
+        namespace_counter=mocked_compute_namespace_counter.return_value
+    )
+
+
+@pytest.mark.usefixtures("mocked_compute_namespace_counter")
+def test_resolve_context_with_invalid_engine(
+    mocked_graph_resolver, mocked_solver_resolver
+):
+    """Fail to get resolved context mapping with invalid engine."""
+    definition_mapping = {
+        "package": "__PACKAGE_DEFINITIONS__",
+        "registries": ["/path/to/registry"]
+    }
+
+    with pytest.raises(ValueError) as error:
+        wiz.resolve_context(["test1"], definition_mapping, engine="other")
+
+    assert "'other' is not a valid resolver engine." in str(error.value)
+
+    mocked_graph_resolver.assert_not_called()
+    mocked_solver_resolver.assert_not_called()
+
+
 @pytest.mark.parametrize("options, environ, max_combinations, max_attempts", [
     ({}, None, None, None),
     ({"environ_mapping": "__ENVIRON__"}, "__ENVIRON__", None, None),